@@ -0,0 +1,154 @@
+"""
+Memory benchmark for the streaming ledger export.
+
+Seeds a full-schema SQLite database with synthetic ledger rows, runs the
+ledger exporter under ``tracemalloc`` and reports the peak Python heap so we
+can confirm memory stays flat as the ledger grows (1M rows by default).
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.core.schema import create_schema
+from src.services.ledger_export_service import LedgerExportService
+
+BENCHMARK_LEDGER_ROWS = 1_000_000
+MEMORY_CEILING_BYTES = 32 * 1024 * 1024
+
+
+@dataclass(slots=True)
+class ExportBenchmarkResult:
+    rows_exported: int
+    peak_bytes: int
+    duration: float
+    file_size_bytes: int
+    export_format: str
+
+
+def seed_ledger_dataset(db_path: Path, total_rows: int = BENCHMARK_LEDGER_ROWS) -> str:
+    """
+    Create a benchmark database with ``total_rows`` ledger entries.
+    """
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    create_schema(conn)
+    conn.execute(
+        "INSERT OR IGNORE INTO associates (id, display_alias, home_currency) "
+        "VALUES (1, 'Bench Alice', 'EUR'), (2, 'Bench Bob', 'GBP')"
+    )
+
+    existing = conn.execute("SELECT COUNT(1) FROM ledger_entries").fetchone()[0]
+    if existing < total_rows:
+        now = time.time()
+        batch: list[tuple[object, ...]] = []
+        for idx in range(existing + 1, total_rows + 1):
+            created = time.strftime(
+                "%Y-%m-%dT%H:%M:%SZ", time.gmtime(now - (total_rows - idx))
+            )
+            entry_type = "DEPOSIT" if idx % 2 else "WITHDRAWAL"
+            associate_id = 1 if idx % 3 else 2
+            amount = f"{(idx % 997) + 0.5:.2f}"
+            batch.append(
+                (
+                    entry_type,
+                    associate_id,
+                    amount,
+                    "EUR",
+                    "1.000000",
+                    amount,
+                    created,
+                    f"Benchmark entry {idx}",
+                )
+            )
+            if len(batch) == 10_000:
+                _insert_ledger_batch(conn, batch)
+                batch.clear()
+        if batch:
+            _insert_ledger_batch(conn, batch)
+        conn.commit()
+
+    conn.close()
+    return str(db_path)
+
+
+def _insert_ledger_batch(conn: sqlite3.Connection, batch: list[tuple[object, ...]]) -> None:
+    conn.executemany(
+        """
+        INSERT INTO ledger_entries (
+            type, associate_id, amount_native, native_currency,
+            fx_rate_snapshot, amount_eur, created_at_utc, note
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        batch,
+    )
+
+
+def run_export_benchmark(
+    db_path: str, export_format: str = "xlsx", export_dir: str | None = None
+) -> ExportBenchmarkResult:
+    """
+    Export the seeded ledger and measure the peak traced allocation.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = LedgerExportService(export_dir=export_dir or temp_dir)
+        file_path = service.export_dir / f"benchmark_MULTI_01-01-2025_ledger.{export_format}"
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            tracemalloc.start()
+            start = time.perf_counter()
+            if export_format == "xlsx":
+                rows = service._export_ledger_to_excel(conn, file_path)
+            else:
+                rows = service._export_ledger_to_csv(conn, file_path)
+            duration = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            conn.close()
+
+        return ExportBenchmarkResult(
+            rows_exported=rows,
+            peak_bytes=peak,
+            duration=duration,
+            file_size_bytes=file_path.stat().st_size,
+            export_format=export_format,
+        )
+
+
+def _format_result(result: ExportBenchmarkResult) -> str:
+    return (
+        f"- Format: {result.export_format}\n"
+        f"- Rows Exported: {result.rows_exported}\n"
+        f"- Peak Python Heap: {result.peak_bytes / (1024 * 1024):.1f} MB "
+        f"(ceiling {MEMORY_CEILING_BYTES / (1024 * 1024):.0f} MB)\n"
+        f"- Duration: {result.duration:.1f}s\n"
+        f"- File Size: {result.file_size_bytes / (1024 * 1024):.1f} MB\n"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark ledger export memory usage.")
+    parser.add_argument("--db", default="data/benchmark/ledger_export.db")
+    parser.add_argument("--rows", type=int, default=BENCHMARK_LEDGER_ROWS)
+    parser.add_argument("--format", choices=("xlsx", "csv", "csv.gz"), default="xlsx")
+    args = parser.parse_args()
+
+    resolved = seed_ledger_dataset(Path(args.db), total_rows=args.rows)
+    result = run_export_benchmark(resolved, export_format=args.format)
+    print("Ledger export benchmark completed:\n")
+    print(_format_result(result))
+
+    if result.peak_bytes > MEMORY_CEILING_BYTES:
+        print("WARNING: Export exceeded the memory ceiling.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Equivalence benchmark for ``find_market_code_from_label``.
+
+Replays a corpus of bookmaker market labels (English, Italian and Romanian,
+with and without team names) from
+``tests/performance/baselines/market_label_corpus.json``. It checks every
+``(market_code, implied_period)`` result against the recorded one and times
+cold passes (memo cache cleared) and warm passes. The recorded results come
+from the substring-scan heuristics the compiled keyword matcher replaced.
+The CLI exits non-zero on any mismatch.
+
+Re-record with ``--write-expected`` only for intentional heuristic changes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, cast
+
+from src.domain import market_taxonomy
+from src.domain.market_taxonomy import find_market_code_from_label
+
+CORPUS_PATH = Path("tests/performance/baselines/market_label_corpus.json")
+
+
+@dataclass(slots=True)
+class Mismatch:
+    label: str
+    home_team: Optional[str]
+    away_team: Optional[str]
+    expected: tuple
+    actual: tuple
+
+
+@dataclass(slots=True)
+class TaxonomyTiming:
+    labels: int
+    cold_us: float
+    warm_us: float
+
+
+def load_corpus(path: Path = CORPUS_PATH) -> List[Dict[str, Optional[str]]]:
+    return cast(List[Dict[str, Optional[str]]], json.loads(path.read_text(encoding="utf-8")))
+
+
+def save_corpus(corpus: List[Dict[str, Optional[str]]], path: Path = CORPUS_PATH) -> None:
+    # One entry per line keeps diffs of re-recorded results readable.
+    lines = ",\n".join(json.dumps(entry, ensure_ascii=False) for entry in corpus)
+    path.write_text(f"[\n{lines}\n]\n", encoding="utf-8")
+
+
+def _classify(entry: Dict[str, Optional[str]]) -> tuple:
+    return find_market_code_from_label(
+        entry["label"], home_team=entry["home_team"], away_team=entry["away_team"]
+    )
+
+
+def find_mismatches(corpus: List[Dict[str, Optional[str]]]) -> List[Mismatch]:
+    """Return corpus entries whose current result differs from the recorded one."""
+    market_taxonomy._find_market_code.cache_clear()
+    mismatches = []
+    for entry in corpus:
+        expected = (entry["market_code"], entry["period"])
+        actual = _classify(entry)
+        if actual != expected:
+            mismatches.append(
+                Mismatch(entry["label"] or "", entry["home_team"], entry["away_team"], expected, actual)
+            )
+    return mismatches
+
+
+def time_corpus(corpus: List[Dict[str, Optional[str]]], repeats: int = 5) -> TaxonomyTiming:
+    """Median per-label time in microseconds for cold and warm passes."""
+    cold, warm = [], []
+    for _ in range(repeats):
+        market_taxonomy._find_market_code.cache_clear()
+        started = time.perf_counter()
+        for entry in corpus:
+            _classify(entry)
+        cold.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        for entry in corpus:
+            _classify(entry)
+        warm.append(time.perf_counter() - started)
+    scale = 1_000_000 / max(len(corpus), 1)
+    return TaxonomyTiming(
+        labels=len(corpus),
+        cold_us=statistics.median(cold) * scale,
+        warm_us=statistics.median(warm) * scale,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check and time market label classification.")
+    parser.add_argument("--corpus", default=str(CORPUS_PATH))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument(
+        "--write-expected",
+        action="store_true",
+        help="Record the current results as the expected ones",
+    )
+    args = parser.parse_args()
+
+    corpus_path = Path(args.corpus)
+    corpus = load_corpus(corpus_path)
+    if args.write_expected:
+        for entry in corpus:
+            entry["market_code"], entry["period"] = _classify(entry)
+        save_corpus(corpus, corpus_path)
+
+    mismatches = find_mismatches(corpus)
+    timing = time_corpus(corpus, repeats=args.repeats)
+    print(
+        f"{timing.labels} labels: cold {timing.cold_us:.1f}us/label, "
+        f"warm {timing.warm_us:.2f}us/label"
+    )
+    for mismatch in mismatches:
+        print(
+            f"MISMATCH: {mismatch.label!r} ({mismatch.home_team} v {mismatch.away_team}) "
+            f"expected {mismatch.expected} got {mismatch.actual}"
+        )
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
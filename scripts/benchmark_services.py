@@ -0,0 +1,362 @@
+"""
+Service-level benchmark suite over the full-schema synthetic dataset.
+
+Times the services the operators wait on (reconciliation, statements, the
+associate hub, ledger export, matching and settlement) against a dataset from
+``scripts.synthetic_dataset`` and compares the medians with the baselines in
+``tests/performance/baselines/service_benchmarks.json``. A scenario regresses
+when its median exceeds ``baseline * tolerance`` and ``baseline + floor``;
+the CLI exits non-zero on any regression so CI fails.
+
+Scenarios that write (matching, settlement) run against a private copy of the
+dataset, so the source database can be reused between runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, TypedDict, cast
+
+from scripts.synthetic_dataset import SCALES, SyntheticDataset, generate_dataset, load_dataset
+from src.core.config import Config
+from src.core.database import get_db_connection
+from src.repositories.associate_hub_repository import AssociateHubRepository
+from src.services.ledger_export_service import LedgerExportService
+from src.services.matching_service import MatchingService
+from src.services.reconciliation_service import ReconciliationService
+from src.services.settlement_service import BetOutcome, SettlementService
+from src.services.statement_service import StatementService
+from src.services.surebet_matcher import SurebetMatcher
+from src.ui.cache import invalidate_connection_cache, invalidate_query_cache, query_df
+
+BASELINES_PATH = (
+    Path(__file__).resolve().parents[1] / "tests" / "performance" / "baselines" / "service_benchmarks.json"
+)
+DEFAULT_TOLERANCE = 2.5
+DEFAULT_FLOOR_SECONDS = 0.1
+
+
+class Baselines(TypedDict):
+    """Shape of ``service_benchmarks.json``: per-scale scenario medians in seconds."""
+
+    tolerance: float
+    floor_seconds: float
+    scales: Dict[str, Dict[str, float]]
+
+INCOMING_QUEUE_SQL = """
+SELECT b.id, b.status, b.created_at_utc, a.display_alias, bk.bookmaker_name, b.stake_eur, b.odds
+FROM bets b
+JOIN associates a ON a.id = b.associate_id
+JOIN bookmakers bk ON bk.id = b.bookmaker_id
+WHERE b.status = ?
+ORDER BY b.created_at_utc DESC
+LIMIT 25
+"""
+
+
+@dataclass(slots=True)
+class BenchmarkContext:
+    """State shared by scenarios during one suite run."""
+
+    dataset: SyntheticDataset
+    db_path: str
+    export_dir: str
+    open_surebet_ids: List[int] = field(default_factory=list)
+    matchable_bet_ids: List[int] = field(default_factory=list)
+    event_queries: List[Dict[str, str]] = field(default_factory=list)
+
+    @property
+    def cutoff(self) -> str:
+        return f"{self.dataset.end_date}T23:59:59Z"
+
+
+@dataclass(slots=True)
+class ScenarioTiming:
+    """Timings of one scenario, in seconds."""
+
+    name: str
+    runs: List[float]
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.runs)
+
+    @property
+    def best(self) -> float:
+        return min(self.runs)
+
+
+@dataclass(slots=True)
+class Regression:
+    name: str
+    median: float
+    baseline: float
+    limit: float
+
+
+def _reconciliation_balances(ctx: BenchmarkContext) -> None:
+    service = ReconciliationService()
+    try:
+        service.get_associate_balances()
+    finally:
+        service.close()
+
+
+def _statement(ctx: BenchmarkContext) -> None:
+    StatementService().generate_statement(ctx.dataset.busiest_associate_id, ctx.cutoff)
+
+
+def _associate_hub_metrics(ctx: BenchmarkContext) -> None:
+    repository = AssociateHubRepository()
+    try:
+        repository.list_associates_with_metrics()
+    finally:
+        repository.close()
+
+
+def _ledger_export(ctx: BenchmarkContext) -> None:
+    result = LedgerExportService(export_dir=ctx.export_dir).export_full_ledger(export_format="csv")
+    Path(result.file_path).unlink(missing_ok=True)
+
+
+def _surebet_match(ctx: BenchmarkContext) -> None:
+    bet_id = ctx.matchable_bet_ids.pop()
+    conn = get_db_connection()
+    try:
+        if SurebetMatcher(conn).attempt_match(bet_id) is None:
+            raise RuntimeError(f"Synthetic bet {bet_id} did not match")
+    finally:
+        conn.close()
+
+
+def _settlement(ctx: BenchmarkContext) -> None:
+    surebet_id = ctx.open_surebet_ids.pop()
+    conn = get_db_connection()
+    try:
+        bet_ids = [
+            row["bet_id"]
+            for row in conn.execute(
+                "SELECT bet_id FROM surebet_bets WHERE surebet_id = ? ORDER BY side", (surebet_id,)
+            )
+        ]
+        outcomes = {bet_ids[0]: BetOutcome.WON, bet_ids[1]: BetOutcome.LOST}
+        result = SettlementService(conn).execute_settlement(surebet_id, outcomes)
+        if not result.success:
+            raise RuntimeError(f"Synthetic surebet {surebet_id} failed to settle: {result.error}")
+    finally:
+        conn.close()
+
+
+def _event_suggestions(ctx: BenchmarkContext) -> None:
+    conn = get_db_connection()
+    try:
+        service = MatchingService(conn)
+        for query in ctx.event_queries:
+            if not service.suggest_for_bet(query).events:
+                raise RuntimeError(f"No event suggestions for {query['selection_text']!r}")
+    finally:
+        conn.close()
+
+
+def _incoming_queue(ctx: BenchmarkContext) -> None:
+    invalidate_query_cache()
+    query_df(INCOMING_QUEUE_SQL, params=("incoming",), db_path=ctx.db_path)
+
+
+SCENARIOS: Dict[str, Callable[[BenchmarkContext], None]] = {
+    "reconciliation_balances": _reconciliation_balances,
+    "statement_generate": _statement,
+    "associate_hub_metrics": _associate_hub_metrics,
+    "ledger_export_csv": _ledger_export,
+    "surebet_attempt_match": _surebet_match,
+    "settlement_execute": _settlement,
+    "event_suggestions": _event_suggestions,
+    "incoming_queue_query": _incoming_queue,
+}
+
+
+@contextmanager
+def _benchmark_database(dataset: SyntheticDataset) -> Iterator[BenchmarkContext]:
+    """Copy the dataset to a scratch directory and point ``Config.DB_PATH`` at it."""
+    with tempfile.TemporaryDirectory(prefix="service-bench-") as scratch:
+        db_path = str(Path(scratch) / "bench.db")
+        source = sqlite3.connect(dataset.db_path)
+        target = sqlite3.connect(db_path)
+        try:
+            source.backup(target)
+        finally:
+            source.close()
+            target.close()
+
+        conn = sqlite3.connect(db_path)
+        try:
+            # Every 97th event, abbreviated the way bookmakers print names.
+            event_queries = [
+                {
+                    "selection_text": row[0].replace(" United", " Utd"),
+                    "kickoff_time_utc": row[1],
+                }
+                for row in conn.execute(
+                    "SELECT normalized_event_name, kickoff_time_utc FROM canonical_events "
+                    "WHERE id % 97 = 0 ORDER BY id LIMIT 20"
+                )
+            ]
+        finally:
+            conn.close()
+
+        previous = Config.DB_PATH
+        Config.DB_PATH = db_path
+        invalidate_connection_cache()
+        invalidate_query_cache()
+        try:
+            yield BenchmarkContext(
+                dataset=dataset,
+                db_path=db_path,
+                export_dir=str(Path(scratch) / "exports"),
+                open_surebet_ids=list(dataset.open_surebet_ids),
+                matchable_bet_ids=list(dataset.matchable_bet_ids),
+                event_queries=event_queries,
+            )
+        finally:
+            Config.DB_PATH = previous
+            invalidate_connection_cache()
+            invalidate_query_cache()
+
+
+def run_suite(
+    dataset: SyntheticDataset,
+    *,
+    repeats: int = 3,
+    scenarios: Optional[List[str]] = None,
+) -> Dict[str, ScenarioTiming]:
+    """
+    Run each scenario once to warm up, then ``repeats`` timed times.
+
+    Args:
+        dataset: Dataset produced by ``generate_dataset``
+        repeats: Timed runs per scenario
+        scenarios: Optional subset of ``SCENARIOS`` names
+
+    Returns:
+        Mapping of scenario name to its timings
+    """
+    names = scenarios or list(SCENARIOS)
+    results: Dict[str, ScenarioTiming] = {}
+    with _benchmark_database(dataset) as ctx:
+        for name in names:
+            scenario = SCENARIOS[name]
+            scenario(ctx)
+            runs = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                scenario(ctx)
+                runs.append(time.perf_counter() - start)
+            results[name] = ScenarioTiming(name=name, runs=runs)
+    return results
+
+
+def load_baselines(path: Path = BASELINES_PATH) -> Baselines:
+    baselines: Baselines = {
+        "tolerance": DEFAULT_TOLERANCE,
+        "floor_seconds": DEFAULT_FLOOR_SECONDS,
+        "scales": {},
+    }
+    if path.exists():
+        baselines.update(cast(Baselines, json.loads(path.read_text(encoding="utf-8"))))
+    return baselines
+
+
+def save_baselines(
+    scale: str, results: Dict[str, ScenarioTiming], path: Path = BASELINES_PATH
+) -> None:
+    """Record the medians of ``results`` as the baselines for ``scale``."""
+    baselines = load_baselines(path)
+    baselines["scales"][scale] = {
+        name: round(timing.median, 4) for name, timing in sorted(results.items())
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def find_regressions(
+    scale: str, results: Dict[str, ScenarioTiming], baselines: Baselines
+) -> List[Regression]:
+    """Return scenarios whose median exceeds the allowed limit for ``scale``."""
+    tolerance = baselines["tolerance"]
+    floor = baselines["floor_seconds"]
+    recorded = baselines["scales"].get(scale, {})
+    regressions = []
+    for name, timing in results.items():
+        baseline = recorded.get(name)
+        if baseline is None:
+            continue
+        limit = max(baseline * tolerance, baseline + floor)
+        if timing.median > limit:
+            regressions.append(Regression(name, timing.median, baseline, limit))
+    return regressions
+
+
+def _format_results(
+    scale: str, results: Dict[str, ScenarioTiming], baselines: Baselines
+) -> str:
+    recorded = baselines["scales"].get(scale, {})
+    lines = [f"{'Scenario':<26} {'Median':>9} {'Best':>9} {'Baseline':>9}"]
+    for name, timing in results.items():
+        baseline = recorded.get(name)
+        baseline_text = f"{baseline:.3f}s" if baseline is not None else "-"
+        lines.append(
+            f"{name:<26} {timing.median:>8.3f}s {timing.best:>8.3f}s {baseline_text:>9}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark services on a synthetic dataset.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="ci")
+    parser.add_argument("--db", help="Dataset path (default data/benchmark/synthetic_<scale>.db)")
+    parser.add_argument("--regenerate", action="store_true", help="Rebuild the dataset even if it exists")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS))
+    parser.add_argument("--baselines", default=str(BASELINES_PATH))
+    parser.add_argument("--update-baselines", action="store_true")
+    parser.add_argument("--json", action="store_true", help="Print raw timings as JSON")
+    args = parser.parse_args()
+
+    db_path = Path(args.db or f"data/benchmark/synthetic_{args.scale}.db")
+    if args.regenerate or not db_path.exists():
+        dataset = generate_dataset(db_path, args.scale)
+    else:
+        dataset = load_dataset(db_path, args.scale)
+    results = run_suite(dataset, repeats=args.repeats, scenarios=args.scenario)
+    baselines_path = Path(args.baselines)
+
+    if args.update_baselines:
+        save_baselines(args.scale, results, baselines_path)
+    baselines = load_baselines(baselines_path)
+
+    if args.json:
+        print(json.dumps({name: asdict(timing) for name, timing in results.items()}, indent=2))
+    else:
+        print(_format_results(args.scale, results, baselines))
+
+    regressions = find_regressions(args.scale, results, baselines)
+    for regression in regressions:
+        print(
+            f"REGRESSION: {regression.name} median {regression.median:.3f}s "
+            f"exceeds {regression.limit:.3f}s (baseline {regression.baseline:.3f}s)"
+        )
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Migration script to add the integer epoch-millisecond timestamp columns.
+
+Adds the generated ``*_ms`` columns listed in ``EPOCH_MS_COLUMNS``
+(ledger_entries.created_at_ms, bets.created_at_ms, bets.kickoff_ms,
+surebets.settled_at_ms, canonical_events.kickoff_ms,
+period_closing_balances.period_end_ms, ledger_archive_runs.period_end_ms)
+and their indexes.
+The columns are computed from the TEXT timestamps, so building the indexes
+backfills every existing row.
+
+The script then reports rows whose TEXT timestamp could not be parsed; those
+rows have a NULL ``*_ms`` value and drop out of range-filtered queries until
+the source value is corrected.
+
+Usage:
+    python scripts/migrate_epoch_ms_columns.py [--db PATH]
+"""
+
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.config import Config
+from src.core.schema import EPOCH_MS_COLUMNS, create_epoch_ms_columns
+
+
+def find_unparsed_rows(conn: sqlite3.Connection, sample_size: int = 5) -> dict:
+    """Return ``{"table.column": (count, [sample values])}`` for unparsed timestamps.
+
+    Args:
+        conn: SQLite database connection
+        sample_size: Number of offending values to include per column
+
+    Returns:
+        Mapping of shadow column to its unparsed row count and sample values
+    """
+    unparsed = {}
+    for table, columns in EPOCH_MS_COLUMNS.items():
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_xinfo({table})").fetchall()}
+        for column, source in columns.items():
+            if column not in existing:
+                continue
+            where = f"{source} IS NOT NULL AND {source} != '' AND {column} IS NULL"
+            count = conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}").fetchone()[0]
+            if count:
+                samples = [
+                    row[0]
+                    for row in conn.execute(
+                        f"SELECT {source} FROM {table} WHERE {where} LIMIT ?", (sample_size,)
+                    ).fetchall()
+                ]
+                unparsed[f"{table}.{column}"] = (count, samples)
+    return unparsed
+
+
+def main() -> None:
+    """Run migration to add the epoch-millisecond columns."""
+    parser = argparse.ArgumentParser(description="Add *_ms timestamp columns.")
+    parser.add_argument("--db", default=None, help="Database path (default Config.DB_PATH)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Migration: Add Epoch-Millisecond Timestamp Columns")
+    print("=" * 60)
+
+    db_path = args.db or Config.DB_PATH
+    try:
+        conn = sqlite3.connect(db_path)
+        print(f"✓ Connected to database {db_path}")
+    except Exception as e:
+        print(f"✗ Failed to connect to database: {e}")
+        sys.exit(1)
+
+    try:
+        create_epoch_ms_columns(conn)
+        conn.commit()
+        print("✓ Columns and indexes in place")
+
+        unparsed = find_unparsed_rows(conn)
+        for name, (count, samples) in unparsed.items():
+            print(f"  ⚠ {name}: {count} row(s) with unparseable timestamps, e.g. {samples}")
+        if not unparsed:
+            print("✓ Every stored timestamp converted")
+
+        print("\n" + "=" * 60)
+        print("✓ Migration completed successfully")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Migration failed: {e}")
+        conn.rollback()
+        sys.exit(1)
+
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,598 @@
+"""
+Full-schema synthetic dataset generator for service benchmarks.
+
+Builds a realistic SQLite database through ``create_schema``: associates with
+bookmakers in several currencies, canonical events, settled surebets with
+their BET_RESULT ledger rows and settlement links, open surebets waiting for
+settlement, verified bets waiting for the matcher, an incoming review queue,
+deposit/withdrawal history up to the requested ledger size, daily FX history
+and periodic bookmaker balance checks.
+
+Generation is deterministic for a given scale and seed and is written day by
+day so the 1M-row scale never holds the whole ledger in memory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from src.core.schema import create_schema
+from src.services.event_normalizer import EventNormalizer
+
+END_DATE = date(2025, 6, 30)
+CURRENCIES = ("EUR", "GBP", "USD", "AUD")
+FX_START_RATES = {"GBP": 1.17, "USD": 0.92, "AUD": 0.61}
+MARKET_CODE = "TOTAL_GOALS_OVER_UNDER"
+PERIOD_SCOPE = "FULL_MATCH"
+LINE_VALUE = "2.5"
+BOOKMAKER_NAMES = (
+    "Bet365", "Pinnacle", "Betfair", "William Hill", "Unibet", "Bwin",
+    "888sport", "Betway", "Sportingbet", "Marathonbet", "Betfred", "Coral",
+)
+TEAM_PREFIXES = (
+    "Northfield", "Riverton", "Ashbury", "Kingsport", "Westmoor", "Eastlake",
+    "Harrowgate", "Brookside", "Stonebridge", "Fairhaven", "Oakridge", "Millbrook",
+    "Redcliff", "Silverton", "Greenvale", "Blackwater",
+)
+TEAM_SUFFIXES = ("United", "City", "Rovers", "Athletic", "Wanderers")
+LEAGUES = ("Premier Division", "Championship", "Serie Nord", "Liga Sur")
+INSERT_BATCH = 10_000
+CENT = Decimal("0.01")
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticScale:
+    """Row targets for one dataset size."""
+
+    name: str
+    associates: int
+    bookmakers_per_associate: int
+    events: int
+    settled_surebets: int
+    open_surebets: int
+    matchable_pairs: int
+    incoming_bets: int
+    ledger_entries: int
+    fx_days: int
+    balance_checks_per_bookmaker: int
+
+
+SCALES: Dict[str, SyntheticScale] = {
+    "ci": SyntheticScale(
+        name="ci",
+        associates=8,
+        bookmakers_per_associate=3,
+        events=300,
+        settled_surebets=400,
+        open_surebets=20,
+        matchable_pairs=20,
+        incoming_bets=200,
+        ledger_entries=5_000,
+        fx_days=120,
+        balance_checks_per_bookmaker=6,
+    ),
+    "100k": SyntheticScale(
+        name="100k",
+        associates=40,
+        bookmakers_per_associate=5,
+        events=5_000,
+        settled_surebets=10_000,
+        open_surebets=200,
+        matchable_pairs=200,
+        incoming_bets=2_000,
+        ledger_entries=100_000,
+        fx_days=365,
+        balance_checks_per_bookmaker=24,
+    ),
+    "1m": SyntheticScale(
+        name="1m",
+        associates=150,
+        bookmakers_per_associate=6,
+        events=40_000,
+        settled_surebets=120_000,
+        open_surebets=1_000,
+        matchable_pairs=1_000,
+        incoming_bets=10_000,
+        ledger_entries=1_000_000,
+        fx_days=730,
+        balance_checks_per_bookmaker=52,
+    ),
+}
+
+
+@dataclass(slots=True)
+class SyntheticDataset:
+    """Paths, row counts and the ids benchmark scenarios operate on."""
+
+    db_path: str
+    scale: SyntheticScale
+    end_date: str
+    row_counts: Dict[str, int] = field(default_factory=dict)
+    open_surebet_ids: List[int] = field(default_factory=list)
+    matchable_bet_ids: List[int] = field(default_factory=list)
+    busiest_associate_id: int = 1
+
+
+def _money(value: Decimal | float) -> str:
+    return str(Decimal(str(value)).quantize(CENT, rounding=ROUND_HALF_UP))
+
+
+def _timestamp(day: date, seconds: int) -> str:
+    moment = datetime(day.year, day.month, day.day) + timedelta(seconds=seconds)
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _insert(conn: sqlite3.Connection, table: str, columns: Sequence[str], rows: List[tuple]) -> None:
+    if not rows:
+        return
+    sql = (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)})"
+    )
+    for start in range(0, len(rows), INSERT_BATCH):
+        conn.executemany(sql, rows[start:start + INSERT_BATCH])
+
+
+BET_COLUMNS = (
+    "id", "associate_id", "bookmaker_id", "canonical_event_id", "canonical_market_id",
+    "market_type", "selection_text", "status", "resolve_status", "stake_eur",
+    "stake_amount", "stake_currency", "stake_original", "odds", "odds_original",
+    "currency", "fx_rate_to_eur", "payout", "market_code", "period_scope",
+    "line_value", "side", "kickoff_time_utc", "ingestion_source", "is_supported",
+    "created_at_utc", "updated_at_utc",
+)
+LEDGER_COLUMNS = (
+    "id", "type", "associate_id", "bookmaker_id", "amount_native", "native_currency",
+    "fx_rate_snapshot", "amount_eur", "settlement_state", "principal_returned_eur",
+    "per_surebet_share_eur", "surebet_id", "bet_id", "opposing_associate_id",
+    "settlement_batch_id", "created_at_utc", "created_by", "note",
+)
+
+
+class _Generator:
+    def __init__(self, conn: sqlite3.Connection, scale: SyntheticScale, seed: int) -> None:
+        self.conn = conn
+        self.scale = scale
+        self.rng = random.Random(seed)
+        self.days = [END_DATE - timedelta(days=offset) for offset in range(scale.fx_days - 1, -1, -1)]
+        self.rates: Dict[Tuple[str, date], Decimal] = {}
+        self.bookmakers: List[Tuple[int, int, str]] = []  # (bookmaker_id, associate_id, currency)
+        self.events: List[Tuple[int, date, str]] = []  # (event_id, kickoff day, kickoff timestamp)
+        self.market_id = 0
+        self.next_bet_id = 1
+        self.next_surebet_id = 1
+        self.next_ledger_id = 1
+
+    def rate(self, currency: str, day: date) -> Decimal:
+        if currency == "EUR":
+            return Decimal("1")
+        return self.rates[(currency, day)]
+
+    # Reference data -------------------------------------------------------
+
+    def fx_history(self) -> None:
+        rows = []
+        for currency, start in FX_START_RATES.items():
+            value = start
+            for day in self.days:
+                value *= 1 + self.rng.gauss(0, 0.003)
+                rate = Decimal(f"{value:.6f}")
+                self.rates[(currency, day)] = rate
+                rows.append((currency, str(rate), _timestamp(day, 16 * 3600), day.isoformat()))
+        _insert(self.conn, "fx_rates_daily", ("currency_code", "rate_to_eur", "fetched_at_utc", "date"), rows)
+
+    def associates_and_bookmakers(self) -> None:
+        created = _timestamp(self.days[0], 0)
+        associates, bookmakers = [], []
+        bookmaker_id = 1
+        for associate_id in range(1, self.scale.associates + 1):
+            home = CURRENCIES[associate_id % len(CURRENCIES)]
+            associates.append((
+                associate_id, f"Associate {associate_id:04d}", home, int(associate_id == 1),
+                _money(self.rng.choice((500, 1000, 2000))), _money(self.rng.choice((3000, 5000, 10000))),
+                created, created,
+            ))
+            names = self.rng.sample(BOOKMAKER_NAMES, min(self.scale.bookmakers_per_associate, len(BOOKMAKER_NAMES)))
+            for name in names:
+                currency = home if self.rng.random() < 0.7 else self.rng.choice(CURRENCIES)
+                entry = (bookmaker_id, associate_id, currency)
+                self.bookmakers.append(entry)
+                bookmakers.append((bookmaker_id, associate_id, name, currency, created, created))
+                bookmaker_id += 1
+        _insert(
+            self.conn, "associates",
+            ("id", "display_alias", "home_currency", "is_admin", "max_surebet_stake_eur",
+             "max_bookmaker_exposure_eur", "created_at_utc", "updated_at_utc"),
+            associates,
+        )
+        _insert(
+            self.conn, "bookmakers",
+            ("id", "associate_id", "bookmaker_name", "account_currency", "created_at_utc", "updated_at_utc"),
+            bookmakers,
+        )
+
+    def canonical_events(self) -> None:
+        self.conn.execute(
+            "INSERT OR IGNORE INTO canonical_markets (market_code, description) VALUES (?, ?)",
+            (MARKET_CODE, "Total Goals Over/Under"),
+        )
+        self.market_id = self.conn.execute(
+            "SELECT id FROM canonical_markets WHERE market_code = ?", (MARKET_CODE,)
+        ).fetchone()[0]
+        teams = [f"{prefix} {suffix}" for prefix in TEAM_PREFIXES for suffix in TEAM_SUFFIXES]
+        rows = []
+        for event_id in range(1, self.scale.events + 1):
+            home, away = self.rng.sample(teams, 2)
+            name = f"{home} vs {away}"
+            keys = EventNormalizer.compute_pair_key(name)
+            assert keys is not None  # synthetic names are always "<home> vs <away>"
+            team1, team2, pair_key = keys
+            day = self.rng.choice(self.days)
+            kickoff = _timestamp(day, self.rng.choice((13, 15, 17, 19, 20)) * 3600)
+            self.events.append((event_id, day, kickoff))
+            created = _timestamp(day - timedelta(days=2), 9 * 3600)
+            rows.append((
+                event_id, name, self.rng.choice(LEAGUES), "football", team1, team2,
+                pair_key, kickoff, created, created,
+            ))
+        _insert(
+            self.conn, "canonical_events",
+            ("id", "normalized_event_name", "league", "sport", "team1_slug", "team2_slug",
+             "pair_key", "kickoff_time_utc", "created_at_utc", "updated_at_utc"),
+            rows,
+        )
+
+    # Bets -------------------------------------------------------------------
+
+    def _bet_row(
+        self,
+        bookmaker: Tuple[int, int, str],
+        event: Tuple[int, date, str],
+        side: str,
+        status: str,
+        stake_eur: Decimal,
+        odds: Decimal,
+        created: str,
+    ) -> tuple:
+        bookmaker_id, associate_id, currency = bookmaker
+        rate = self.rate(currency, event[1])
+        stake_native = _money(stake_eur / rate)
+        bet_id = self.next_bet_id
+        self.next_bet_id += 1
+        return (
+            bet_id, associate_id, bookmaker_id, event[0], self.market_id,
+            "Total Goals", f"{side.title()} {LINE_VALUE}", status, "resolved", _money(stake_eur),
+            stake_native, currency, stake_native, str(odds), str(odds),
+            currency, str(rate), _money(Decimal(stake_native) * odds), MARKET_CODE, PERIOD_SCOPE,
+            LINE_VALUE, side, event[2], "telegram", 1,
+            created, created,
+        )
+
+    def _pair(self) -> Tuple[Tuple[int, int, str], Tuple[int, int, str]]:
+        first = self.rng.choice(self.bookmakers)
+        second = self.rng.choice(self.bookmakers)
+        while second[1] == first[1] and self.scale.associates > 1:
+            second = self.rng.choice(self.bookmakers)
+        return first, second
+
+    def _odds_pair(self) -> Tuple[Decimal, Decimal]:
+        over = Decimal(f"{self.rng.uniform(1.95, 2.20):.2f}")
+        # Keep the implied probability just under 1 so every pair is a surebet.
+        under = (over / (over - 1) * Decimal("1.02")).quantize(CENT)
+        return over, under
+
+    def surebets(self) -> Dict[date, List[dict]]:
+        """Create settled, open and matchable bets; returns settlements keyed by day."""
+        settlements: Dict[date, List[dict]] = {}
+        bets: List[tuple] = []
+        surebets: List[tuple] = []
+        links: List[tuple] = []
+        settled_events = sorted(self.rng.choices(self.events, k=self.scale.settled_surebets), key=lambda e: e[2])
+        for event in settled_events:
+            over_odds, under_odds = self._odds_pair()
+            stake = Decimal(self.rng.randrange(50, 400))
+            under_stake = (stake * over_odds / under_odds).quantize(CENT)
+            created = _timestamp(event[1], 10 * 3600)
+            over_bm, under_bm = self._pair()
+            over = self._bet_row(over_bm, event, "OVER", "settled", stake, over_odds, created)
+            under = self._bet_row(under_bm, event, "UNDER", "settled", under_stake, under_odds, created)
+            surebet_id = self.next_surebet_id
+            self.next_surebet_id += 1
+            settled_at = _timestamp(event[1], 23 * 3600)
+            total = stake + under_stake
+            surebets.append((
+                surebet_id, event[0], self.market_id, MARKET_CODE, PERIOD_SCOPE, LINE_VALUE,
+                "settled", _money(total), _money(stake * over_odds - total), settled_at, created, settled_at,
+            ))
+            links.append((surebet_id, over[0], "A", created))
+            links.append((surebet_id, under[0], "B", created))
+            bets.extend((over, under))
+            over_wins = self.rng.random() < 0.5
+            winner, loser = (over, under) if over_wins else (under, over)
+            settlements.setdefault(event[1], []).append({
+                "surebet_id": surebet_id,
+                "winner": winner,
+                "loser": loser,
+                "settled_at": settled_at,
+            })
+
+        recent = [event for event in self.events if event[1] >= self.days[-min(14, len(self.days))]]
+        for event in self.rng.choices(recent or self.events, k=self.scale.open_surebets):
+            over_odds, under_odds = self._odds_pair()
+            stake = Decimal(self.rng.randrange(50, 400))
+            under_stake = (stake * over_odds / under_odds).quantize(CENT)
+            created = _timestamp(event[1], 10 * 3600)
+            over_bm, under_bm = self._pair()
+            over = self._bet_row(over_bm, event, "OVER", "matched", stake, over_odds, created)
+            under = self._bet_row(under_bm, event, "UNDER", "matched", under_stake, under_odds, created)
+            surebet_id = self.next_surebet_id
+            self.next_surebet_id += 1
+            total = stake + under_stake
+            surebets.append((
+                surebet_id, event[0], self.market_id, MARKET_CODE, PERIOD_SCOPE, LINE_VALUE,
+                "open", _money(total), _money(stake * over_odds - total), None, created, created,
+            ))
+            links.append((surebet_id, over[0], "A", created))
+            links.append((surebet_id, under[0], "B", created))
+            bets.extend((over, under))
+
+        # Each matchable pair sits on its own event so attempts never collide.
+        matchable_events = self.rng.sample(self.events, min(self.scale.matchable_pairs, len(self.events)))
+        for event in matchable_events:
+            over_odds, under_odds = self._odds_pair()
+            stake = Decimal(self.rng.randrange(50, 400))
+            created = _timestamp(event[1], 9 * 3600)
+            over_bm, under_bm = self._pair()
+            over = self._bet_row(over_bm, event, "OVER", "verified", stake, over_odds, created)
+            under = self._bet_row(under_bm, event, "UNDER", "verified", stake, under_odds, created)
+            bets.extend((over, under))
+
+        for _ in range(self.scale.incoming_bets):
+            event = self.rng.choice(self.events)
+            created = _timestamp(event[1], self.rng.randrange(6, 12) * 3600)
+            status = "incoming" if self.rng.random() < 0.8 else "rejected"
+            side = self.rng.choice(("OVER", "UNDER"))
+            bets.append(self._bet_row(
+                self.rng.choice(self.bookmakers), event, side, status,
+                Decimal(self.rng.randrange(20, 300)), Decimal("2.00"), created,
+            ))
+
+        _insert(self.conn, "bets", BET_COLUMNS, bets)
+        _insert(
+            self.conn, "surebets",
+            ("id", "canonical_event_id", "canonical_market_id", "market_code", "period_scope",
+             "line_value", "status", "total_stake_eur", "expected_profit_eur", "settled_at_utc",
+             "created_at_utc", "updated_at_utc"),
+            surebets,
+        )
+        _insert(self.conn, "surebet_bets", ("surebet_id", "bet_id", "side", "created_at_utc"), links)
+        return settlements
+
+    # Ledger -----------------------------------------------------------------
+
+    def _ledger_row(self, row: list) -> tuple:
+        row[0] = self.next_ledger_id
+        self.next_ledger_id += 1
+        return tuple(row)
+
+    def _funding_row(
+        self, day: date, seconds: int, entry_type: str, bookmaker: Tuple[int, int, str], amount: Decimal
+    ) -> list:
+        bookmaker_id, associate_id, currency = bookmaker
+        rate = self.rate(currency, day)
+        return [
+            None, entry_type, associate_id, bookmaker_id, _money(amount), currency,
+            str(rate), _money(amount * rate), None, None, None, None, None, None, None,
+            _timestamp(day, seconds), "synthetic", f"Synthetic {entry_type.lower()}",
+        ]
+
+    def _settlement_rows(self, settlement: dict, day: date) -> List[list]:
+        """Winner then loser BET_RESULT rows, as ``SettlementService`` writes them."""
+        winner, loser = settlement["winner"], settlement["loser"]
+        winner_stake, winner_odds = Decimal(winner[9]), Decimal(winner[13])
+        loser_stake = Decimal(loser[9])
+        profit = winner_stake * winner_odds - winner_stake - loser_stake
+        share = (profit / 2).quantize(CENT, rounding=ROUND_HALF_UP)
+        batch_id = f"SYN-{settlement['surebet_id']:08d}"
+        rows = []
+        for bet, state, principal, opposing in (
+            (winner, "WON", winner_stake, loser[1]),
+            (loser, "LOST", Decimal("0"), winner[1]),
+        ):
+            total = principal + share
+            rows.append([
+                None, "BET_RESULT", bet[1], bet[2], _money(total), "EUR",
+                str(self.rate(bet[15], day)), _money(total), state, _money(principal), _money(share),
+                settlement["surebet_id"], bet[0], opposing, batch_id,
+                settlement["settled_at"], "local_user", f"Surebet {settlement['surebet_id']} settlement",
+            ])
+        return rows
+
+    def ledger(self, settlements: Dict[date, List[dict]]) -> None:
+        opening = [
+            self._funding_row(self.days[0], 8 * 3600, "DEPOSIT", bookmaker, Decimal(self.rng.randrange(2000, 8000)))
+            for bookmaker in self.bookmakers
+        ]
+        settlement_rows = 2 * self.scale.settled_surebets
+        filler_total = max(self.scale.ledger_entries - len(opening) - settlement_rows, 0)
+        per_day, remainder = divmod(filler_total, len(self.days))
+
+        link_rows: List[tuple] = []
+        for index, day in enumerate(self.days):
+            # (timestamp, surebet id, position, row) keeps winner/loser adjacent
+            staged: List[Tuple[str, int, int, list]] = []
+            if index == 0:
+                staged.extend((row[15], 0, 0, row) for row in opening)
+            for _ in range(per_day + (1 if index < remainder else 0)):
+                bookmaker = self.rng.choice(self.bookmakers)
+                roll = self.rng.random()
+                if roll < 0.55:
+                    entry_type, amount = "DEPOSIT", Decimal(self.rng.randrange(50, 1500))
+                elif roll < 0.95:
+                    entry_type, amount = "WITHDRAWAL", -Decimal(self.rng.randrange(50, 1200))
+                else:
+                    entry_type, amount = "BOOKMAKER_CORRECTION", Decimal(self.rng.randrange(-50, 50))
+                row = self._funding_row(day, self.rng.randrange(8 * 3600, 22 * 3600), entry_type, bookmaker, amount)
+                staged.append((row[15], 0, 0, row))
+            link_amounts: Dict[int, str] = {}
+            for settlement in settlements.get(day, ()):
+                winner = settlement["winner"]
+                stake = Decimal(winner[9])
+                link_amounts[settlement["surebet_id"]] = _money(stake * Decimal(winner[13]) - stake)
+                for position, row in enumerate(self._settlement_rows(settlement, day)):
+                    staged.append((row[15], settlement["surebet_id"], position, row))
+
+            staged.sort(key=lambda item: item[:3])
+            rows = [self._ledger_row(row) for *_, row in staged]
+            _insert(self.conn, "ledger_entries", LEDGER_COLUMNS, rows)
+
+            results = [row for row in rows if row[1] == "BET_RESULT"]
+            for winner, loser in zip(results[::2], results[1::2]):
+                link_rows.append((
+                    winner[11], winner[2], loser[2], link_amounts[winner[11]],
+                    winner[0], loser[0], winner[15],
+                ))
+            if len(link_rows) >= INSERT_BATCH:
+                self._insert_links(link_rows)
+                link_rows = []
+        self._insert_links(link_rows)
+
+    def _insert_links(self, rows: List[tuple]) -> None:
+        _insert(
+            self.conn, "surebet_settlement_links",
+            ("surebet_id", "winner_associate_id", "loser_associate_id", "amount_eur",
+             "winner_ledger_entry_id", "loser_ledger_entry_id", "created_at_utc"),
+            rows,
+        )
+
+    def balance_checks(self) -> None:
+        checks = max(self.scale.balance_checks_per_bookmaker, 1)
+        step = max(len(self.days) // checks, 1)
+        rows = []
+        for bookmaker_id, associate_id, currency in self.bookmakers:
+            for day in self.days[step - 1::step][:checks]:
+                balance = Decimal(self.rng.randrange(500, 9000))
+                rate = self.rate(currency, day)
+                rows.append((
+                    associate_id, bookmaker_id, _money(balance), currency,
+                    _money(balance * rate), str(rate), _timestamp(day, 21 * 3600),
+                ))
+        _insert(
+            self.conn, "bookmaker_balance_checks",
+            ("associate_id", "bookmaker_id", "balance_native", "native_currency",
+             "balance_eur", "fx_rate_used", "check_date_utc"),
+            rows,
+        )
+
+
+def generate_dataset(
+    db_path: Path | str,
+    scale: SyntheticScale | str = "ci",
+    *,
+    seed: int = 42,
+) -> SyntheticDataset:
+    """
+    Build a fresh synthetic database at ``db_path``.
+
+    Args:
+        db_path: Target SQLite file; an existing file is replaced
+        scale: A :class:`SyntheticScale` or the name of one in ``SCALES``
+        seed: Random seed; the same seed and scale give the same rows
+
+    Returns:
+        SyntheticDataset with row counts and the ids benchmarks operate on
+    """
+    if isinstance(scale, str):
+        scale = SCALES[scale]
+    path = Path(db_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+
+    conn = sqlite3.connect(path)
+    try:
+        create_schema(conn)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = OFF")
+        generator = _Generator(conn, scale, seed)
+        generator.fx_history()
+        generator.associates_and_bookmakers()
+        generator.canonical_events()
+        settlements = generator.surebets()
+        generator.ledger(settlements)
+        generator.balance_checks()
+        conn.commit()
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+    return load_dataset(path, scale)
+
+
+def load_dataset(db_path: Path | str, scale: SyntheticScale | str = "ci") -> SyntheticDataset:
+    """Describe an existing synthetic database without regenerating it."""
+    if isinstance(scale, str):
+        scale = SCALES[scale]
+    conn = sqlite3.connect(db_path)
+    try:
+        dataset = SyntheticDataset(db_path=str(db_path), scale=scale, end_date=END_DATE.isoformat())
+        for table in (
+            "associates", "bookmakers", "canonical_events", "bets", "surebets",
+            "surebet_settlement_links", "ledger_entries", "fx_rates_daily",
+            "bookmaker_balance_checks",
+        ):
+            dataset.row_counts[table] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        dataset.open_surebet_ids = [
+            row[0] for row in conn.execute("SELECT id FROM surebets WHERE status = 'open' ORDER BY id")
+        ]
+        dataset.matchable_bet_ids = [
+            row[0]
+            for row in conn.execute(
+                """
+                SELECT b.id FROM bets b
+                WHERE b.status = 'verified' AND b.side = 'OVER'
+                  AND NOT EXISTS (SELECT 1 FROM surebet_bets sb WHERE sb.bet_id = b.id)
+                ORDER BY b.id
+                """
+            )
+        ]
+        busiest = conn.execute(
+            "SELECT associate_id FROM ledger_entries GROUP BY associate_id "
+            "ORDER BY COUNT(*) DESC, associate_id LIMIT 1"
+        ).fetchone()
+        dataset.busiest_associate_id = busiest[0] if busiest else 1
+    finally:
+        conn.close()
+    return dataset
+
+
+def _format_counts(counts: Dict[str, int]) -> Iterable[str]:
+    width = max(len(table) for table in counts)
+    for table, count in counts.items():
+        yield f"- {table.ljust(width)}  {count:>10,}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a full-schema synthetic dataset.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="ci")
+    parser.add_argument("--db", help="Target database (default data/benchmark/synthetic_<scale>.db)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    db_path = Path(args.db or f"data/benchmark/synthetic_{args.scale}.db")
+    start = time.perf_counter()
+    dataset = generate_dataset(db_path, args.scale, seed=args.seed)
+    print(f"Generated {db_path} ({args.scale}) in {time.perf_counter() - start:.1f}s:\n")
+    print("\n".join(_format_counts(dataset.row_counts)))
+
+
+if __name__ == "__main__":
+    main()
@@ -44,6 +44,24 @@ class Config:
         "yes",
         "y",
     )
+    # SQL statement tracing (see src/core/sql_tracing.py)
+    SQL_TRACE_ENABLED: bool = os.getenv("SQL_TRACE_ENABLED", "false").strip().lower() in (
+        "1",
+        "true",
+        "yes",
+        "y",
+    )
+    SQL_SLOW_QUERY_MS: float = _float_env("SQL_SLOW_QUERY_MS", 250.0)
+    # Cross-session timing telemetry (see src/core/telemetry.py)
+    TELEMETRY_ENABLED: bool = os.getenv("TELEMETRY_ENABLED", "true").strip().lower() in (
+        "1",
+        "true",
+        "yes",
+        "y",
+    )
+    TELEMETRY_DB_PATH: str = os.getenv("TELEMETRY_DB_PATH", "data/telemetry.db")
+    TELEMETRY_MAX_SAMPLES: int = _int_env("TELEMETRY_MAX_SAMPLES", 50_000)
+    APP_RELEASE: Optional[str] = os.getenv("APP_RELEASE")
 
     # Telegram
     TELEGRAM_BOT_TOKEN: Optional[str] = os.getenv("TELEGRAM_BOT_TOKEN")
@@ -59,6 +77,11 @@ class Config:
 
     # OpenAI
     OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
+    # Concurrent OCR calls when a manual upload carries several screenshots
+    OCR_MAX_WORKERS: int = _int_env("OCR_MAX_WORKERS", 6)
+
+    # Scheduled jobs: how many independent pipeline jobs may run at once
+    JOB_MAX_WORKERS: int = _int_env("JOB_MAX_WORKERS", 2)
 
     # FX API
     FX_API_KEY: Optional[str] = os.getenv("FX_API_KEY")
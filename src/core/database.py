@@ -10,10 +10,12 @@ This module handles:
 import os
 import sqlite3
 import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from src.core.config import Config
+from src.core.sql_tracing import connection_factory
 
 
 _SCHEMA_LOCK = threading.Lock()
@@ -56,8 +58,9 @@ def get_db_connection(db_path: Optional[str] = None) -> sqlite3.Connection:
     # Ensure data directory exists
     ensure_data_directory()
 
-    # Create connection with row factory providing dict-like ``get``
-    conn = sqlite3.connect(db_path, check_same_thread=False)
+    # Create connection with row factory providing dict-like ``get``; the
+    # factory traces statements when SQL tracing is enabled
+    conn = sqlite3.connect(db_path, check_same_thread=False, factory=connection_factory())
     conn.row_factory = RowWithGet
 
     # Configure SQLite for optimal performance and data integrity
@@ -77,6 +80,8 @@ def get_db_connection(db_path: Optional[str] = None) -> sqlite3.Connection:
                     from src.core.schema import create_schema
 
                     create_schema(conn)
+                    # Schema helpers leave backfills to the caller's transaction
+                    conn.commit()
                 except Exception as exc:  # pragma: no cover - defensive log path
                     print(f"WARNING: Failed to ensure schema is current: {exc}")
                 else:
@@ -103,6 +108,7 @@ def initialize_database(db_path: Optional[str] = None) -> sqlite3.Connection:
 
     # Create schema
     create_schema(conn)
+    conn.commit()
 
     # Insert seed data
     insert_seed_data(conn)
@@ -121,6 +127,32 @@ def close_connection(conn: sqlite3.Connection) -> None:
         conn.close()
 
 
+@lru_cache(maxsize=64)
+def _realpath(path: str) -> str:
+    return os.path.realpath(path)
+
+
+def database_file_key(conn: sqlite3.Connection) -> Optional[Tuple[str, int, int]]:
+    """
+    Identify the main database file behind ``conn`` for process-wide caches.
+
+    Returns:
+        ``(realpath, st_dev, st_ino)``, or None for in-memory/temporary databases.
+        The inode guards against a database recreated at the same path.
+    """
+    for row in conn.execute("PRAGMA database_list").fetchall():
+        if row[1] == "main":
+            path = row[2]
+            if not path:
+                return None
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+            return (_realpath(path), stat.st_dev, stat.st_ino)
+    return None
+
+
 def backup_database(backup_path: str) -> None:
     """
     Create a backup of the database.
@@ -5,7 +5,29 @@ This module defines all 12 core tables with proper constraints and indexes.
 """
 
 import sqlite3
-from typing import List, Set
+from typing import Dict, List, Set
+
+# Integer epoch-millisecond shadows of the TEXT timestamps that range queries
+# filter on. The TEXT columns mix "YYYY-MM-DD HH:MM:SSZ", ISO "...Z" and
+# "...+00:00Z" spellings, which do not compare correctly as strings.
+EPOCH_MS_COLUMNS: Dict[str, Dict[str, str]] = {
+    "ledger_entries": {"created_at_ms": "created_at_utc"},
+    "bets": {"created_at_ms": "created_at_utc", "kickoff_ms": "kickoff_time_utc"},
+    "surebets": {"settled_at_ms": "settled_at_utc"},
+    "canonical_events": {"kickoff_ms": "kickoff_time_utc"},
+    "period_closing_balances": {"period_end_ms": "period_end_utc"},
+    "ledger_archive_runs": {"period_end_ms": "period_end_utc"},
+}
+
+EPOCH_MS_INDEXES: Dict[str, str] = {
+    "idx_ledger_associate_created_ms": "ledger_entries(associate_id, created_at_ms)",
+    "idx_ledger_created_ms": "ledger_entries(created_at_ms)",
+    "idx_bets_created_ms": "bets(created_at_ms)",
+    "idx_bets_kickoff_ms": "bets(kickoff_ms)",
+    "idx_surebets_settled_ms": "surebets(settled_at_ms)",
+    "idx_canonical_events_kickoff_ms": "canonical_events(kickoff_ms)",
+    "idx_period_closing_associate_end_ms": "period_closing_balances(associate_id, period_end_ms)",
+}
 
 
 def create_schema(conn: sqlite3.Connection) -> None:
@@ -19,6 +41,7 @@ def create_schema(conn: sqlite3.Connection) -> None:
     create_associates_table(conn)
     create_bookmakers_table(conn)
     create_canonical_events_table(conn)
+    create_canonical_event_aliases_table(conn)
     create_canonical_markets_table(conn)
     create_bets_table(conn)
     create_pending_photos_table(conn)
@@ -26,15 +49,25 @@ def create_schema(conn: sqlite3.Connection) -> None:
     create_surebets_table(conn)
     create_surebet_bets_table(conn)
     create_surebet_settlement_links_table(conn)
+    create_counterparty_delta_table(conn)
     create_ledger_entries_table(conn)
     create_verification_audit_table(conn)
     create_multibook_message_log_table(conn)
     create_bookmaker_balance_checks_table(conn)
+    create_latest_balance_check_table(conn)
     create_fx_rates_daily_table(conn)
     create_chat_registrations_table(conn)
     create_funding_drafts_table(conn)
     create_notification_audit_table(conn)
     create_telegram_audit_log_table(conn)
+    create_telegram_file_cache_table(conn)
+    create_ledger_export_watermarks_table(conn)
+    create_maintenance_markers_table(conn)
+    create_period_closing_balances_table(conn)
+    create_ledger_archive_runs_table(conn)
+    create_open_exposure_tables(conn)
+    create_job_runs_tables(conn)
+    create_epoch_ms_columns(conn)
 
     # Create triggers for data integrity
     create_ledger_append_only_trigger(conn)
@@ -182,6 +215,31 @@ def create_canonical_events_table(conn: sqlite3.Connection) -> None:
     )
 
 
+def create_canonical_event_aliases_table(conn: sqlite3.Connection) -> None:
+    """Create the record of duplicate canonical events merged into a survivor."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS canonical_event_aliases (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            merged_event_id INTEGER NOT NULL UNIQUE,
+            canonical_event_id INTEGER NOT NULL,
+            merged_event_name TEXT,
+            merged_kickoff_time_utc TEXT,
+            score REAL,
+            merged_at_utc TEXT NOT NULL DEFAULT (datetime('now') || 'Z'),
+            FOREIGN KEY (canonical_event_id) REFERENCES canonical_events(id)
+        )
+        """
+    )
+
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_canonical_event_aliases_event
+        ON canonical_event_aliases(canonical_event_id)
+        """
+    )
+
+
 def create_canonical_markets_table(conn: sqlite3.Connection) -> None:
     """Create the canonical_markets table."""
     conn.execute(
@@ -457,6 +515,14 @@ def create_surebet_bets_table(conn: sqlite3.Connection) -> None:
     """
     )
 
+    # Bet -> surebet lookups (matcher idempotency, exposure tracking, cascades)
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_surebet_bets_bet_id
+        ON surebet_bets(bet_id)
+    """
+    )
+
 
 def create_surebet_settlement_links_table(conn: sqlite3.Connection) -> None:
     """Create the surebet_settlement_links table for delta provenance tracking."""
@@ -502,6 +568,150 @@ def create_surebet_settlement_links_table(conn: sqlite3.Connection) -> None:
     """
     )
 
+    # Composite indexes so each side of the provenance feed is an ordered range scan
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_surebet_links_winner_created
+        ON surebet_settlement_links(winner_associate_id, created_at_utc)
+    """
+    )
+
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_surebet_links_loser_created
+        ON surebet_settlement_links(loser_associate_id, created_at_utc)
+    """
+    )
+
+
+# Per-(associate, counterparty) totals derived from surebet_settlement_links.
+# Each link counts as a win for the winner against the loser and as a loss for
+# the loser against the winner; self-links only count on the winning side.
+# Amounts are rounded to cents per link, exactly as the insert trigger does.
+COUNTERPARTY_DELTA_AGGREGATE_SQL = """
+    SELECT
+        associate_id,
+        counterparty_id,
+        printf('%.2f', SUM(signed_eur)) AS net_amount_eur,
+        printf('%.2f', SUM(won_eur)) AS total_won_eur,
+        printf('%.2f', SUM(lost_eur)) AS total_lost_eur,
+        COUNT(*) AS surebet_count,
+        MIN(created_at_utc) AS first_transaction_utc,
+        MAX(created_at_utc) AS last_transaction_utc
+    FROM (
+        SELECT
+            winner_associate_id AS associate_id,
+            loser_associate_id AS counterparty_id,
+            CAST(printf('%.2f', amount_eur) AS REAL) AS signed_eur,
+            CAST(printf('%.2f', amount_eur) AS REAL) AS won_eur,
+            0.0 AS lost_eur,
+            created_at_utc
+        FROM surebet_settlement_links
+        UNION ALL
+        SELECT
+            loser_associate_id,
+            winner_associate_id,
+            -CAST(printf('%.2f', amount_eur) AS REAL),
+            0.0,
+            CAST(printf('%.2f', amount_eur) AS REAL),
+            created_at_utc
+        FROM surebet_settlement_links
+        WHERE winner_associate_id != loser_associate_id
+    )
+    GROUP BY associate_id, counterparty_id
+"""
+
+
+def create_counterparty_delta_table(conn: sqlite3.Connection) -> None:
+    """
+    Create the counterparty_delta matrix and the trigger that maintains it.
+
+    Rows are updated by an AFTER INSERT trigger on surebet_settlement_links, so
+    settlement and correction links adjust the matrix in the same transaction.
+    A newly created table is seeded from any existing links inside the
+    caller's transaction; the caller commits.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'counterparty_delta'"
+    ).fetchone()
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS counterparty_delta (
+            associate_id INTEGER NOT NULL,
+            counterparty_id INTEGER NOT NULL,
+            net_amount_eur TEXT NOT NULL DEFAULT '0.00',
+            total_won_eur TEXT NOT NULL DEFAULT '0.00',
+            total_lost_eur TEXT NOT NULL DEFAULT '0.00',
+            surebet_count INTEGER NOT NULL DEFAULT 0,
+            first_transaction_utc TEXT,
+            last_transaction_utc TEXT,
+            updated_at_utc TEXT NOT NULL DEFAULT (datetime('now') || 'Z'),
+            PRIMARY KEY (associate_id, counterparty_id),
+            FOREIGN KEY (associate_id) REFERENCES associates(id),
+            FOREIGN KEY (counterparty_id) REFERENCES associates(id)
+        )
+        """
+    )
+
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS counterparty_delta_on_link_insert
+        AFTER INSERT ON surebet_settlement_links
+        BEGIN
+            INSERT INTO counterparty_delta (
+                associate_id, counterparty_id, net_amount_eur, total_won_eur,
+                total_lost_eur, surebet_count, first_transaction_utc,
+                last_transaction_utc, updated_at_utc
+            ) VALUES (
+                NEW.winner_associate_id, NEW.loser_associate_id,
+                printf('%.2f', NEW.amount_eur), printf('%.2f', NEW.amount_eur),
+                '0.00', 1, NEW.created_at_utc, NEW.created_at_utc,
+                datetime('now') || 'Z'
+            )
+            ON CONFLICT(associate_id, counterparty_id) DO UPDATE SET
+                net_amount_eur = printf('%.2f', CAST(net_amount_eur AS REAL) + CAST(excluded.net_amount_eur AS REAL)),
+                total_won_eur = printf('%.2f', CAST(total_won_eur AS REAL) + CAST(excluded.total_won_eur AS REAL)),
+                surebet_count = surebet_count + 1,
+                first_transaction_utc = MIN(COALESCE(first_transaction_utc, excluded.first_transaction_utc), excluded.first_transaction_utc),
+                last_transaction_utc = MAX(COALESCE(last_transaction_utc, excluded.last_transaction_utc), excluded.last_transaction_utc),
+                updated_at_utc = excluded.updated_at_utc;
+
+            INSERT INTO counterparty_delta (
+                associate_id, counterparty_id, net_amount_eur, total_won_eur,
+                total_lost_eur, surebet_count, first_transaction_utc,
+                last_transaction_utc, updated_at_utc
+            )
+            SELECT
+                NEW.loser_associate_id, NEW.winner_associate_id,
+                printf('%.2f', -CAST(NEW.amount_eur AS REAL)), '0.00',
+                printf('%.2f', NEW.amount_eur), 1, NEW.created_at_utc,
+                NEW.created_at_utc, datetime('now') || 'Z'
+            WHERE NEW.winner_associate_id != NEW.loser_associate_id
+            ON CONFLICT(associate_id, counterparty_id) DO UPDATE SET
+                net_amount_eur = printf('%.2f', CAST(net_amount_eur AS REAL) + CAST(excluded.net_amount_eur AS REAL)),
+                total_lost_eur = printf('%.2f', CAST(total_lost_eur AS REAL) + CAST(excluded.total_lost_eur AS REAL)),
+                surebet_count = surebet_count + 1,
+                first_transaction_utc = MIN(COALESCE(first_transaction_utc, excluded.first_transaction_utc), excluded.first_transaction_utc),
+                last_transaction_utc = MAX(COALESCE(last_transaction_utc, excluded.last_transaction_utc), excluded.last_transaction_utc),
+                updated_at_utc = excluded.updated_at_utc;
+        END
+        """
+    )
+
+    has_links = conn.execute("SELECT 1 FROM surebet_settlement_links LIMIT 1").fetchone()
+    if not exists and has_links:
+        conn.execute(
+            f"""
+            INSERT INTO counterparty_delta (
+                associate_id, counterparty_id, net_amount_eur, total_won_eur,
+                total_lost_eur, surebet_count, first_transaction_utc,
+                last_transaction_utc
+            )
+            {COUNTERPARTY_DELTA_AGGREGATE_SQL}
+            """
+        )
+
 
 def create_ledger_entries_table(conn: sqlite3.Connection) -> None:
     """Create the ledger_entries table."""
@@ -783,6 +993,119 @@ def create_bookmaker_balance_checks_table(conn: sqlite3.Connection) -> None:
     )
 
 
+def create_latest_balance_check_table(conn: sqlite3.Connection) -> None:
+    """
+    Create the latest_balance_check pointer table and its maintenance triggers.
+
+    Holds the newest bookmaker_balance_checks row per (associate, bookmaker) so
+    latest-balance lookups do not scan the check history. Inserts advance the
+    pointer; date/pair updates and deletes re-resolve it through the UNIQUE
+    (associate_id, bookmaker_id, check_date_utc) index.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'latest_balance_check'"
+    ).fetchone()
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS latest_balance_check (
+            associate_id INTEGER NOT NULL,
+            bookmaker_id INTEGER NOT NULL,
+            balance_check_id INTEGER NOT NULL,
+            check_date_utc TEXT NOT NULL,
+            PRIMARY KEY (associate_id, bookmaker_id),
+            FOREIGN KEY (balance_check_id) REFERENCES bookmaker_balance_checks(id)
+        )
+        """
+    )
+
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS latest_balance_check_on_insert
+        AFTER INSERT ON bookmaker_balance_checks
+        BEGIN
+            INSERT INTO latest_balance_check (
+                associate_id, bookmaker_id, balance_check_id, check_date_utc
+            ) VALUES (NEW.associate_id, NEW.bookmaker_id, NEW.id, NEW.check_date_utc)
+            ON CONFLICT(associate_id, bookmaker_id) DO UPDATE SET
+                balance_check_id = excluded.balance_check_id,
+                check_date_utc = excluded.check_date_utc
+            WHERE excluded.check_date_utc >= latest_balance_check.check_date_utc;
+        END
+        """
+    )
+
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS latest_balance_check_on_update
+        AFTER UPDATE OF associate_id, bookmaker_id, check_date_utc ON bookmaker_balance_checks
+        BEGIN
+            DELETE FROM latest_balance_check
+            WHERE associate_id = OLD.associate_id AND bookmaker_id = OLD.bookmaker_id;
+            INSERT OR REPLACE INTO latest_balance_check (
+                associate_id, bookmaker_id, balance_check_id, check_date_utc
+            )
+            SELECT associate_id, bookmaker_id, id, check_date_utc
+            FROM bookmaker_balance_checks
+            WHERE associate_id = OLD.associate_id AND bookmaker_id = OLD.bookmaker_id
+            ORDER BY check_date_utc DESC
+            LIMIT 1;
+            INSERT OR REPLACE INTO latest_balance_check (
+                associate_id, bookmaker_id, balance_check_id, check_date_utc
+            )
+            SELECT associate_id, bookmaker_id, id, check_date_utc
+            FROM bookmaker_balance_checks
+            WHERE associate_id = NEW.associate_id AND bookmaker_id = NEW.bookmaker_id
+            ORDER BY check_date_utc DESC
+            LIMIT 1;
+        END
+        """
+    )
+
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS latest_balance_check_on_delete
+        AFTER DELETE ON bookmaker_balance_checks
+        BEGIN
+            DELETE FROM latest_balance_check
+            WHERE associate_id = OLD.associate_id AND bookmaker_id = OLD.bookmaker_id;
+            INSERT INTO latest_balance_check (
+                associate_id, bookmaker_id, balance_check_id, check_date_utc
+            )
+            SELECT associate_id, bookmaker_id, id, check_date_utc
+            FROM bookmaker_balance_checks
+            WHERE associate_id = OLD.associate_id AND bookmaker_id = OLD.bookmaker_id
+            ORDER BY check_date_utc DESC
+            LIMIT 1;
+        END
+        """
+    )
+
+    has_checks = conn.execute("SELECT 1 FROM bookmaker_balance_checks LIMIT 1").fetchone()
+    if not exists and has_checks:
+        conn.execute(
+            """
+            INSERT INTO latest_balance_check (
+                associate_id, bookmaker_id, balance_check_id, check_date_utc
+            )
+            SELECT associate_id, bookmaker_id, id, check_date_utc
+            FROM (
+                SELECT
+                    associate_id,
+                    bookmaker_id,
+                    id,
+                    check_date_utc,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY associate_id, bookmaker_id
+                        ORDER BY check_date_utc DESC
+                    ) AS position
+                FROM bookmaker_balance_checks
+            )
+            WHERE position = 1
+            """
+        )
+
+
 def create_fx_rates_daily_table(conn: sqlite3.Connection) -> None:
     """Create the fx_rates_daily table."""
     conn.execute(
@@ -978,6 +1301,368 @@ def create_telegram_audit_log_table(conn: sqlite3.Connection) -> None:
     )
 
 
+def create_telegram_file_cache_table(conn: sqlite3.Connection) -> None:
+    """Create cache mapping screenshot hashes to uploaded Telegram file_ids."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS telegram_file_cache (
+            screenshot_sha256 TEXT PRIMARY KEY,
+            file_id TEXT NOT NULL,
+            file_unique_id TEXT,
+            created_at_utc TEXT NOT NULL DEFAULT (datetime('now') || 'Z'),
+            last_used_at_utc TEXT NOT NULL DEFAULT (datetime('now') || 'Z')
+        )
+        """
+    )
+
+
+def create_ledger_export_watermarks_table(conn: sqlite3.Connection) -> None:
+    """Create high-water marks for incremental (delta) ledger exports per scope."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ledger_export_watermarks (
+            scope_key TEXT PRIMARY KEY,
+            associate_id INTEGER,
+            last_entry_id INTEGER NOT NULL DEFAULT 0,
+            last_export_path TEXT,
+            compacted_through_entry_id INTEGER NOT NULL DEFAULT 0,
+            snapshot_path TEXT,
+            updated_at_utc TEXT NOT NULL DEFAULT (datetime('now') || 'Z'),
+            FOREIGN KEY (associate_id) REFERENCES associates(id)
+        )
+        """
+    )
+
+
+def create_maintenance_markers_table(conn: sqlite3.Connection) -> None:
+    """Create completion markers for one-time maintenance jobs and backfills."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS maintenance_markers (
+            marker_key TEXT PRIMARY KEY,
+            completed_at_utc TEXT NOT NULL DEFAULT (datetime('now') || 'Z'),
+            details TEXT
+        )
+        """
+    )
+
+
+def create_period_closing_balances_table(conn: sqlite3.Connection) -> None:
+    """
+    Create closed-period balance checkpoints used as statement starting points.
+
+    Each close writes one associate-total row (bookmaker_id NULL) and one row
+    per bookmaker. A checkpoint covers ledger rows with created_at_utc at or
+    before period_end_utc and id at or below through_entry_id; statements add
+    every other qualifying row on top, so late-inserted backdated entries are
+    still counted. withdrawals_eur is ledger-signed on associate rows and
+    absolute on bookmaker rows, matching the statement breakdown.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS period_closing_balances (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            period_end_utc TEXT NOT NULL,
+            associate_id INTEGER NOT NULL,
+            bookmaker_id INTEGER,
+            through_entry_id INTEGER NOT NULL,
+            deposits_eur TEXT NOT NULL DEFAULT '0.00',
+            withdrawals_eur TEXT NOT NULL DEFAULT '0.00',
+            net_deposits_eur TEXT,
+            fair_share_eur TEXT,
+            should_hold_eur TEXT,
+            holdings_eur TEXT NOT NULL DEFAULT '0.00',
+            imbalance_eur TEXT,
+            balance_native TEXT,
+            native_currency TEXT,
+            closed_at_utc TEXT NOT NULL DEFAULT (datetime('now') || 'Z'),
+            closed_by TEXT,
+            FOREIGN KEY (associate_id) REFERENCES associates(id),
+            FOREIGN KEY (bookmaker_id) REFERENCES bookmakers(id)
+        )
+        """
+    )
+
+    conn.execute(
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_period_closing_scope
+        ON period_closing_balances(associate_id, period_end_utc, IFNULL(bookmaker_id, 0))
+        """
+    )
+
+
+def create_ledger_archive_runs_table(conn: sqlite3.Connection) -> None:
+    """Create the manifest of rows moved into per-year archive databases."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ledger_archive_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            period_end_utc TEXT NOT NULL,
+            table_name TEXT NOT NULL,
+            archive_path TEXT NOT NULL,
+            row_count INTEGER NOT NULL DEFAULT 0,
+            max_row_id INTEGER,
+            archived_at_utc TEXT NOT NULL DEFAULT (datetime('now') || 'Z')
+        )
+        """
+    )
+
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_ledger_archive_runs_table
+        ON ledger_archive_runs(table_name, period_end_utc)
+        """
+    )
+
+
+def create_open_exposure_tables(conn: sqlite3.Connection) -> None:
+    """
+    Create the open-exposure tracker tables and their maintenance triggers.
+
+    open_exposure_bets holds the EUR stake of every open (verified or matched)
+    bet, written by ``ExposureService`` because the conversion needs FX rates.
+    Triggers roll those rows up into open_exposure (per associate and
+    bookmaker) and surebet_open_exposure (per surebet and associate), and drop
+    or re-key them when a bet leaves the open states, moves bookmaker, or is
+    linked to / unlinked from a surebet. Amounts are integer cents so the
+    running sums stay exact.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS open_exposure_bets (
+            bet_id INTEGER PRIMARY KEY,
+            associate_id INTEGER NOT NULL,
+            bookmaker_id INTEGER NOT NULL,
+            surebet_id INTEGER,
+            native_currency TEXT NOT NULL,
+            stake_native TEXT NOT NULL,
+            stake_eur_cents INTEGER NOT NULL,
+            updated_at_utc TEXT NOT NULL DEFAULT (datetime('now') || 'Z')
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS open_exposure (
+            associate_id INTEGER NOT NULL,
+            bookmaker_id INTEGER NOT NULL,
+            open_stake_cents INTEGER NOT NULL DEFAULT 0,
+            open_bet_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (associate_id, bookmaker_id)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS surebet_open_exposure (
+            surebet_id INTEGER NOT NULL,
+            associate_id INTEGER NOT NULL,
+            open_stake_cents INTEGER NOT NULL DEFAULT 0,
+            open_bet_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (surebet_id, associate_id)
+        )
+        """
+    )
+
+    add_new = """
+            INSERT INTO open_exposure (associate_id, bookmaker_id, open_stake_cents, open_bet_count)
+            VALUES (NEW.associate_id, NEW.bookmaker_id, NEW.stake_eur_cents, 1)
+            ON CONFLICT(associate_id, bookmaker_id) DO UPDATE SET
+                open_stake_cents = open_stake_cents + excluded.open_stake_cents,
+                open_bet_count = open_bet_count + 1;
+            INSERT INTO surebet_open_exposure (surebet_id, associate_id, open_stake_cents, open_bet_count)
+            SELECT NEW.surebet_id, NEW.associate_id, NEW.stake_eur_cents, 1
+            WHERE NEW.surebet_id IS NOT NULL
+            ON CONFLICT(surebet_id, associate_id) DO UPDATE SET
+                open_stake_cents = open_stake_cents + excluded.open_stake_cents,
+                open_bet_count = open_bet_count + 1;
+    """
+    remove_old = """
+            UPDATE open_exposure
+            SET open_stake_cents = open_stake_cents - OLD.stake_eur_cents,
+                open_bet_count = open_bet_count - 1
+            WHERE associate_id = OLD.associate_id AND bookmaker_id = OLD.bookmaker_id;
+            DELETE FROM open_exposure
+            WHERE associate_id = OLD.associate_id AND bookmaker_id = OLD.bookmaker_id
+              AND open_bet_count <= 0;
+            UPDATE surebet_open_exposure
+            SET open_stake_cents = open_stake_cents - OLD.stake_eur_cents,
+                open_bet_count = open_bet_count - 1
+            WHERE surebet_id = OLD.surebet_id AND associate_id = OLD.associate_id;
+            DELETE FROM surebet_open_exposure
+            WHERE surebet_id = OLD.surebet_id AND associate_id = OLD.associate_id
+              AND open_bet_count <= 0;
+    """
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS open_exposure_on_insert
+        AFTER INSERT ON open_exposure_bets
+        BEGIN
+            {add_new}
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS open_exposure_on_update
+        AFTER UPDATE OF associate_id, bookmaker_id, surebet_id, stake_eur_cents
+        ON open_exposure_bets
+        BEGIN
+            {remove_old}
+            {add_new}
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS open_exposure_on_delete
+        AFTER DELETE ON open_exposure_bets
+        BEGIN
+            {remove_old}
+        END
+        """
+    )
+
+    # Transitions that need no FX conversion are followed in SQL, so settling,
+    # rejecting, matching or deleting a bet keeps the tracker current on any path.
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS open_exposure_bet_closed
+        AFTER UPDATE OF status ON bets
+        WHEN NEW.status NOT IN ('verified', 'matched')
+        BEGIN
+            DELETE FROM open_exposure_bets WHERE bet_id = NEW.id;
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS open_exposure_bet_moved
+        AFTER UPDATE OF associate_id, bookmaker_id ON bets
+        BEGIN
+            UPDATE open_exposure_bets
+            SET associate_id = NEW.associate_id, bookmaker_id = NEW.bookmaker_id
+            WHERE bet_id = NEW.id;
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS open_exposure_bet_deleted
+        AFTER DELETE ON bets
+        BEGIN
+            DELETE FROM open_exposure_bets WHERE bet_id = OLD.id;
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS open_exposure_bet_linked
+        AFTER INSERT ON surebet_bets
+        BEGIN
+            UPDATE open_exposure_bets SET surebet_id = NEW.surebet_id
+            WHERE bet_id = NEW.bet_id;
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS open_exposure_bet_unlinked
+        AFTER DELETE ON surebet_bets
+        BEGIN
+            UPDATE open_exposure_bets SET surebet_id = NULL
+            WHERE bet_id = OLD.bet_id AND surebet_id = OLD.surebet_id;
+        END
+        """
+    )
+
+
+def create_job_runs_tables(conn: sqlite3.Connection) -> None:
+    """
+    Create the job run history and the advisory locks that keep jobs single-instance.
+
+    job_runs gets one row per attempt. A lock row is held from start to finish
+    of a job; expires_at_epoch (unix seconds) lets a crashed holder's lock be
+    taken over.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS job_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_name TEXT NOT NULL,
+            pipeline_run_id TEXT,
+            status TEXT NOT NULL,
+            attempt INTEGER NOT NULL DEFAULT 1,
+            owner TEXT,
+            started_at_utc TEXT NOT NULL,
+            finished_at_utc TEXT,
+            duration_ms INTEGER,
+            row_count INTEGER,
+            error_message TEXT,
+            CHECK (status IN ('running', 'succeeded', 'failed', 'skipped'))
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_job_runs_job_started
+        ON job_runs(job_name, started_at_utc)
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS job_locks (
+            lock_name TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            acquired_at_utc TEXT NOT NULL,
+            expires_at_epoch REAL NOT NULL
+        )
+        """
+    )
+
+
+def epoch_ms_sql(column: str) -> str:
+    """
+    Return the SQL expression converting a TEXT UTC timestamp to epoch milliseconds.
+
+    ``julianday`` accepts the space and ``T`` separators, fractional seconds and
+    a trailing ``Z``; the legacy ``+00:00Z`` suffix is folded to ``Z`` first.
+    Unparseable values yield NULL. Mirrors
+    :func:`src.utils.datetime_helpers.to_epoch_ms`.
+    """
+    return (
+        f"CAST(ROUND((julianday(replace({column}, '+00:00Z', 'Z')) - 2440587.5) "
+        f"* 86400000.0) AS INTEGER)"
+    )
+
+
+def create_epoch_ms_columns(conn: sqlite3.Connection) -> None:
+    """
+    Add the ``*_ms`` generated columns from ``EPOCH_MS_COLUMNS`` and their indexes.
+
+    The columns are VIRTUAL, so every write keeps them in sync (including the
+    append-only ledger, which cannot be updated after insert) and building the
+    indexes backfills existing rows. Tables that are missing, or lack the
+    source column, are skipped.
+    """
+    for table, columns in EPOCH_MS_COLUMNS.items():
+        # table_info omits generated columns; table_xinfo lists them.
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_xinfo({table})").fetchall()}
+        for column, source in columns.items():
+            if source in existing and column not in existing:
+                conn.execute(
+                    f"ALTER TABLE {table} ADD COLUMN {column} INTEGER "
+                    f"GENERATED ALWAYS AS ({epoch_ms_sql(source)}) VIRTUAL"
+                )
+                existing.add(column)
+
+    for index, target in EPOCH_MS_INDEXES.items():
+        table, column_list = target.split("(", 1)
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_xinfo({table})").fetchall()}
+        if all(column.strip() in existing for column in column_list.rstrip(")").split(",")):
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {target}")
+
+
 def get_all_table_names(conn: sqlite3.Connection) -> List[str]:
     """
     Get a list of all table names in the database.
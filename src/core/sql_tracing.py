@@ -0,0 +1,333 @@
+"""
+SQL statement tracing for connections created by ``get_db_connection``.
+
+When tracing is enabled, connections are built with :class:`TracingConnection`,
+whose cursors time every statement from ``execute`` until its rows have been
+fetched. Each statement is normalized (literals replaced by ``?``) and
+aggregated process-wide with per-statement p50/p95, row counts and the
+calling ``src.*`` function. Statements slower than the threshold are appended
+as JSON lines to ``<LOG_DIR>/slow_queries.log``.
+
+Tracing is off by default (``SQL_TRACE_ENABLED``); toggling it at runtime only
+affects connections opened afterwards.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from pathlib import Path
+from types import FrameType
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Self, TypeVar, overload
+
+from src.core.config import Config
+
+MAX_SAMPLES_PER_STATEMENT = 500
+MAX_SLOW_QUERIES = 100
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_SKIPPED_MODULES = ("src.core.sql_tracing", "src.core.database")
+
+_CursorT = TypeVar("_CursorT", bound=sqlite3.Cursor)
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse literals, placeholder lists and whitespace so variants share a key."""
+    text = _STRING_LITERAL.sub("?", sql)
+    text = _NUMBER_LITERAL.sub("?", text)
+    text = _PLACEHOLDER_LIST.sub("(?...)", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def _calling_service() -> str:
+    """Return ``module:function`` of the nearest application frame."""
+    frame: Optional[FrameType] = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("src.") and not module.startswith(_SKIPPED_MODULES):
+            return f"{module}:{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+@dataclass(slots=True)
+class SqlStatementStats:
+    """Aggregated timings for one normalized statement."""
+
+    sql: str
+    calls: int
+    total_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+    avg_rows: float
+    top_caller: str
+
+
+class _StatementAggregate:
+    __slots__ = ("calls", "total_ms", "max_ms", "rows", "samples", "callers")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.samples: Deque[float] = deque(maxlen=MAX_SAMPLES_PER_STATEMENT)
+        self.callers: Counter = Counter()
+
+
+class SqlTraceRegistry:
+    """Thread-safe, process-wide store of statement timings and slow queries."""
+
+    def __init__(
+        self,
+        slow_threshold_ms: float = Config.SQL_SLOW_QUERY_MS,
+        slow_log_path: Optional[str] = None,
+    ) -> None:
+        self.slow_threshold_ms = slow_threshold_ms
+        self.slow_log_path = (
+            Path(slow_log_path) if slow_log_path else Path(Config.LOG_DIR) / "slow_queries.log"
+        )
+        self._lock = threading.Lock()
+        self._statements: Dict[str, _StatementAggregate] = {}
+        self._slow: Deque[Dict[str, Any]] = deque(maxlen=MAX_SLOW_QUERIES)
+
+    def record(self, sql: str, duration_ms: float, rows: int, caller: str) -> None:
+        """Add one executed statement."""
+        normalized = normalize_sql(sql)
+        slow_entry: Optional[Dict[str, Any]] = None
+        with self._lock:
+            aggregate = self._statements.get(normalized)
+            if aggregate is None:
+                aggregate = self._statements[normalized] = _StatementAggregate()
+            aggregate.calls += 1
+            aggregate.total_ms += duration_ms
+            aggregate.max_ms = max(aggregate.max_ms, duration_ms)
+            aggregate.rows += max(rows, 0)
+            aggregate.samples.append(duration_ms)
+            aggregate.callers[caller] += 1
+            if duration_ms >= self.slow_threshold_ms:
+                slow_entry = {
+                    "timestamp": time.time(),
+                    "duration_ms": round(duration_ms, 3),
+                    "rows": rows,
+                    "caller": caller,
+                    "sql": normalized,
+                }
+                self._slow.append(slow_entry)
+        if slow_entry is not None:
+            self._write_slow_entry(slow_entry)
+
+    def top_statements(self, limit: int = 10, order_by: str = "total_ms") -> List[SqlStatementStats]:
+        """Return the heaviest statements, ordered by ``total_ms``, ``p95_ms`` or ``calls``."""
+        with self._lock:
+            snapshot = [
+                (sql, aggregate.calls, aggregate.total_ms, aggregate.max_ms, aggregate.rows,
+                 sorted(aggregate.samples), aggregate.callers.most_common(1))
+                for sql, aggregate in self._statements.items()
+            ]
+        stats = [
+            SqlStatementStats(
+                sql=sql,
+                calls=calls,
+                total_ms=total_ms,
+                p50_ms=_percentile(samples, 50),
+                p95_ms=_percentile(samples, 95),
+                max_ms=max_ms,
+                avg_rows=rows / calls if calls else 0.0,
+                top_caller=callers[0][0] if callers else "unknown",
+            )
+            for sql, calls, total_ms, max_ms, rows, samples, callers in snapshot
+        ]
+        stats.sort(key=lambda item: getattr(item, order_by), reverse=True)
+        return stats[:limit]
+
+    def slow_queries(self) -> List[Dict[str, Any]]:
+        """Return recent slow statements, newest last."""
+        with self._lock:
+            return list(self._slow)
+
+    def reset(self) -> None:
+        """Drop all aggregated statements and slow entries."""
+        with self._lock:
+            self._statements.clear()
+            self._slow.clear()
+
+    def _write_slow_entry(self, entry: Dict[str, Any]) -> None:
+        try:
+            self.slow_log_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.slow_log_path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry) + "\n")
+        except OSError:
+            pass
+
+
+class TracingCursor(sqlite3.Cursor):
+    """Cursor that reports each statement once its rows are consumed."""
+
+    _trace: Optional[List[Any]] = None
+
+    def execute(self, sql: str, parameters: Any = (), /) -> Self:
+        self._finish()
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._begin(sql, start)
+
+    def executemany(self, sql: str, seq_of_parameters: Iterable[Any], /) -> Self:
+        self._finish()
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._begin(sql, start)
+            self._finish()
+
+    def executescript(self, sql_script: str, /) -> sqlite3.Cursor:
+        self._finish()
+        start = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            self._begin(sql_script, start)
+            self._finish()
+
+    def fetchone(self) -> Any:
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._consumed(start, 0 if row is None else 1, exhausted=row is None)
+        return row
+
+    def fetchmany(self, size: Optional[int] = None) -> List[Any]:
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        requested = self.arraysize if size is None else size
+        self._consumed(start, len(rows), exhausted=len(rows) < requested)
+        return rows
+
+    def fetchall(self) -> List[Any]:
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._consumed(start, len(rows), exhausted=True)
+        return rows
+
+    def __next__(self) -> Any:
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._consumed(start, 0, exhausted=True)
+            raise
+        self._consumed(start, 1, exhausted=False)
+        return row
+
+    def close(self) -> None:
+        self._finish()
+        super().close()
+
+    def __del__(self) -> None:
+        try:
+            self._finish()
+        except Exception:  # pragma: no cover - interpreter shutdown
+            pass
+
+    def _begin(self, sql: str, start: float) -> None:
+        # [sql, elapsed seconds, rows, caller]
+        self._trace = [sql, time.perf_counter() - start, 0, _calling_service()]
+        if self.description is None:
+            # Nothing to fetch: writes and DDL are complete now.
+            self._trace[2] = max(self.rowcount, 0)
+            self._finish()
+
+    def _consumed(self, start: float, rows: int, *, exhausted: bool) -> None:
+        trace = self._trace
+        if trace is None:
+            return
+        trace[1] += time.perf_counter() - start
+        trace[2] += rows
+        if exhausted:
+            self._finish()
+
+    def _finish(self) -> None:
+        trace, self._trace = self._trace, None
+        if trace is not None:
+            get_registry().record(trace[0], trace[1] * 1000.0, trace[2], trace[3])
+
+
+class TracingConnection(sqlite3.Connection):
+    """Connection whose statements, including ``conn.execute`` shortcuts, are traced."""
+
+    @overload
+    def cursor(self, factory: None = None) -> TracingCursor: ...
+
+    @overload
+    def cursor(self, factory: Callable[[sqlite3.Connection], _CursorT]) -> _CursorT: ...
+
+    def cursor(
+        self, factory: Optional[Callable[[sqlite3.Connection], sqlite3.Cursor]] = None
+    ) -> sqlite3.Cursor:
+        return super().cursor(TracingCursor if factory is None else factory)
+
+    def execute(self, sql: str, parameters: Any = (), /) -> sqlite3.Cursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Iterable[Any], /) -> sqlite3.Cursor:
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script: str, /) -> sqlite3.Cursor:
+        return self.cursor().executescript(sql_script)
+
+
+_REGISTRY = SqlTraceRegistry()
+_ENABLED = Config.SQL_TRACE_ENABLED
+
+
+def get_registry() -> SqlTraceRegistry:
+    """Return the process-wide trace registry."""
+    return _REGISTRY
+
+
+def is_tracing_enabled() -> bool:
+    return _ENABLED
+
+
+def set_tracing_enabled(enabled: bool) -> None:
+    """Turn tracing on or off for connections opened from now on."""
+    global _ENABLED
+    _ENABLED = bool(enabled)
+
+
+def connection_factory() -> type[sqlite3.Connection]:
+    """Return the ``sqlite3.connect`` factory matching the current tracing state."""
+    return TracingConnection if _ENABLED else sqlite3.Connection
+
+
+__all__ = [
+    "SqlStatementStats",
+    "SqlTraceRegistry",
+    "TracingConnection",
+    "TracingCursor",
+    "connection_factory",
+    "get_registry",
+    "is_tracing_enabled",
+    "normalize_sql",
+    "set_tracing_enabled",
+]
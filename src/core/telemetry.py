@@ -0,0 +1,415 @@
+"""
+Persistent timing telemetry shared by every process (UI, bot handlers, jobs).
+
+Timings are buffered in memory and flushed in small batches to a separate
+SQLite file (``TELEMETRY_DB_PATH``), so recording never contends with the
+accounting database. Each flush:
+
+- appends raw samples to ``timing_samples``, a ring buffer capped at
+  ``TELEMETRY_MAX_SAMPLES`` rows, and
+- folds them into per-day rollups: exact count/total/max in ``timing_rollups``
+  and a log-scale histogram in ``timing_histograms`` from which p50/p95/p99
+  are read. Rollups outlive the ring buffer.
+
+Rows carry the release (``APP_RELEASE``, defaulting to the package version) so
+operators can compare deployments. Telemetry failures are logged and dropped;
+they never reach the caller.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import math
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import structlog
+
+from src import __version__
+from src.core.config import Config
+
+logger = structlog.get_logger()
+
+FLUSH_BATCH_SIZE = 25
+FLUSH_INTERVAL_SECONDS = 5.0
+
+# Log-scale buckets: each is 10% wider than the last, starting at 10 microseconds.
+_BUCKET_BASE_MS = 0.01
+_BUCKET_GROWTH = 1.1
+
+
+def bucket_for(duration_ms: float) -> int:
+    """Return the histogram bucket holding ``duration_ms``."""
+    if duration_ms <= _BUCKET_BASE_MS:
+        return 0
+    return int(math.log(duration_ms / _BUCKET_BASE_MS) / math.log(_BUCKET_GROWTH)) + 1
+
+
+def bucket_upper_ms(bucket: int) -> float:
+    """Return the upper bound of a histogram bucket in milliseconds."""
+    return _BUCKET_BASE_MS * _BUCKET_GROWTH ** bucket
+
+
+@dataclass(slots=True)
+class TimingSample:
+    label: str
+    source: str
+    duration_ms: float
+    recorded_at: float
+
+
+@dataclass(slots=True)
+class TimingRollup:
+    """Daily percentiles for one label, source and release."""
+
+    day: str
+    label: str
+    source: str
+    release: str
+    count: int
+    mean_ms: float
+    max_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+def _histogram_percentile(
+    buckets: Sequence[Tuple[int, int]], count: int, pct: float, max_ms: float
+) -> float:
+    """Nearest-rank percentile from sorted (bucket, count) pairs."""
+    if not count:
+        return 0.0
+    target = max(1, math.ceil(pct / 100.0 * count))
+    seen = 0
+    for bucket, bucket_count in buckets:
+        seen += bucket_count
+        if seen >= target:
+            return min(bucket_upper_ms(bucket), max_ms)
+    return max_ms
+
+
+class TelemetryStore:
+    """SQLite-backed timing store; safe to share between threads and processes."""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        *,
+        max_samples: Optional[int] = None,
+        release: Optional[str] = None,
+    ) -> None:
+        self.db_path = Path(db_path or Config.TELEMETRY_DB_PATH)
+        self.max_samples = max_samples if max_samples is not None else Config.TELEMETRY_MAX_SAMPLES
+        self.release = release or Config.APP_RELEASE or __version__
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=5.0, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS timing_samples (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    recorded_at_utc TEXT NOT NULL,
+                    label TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    release TEXT NOT NULL,
+                    duration_ms REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS timing_rollups (
+                    day TEXT NOT NULL,
+                    label TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    release TEXT NOT NULL,
+                    sample_count INTEGER NOT NULL,
+                    total_ms REAL NOT NULL,
+                    max_ms REAL NOT NULL,
+                    PRIMARY KEY (day, label, source, release)
+                );
+                CREATE TABLE IF NOT EXISTS timing_histograms (
+                    day TEXT NOT NULL,
+                    label TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    release TEXT NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    sample_count INTEGER NOT NULL,
+                    PRIMARY KEY (day, label, source, release, bucket)
+                );
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def write(self, samples: Sequence[TimingSample]) -> None:
+        """Persist samples and fold them into the daily rollups in one transaction."""
+        if not samples:
+            return
+        rollups: Dict[Tuple[str, str, str], List[float]] = defaultdict(list)
+        rows = []
+        for sample in samples:
+            stamp = datetime.fromtimestamp(sample.recorded_at, tz=timezone.utc)
+            rows.append(
+                (
+                    stamp.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+                    sample.label,
+                    sample.source,
+                    self.release,
+                    sample.duration_ms,
+                )
+            )
+            rollups[(stamp.strftime("%Y-%m-%d"), sample.label, sample.source)].append(
+                sample.duration_ms
+            )
+
+        histogram: Dict[Tuple[str, str, str, int], int] = defaultdict(int)
+        for (day, label, source), durations in rollups.items():
+            for duration in durations:
+                histogram[(day, label, source, bucket_for(duration))] += 1
+
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    """
+                    INSERT INTO timing_samples (recorded_at_utc, label, source, release, duration_ms)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    rows,
+                )
+                conn.executemany(
+                    """
+                    INSERT INTO timing_rollups (
+                        day, label, source, release, sample_count, total_ms, max_ms
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(day, label, source, release) DO UPDATE SET
+                        sample_count = sample_count + excluded.sample_count,
+                        total_ms = total_ms + excluded.total_ms,
+                        max_ms = MAX(max_ms, excluded.max_ms)
+                    """,
+                    [
+                        (day, label, source, self.release, len(durations), sum(durations), max(durations))
+                        for (day, label, source), durations in rollups.items()
+                    ],
+                )
+                conn.executemany(
+                    """
+                    INSERT INTO timing_histograms (
+                        day, label, source, release, bucket, sample_count
+                    ) VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(day, label, source, release, bucket) DO UPDATE SET
+                        sample_count = sample_count + excluded.sample_count
+                    """,
+                    [
+                        (day, label, source, self.release, bucket, count)
+                        for (day, label, source, bucket), count in histogram.items()
+                    ],
+                )
+                conn.execute(
+                    "DELETE FROM timing_samples "
+                    "WHERE id <= (SELECT MAX(id) FROM timing_samples) - ?",
+                    (self.max_samples,),
+                )
+
+    def get_rollups(
+        self,
+        *,
+        start_day: Optional[str] = None,
+        end_day: Optional[str] = None,
+        label: Optional[str] = None,
+        source: Optional[str] = None,
+        release: Optional[str] = None,
+        by_day: bool = True,
+    ) -> List[TimingRollup]:
+        """
+        Return daily percentiles, newest day first.
+
+        Args:
+            start_day: Inclusive ``YYYY-MM-DD`` lower bound
+            end_day: Inclusive ``YYYY-MM-DD`` upper bound
+            label: Restrict to one label
+            source: Restrict to one source (``ui``, ``bot``, ``job``)
+            release: Restrict to one release
+            by_day: When False, merge the histograms of every matching day
+                into one rollup per label/source/release (``day`` is "all")
+        """
+        clauses: List[str] = []
+        params: List[object] = []
+        for column, value, operator in (
+            ("day", start_day, ">="),
+            ("day", end_day, "<="),
+            ("label", label, "="),
+            ("source", source, "="),
+            ("release", release, "="),
+        ):
+            if value is not None:
+                clauses.append(f"{column} {operator} ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            conn = self._connection()
+            day_expr = "day" if by_day else "'all'"
+            totals = conn.execute(
+                f"""
+                SELECT {day_expr} AS day, label, source, release,
+                       SUM(sample_count) AS sample_count, SUM(total_ms) AS total_ms,
+                       MAX(max_ms) AS max_ms
+                FROM timing_rollups {where}
+                GROUP BY 1, label, source, release
+                ORDER BY 1 DESC, label, source, release
+                """,
+                params,
+            ).fetchall()
+            histogram_rows = conn.execute(
+                f"""
+                SELECT {day_expr} AS day, label, source, release, bucket,
+                       SUM(sample_count) AS sample_count
+                FROM timing_histograms {where}
+                GROUP BY 1, label, source, release, bucket
+                ORDER BY bucket
+                """,
+                params,
+            ).fetchall()
+
+        buckets: Dict[Tuple[str, str, str, str], List[Tuple[int, int]]] = defaultdict(list)
+        for row in histogram_rows:
+            buckets[(row["day"], row["label"], row["source"], row["release"])].append(
+                (row["bucket"], row["sample_count"])
+            )
+
+        rollups: List[TimingRollup] = []
+        for row in totals:
+            key = (row["day"], row["label"], row["source"], row["release"])
+            count = row["sample_count"]
+            max_ms = row["max_ms"]
+            rollups.append(
+                TimingRollup(
+                    day=row["day"],
+                    label=row["label"],
+                    source=row["source"],
+                    release=row["release"],
+                    count=count,
+                    mean_ms=row["total_ms"] / count if count else 0.0,
+                    max_ms=max_ms,
+                    p50_ms=_histogram_percentile(buckets[key], count, 50, max_ms),
+                    p95_ms=_histogram_percentile(buckets[key], count, 95, max_ms),
+                    p99_ms=_histogram_percentile(buckets[key], count, 99, max_ms),
+                )
+            )
+        return rollups
+
+    def sample_count(self) -> int:
+        """Return the number of raw samples currently retained."""
+        with self._lock:
+            row = self._connection().execute("SELECT COUNT(*) FROM timing_samples").fetchone()
+        return int(row[0])
+
+
+_buffer: List[TimingSample] = []
+_buffer_lock = threading.Lock()
+_last_flush = time.monotonic()
+_store: Optional[TelemetryStore] = None
+_enabled = Config.TELEMETRY_ENABLED
+
+
+def get_store() -> TelemetryStore:
+    """Return the process-wide telemetry store."""
+    global _store
+    if _store is None:
+        _store = TelemetryStore()
+    return _store
+
+
+def configure(store: Optional[TelemetryStore] = None, *, enabled: Optional[bool] = None) -> None:
+    """Swap the process-wide store or toggle recording (used by tests and tools)."""
+    global _store, _enabled
+    flush()
+    if store is not None:
+        _store = store
+    if enabled is not None:
+        _enabled = enabled
+
+
+def record_timing(label: str, duration_seconds: float, *, source: str = "ui") -> None:
+    """Queue a timing; flushed in batches or after ``FLUSH_INTERVAL_SECONDS``."""
+    if not _enabled:
+        return
+    global _last_flush
+    sample = TimingSample(label, source, duration_seconds * 1000.0, time.time())
+    with _buffer_lock:
+        _buffer.append(sample)
+        due = (
+            len(_buffer) >= FLUSH_BATCH_SIZE
+            or time.monotonic() - _last_flush >= FLUSH_INTERVAL_SECONDS
+        )
+    if due:
+        flush()
+
+
+def flush() -> None:
+    """Write buffered samples to the store."""
+    global _last_flush
+    with _buffer_lock:
+        pending = list(_buffer)
+        _buffer.clear()
+        _last_flush = time.monotonic()
+    if not pending:
+        return
+    try:
+        get_store().write(pending)
+    except Exception as exc:  # Telemetry must never break the caller
+        logger.warning("telemetry_flush_failed", error=str(exc), dropped=len(pending))
+
+
+class timed(contextlib.ContextDecorator):
+    """Context manager / decorator recording the wrapped block's duration."""
+
+    def __init__(self, label: str, *, source: str = "job") -> None:
+        self.label = label
+        self.source = source
+        self._start = 0.0
+
+    def _recreate_cm(self) -> "timed":
+        # Fresh instance per decorated call so concurrent calls keep their own start.
+        return type(self)(self.label, source=self.source)
+
+    def __enter__(self) -> "timed":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        record_timing(self.label, time.perf_counter() - self._start, source=self.source)
+
+
+atexit.register(flush)
+
+
+__all__ = [
+    "TelemetryStore",
+    "TimingRollup",
+    "TimingSample",
+    "configure",
+    "flush",
+    "get_store",
+    "record_timing",
+    "timed",
+]
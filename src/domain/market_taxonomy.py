@@ -8,7 +8,9 @@ to normalized codes and period scopes.
 
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
 import re
 import unicodedata
 
@@ -147,15 +149,20 @@ def _strip_accents(text: str) -> str:
     return normalized.encode("ascii", "ignore").decode("ascii")
 
 
-def _team_tokens(team: str | None) -> List[str]:
+_NON_ALNUM = re.compile(r"[^A-Z0-9 ]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def _team_tokens(team: str | None) -> Tuple[str, ...]:
     """Build searchable tokens for a team name."""
     if not team:
-        return []
+        return ()
     cleaned = _strip_accents(team).upper()
-    cleaned = re.sub(r"[^A-Z0-9 ]+", " ", cleaned)
-    cleaned = re.sub(r"\s+", " ", cleaned).strip()
+    cleaned = _NON_ALNUM.sub(" ", cleaned)
+    cleaned = _WHITESPACE.sub(" ", cleaned).strip()
     if not cleaned:
-        return []
+        return ()
     tokens: List[str] = [cleaned]
     compact = cleaned.replace(" ", "")
     if len(compact) >= 3:
@@ -167,7 +174,7 @@ def _team_tokens(team: str | None) -> List[str]:
     for tok in tokens:
         if tok not in deduped:
             deduped.append(tok)
-    return deduped
+    return tuple(deduped)
 
 
 PERIOD_SYNONYMS: Dict[str, str] = {
@@ -459,6 +466,128 @@ def normalize_period(label: str | None) -> str | None:
     return PERIOD_SYNONYMS.get(key, None)
 
 
+# Keyword tables for find_market_code_from_label. Each group is matched as a
+# plain substring of one of three views of the label: ``up`` (stripped and
+# uppercased), ``up_simplified`` (numbers blanked out) or ``search_text``
+# (accents removed).
+_FULL_MATCH_KEYWORDS = frozenset(
+    ["FULL TIME", "FULLTIME", "FT", "MATCH", "PARTITA INTERA", "TEMPO REGOLAMENTARE", "TEMPO PIENO"]
+)
+_FIRST_HALF_KEYWORDS = frozenset(["FIRST HALF", "1ST HALF", "PRIMO TEMPO", "1 TEMPO", "1T"])
+_SECOND_HALF_KEYWORDS = frozenset(["SECOND HALF", "2ND HALF", "SECONDO TEMPO", "2 TEMPO", "2T"])
+_THRESHOLD_KEYWORDS = frozenset(
+    [" OVER", "UNDER", " PIU", " PIU'", " PI\u00D9", " MENO", " OR MORE", " OR LESS", " +", " -", " PESTE", " SUB"]
+)
+
+_OU_KEYWORDS = frozenset(["OVER/UNDER", "UNDER/OVER", "O/U", "PESTE/SUB", "SUB/PESTE"])
+_EVEN_ODD_KEYWORDS = frozenset(["PARI", "DISPARI", "ODD", "EVEN"])
+_GOALS_KEYWORDS = frozenset(["GOALS", "GOAL", "GOL", "GOLS", "GOLURI"])
+_CORNERS_KEYWORDS = frozenset(["CORNERS", "CORNER", "CALCI D'ANGOLO", "ANGOLI", "CORNERE", "LOVITURI DE COLT"])
+_CARDS_KEYWORDS = frozenset(["CARDS", "CARD", "CARTELLINI", "AMMONIZIONI", "BOOKINGS", "CARTONASE", "CARTONAS"])
+_SHOTS_ON_TARGET_KEYWORDS = frozenset(["SHOTS ON TARGET", "SOT", "TIRI IN PORTA", "SUTURI PE POARTA"])
+_SHOTS_KEYWORDS = frozenset(["SHOTS", "TIRI", "SUTURI"])
+_OFFSIDES_KEYWORDS = frozenset(["OFFSIDES", "FUORIGIOCO", "OFFSIDE", "OFSAID", "OFSAIT"])
+_FOULS_KEYWORDS = frozenset(["FOULS", "FALLI", "FAULT", "FAULTURI"])
+_NO_GOAL_KEYWORDS = frozenset(
+    [" NO GOAL", " NO GOL", " DOES NOT SCORE", " DOESN'T SCORE", " DOESNT SCORE", " NU MARCHEAZA", " NU INSCRIE"]
+)
+_GAMES_KEYWORDS = frozenset(["TOTAL GAMES", "GAMES", "GIOCHI"])
+
+# Yes/No and two-way markets recognised from keywords alone, in priority order.
+_KEYWORD_MARKETS: Tuple[Tuple[str, FrozenSet[str]], ...] = (
+    ("HOME_TEAM_TO_SCORE", frozenset(["HOME TEAM TO SCORE", "TEAM A TO SCORE", "SEGNA CASA", "ECHIPA GAZDA MARCHEAZA", "GAZDA MARCHEAZA", "ECHIPA GAZDA INSCRIE", "GAZDA INSCRIE"])),
+    ("AWAY_TEAM_TO_SCORE", frozenset(["AWAY TEAM TO SCORE", "TEAM B TO SCORE", "SEGNA OSPITE", "ECHIPA OASPETE MARCHEAZA", "OASPETE MARCHEAZA", "ECHIPA OASPETE INSCRIE", "OASPETE INSCRIE"])),
+    ("HOME_TEAM_CLEAN_SHEET", frozenset(["HOME CLEAN SHEET", "PORTA INVIOLATA CASA", "GAZDA NU PRIMESTE GOL", "ECHIPA GAZDA NU PRIMESTE GOL"])),
+    ("AWAY_TEAM_CLEAN_SHEET", frozenset(["AWAY CLEAN SHEET", "PORTA INVIOLATA OSPITE", "OASPETE NU PRIMESTE GOL", "ECHIPA OASPETE NU PRIMESTE GOL"])),
+    ("HOME_TEAM_RED_CARD", frozenset(["HOME RED CARD", "CARTELLINO ROSSO CASA", "GAZDA CARTONAS ROSU", "ECHIPA GAZDA CARTONAS ROSU"])),
+    ("AWAY_TEAM_RED_CARD", frozenset(["AWAY RED CARD", "CARTELLINO ROSSO OSPITE", "OASPETE CARTONAS ROSU", "ECHIPA OASPETE CARTONAS ROSU"])),
+    ("RED_CARD_AWARDED", frozenset(["CARTELLINO ROSSO", "ESPULSIONE", "RED CARD", "CARTONAS ROSU", "ELIMINARE"])),
+    ("PENALTY_AWARDED", frozenset(["CALCIO DI RIGORE", "RIGORE", "PENALTY IN MATCH", "PENALTY AWARDED", "PENALTY", "PENALTI"])),
+    ("BOTH_TEAMS_TO_SCORE", frozenset(["BTTS", "BOTH TEAMS TO SCORE", "ENTRAMBE LE SQUADRE SEGNANO", "GOAL/NOGOAL", "GOL/NOGOL", "AMBELE MARCHEAZA", "AMBELE ECHIPE MARCHEAZA"])),
+    ("DOUBLE_CHANCE", frozenset(["DOUBLE CHANCE", "DOPPIA CHANCE"])),
+    ("DRAW_NO_BET", frozenset(["DRAW NO BET", "DNB", "PAREGGIO NESSUNA SCOMMESSA", "PAREGGIO RIMBORSO"])),
+    ("ASIAN_HANDICAP", frozenset(["ASIAN HANDICAP", "HANDICAP ASIATICO", "HANDICAP"])),
+    ("MATCH_WINNER", frozenset(["MATCH WINNER", "TO WIN MATCH", "MONEYLINE", "VINCENTE INCONTRO", "VINCENTE PARTITA"])),
+)
+
+_HOME_INDICATORS = frozenset(["HOME", "TEAM A", "CASA", "SQUADRA CASA", "ACASA", "GAZDA", "ECHIPA GAZDA"])
+_AWAY_INDICATORS = frozenset(
+    ["AWAY", "TEAM B", "OSPITE", "TRASFERTA", "SQUADRA OSPITE", "DEPLASARE", "OASPETE", "ECHIPA OASPETE"]
+)
+_TO_SCORE_KEYWORDS = frozenset([" TO SCORE", " SEGNA ", " MARCHEAZA", " INSCRIE "])
+
+_NUMBER_PATTERN = re.compile(r"[0-9]+[\.,]?[0-9]*")
+
+# Number of distinct (label, home_team, away_team) results kept in memory.
+MARKET_LABEL_CACHE_SIZE = 4096
+
+
+class _KeywordMatcher:
+    """Find every keyword occurring in a text with a single regex scan.
+
+    The keywords are compiled into one trie-shaped pattern inside a lookahead,
+    so at each position the regex reports the longest keyword starting there
+    (overlaps included). Shorter keywords starting at the same position are
+    its prefixes and come from a precomputed table, which makes :meth:`hits`
+    equal to ``{kw for kw in keywords if kw in text}``.
+    """
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        unique = {kw for kw in keywords if kw}
+        trie: Dict[str, dict] = {}
+        for kw in unique:
+            node = trie
+            for char in kw:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        self._pattern = re.compile("(?=(" + self._trie_pattern(trie) + "))")
+        self._prefixes: Dict[str, FrozenSet[str]] = {
+            kw: frozenset(kw[:end] for end in range(1, len(kw) + 1) if kw[:end] in unique)
+            for kw in unique
+        }
+
+    @classmethod
+    def _trie_pattern(cls, node: Dict[str, dict]) -> str:
+        # Children are tried before the end marker so the longest keyword wins.
+        branches = [re.escape(char) + cls._trie_pattern(child) for char, child in node.items() if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return "(?:" + body + ")?"
+        return body
+
+    def hits(self, text: str) -> Set[str]:
+        found: Set[str] = set()
+        for match in self._pattern.finditer(text):
+            found |= self._prefixes[match.group(1)]
+        return found
+
+
+_UP_MATCHER = _KeywordMatcher(
+    chain(_FULL_MATCH_KEYWORDS, _FIRST_HALF_KEYWORDS, _SECOND_HALF_KEYWORDS, _THRESHOLD_KEYWORDS)
+)
+_SIMPLIFIED_MATCHER = _KeywordMatcher(
+    chain(
+        _OU_KEYWORDS,
+        _EVEN_ODD_KEYWORDS,
+        _GOALS_KEYWORDS,
+        _CORNERS_KEYWORDS,
+        _CARDS_KEYWORDS,
+        _SHOTS_ON_TARGET_KEYWORDS,
+        _SHOTS_KEYWORDS,
+        _OFFSIDES_KEYWORDS,
+        _FOULS_KEYWORDS,
+        _NO_GOAL_KEYWORDS,
+        _GAMES_KEYWORDS,
+        *(keywords for _, keywords in _KEYWORD_MARKETS),
+    )
+)
+_SEARCH_MATCHER = _KeywordMatcher(chain(_HOME_INDICATORS, _AWAY_INDICATORS, _TO_SCORE_KEYWORDS))
+# Only scanned when no heuristic matched.
+_SYNONYM_MATCHER = _KeywordMatcher(needle for needle, _, _ in MARKET_SYNONYMS)
+
+
 def find_market_code_from_label(
     label: str | None,
     *,
@@ -471,256 +600,167 @@ def find_market_code_from_label(
     - Token-aware O/U detection to handle numeric inserts (e.g., "Over/Under 2.5 Goals").
     - Italian + English keywords supported.
     - Fallback to substring synonym list.
+
+    Results are memoized per (label, home_team, away_team).
     """
     if not label:
         return None, None
+    return _find_market_code(label, home_team, away_team)
 
+
+@lru_cache(maxsize=MARKET_LABEL_CACHE_SIZE)
+def _find_market_code(
+    label: str, home_team: str | None, away_team: str | None
+) -> Tuple[str | None, str | None]:
     up = label.strip().upper()
     search_text = _strip_accents(up)
-    home_tokens = _team_tokens(home_team)
-    away_tokens = _team_tokens(away_team)
+    up_simplified = _NUMBER_PATTERN.sub(" ", up)
+
+    # One scan per view of the label; every check below is a set lookup.
+    up_hits = _UP_MATCHER.hits(up)
+    simplified_hits = _SIMPLIFIED_MATCHER.hits(up_simplified)
+    search_hits = _SEARCH_MATCHER.hits(search_text)
+
+    home = not search_hits.isdisjoint(_HOME_INDICATORS) or any(
+        token in search_text for token in _team_tokens(home_team)
+    )
+    away = not search_hits.isdisjoint(_AWAY_INDICATORS) or any(
+        token in search_text for token in _team_tokens(away_team)
+    )
+    home_only = home and not away
+    away_only = away and not home
 
     # quick implied period
     implied_period = None
-    if any(
-        p in up
-        for p in [
-            "FULL TIME",
-            "FULLTIME",
-            "FT",
-            "MATCH",
-            "PARTITA INTERA",
-            "TEMPO REGOLAMENTARE",
-            "TEMPO PIENO",
-        ]
-    ):
+    if not up_hits.isdisjoint(_FULL_MATCH_KEYWORDS):
         implied_period = "FULL_MATCH"
-    if any(p in up for p in ["FIRST HALF", "1ST HALF", "PRIMO TEMPO", "1 TEMPO", "1T"]):
+    if not up_hits.isdisjoint(_FIRST_HALF_KEYWORDS):
         implied_period = implied_period or "FIRST_HALF"
-    if any(
-        p in up for p in ["SECOND HALF", "2ND HALF", "SECONDO TEMPO", "2 TEMPO", "2T"]
-    ):
+    if not up_hits.isdisjoint(_SECOND_HALF_KEYWORDS):
         implied_period = implied_period or "SECOND_HALF"
 
-    # Normalize by removing decimals to make patterns robust
-    up_simplified = re.sub(r"[0-9]+[\.,]?[0-9]*", " ", up)
-
-    def has_ou() -> bool:
-        return any(
-            token in up_simplified
-            for token in ["OVER/UNDER", "UNDER/OVER", "O/U", "PESTE/SUB", "SUB/PESTE"]
-        )
-
-    def any_in(s: str, candidates: List[str]) -> bool:
-        return any(c in s for c in candidates)
-
-    def has_team_indicator(*, home: bool) -> bool:
-        base_tokens = (
-            ["HOME", "TEAM A", "CASA", "SQUADRA CASA", "ACASA", "GAZDA", "ECHIPA GAZDA"]
-            if home
-            else ["AWAY", "TEAM B", "OSPITE", "TRASFERTA", "SQUADRA OSPITE", "DEPLASARE", "OASPETE", "ECHIPA OASPETE"]
-        )
-        dynamic_tokens = home_tokens if home else away_tokens
-        tokens = base_tokens + dynamic_tokens
-        return any_in(search_text, tokens)
-
-    def has_threshold_language() -> bool:
-        return any_in(
-            up,
-            [
-                " OVER",
-                "UNDER",
-                " PIU",
-                " PIU'",
-                " PI\u00D9",
-                " MENO",
-                " OR MORE",
-                " OR LESS",
-                " +",
-                " -",
-                " PESTE",
-                " SUB",
-            ],
-        )
-
-    def has_even_odd_tokens() -> bool:
-        return any_in(up_simplified, ["PARI", "DISPARI", "ODD", "EVEN"])
-
-    goals_keywords = ["GOALS", "GOAL", "GOL", "GOLS", "GOLURI"]
+    has_ou = not simplified_hits.isdisjoint(_OU_KEYWORDS)
+    has_threshold_language = not up_hits.isdisjoint(_THRESHOLD_KEYWORDS)
+    goals = not simplified_hits.isdisjoint(_GOALS_KEYWORDS)
+    corners = not simplified_hits.isdisjoint(_CORNERS_KEYWORDS)
+    cards = not simplified_hits.isdisjoint(_CARDS_KEYWORDS)
+    shots_on_target = not simplified_hits.isdisjoint(_SHOTS_ON_TARGET_KEYWORDS)
+    shots = not simplified_hits.isdisjoint(_SHOTS_KEYWORDS)
 
     # Goals O/U (total and team)
-    if has_ou() and any_in(up_simplified, goals_keywords):
-        if has_team_indicator(home=True) and not has_team_indicator(home=False):
+    if has_ou and goals:
+        if home_only:
             return "HOME_TEAM_TOTAL_GOALS_OVER_UNDER", implied_period
-        if has_team_indicator(home=False) and not has_team_indicator(home=True):
+        if away_only:
             return "AWAY_TEAM_TOTAL_GOALS_OVER_UNDER", implied_period
         return "TOTAL_GOALS_OVER_UNDER", implied_period
 
-    corners_keywords = ["CORNERS", "CORNER", "CALCI D'ANGOLO", "ANGOLI", "CORNERE", "LOVITURI DE COLT"]
-
     # Corners O/U (total + team)
-    if has_ou() and any_in(up_simplified, corners_keywords):
-        if has_team_indicator(home=True) and not has_team_indicator(home=False):
+    if has_ou and corners:
+        if home_only:
             return "HOME_TEAM_TOTAL_CORNERS_OVER_UNDER", implied_period
-        if has_team_indicator(home=False) and not has_team_indicator(home=True):
+        if away_only:
             return "AWAY_TEAM_TOTAL_CORNERS_OVER_UNDER", implied_period
         return "TOTAL_CORNERS_OVER_UNDER", implied_period
 
-    # Team-specific corners (detect even without explicit "over/under")
-    if any_in(up_simplified, corners_keywords) and has_threshold_language():
-        if has_team_indicator(home=True) and not has_team_indicator(home=False):
+    # Corners with "over"/"under" wording; a label naming both sides counts as home
+    if corners and has_threshold_language:
+        if home:
             return "HOME_TEAM_TOTAL_CORNERS_OVER_UNDER", implied_period
-        if has_team_indicator(home=False) and not has_team_indicator(home=True):
-            return "AWAY_TEAM_TOTAL_CORNERS_OVER_UNDER", implied_period
-
-    # If label explicitly mentions corners with team indicators plus "over"/"under" wording
-    if any_in(up_simplified, corners_keywords) and has_threshold_language():
-        if has_team_indicator(home=True):
-            return "HOME_TEAM_TOTAL_CORNERS_OVER_UNDER", implied_period
-        if has_team_indicator(home=False):
+        if away:
             return "AWAY_TEAM_TOTAL_CORNERS_OVER_UNDER", implied_period
         return "TOTAL_CORNERS_OVER_UNDER", implied_period
 
     # Cards O/U
-    if has_ou() and any_in(up_simplified, ["CARDS", "CARD", "CARTELLINI", "AMMONIZIONI", "BOOKINGS", "CARTONASE", "CARTONAS"]):
+    if has_ou and cards:
         return "TOTAL_CARDS_OVER_UNDER", implied_period
 
     # Shots on target O/U (total + team detection)
-    shots_on_target_keywords = ["SHOTS ON TARGET", "SOT", "TIRI IN PORTA", "SUTURI PE POARTA"]
-    if (has_ou() or has_threshold_language()) and any_in(up_simplified, shots_on_target_keywords):
-        home_flag = has_team_indicator(home=True)
-        away_flag = has_team_indicator(home=False)
-        if home_flag and not away_flag:
+    if (has_ou or has_threshold_language) and shots_on_target:
+        if home_only:
             return "HOME_TEAM_TOTAL_SHOTS_ON_TARGET_OVER_UNDER", implied_period
-        if away_flag and not home_flag:
+        if away_only:
             return "AWAY_TEAM_TOTAL_SHOTS_ON_TARGET_OVER_UNDER", implied_period
         return "TOTAL_SHOTS_ON_TARGET_OVER_UNDER", implied_period
 
     # Team-specific shots on target mention even without explicit threshold tokens (e.g., "by Nantes")
-    if any_in(up_simplified, shots_on_target_keywords):
-        home_flag = has_team_indicator(home=True)
-        away_flag = has_team_indicator(home=False)
-        if home_flag and not away_flag:
+    if shots_on_target:
+        if home_only:
             return "HOME_TEAM_TOTAL_SHOTS_ON_TARGET_OVER_UNDER", implied_period
-        if away_flag and not home_flag:
+        if away_only:
             return "AWAY_TEAM_TOTAL_SHOTS_ON_TARGET_OVER_UNDER", implied_period
 
     # Shots O/U (generic totals + team)
-    shots_keywords = ["SHOTS", "TIRI", "SUTURI"]
-    if (has_ou() or has_threshold_language()) and any_in(up_simplified, shots_keywords):
-        home_flag = has_team_indicator(home=True)
-        away_flag = has_team_indicator(home=False)
-        if home_flag and not away_flag:
+    if (has_ou or has_threshold_language) and shots:
+        if home_only:
             return "HOME_TEAM_TOTAL_SHOTS_OVER_UNDER", implied_period
-        if away_flag and not home_flag:
+        if away_only:
             return "AWAY_TEAM_TOTAL_SHOTS_OVER_UNDER", implied_period
         return "TOTAL_SHOTS_OVER_UNDER", implied_period
 
     # Team-specific shots mention even without explicit threshold text
-    if any_in(up_simplified, shots_keywords):
-        home_flag = has_team_indicator(home=True)
-        away_flag = has_team_indicator(home=False)
-        if home_flag and not away_flag:
+    if shots:
+        if home_only:
             return "HOME_TEAM_TOTAL_SHOTS_OVER_UNDER", implied_period
-        if away_flag and not home_flag:
+        if away_only:
             return "AWAY_TEAM_TOTAL_SHOTS_OVER_UNDER", implied_period
 
     # --- Team-specific CARDS O/U (detect even without explicit 'O/U' if threshold language appears)
-    cards_keywords = ["CARDS", "CARD", "CARTELLINI", "AMMONIZIONI", "BOOKINGS", "CARTONASE", "CARTONAS"]
-    if any_in(up_simplified, cards_keywords) and has_threshold_language():
-        if has_team_indicator(home=True) and not has_team_indicator(home=False):
+    if cards and has_threshold_language:
+        if home_only:
             return "HOME_TEAM_TOTAL_CARDS_OVER_UNDER", implied_period
-        if has_team_indicator(home=False) and not has_team_indicator(home=True):
+        if away_only:
             return "AWAY_TEAM_TOTAL_CARDS_OVER_UNDER", implied_period
 
     # Team-specific GOALS O/U
-    if has_even_odd_tokens():
-        if any_in(up_simplified, corners_keywords):
+    if not simplified_hits.isdisjoint(_EVEN_ODD_KEYWORDS):
+        if corners:
             return "TOTAL_CORNERS_EVEN_ODD", implied_period
-        if any_in(up_simplified, goals_keywords):
-            if has_team_indicator(home=True) and not has_team_indicator(home=False):
+        if goals:
+            if home_only:
                 return "HOME_TEAM_GOALS_EVEN_ODD", implied_period
-            if has_team_indicator(home=False) and not has_team_indicator(home=True):
+            if away_only:
                 return "AWAY_TEAM_GOALS_EVEN_ODD", implied_period
             return "TOTAL_GOALS_EVEN_ODD", implied_period
 
     # OFFSIDES O/U (total + team)
-    offsides_keywords = ["OFFSIDES", "FUORIGIOCO", "OFFSIDE", "OFSAID", "OFSAIT"]
-    if has_ou() and any_in(up_simplified, offsides_keywords):
-        if has_team_indicator(home=True) and not has_team_indicator(home=False):
+    if has_ou and not simplified_hits.isdisjoint(_OFFSIDES_KEYWORDS):
+        if home_only:
             return "HOME_TEAM_TOTAL_OFFSIDES_OVER_UNDER", implied_period
-        if has_team_indicator(home=False) and not has_team_indicator(home=True):
+        if away_only:
             return "AWAY_TEAM_TOTAL_OFFSIDES_OVER_UNDER", implied_period
         return "TOTAL_OFFSIDES_OVER_UNDER", implied_period
 
     # FOULS O/U (total + team)
-    fouls_keywords = ["FOULS", "FALLI", "FAULT", "FAULTURI"]
-    if has_ou() and any_in(up_simplified, fouls_keywords):
-        if has_team_indicator(home=True) and not has_team_indicator(home=False):
+    if has_ou and not simplified_hits.isdisjoint(_FOULS_KEYWORDS):
+        if home_only:
             return "HOME_TEAM_TOTAL_FOULS_OVER_UNDER", implied_period
-        if has_team_indicator(home=False) and not has_team_indicator(home=True):
+        if away_only:
             return "AWAY_TEAM_TOTAL_FOULS_OVER_UNDER", implied_period
         return "TOTAL_FOULS_OVER_UNDER", implied_period
 
     # Team "to score" / "no goal" using explicit team name or side wording
-    if any_in(search_text, [" TO SCORE", " SEGNA ", " MARCHEAZA", " INSCRIE "]):
-        home_flag = has_team_indicator(home=True)
-        away_flag = has_team_indicator(home=False)
-        if home_flag and not away_flag:
-            return "HOME_TEAM_TO_SCORE", implied_period
-        if away_flag and not home_flag:
-            return "AWAY_TEAM_TO_SCORE", implied_period
-
-    if any_in(
-        up_simplified,
-        [" NO GOAL", " NO GOL", " DOES NOT SCORE", " DOESN'T SCORE", " DOESNT SCORE", " NU MARCHEAZA", " NU INSCRIE"],
+    if not search_hits.isdisjoint(_TO_SCORE_KEYWORDS) or not simplified_hits.isdisjoint(
+        _NO_GOAL_KEYWORDS
     ):
-        home_flag = has_team_indicator(home=True)
-        away_flag = has_team_indicator(home=False)
-        if home_flag and not away_flag:
+        if home_only:
             return "HOME_TEAM_TO_SCORE", implied_period
-        if away_flag and not home_flag:
+        if away_only:
             return "AWAY_TEAM_TO_SCORE", implied_period
 
-    # Team Yes/No props (no O/U)
-    if any_in(up_simplified, ["HOME TEAM TO SCORE", "TEAM A TO SCORE", "SEGNA CASA", "ECHIPA GAZDA MARCHEAZA", "GAZDA MARCHEAZA", "ECHIPA GAZDA INSCRIE", "GAZDA INSCRIE"]):
-        return "HOME_TEAM_TO_SCORE", implied_period
-    if any_in(up_simplified, ["AWAY TEAM TO SCORE", "TEAM B TO SCORE", "SEGNA OSPITE", "ECHIPA OASPETE MARCHEAZA", "OASPETE MARCHEAZA", "ECHIPA OASPETE INSCRIE", "OASPETE INSCRIE"]):
-        return "AWAY_TEAM_TO_SCORE", implied_period
-    if any_in(up_simplified, ["HOME CLEAN SHEET", "PORTA INVIOLATA CASA", "GAZDA NU PRIMESTE GOL", "ECHIPA GAZDA NU PRIMESTE GOL"]):
-        return "HOME_TEAM_CLEAN_SHEET", implied_period
-    if any_in(up_simplified, ["AWAY CLEAN SHEET", "PORTA INVIOLATA OSPITE", "OASPETE NU PRIMESTE GOL", "ECHIPA OASPETE NU PRIMESTE GOL"]):
-        return "AWAY_TEAM_CLEAN_SHEET", implied_period
-    if any_in(up_simplified, ["HOME RED CARD", "CARTELLINO ROSSO CASA", "GAZDA CARTONAS ROSU", "ECHIPA GAZDA CARTONAS ROSU"]):
-        return "HOME_TEAM_RED_CARD", implied_period
-    if any_in(up_simplified, ["AWAY RED CARD", "CARTELLINO ROSSO OSPITE", "OASPETE CARTONAS ROSU", "ECHIPA OASPETE CARTONAS ROSU"]):
-        return "AWAY_TEAM_RED_CARD", implied_period
-
-    # Yes/No popular markets (without explicit O/U)
-    if any_in(up_simplified, ["CARTELLINO ROSSO", "ESPULSIONE", "RED CARD", "CARTONAS ROSU", "ELIMINARE"]):
-        return "RED_CARD_AWARDED", implied_period
-    if any_in(up_simplified, ["CALCIO DI RIGORE", "RIGORE", "PENALTY IN MATCH", "PENALTY AWARDED", "PENALTY", "PENALTI"]):
-        return "PENALTY_AWARDED", implied_period
-    if any_in(up_simplified, ["BTTS", "BOTH TEAMS TO SCORE", "ENTRAMBE LE SQUADRE SEGNANO", "GOAL/NOGOAL", "GOL/NOGOL", "AMBELE MARCHEAZA", "AMBELE ECHIPE MARCHEAZA"]):
-        return "BOTH_TEAMS_TO_SCORE", implied_period
-
-    # Team two-way
-    if any_in(up_simplified, ["DOUBLE CHANCE", "DOPPIA CHANCE"]):
-        return "DOUBLE_CHANCE", implied_period
-    if any_in(up_simplified, ["DRAW NO BET", "DNB", "PAREGGIO NESSUNA SCOMMESSA", "PAREGGIO RIMBORSO"]):
-        return "DRAW_NO_BET", implied_period
-    if any_in(up_simplified, ["ASIAN HANDICAP", "HANDICAP ASIATICO", "HANDICAP"]):
-        return "ASIAN_HANDICAP", implied_period
+    # Team Yes/No props, Yes/No popular markets, two-way and tennis winners
+    for code, keywords in _KEYWORD_MARKETS:
+        if not simplified_hits.isdisjoint(keywords):
+            return code, implied_period
 
     # Tennis
-    if any_in(up_simplified, ["MATCH WINNER", "TO WIN MATCH", "MONEYLINE", "VINCENTE INCONTRO", "VINCENTE PARTITA"]):
-        return "MATCH_WINNER", implied_period
-    if has_ou() and any_in(up_simplified, ["TOTAL GAMES", "GAMES", "GIOCHI"]):
+    if has_ou and not simplified_hits.isdisjoint(_GAMES_KEYWORDS):
         return "TOTAL_GAMES_OVER_UNDER", implied_period
 
     # Fallback to synonym substrings
+    synonym_hits = _SYNONYM_MATCHER.hits(up)
     for needle, code, syn_period in MARKET_SYNONYMS:
-        if needle in up:
+        if needle in synonym_hits:
             return code, syn_period or implied_period
 
     return None, implied_period
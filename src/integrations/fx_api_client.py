@@ -11,7 +11,7 @@ from typing import Dict, Optional
 from urllib.parse import urlencode, urljoin
 
 from src.core.config import Config
-from src.services.fx_manager import store_fx_rate, format_timestamp_utc
+from src.services.fx_manager import store_fx_rates_bulk, format_timestamp_utc
 
 logger = structlog.get_logger()
 
@@ -126,29 +126,15 @@ class FXAPIClient:
         """
         Store fetched FX rates in the database.
 
+        The whole rate set is written in one transaction.
+
         Args:
             rates: Dictionary mapping currency codes to EUR rates
             source: Source of the rates
         """
         timestamp = format_timestamp_utc()
-
-        for currency, rate in rates.items():
-            try:
-                store_fx_rate(
-                    currency=currency,
-                    rate_to_eur=rate,
-                    fetched_at_utc=timestamp,
-                    source=source,
-                )
-            except Exception as e:
-                logger.error(
-                    "fx_rate_store_failed",
-                    currency=currency,
-                    rate=str(rate),
-                    error=str(e),
-                )
-
-        logger.info("fx_rates_stored", source=source, count=len(rates), timestamp=timestamp)
+        count = store_fx_rates_bulk(rates, fetched_at_utc=timestamp, source=source)
+        logger.info("fx_rates_stored", source=source, count=count, timestamp=timestamp)
 
     async def fetch_and_store_rates(self) -> bool:
         """
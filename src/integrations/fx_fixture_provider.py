@@ -0,0 +1,91 @@
+"""
+Local FX rate fixture provider for the Surebet Accounting System.
+
+Serves historical rate sets from a file instead of the external API, so
+``fx_rates_daily`` can be backfilled over date ranges offline. Two layouts
+are accepted, both holding rates to EUR (EUR per 1 unit of currency):
+
+- JSON: ``{"2025-01-02": {"GBP": "1.19", "USD": "0.96"}, ...}``
+- CSV: a header row with ``date,currency_code,rate_to_eur`` columns
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class FXFixtureProvider:
+    """Rate sets keyed by date, loaded from a JSON or CSV fixture file."""
+
+    def __init__(self, path: str | Path):
+        """
+        Load the fixture file.
+
+        Args:
+            path: JSON or CSV fixture (chosen by file suffix)
+
+        Raises:
+            ValueError: If the file layout or a rate is invalid
+        """
+        self.path = Path(path)
+        if self.path.suffix.lower() == ".csv":
+            raw = self._read_csv(self.path)
+        else:
+            raw = self._read_json(self.path)
+
+        self._rates: Dict[str, Dict[str, Decimal]] = {}
+        for day, currencies in raw.items():
+            rate_date = date.fromisoformat(str(day)[:10]).isoformat()
+            rates: Dict[str, Decimal] = {}
+            for currency, rate in currencies.items():
+                try:
+                    rates[currency.upper()] = Decimal(str(rate))
+                except InvalidOperation as exc:
+                    raise ValueError(
+                        f"Invalid rate {rate!r} for {currency} on {rate_date} in {self.path}"
+                    ) from exc
+            self._rates[rate_date] = rates
+
+        logger.info("fx_fixture_loaded", path=str(self.path), dates=len(self._rates))
+
+    @property
+    def source(self) -> str:
+        return f"fixture:{self.path.name}"
+
+    def dates(self) -> List[str]:
+        """Fixture dates in ascending order."""
+        return sorted(self._rates)
+
+    def rates_for(self, rate_date: date) -> Optional[Dict[str, Decimal]]:
+        """Return the rate set for ``rate_date``, or None when the fixture has no entry."""
+        rates = self._rates.get(rate_date.isoformat())
+        return dict(rates) if rates is not None else None
+
+    @staticmethod
+    def _read_json(path: Path) -> Dict[str, Dict[str, object]]:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(data, dict) or not all(isinstance(v, dict) for v in data.values()):
+            raise ValueError(f"FX fixture {path} must map dates to currency rate objects")
+        return data
+
+    @staticmethod
+    def _read_csv(path: Path) -> Dict[str, Dict[str, object]]:
+        data: Dict[str, Dict[str, object]] = defaultdict(dict)
+        with path.open(newline="", encoding="utf-8") as handle:
+            reader = csv.DictReader(handle)
+            missing = {"date", "currency_code", "rate_to_eur"} - set(reader.fieldnames or ())
+            if missing:
+                raise ValueError(f"FX fixture {path} is missing columns: {sorted(missing)}")
+            for row in reader:
+                data[row["date"]][row["currency_code"]] = row["rate_to_eur"]
+        return data
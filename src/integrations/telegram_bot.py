@@ -40,6 +40,7 @@ from telegram.ext import (
     ContextTypes,
 )
 
+from src.core import telemetry
 from src.core.config import Config
 from src.core.database import get_db_connection
 from src.services.bookmaker_balance_service import BookmakerBalanceService
@@ -254,6 +255,7 @@ class TelegramBot:
         Returns:
             Wrapped handler with rate limiting
         """
+        timing_label = f"telegram.{getattr(handler, '__name__', 'handler').lstrip('_')}"
 
         async def wrapped(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
             user = update.effective_user
@@ -280,7 +282,8 @@ class TelegramBot:
 
                 self._user_last_command[user_id] = current_time
 
-            await handler(update, context)
+            with telemetry.timed(timing_label, source="bot"):
+                await handler(update, context)
 
         return wrapped
 
@@ -0,0 +1,91 @@
+"""
+Cold ledger archive job.
+
+Moves ledger, bet and audit rows covered by a closed period into
+``archive_YYYY.db`` files next to the hot database. ``--verify`` checks the
+archives against the manifest and exits non-zero on any problem.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Optional
+
+from src.core.telemetry import timed
+from src.services.ledger_archive_service import LedgerArchiveService
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def archive_period(
+    period_end_utc: str,
+    *,
+    archive_dir: Optional[str] = None,
+    dry_run: bool = False,
+    vacuum: bool = False,
+) -> None:
+    """Archive one closed period and optionally compact the hot database."""
+    service = LedgerArchiveService(archive_dir=archive_dir)
+    try:
+        result = service.archive_period(period_end_utc, dry_run=dry_run)
+        if vacuum and not dry_run and result.total_rows:
+            service.vacuum()
+    finally:
+        service.close()
+
+
+def verify_archives(archive_dir: Optional[str] = None) -> int:
+    """Verify archives against the manifest; returns the number of problems."""
+    service = LedgerArchiveService(archive_dir=archive_dir)
+    try:
+        problems = service.verify_archives()
+    finally:
+        service.close()
+    for problem in problems:
+        logger.warning("ledger_archive_problem", **problem)
+    return len(problems)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Archive or verify cold ledger rows.")
+    parser.add_argument(
+        "--period-end",
+        help="Closed UTC period end to archive through, e.g. 2025-10-31T23:59:59Z",
+    )
+    parser.add_argument("--archive-dir", help="Directory for archive_YYYY.db files")
+    parser.add_argument("--dry-run", action="store_true", help="Only count rows that would move")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM the hot database afterwards")
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Check archives against the manifest instead of archiving",
+    )
+    args = parser.parse_args()
+    if not args.verify and not args.period_end:
+        parser.error("--period-end is required unless --verify is given")
+    return args
+
+
+@timed("job.archive_ledger")
+def main() -> None:
+    args = _parse_args()
+    try:
+        if args.verify:
+            if verify_archives(args.archive_dir):
+                sys.exit(2)
+        else:
+            archive_period(
+                args.period_end,
+                archive_dir=args.archive_dir,
+                dry_run=args.dry_run,
+                vacuum=args.vacuum,
+            )
+    except Exception as exc:  # pragma: no cover - ensures job surfaces failure
+        logger.error("archive_ledger_job_failed", error=str(exc))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+One-time delta provenance backfill job.
+
+Reconstructs ``surebet_settlement_links`` rows for historical settlements
+whose ledger entries predate provenance tracking, then records a completion
+marker so the provenance views never have to scan for missing links.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Optional
+
+from src.core.telemetry import timed
+from src.services.delta_provenance_service import DeltaProvenanceService
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def backfill_delta_provenance(force: bool = False) -> Optional[int]:
+    """Run the link backfill unless its completion marker already exists."""
+    service = DeltaProvenanceService()
+    try:
+        created = service.run_link_backfill(force=force)
+    finally:
+        service.db.close()
+    if created is None:
+        logger.info("delta_provenance_backfill_already_complete")
+    else:
+        logger.info("delta_provenance_backfill_job_completed", links_created=created)
+    return created
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Backfill missing delta provenance links.")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-run the backfill even if it has already completed",
+    )
+    return parser.parse_args()
+
+
+@timed("job.backfill_delta_provenance")
+def main() -> None:
+    args = _parse_args()
+    try:
+        backfill_delta_provenance(force=args.force)
+    except Exception as exc:  # pragma: no cover - ensures job surfaces failure
+        logger.error("delta_provenance_backfill_job_failed", error=str(exc))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Historical FX rate backfill job.
+
+Writes one rate set per day of a date range into ``fx_rates_daily`` from a
+local fixture file (see ``src.integrations.fx_fixture_provider``). Each day
+is stored in a single transaction; days the fixture does not cover (weekends,
+bank holidays) are skipped and resolve through the as-of lookup instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import List, Optional
+
+from src.core.database import get_db_connection
+from src.core.telemetry import timed
+from src.integrations.fx_fixture_provider import FXFixtureProvider
+from src.services.fx_manager import store_fx_rates_bulk
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class FXBackfillResult:
+    """Summary of a backfill run."""
+
+    days_written: int = 0
+    rates_written: int = 0
+    missing_dates: List[str] = field(default_factory=list)
+
+
+def backfill_fx_rates(
+    provider: FXFixtureProvider,
+    start: date,
+    end: date,
+    conn: Optional[sqlite3.Connection] = None,
+) -> FXBackfillResult:
+    """Store the provider's rate set for every day from ``start`` to ``end`` inclusive."""
+    if end < start:
+        raise ValueError(f"Backfill end {end} is before start {start}")
+
+    should_close = conn is None
+    conn = conn or get_db_connection()
+    result = FXBackfillResult()
+    try:
+        day = start
+        while day <= end:
+            rates = provider.rates_for(day)
+            if rates:
+                result.rates_written += store_fx_rates_bulk(
+                    rates,
+                    fetched_at_utc=f"{day.isoformat()}T00:00:00Z",
+                    source=provider.source,
+                    conn=conn,
+                )
+                result.days_written += 1
+            else:
+                result.missing_dates.append(day.isoformat())
+            day += timedelta(days=1)
+    finally:
+        if should_close:
+            conn.close()
+
+    logger.info(
+        "fx_backfill_completed",
+        start=start.isoformat(),
+        end=end.isoformat(),
+        days_written=result.days_written,
+        rates_written=result.rates_written,
+        missing_days=len(result.missing_dates),
+    )
+    return result
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Backfill historical FX rates from a fixture.")
+    parser.add_argument("--fixture", required=True, help="JSON or CSV rate fixture file")
+    parser.add_argument("--start", type=date.fromisoformat, help="First day (default: fixture start)")
+    parser.add_argument("--end", type=date.fromisoformat, help="Last day (default: fixture end)")
+    return parser.parse_args()
+
+
+@timed("job.backfill_fx_rates")
+def main() -> None:
+    args = _parse_args()
+    try:
+        provider = FXFixtureProvider(args.fixture)
+        dates = provider.dates()
+        if not dates:
+            logger.warning("fx_backfill_empty_fixture", fixture=args.fixture)
+            return
+        start = args.start or date.fromisoformat(dates[0])
+        end = args.end or date.fromisoformat(dates[-1])
+        backfill_fx_rates(provider, start, end)
+    except Exception as exc:  # pragma: no cover - ensures job surfaces failure
+        logger.error("fx_backfill_job_failed", error=str(exc))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Accounting period close job.
+
+Snapshots every associate's statement balances as of a period end into
+``period_closing_balances`` so later statements start from the checkpoint.
+``--verify`` recomputes all checkpoints from the ledger and exits non-zero
+if any disagree.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Optional
+
+from src.core.telemetry import timed
+from src.services.period_close_service import PeriodCloseService
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def close_period(period_end_utc: str, associate_id: Optional[int] = None) -> None:
+    """Close the period for one or all associates."""
+    service = PeriodCloseService()
+    try:
+        service.close_period(period_end_utc, associate_id=associate_id, closed_by="close_period_job")
+    finally:
+        service.close()
+
+
+def verify_periods(associate_id: Optional[int] = None) -> int:
+    """Verify stored checkpoints; returns the number of mismatches."""
+    service = PeriodCloseService()
+    try:
+        mismatches = service.verify_checkpoints(associate_id)
+    finally:
+        service.close()
+    for mismatch in mismatches:
+        logger.warning("period_checkpoint_mismatch", **mismatch)
+    return len(mismatches)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Close or verify accounting periods.")
+    parser.add_argument(
+        "--period-end",
+        help="Inclusive UTC period end to close, e.g. 2025-10-31T23:59:59Z",
+    )
+    parser.add_argument("--associate-id", type=int, help="Limit to a single associate")
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Recompute stored checkpoints from the ledger instead of closing",
+    )
+    args = parser.parse_args()
+    if not args.verify and not args.period_end:
+        parser.error("--period-end is required unless --verify is given")
+    return args
+
+
+@timed("job.close_period")
+def main() -> None:
+    args = _parse_args()
+    try:
+        if args.verify:
+            if verify_periods(args.associate_id):
+                sys.exit(2)
+        else:
+            close_period(args.period_end, associate_id=args.associate_id)
+    except Exception as exc:  # pragma: no cover - ensures job surfaces failure
+        logger.error("close_period_job_failed", error=str(exc))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Canonical event dedup job.
+
+Finds near-duplicate canonical events (same sport, same pair_key or
+near-identical names, kickoffs within the dedup window) and merges each
+cluster into its oldest event. Bets and surebets are repointed and the merged
+IDs are kept in ``canonical_event_aliases``. Verified bets on the surviving
+events are then re-run through surebet matching. ``--dry-run`` only logs the
+clusters.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from src.core.telemetry import timed
+from src.services.event_dedup_service import DedupResult, EventDedupService
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def dedupe_events(*, dry_run: bool = False, workers: int = -1) -> DedupResult:
+    """Run one dedup pass over ``canonical_events``."""
+    service = EventDedupService(workers=workers)
+    try:
+        result = service.dedupe(dry_run=dry_run)
+    finally:
+        service.close()
+    for cluster in result.clusters:
+        logger.info(
+            "canonical_event_duplicate_cluster",
+            survivor_id=cluster.survivor_id,
+            merged_ids=cluster.merged_ids,
+            dry_run=dry_run,
+        )
+    return result
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Merge duplicate canonical events.")
+    parser.add_argument("--dry-run", action="store_true", help="Only report duplicate clusters")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=-1,
+        help="Scoring threads for rapidfuzz.process.cdist (-1 uses every core)",
+    )
+    return parser.parse_args()
+
+
+@timed("job.dedupe_events")
+def main() -> None:
+    args = _parse_args()
+    try:
+        dedupe_events(dry_run=args.dry_run, workers=args.workers)
+    except Exception as exc:  # pragma: no cover - ensures job surfaces failure
+        logger.error("dedupe_events_job_failed", error=str(exc))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
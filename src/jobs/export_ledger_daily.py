@@ -3,6 +3,10 @@ Daily ledger export job.
 
 Runs the LedgerExportService to produce a styled Excel workbook so that
 automated backups match the manual export UI.
+
+With ``--incremental`` only the ledger rows added since the previous run are
+written (as a gzip CSV delta), and the deltas are periodically compacted into
+a full snapshot, so the nightly run scales with the day's activity.
 """
 
 from __future__ import annotations
@@ -11,16 +15,31 @@ import argparse
 import sys
 from typing import Optional
 
-from src.services.ledger_export_service import LedgerExportResult, LedgerExportService
+from src.core.telemetry import timed
+from src.jobs.runner import FAILED, LEDGER_EXPORT_JOB, JobRunner, JobSpec
+from src.services.ledger_delta_export_service import (
+    DEFAULT_COMPACT_EVERY,
+    LedgerDeltaExportResult,
+    LedgerDeltaExportService,
+)
+from src.services.ledger_export_service import (
+    EXPORT_FORMATS,
+    LedgerExportResult,
+    LedgerExportService,
+)
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
-def export_ledger(associate_id: Optional[int] = None) -> LedgerExportResult:
+def export_ledger(
+    associate_id: Optional[int] = None, export_format: str = "xlsx"
+) -> LedgerExportResult:
     """Run the ledger export and return metadata."""
     service = LedgerExportService()
-    result = service.export_full_ledger(associate_id=associate_id)
+    result = service.export_full_ledger(
+        associate_id=associate_id, export_format=export_format
+    )
     logger.info(
         "ledger_export_job_completed",
         file_path=result.file_path,
@@ -31,6 +50,34 @@ def export_ledger(associate_id: Optional[int] = None) -> LedgerExportResult:
     return result
 
 
+def export_ledger_incremental(
+    associate_id: Optional[int] = None,
+    compact_every: Optional[int] = DEFAULT_COMPACT_EVERY,
+    force_compact: bool = False,
+) -> LedgerDeltaExportResult:
+    """Export rows past the scope watermark and compact deltas when due."""
+    service = LedgerDeltaExportService()
+    try:
+        result = service.export_delta(
+            associate_id=associate_id, compact_every=compact_every
+        )
+        if force_compact:
+            snapshot = service.compact(associate_id=associate_id)
+            if snapshot is not None:
+                result.snapshot_path = str(snapshot)
+    finally:
+        service.close()
+    logger.info(
+        "ledger_incremental_export_job_completed",
+        file_path=result.file_path,
+        row_count=result.row_count,
+        through_entry_id=result.through_entry_id,
+        snapshot_path=result.snapshot_path,
+        scope=result.scope_key,
+    )
+    return result
+
+
 def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Generate styled ledger Excel exports.")
     parser.add_argument(
@@ -39,15 +86,48 @@ def _parse_args() -> argparse.Namespace:
         default=None,
         help="Optional associate ID to limit the export scope.",
     )
+    parser.add_argument(
+        "--format",
+        choices=EXPORT_FORMATS,
+        default="xlsx",
+        help="Output format; csv and csv.gz skip workbook styling for speed.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Export only rows added since the last run as a gzip CSV delta.",
+    )
+    parser.add_argument(
+        "--compact-every",
+        type=int,
+        default=DEFAULT_COMPACT_EVERY,
+        help="Merge deltas into a full snapshot once this many are pending (0 disables).",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Force compaction of pending deltas after an incremental run.",
+    )
     return parser.parse_args()
 
 
+@timed("job.export_ledger_daily")
 def main() -> None:
     args = _parse_args()
-    try:
-        export_ledger(associate_id=args.associate_id)
-    except Exception as exc:  # pragma: no cover - ensures job surfaces failure
-        logger.error("ledger_export_job_failed", error=str(exc))
+
+    def _export() -> int:
+        if args.incremental:
+            return export_ledger_incremental(
+                associate_id=args.associate_id,
+                compact_every=args.compact_every or None,
+                force_compact=args.compact,
+            ).row_count
+        return export_ledger(associate_id=args.associate_id, export_format=args.format).row_count
+
+    # Shares the nightly pipeline's lock, so overlapping starts are skipped
+    result = JobRunner().run_job(JobSpec(LEDGER_EXPORT_JOB, _export))
+    if result.status == FAILED:  # pragma: no cover - ensures job surfaces failure
+        logger.error("ledger_export_job_failed", error=result.error)
         sys.exit(1)
 
 
@@ -14,8 +14,11 @@ import structlog
 
 from src.core.config import Config
 from src.core.database import get_db_connection
+from src.core.telemetry import timed
 from src.integrations.fx_api_client import fetch_daily_fx_rates
+from src.jobs.runner import FX_REFRESH_JOB, SKIPPED, JobRunner, JobSpec
 from src.services.fx_manager import store_fx_rate, format_timestamp_utc
+from src.services.surebet_risk_recompute_service import SurebetRiskRecomputeService
 
 # Configure structured logging
 structlog.configure(
@@ -86,18 +89,22 @@ def insert_sample_fx_rates() -> None:
 
 async def update_fx_rates_daily() -> bool:
     """
-    Update FX rates from external API.
+    Update FX rates from external API, then recompute open surebet risk for
+    the currencies whose rates changed.
 
     Returns:
         True if successful, False otherwise
     """
     logger.info("fx_rate_update_started")
 
+    risk_service = SurebetRiskRecomputeService()
     try:
+        rates_before = risk_service.snapshot_rates()
         success = await fetch_daily_fx_rates()
 
         if success:
             logger.info("fx_rate_update_completed_successfully")
+            recompute_risk_after_fx_update(risk_service, rates_before)
         else:
             logger.error("fx_rate_update_failed")
 
@@ -106,8 +113,27 @@ async def update_fx_rates_daily() -> bool:
     except Exception as e:
         logger.error("fx_rate_update_exception", error=str(e), exc_info=True)
         return False
+    finally:
+        risk_service.close()
+
+
+def recompute_risk_after_fx_update(
+    risk_service: SurebetRiskRecomputeService, rates_before: dict
+) -> None:
+    """Refresh stale surebet risk; a failure here must not fail the FX update."""
+    try:
+        result = risk_service.recompute_changed_rates(rates_before)
+        logger.info(
+            "fx_rate_update_risk_recomputed",
+            currencies=result.currencies,
+            updated=len(result.updated),
+            classification_changes=len(result.classification_changes),
+        )
+    except Exception as e:
+        logger.error("fx_rate_update_risk_recompute_failed", error=str(e))
 
 
+@timed("job.fetch_fx_rates")
 def main() -> None:
     """
     Main entry point for the FX rate update job.
@@ -115,7 +141,7 @@ def main() -> None:
     This function:
     1. Validates configuration
     2. Inserts sample rates if requested
-    3. Fetches and stores latest rates from API
+    3. Fetches and stores latest rates from API (single-instance, recorded in job_runs)
     """
     # Validate configuration
     try:
@@ -130,10 +156,16 @@ def main() -> None:
         insert_sample_fx_rates()
         return
 
-    # Update rates from API
-    success = asyncio.run(update_fx_rates_daily())
+    # Update rates from API; the shared lock keeps cron and the nightly
+    # pipeline from refreshing at the same time
+    def _update() -> None:
+        if not asyncio.run(update_fx_rates_daily()):
+            raise RuntimeError("FX rate update failed")
 
-    if not success:
+    result = JobRunner().run_job(JobSpec(FX_REFRESH_JOB, _update))
+    if result.status == SKIPPED:
+        return
+    if not result.ok:
         logger.error("fx_rate_update_job_failed")
         sys.exit(1)
 
@@ -0,0 +1,68 @@
+"""
+Counterparty delta matrix rebuild/verify job.
+
+``counterparty_delta`` is maintained incrementally by a trigger on
+``surebet_settlement_links``. This job re-aggregates the links to check the
+matrix for drift (``--verify``) or to recompute it from scratch.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Dict, List
+
+from src.core.telemetry import timed
+from src.services.delta_provenance_service import DeltaProvenanceService
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def verify_counterparty_delta() -> List[Dict]:
+    """Return matrix rows that disagree with the settlement links."""
+    service = DeltaProvenanceService()
+    try:
+        return service.verify_counterparty_deltas()
+    finally:
+        service.db.close()
+
+
+def rebuild_counterparty_delta() -> int:
+    """Recompute the matrix and return the number of pairs written."""
+    service = DeltaProvenanceService()
+    try:
+        return service.rebuild_counterparty_deltas()
+    finally:
+        service.db.close()
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild or verify the counterparty delta matrix.")
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Only report mismatches; exit non-zero if any are found",
+    )
+    return parser.parse_args()
+
+
+@timed("job.rebuild_counterparty_delta")
+def main() -> None:
+    args = _parse_args()
+    try:
+        if args.verify:
+            mismatches = verify_counterparty_delta()
+            for mismatch in mismatches:
+                logger.warning("counterparty_delta_mismatch", **mismatch)
+            if mismatches:
+                sys.exit(2)
+        else:
+            rebuild_counterparty_delta()
+    except Exception as exc:  # pragma: no cover - ensures job surfaces failure
+        logger.error("counterparty_delta_job_failed", error=str(exc))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
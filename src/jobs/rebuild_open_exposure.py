@@ -0,0 +1,59 @@
+"""
+Open-exposure tracker maintenance job.
+
+Recomputes the per-bet, per-bookmaker and per-surebet open stake tables from
+``bets`` (see ``ExposureService``). With ``--verify`` it only compares the
+tracker against a fresh recomputation and exits non-zero on drift, so it can
+run as a scheduled consistency check.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from src.core.telemetry import timed
+from src.services.exposure_service import ExposureService
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild or verify the open-exposure tracker.")
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Report discrepancies without rewriting the tracker",
+    )
+    return parser.parse_args()
+
+
+@timed("job.rebuild_open_exposure")
+def main() -> None:
+    args = _parse_args()
+    service = ExposureService()
+    try:
+        if args.verify:
+            discrepancies = service.verify()
+            for item in discrepancies[:50]:
+                logger.warning(
+                    "open_exposure_discrepancy",
+                    scope=item.scope,
+                    key=list(item.key),
+                    expected=item.expected,
+                    actual=item.actual,
+                )
+            if discrepancies:
+                sys.exit(1)
+        else:
+            service.rebuild()
+    except Exception as exc:  # pragma: no cover - ensures job surfaces failure
+        logger.error("open_exposure_job_failed", error=str(exc))
+        sys.exit(1)
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Batch surebet risk recompute job.
+
+Recomputes worst-case profit, ROI and risk classification for open surebets
+from current FX rates and writes back only the rows that changed. The FX job
+runs it automatically for the currencies whose rates moved; run it by hand
+with ``--currency`` to limit it, or without to sweep every open surebet.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import List, Optional
+
+from src.core.telemetry import timed
+from src.services.surebet_risk_recompute_service import (
+    RiskRecomputeResult,
+    SurebetRiskRecomputeService,
+)
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def recompute_surebet_risk(currencies: Optional[List[str]] = None) -> RiskRecomputeResult:
+    """Recompute open surebet risk, optionally limited to ``currencies``."""
+    service = SurebetRiskRecomputeService()
+    try:
+        return service.recompute(currencies)
+    finally:
+        service.close()
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Recompute risk metrics for open surebets.")
+    parser.add_argument(
+        "--currency",
+        action="append",
+        dest="currencies",
+        help="Only surebets with a leg in this currency (repeatable; default all)",
+    )
+    return parser.parse_args()
+
+
+@timed("job.recompute_surebet_risk")
+def main() -> None:
+    args = _parse_args()
+    try:
+        recompute_surebet_risk(args.currencies)
+    except Exception as exc:  # pragma: no cover - ensures job surfaces failure
+        logger.error("recompute_surebet_risk_job_failed", error=str(exc))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Bulk canonical event re-link job.
+
+Scores every incoming/verified bet without a canonical event against the
+event index, links the high-confidence matches in one transaction, writes a
+CSV review report for the medium-confidence ones and re-runs surebet matching
+for the newly linked bets. Run it after editing the team alias file or
+merging canonical events.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Optional
+
+from src.core.telemetry import timed
+from src.services.event_relink_service import EventRelinkService, RelinkResult
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def relink_events(
+    *,
+    dry_run: bool = False,
+    workers: int = -1,
+    report_dir: Optional[str] = None,
+) -> RelinkResult:
+    """Run one re-link pass over the unlinked bet backlog."""
+    service = EventRelinkService(workers=workers, report_dir=report_dir)
+    try:
+        return service.relink(dry_run=dry_run)
+    finally:
+        service.close()
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Re-link unlinked bets to canonical events.")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Write the review report (including would-be links) without linking",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=-1,
+        help="Scoring threads for rapidfuzz.process.cdist (-1 uses every core)",
+    )
+    parser.add_argument("--report-dir", help="Directory for the review CSV (default exports dir)")
+    return parser.parse_args()
+
+
+@timed("job.relink_events")
+def main() -> None:
+    args = _parse_args()
+    try:
+        relink_events(dry_run=args.dry_run, workers=args.workers, report_dir=args.report_dir)
+    except Exception as exc:  # pragma: no cover - ensures job surfaces failure
+        logger.error("relink_events_job_failed", error=str(exc))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
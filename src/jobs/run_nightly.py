@@ -0,0 +1,150 @@
+"""
+Nightly pipeline: FX refresh, risk recompute, ledger export and daily statements.
+
+Runs the jobs as a DAG through ``JobRunner``:
+
+- ``fx_refresh`` fetches the day's rates;
+- ``risk_recompute`` and ``daily_statements`` wait for it (statements quote
+  balances at the latest rates);
+- ``ledger_export`` writes the incremental ledger delta. It depends on nothing
+  and runs alongside the FX branch.
+
+Every job holds the same lock as its standalone entry point, so a cron or UI
+run already in progress is skipped rather than repeated. Each step is
+recorded in ``job_runs``. The job exits 1 when any step failed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence
+
+from src.core.telemetry import timed
+from src.integrations.fx_api_client import fetch_daily_fx_rates
+from src.jobs.export_ledger_daily import export_ledger_incremental
+from src.jobs.runner import (
+    DAILY_STATEMENTS_JOB,
+    FAILED,
+    FX_REFRESH_JOB,
+    LEDGER_EXPORT_JOB,
+    RISK_RECOMPUTE_JOB,
+    JobRunner,
+    JobSpec,
+)
+from src.services.daily_statement_service import DailyStatementSender
+from src.services.surebet_risk_recompute_service import SurebetRiskRecomputeService
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+PIPELINE_NAME = "nightly"
+
+
+def build_nightly_pipeline(skip: Sequence[str] = ()) -> List[JobSpec]:
+    """
+    Return the nightly job specs, leaving out the names in ``skip``.
+
+    A skipped job counts as satisfied for the jobs that depend on it.
+    """
+    # FX rates captured before the refresh, for the targeted risk recompute
+    state: Dict[str, Dict[str, Decimal]] = {}
+
+    def fx_refresh() -> Optional[int]:
+        risk_service = SurebetRiskRecomputeService()
+        try:
+            state["rates_before"] = risk_service.snapshot_rates()
+        finally:
+            risk_service.close()
+        if not asyncio.run(fetch_daily_fx_rates()):
+            raise RuntimeError("FX provider returned no rates")
+        return None
+
+    def risk_recompute() -> int:
+        service = SurebetRiskRecomputeService()
+        try:
+            rates_before = state.get("rates_before")
+            if rates_before is None:
+                result = service.recompute()
+            else:
+                result = service.recompute_changed_rates(rates_before)
+            return len(result.updated)
+        finally:
+            service.close()
+
+    def ledger_export() -> int:
+        return export_ledger_incremental().row_count
+
+    def daily_statements() -> int:
+        sender = DailyStatementSender()
+        try:
+            result = asyncio.run(sender.send_all())
+        finally:
+            sender.close()
+        if result.failed:
+            logger.warning("nightly_statements_partial", sent=result.sent, failed=result.failed)
+        return result.sent
+
+    specs = [
+        JobSpec(FX_REFRESH_JOB, fx_refresh, retries=2, backoff_seconds=60.0),
+        JobSpec(RISK_RECOMPUTE_JOB, risk_recompute, depends_on=(FX_REFRESH_JOB,), retries=1),
+        JobSpec(LEDGER_EXPORT_JOB, ledger_export, retries=1),
+        # No retries: a rerun would resend the statements that did go out; the
+        # sender already retries each message.
+        JobSpec(DAILY_STATEMENTS_JOB, daily_statements, depends_on=(FX_REFRESH_JOB,)),
+    ]
+    skipped = set(skip)
+    unknown = skipped - {spec.name for spec in specs}
+    if unknown:
+        raise ValueError(f"Unknown nightly jobs: {sorted(unknown)}")
+    return [
+        JobSpec(
+            spec.name,
+            spec.func,
+            depends_on=tuple(dep for dep in spec.depends_on if dep not in skipped),
+            retries=spec.retries,
+            backoff_seconds=spec.backoff_seconds,
+            backoff_factor=spec.backoff_factor,
+            lock_ttl_seconds=spec.lock_ttl_seconds,
+        )
+        for spec in specs
+        if spec.name not in skipped
+    ]
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the nightly job pipeline.")
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=None,
+        help="Independent jobs run at once (default: JOB_MAX_WORKERS).",
+    )
+    parser.add_argument(
+        "--skip",
+        action="append",
+        default=[],
+        metavar="JOB",
+        help="Leave a job out (repeatable): fx_refresh, risk_recompute, ledger_export, daily_statements.",
+    )
+    return parser.parse_args()
+
+
+@timed("job.run_nightly")
+def main() -> None:
+    args = _parse_args()
+    try:
+        specs = build_nightly_pipeline(skip=args.skip)
+        results = JobRunner(max_workers=args.max_workers).run_pipeline(PIPELINE_NAME, specs)
+    except Exception as exc:  # pragma: no cover - ensures job surfaces failure
+        logger.error("nightly_pipeline_failed", error=str(exc))
+        sys.exit(1)
+
+    if any(result.status == FAILED for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+"""
+Single-instance job runner with run history.
+
+FX refresh, ledger export and daily statements are started by cron, by the
+nightly pipeline (``src.jobs.run_nightly``) and from the UI. The runner makes
+those entry points share three things:
+
+- an advisory lock per job name in ``job_locks``, so a second start while a
+  run is in progress is recorded as skipped instead of overlapping. A lock
+  expires after ``lock_ttl_seconds``, so a crashed holder does not block the
+  job forever;
+- a ``job_runs`` row per attempt with timings, row count and outcome;
+- retries with exponential backoff.
+
+:meth:`JobRunner.run_pipeline` runs a set of jobs as a DAG. A job starts once
+every dependency succeeded, and independent jobs run concurrently on up to
+``max_workers`` threads. Each job opens its own connections; the runner's
+bookkeeping uses short-lived connections from ``connection_factory``.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.core.config import Config
+from src.core.database import get_db_connection
+from src.utils.datetime_helpers import utc_now_iso
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Lock names shared by the cron entry points, the nightly pipeline and the UI.
+FX_REFRESH_JOB = "fx_refresh"
+RISK_RECOMPUTE_JOB = "risk_recompute"
+LEDGER_EXPORT_JOB = "ledger_export"
+DAILY_STATEMENTS_JOB = "daily_statements"
+
+DEFAULT_LOCK_TTL_SECONDS = 6 * 60 * 60
+
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+class JobLockedError(RuntimeError):
+    """Raised by :func:`job_lock` when another run holds the lock."""
+
+    def __init__(self, name: str, holder: Optional[str]) -> None:
+        self.name = name
+        self.holder = holder
+        super().__init__(f"Job {name} is already running ({holder or 'unknown holder'})")
+
+
+@dataclass(frozen=True)
+class JobSpec:
+    """
+    A runnable job.
+
+    ``func`` returns the number of rows it processed (or None) and raises on
+    failure.
+    """
+
+    name: str
+    func: Callable[[], Optional[int]]
+    depends_on: Tuple[str, ...] = ()
+    retries: int = 0
+    backoff_seconds: float = 30.0
+    backoff_factor: float = 2.0
+    lock_ttl_seconds: float = DEFAULT_LOCK_TTL_SECONDS
+
+
+@dataclass
+class JobResult:
+    """Final outcome of a job after all attempts."""
+
+    job_name: str
+    status: str
+    attempts: int = 0
+    row_count: Optional[int] = None
+    duration_ms: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == SUCCEEDED
+
+
+def new_lock_owner() -> str:
+    """Unique holder token: host, process and a random suffix per acquisition."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def acquire_lock(
+    conn: sqlite3.Connection,
+    name: str,
+    owner: str,
+    ttl_seconds: float = DEFAULT_LOCK_TTL_SECONDS,
+) -> bool:
+    """
+    Take the advisory lock ``name`` unless a live holder has it.
+
+    Returns:
+        True when ``owner`` now holds the lock
+    """
+    now = time.time()
+    conn.execute(
+        """
+        INSERT INTO job_locks (lock_name, owner, acquired_at_utc, expires_at_epoch)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(lock_name) DO UPDATE SET
+            owner = excluded.owner,
+            acquired_at_utc = excluded.acquired_at_utc,
+            expires_at_epoch = excluded.expires_at_epoch
+        WHERE job_locks.expires_at_epoch < ?
+        """,
+        (name, owner, utc_now_iso(), now + ttl_seconds, now),
+    )
+    conn.commit()
+    return lock_holder(conn, name) == owner
+
+
+def release_lock(conn: sqlite3.Connection, name: str, owner: str) -> None:
+    """Release ``name`` if ``owner`` still holds it."""
+    conn.execute("DELETE FROM job_locks WHERE lock_name = ? AND owner = ?", (name, owner))
+    conn.commit()
+
+
+def lock_holder(conn: sqlite3.Connection, name: str) -> Optional[str]:
+    row = conn.execute("SELECT owner FROM job_locks WHERE lock_name = ?", (name,)).fetchone()
+    return row[0] if row else None
+
+
+@contextmanager
+def job_lock(
+    name: str,
+    *,
+    ttl_seconds: float = DEFAULT_LOCK_TTL_SECONDS,
+    connection_factory: Callable[[], sqlite3.Connection] = get_db_connection,
+) -> Iterator[str]:
+    """
+    Hold the advisory lock for ``name`` around an ad-hoc run (e.g. a UI button).
+
+    Raises:
+        JobLockedError: If another run holds the lock
+    """
+    owner = new_lock_owner()
+    conn = connection_factory()
+    try:
+        if not acquire_lock(conn, name, owner, ttl_seconds):
+            raise JobLockedError(name, lock_holder(conn, name))
+        try:
+            yield owner
+        finally:
+            release_lock(conn, name, owner)
+    finally:
+        conn.close()
+
+
+class JobRunner:
+    """Run jobs single-instance, with retries and run history."""
+
+    def __init__(
+        self,
+        *,
+        connection_factory: Callable[[], sqlite3.Connection] = get_db_connection,
+        max_workers: Optional[int] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Args:
+            connection_factory: Opens connections for locks and run history
+            max_workers: Concurrent pipeline jobs (defaults to ``Config.JOB_MAX_WORKERS``)
+            sleep: Backoff sleep, replaceable in tests
+        """
+        self._connect = connection_factory
+        self.max_workers = max(1, max_workers or Config.JOB_MAX_WORKERS)
+        self._sleep = sleep
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def run_job(self, spec: JobSpec, *, pipeline_run_id: Optional[str] = None) -> JobResult:
+        """
+        Run ``spec`` under its lock, retrying failures with backoff.
+
+        Returns:
+            JobResult; ``skipped`` when another run holds the lock
+        """
+        owner = new_lock_owner()
+        conn = self._connect()
+        try:
+            if not acquire_lock(conn, spec.name, owner, spec.lock_ttl_seconds):
+                reason = f"already running ({lock_holder(conn, spec.name)})"
+                self._record_skip(conn, spec.name, pipeline_run_id, reason)
+                logger.warning("job_skipped_locked", job=spec.name, reason=reason)
+                return JobResult(spec.name, SKIPPED, error=reason)
+            try:
+                return self._run_attempts(conn, spec, owner, pipeline_run_id)
+            finally:
+                release_lock(conn, spec.name, owner)
+        finally:
+            conn.close()
+
+    def run_pipeline(self, name: str, specs: Sequence[JobSpec]) -> Dict[str, JobResult]:
+        """
+        Run ``specs`` as a DAG under the pipeline lock ``pipeline:<name>``.
+
+        A job whose dependency did not succeed is recorded as skipped.
+
+        Returns:
+            Results keyed by job name, in ``specs`` order (empty when another
+            run of the pipeline holds the lock)
+
+        Raises:
+            ValueError: On duplicate names, unknown dependencies or cycles
+        """
+        ordered = _validate_dag(specs)
+        pipeline_run_id = f"{name}-{uuid.uuid4().hex[:12]}"
+
+        with self._pipeline_lock(name) as locked:
+            if not locked:
+                return {}
+            logger.info(
+                "job_pipeline_started",
+                pipeline=name,
+                pipeline_run_id=pipeline_run_id,
+                jobs=[spec.name for spec in ordered],
+                max_workers=self.max_workers,
+            )
+            started = time.perf_counter()
+            results: Dict[str, JobResult] = {}
+            pending = {spec.name: spec for spec in ordered}
+            running: Dict[Future, str] = {}
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job") as pool:
+                while pending or running:
+                    for job_name, spec in list(pending.items()):
+                        blocked = [dep for dep in spec.depends_on if dep in results and not results[dep].ok]
+                        if blocked:
+                            reason = f"dependency {blocked[0]} {results[blocked[0]].status}"
+                            self._skip(job_name, pipeline_run_id, reason, results)
+                            del pending[job_name]
+                        elif all(dep in results for dep in spec.depends_on):
+                            future = pool.submit(self.run_job, spec, pipeline_run_id=pipeline_run_id)
+                            running[future] = job_name
+                            del pending[job_name]
+                    if not running:
+                        continue
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results[running.pop(future)] = future.result()
+
+            logger.info(
+                "job_pipeline_completed",
+                pipeline=name,
+                pipeline_run_id=pipeline_run_id,
+                duration_ms=int((time.perf_counter() - started) * 1000),
+                outcomes={job_name: result.status for job_name, result in results.items()},
+            )
+            return {spec.name: results[spec.name] for spec in specs}
+
+    def recent_runs(self, job_name: Optional[str] = None, limit: int = 20) -> List[Dict[str, object]]:
+        """Latest job_runs rows, newest first."""
+        query = "SELECT * FROM job_runs"
+        params: List[object] = []
+        if job_name is not None:
+            query += " WHERE job_name = ?"
+            params.append(job_name)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        conn = self._connect()
+        try:
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute(query, params).fetchall()]
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _run_attempts(
+        self,
+        conn: sqlite3.Connection,
+        spec: JobSpec,
+        owner: str,
+        pipeline_run_id: Optional[str],
+    ) -> JobResult:
+        delay = spec.backoff_seconds
+        attempts = spec.retries + 1
+        for attempt in range(1, attempts + 1):
+            run_id = conn.execute(
+                """
+                INSERT INTO job_runs (job_name, pipeline_run_id, status, attempt, owner, started_at_utc)
+                VALUES (?, ?, 'running', ?, ?, ?)
+                """,
+                (spec.name, pipeline_run_id, attempt, owner, utc_now_iso()),
+            ).lastrowid
+            conn.commit()
+            if run_id is None:
+                raise RuntimeError(f"Could not record a run for job {spec.name}")
+            logger.info("job_started", job=spec.name, attempt=attempt, pipeline_run_id=pipeline_run_id)
+
+            started = time.perf_counter()
+            try:
+                rows = spec.func()
+            except Exception as exc:
+                duration_ms = int((time.perf_counter() - started) * 1000)
+                self._finish(conn, run_id, FAILED, duration_ms, None, str(exc))
+                if attempt == attempts:
+                    logger.error("job_failed", job=spec.name, attempts=attempt, error=str(exc))
+                    return JobResult(spec.name, FAILED, attempt, None, duration_ms, str(exc))
+                logger.warning(
+                    "job_attempt_failed",
+                    job=spec.name,
+                    attempt=attempt,
+                    retry_in_seconds=delay,
+                    error=str(exc),
+                )
+                self._sleep(delay)
+                delay *= spec.backoff_factor
+                continue
+
+            duration_ms = int((time.perf_counter() - started) * 1000)
+            row_count = rows if isinstance(rows, int) and not isinstance(rows, bool) else None
+            self._finish(conn, run_id, SUCCEEDED, duration_ms, row_count, None)
+            logger.info(
+                "job_succeeded",
+                job=spec.name,
+                attempt=attempt,
+                duration_ms=duration_ms,
+                row_count=row_count,
+            )
+            return JobResult(spec.name, SUCCEEDED, attempt, row_count, duration_ms)
+
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def _finish(
+        self,
+        conn: sqlite3.Connection,
+        run_id: int,
+        status: str,
+        duration_ms: int,
+        row_count: Optional[int],
+        error: Optional[str],
+    ) -> None:
+        conn.execute(
+            """
+            UPDATE job_runs
+            SET status = ?, finished_at_utc = ?, duration_ms = ?, row_count = ?, error_message = ?
+            WHERE id = ?
+            """,
+            (status, utc_now_iso(), duration_ms, row_count, error, run_id),
+        )
+        conn.commit()
+
+    def _record_skip(
+        self,
+        conn: sqlite3.Connection,
+        job_name: str,
+        pipeline_run_id: Optional[str],
+        reason: str,
+    ) -> None:
+        timestamp = utc_now_iso()
+        conn.execute(
+            """
+            INSERT INTO job_runs (
+                job_name, pipeline_run_id, status, attempt, started_at_utc,
+                finished_at_utc, duration_ms, error_message
+            ) VALUES (?, ?, 'skipped', 0, ?, ?, 0, ?)
+            """,
+            (job_name, pipeline_run_id, timestamp, timestamp, reason),
+        )
+        conn.commit()
+
+    def _skip(
+        self,
+        job_name: str,
+        pipeline_run_id: str,
+        reason: str,
+        results: Dict[str, JobResult],
+    ) -> None:
+        conn = self._connect()
+        try:
+            self._record_skip(conn, job_name, pipeline_run_id, reason)
+        finally:
+            conn.close()
+        logger.warning("job_skipped_dependency", job=job_name, reason=reason)
+        results[job_name] = JobResult(job_name, SKIPPED, error=reason)
+
+    @contextmanager
+    def _pipeline_lock(self, name: str) -> Iterator[bool]:
+        lock_name = f"pipeline:{name}"
+        owner = new_lock_owner()
+        conn = self._connect()
+        try:
+            if not acquire_lock(conn, lock_name, owner):
+                logger.warning(
+                    "job_pipeline_skipped_locked",
+                    pipeline=name,
+                    holder=lock_holder(conn, lock_name),
+                )
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                release_lock(conn, lock_name, owner)
+        finally:
+            conn.close()
+
+
+def _validate_dag(specs: Sequence[JobSpec]) -> List[JobSpec]:
+    """Check names and dependencies; return ``specs`` in a topological order."""
+    by_name: Dict[str, JobSpec] = {}
+    for spec in specs:
+        if spec.name in by_name:
+            raise ValueError(f"Duplicate job name: {spec.name}")
+        by_name[spec.name] = spec
+    for spec in specs:
+        unknown = [dep for dep in spec.depends_on if dep not in by_name]
+        if unknown:
+            raise ValueError(f"Job {spec.name} depends on unknown jobs: {unknown}")
+
+    ordered: List[JobSpec] = []
+    placed: set[str] = set()
+    remaining = list(specs)
+    while remaining:
+        ready = [spec for spec in remaining if all(dep in placed for dep in spec.depends_on)]
+        if not ready:
+            raise ValueError(f"Dependency cycle among jobs: {[spec.name for spec in remaining]}")
+        for spec in ready:
+            ordered.append(spec)
+            placed.add(spec.name)
+        remaining = [spec for spec in remaining if spec.name not in placed]
+    return ordered
@@ -129,6 +129,13 @@ class AssociateHubRepository:
         except Exception:  # pragma: no cover - defensive close
             pass
 
+    def _ledger_relation(self) -> str:
+        """Return the ledger relation covering archived rows (see ledger_archive_service)."""
+        # Local import avoids a circular import through src.repositories
+        from src.services.ledger_archive_service import ledger_relation
+
+        return ledger_relation(self.db)
+
     def list_associates_with_metrics(
         self,
         *,
@@ -159,8 +166,9 @@ class AssociateHubRepository:
         Returns:
             List of associate metrics
         """
-        # Build base query
-        query = """
+        # Build base query; running totals must include archived ledger rows
+        ledger = self._ledger_relation()
+        query = f"""
         SELECT 
             a.id AS associate_id,
             a.display_alias AS associate_alias,
@@ -178,14 +186,14 @@ class AssociateHubRepository:
             COALESCE(holdings.current_holding_eur, 0) AS current_holding_eur,
             COALESCE(shares.fair_share_eur, 0) AS fair_share_eur,
             COALESCE(pending.pending_balance_eur, 0) AS pending_balance_eur,
-            MAX(COALESCE(bh.check_date_utc, le.created_at_utc)) AS last_activity_utc
+            MAX(COALESCE(bh.last_check_utc, le.last_entry_utc)) AS last_activity_utc
         FROM associates a
         LEFT JOIN bookmakers b ON b.associate_id = a.id
         LEFT JOIN (
             SELECT 
                 associate_id,
                 SUM(CAST(amount_eur AS REAL)) AS net_deposits_eur
-            FROM ledger_entries 
+            FROM {ledger} 
             WHERE type IN ('DEPOSIT', 'WITHDRAWAL')
             GROUP BY associate_id
         ) deposits ON deposits.associate_id = a.id
@@ -193,7 +201,7 @@ class AssociateHubRepository:
             SELECT 
                 associate_id,
                 SUM(CAST(amount_eur AS REAL)) AS current_holding_eur
-            FROM ledger_entries
+            FROM {ledger}
             GROUP BY associate_id
         ) holdings ON holdings.associate_id = a.id
         LEFT JOIN (
@@ -206,7 +214,7 @@ class AssociateHubRepository:
                         ELSE 0
                     END
                 ) AS fair_share_eur
-            FROM ledger_entries
+            FROM {ledger}
             WHERE type = 'BET_RESULT'
             GROUP BY associate_id
         ) shares ON shares.associate_id = a.id
@@ -224,8 +232,16 @@ class AssociateHubRepository:
             WHERE status IN ('verified', 'matched')
             GROUP BY associate_id
         ) pending ON pending.associate_id = a.id
-        LEFT JOIN bookmaker_balance_checks bh ON bh.associate_id = a.id
-        LEFT JOIN ledger_entries le ON le.associate_id = a.id
+        LEFT JOIN (
+            SELECT associate_id, MAX(check_date_utc) AS last_check_utc
+            FROM bookmaker_balance_checks
+            GROUP BY associate_id
+        ) bh ON bh.associate_id = a.id
+        LEFT JOIN (
+            SELECT associate_id, MAX(created_at_utc) AS last_entry_utc
+            FROM {ledger}
+            GROUP BY associate_id
+        ) le ON le.associate_id = a.id
         WHERE 1=1
         """
         
@@ -316,8 +332,8 @@ class AssociateHubRepository:
             "nd_asc": f"{nd_expr} ASC",
             "delta_desc": f"{delta_expr} DESC",
             "delta_asc": f"{delta_expr} ASC",
-            "activity_desc": "MAX(COALESCE(bh.check_date_utc, le.created_at_utc)) DESC",
-            "activity_asc": "MAX(COALESCE(bh.check_date_utc, le.created_at_utc)) ASC",
+            "activity_desc": "MAX(COALESCE(bh.last_check_utc, le.last_entry_utc)) DESC",
+            "activity_asc": "MAX(COALESCE(bh.last_check_utc, le.last_entry_utc)) ASC",
             "balance_desc": "COALESCE(holdings.current_holding_eur, 0) DESC",
             "balance_asc": "COALESCE(holdings.current_holding_eur, 0) ASC",
             "pending_desc": "COALESCE(pending.pending_balance_eur, 0) DESC",
@@ -413,8 +429,56 @@ class AssociateHubRepository:
         Returns:
             List of bookmaker summaries
         """
-        query = """
+        return self._fetch_bookmaker_summaries([associate_id])
+
+    def list_bookmakers_for_associates(
+        self, associate_ids: Optional[Sequence[int]] = None
+    ) -> Dict[int, List[BookmakerSummary]]:
+        """
+        Get bookmaker summaries for many associates in a single query.
+
+        Ledger, balance-check and pending-stake aggregates are computed once
+        and grouped, instead of re-aggregating per associate.
+
+        Args:
+            associate_ids: Associates to include; None returns every associate
+
+        Returns:
+            Mapping of associate_id → bookmaker summaries (ordered by name)
+        """
+        if associate_ids is not None:
+            associate_ids = list(dict.fromkeys(int(value) for value in associate_ids))
+            if not associate_ids:
+                return {}
+
+        grouped: Dict[int, List[BookmakerSummary]] = {}
+        if associate_ids:
+            for associate_id in associate_ids:
+                grouped[associate_id] = []
+        for summary in self._fetch_bookmaker_summaries(associate_ids):
+            grouped.setdefault(summary.associate_id, []).append(summary)
+        return grouped
+
+    def _fetch_bookmaker_summaries(
+        self, associate_ids: Optional[Sequence[int]]
+    ) -> List[BookmakerSummary]:
+        """Run the bookmaker summary query for the given associates (None = all)."""
+        if associate_ids is None:
+            ledger_filter = ""
+            checks_filter = ""
+            outer_filter = ""
+            params: Tuple[Any, ...] = ()
+        else:
+            placeholders = ",".join("?" for _ in associate_ids)
+            ledger_filter = f"AND associate_id IN ({placeholders})"
+            checks_filter = f"WHERE associate_id IN ({placeholders})"
+            outer_filter = f"WHERE b.associate_id IN ({placeholders})"
+            params = tuple(associate_ids) * 3
+
+        ledger = self._ledger_relation()
+        query = f"""
         SELECT 
+            b.associate_id AS associate_id,
             b.id AS bookmaker_id,
             b.bookmaker_name,
             b.is_active AS is_active,
@@ -438,6 +502,7 @@ class AssociateHubRepository:
         JOIN associates a ON a.id = b.associate_id
         LEFT JOIN (
             SELECT 
+                associate_id,
                 bookmaker_id,
                 SUM(
                     CASE
@@ -447,23 +512,29 @@ class AssociateHubRepository:
                         ELSE 0
                     END
                 ) AS modeled_balance_eur
-            FROM ledger_entries 
-            WHERE associate_id = ?
-              AND bookmaker_id IS NOT NULL
-            GROUP BY bookmaker_id
-        ) ledger ON ledger.bookmaker_id = b.id
+            FROM {ledger} 
+            WHERE bookmaker_id IS NOT NULL
+              {ledger_filter}
+            GROUP BY associate_id, bookmaker_id
+        ) ledger ON ledger.bookmaker_id = b.id AND ledger.associate_id = b.associate_id
         LEFT JOIN (
             SELECT 
+                associate_id,
                 bookmaker_id,
                 balance_eur AS reported_balance_eur,
                 balance_native,
                 native_currency,
                 fx_rate_used,
                 check_date_utc AS last_balance_check_utc,
-                ROW_NUMBER() OVER (PARTITION BY bookmaker_id ORDER BY check_date_utc DESC) AS rn
+                ROW_NUMBER() OVER (
+                    PARTITION BY associate_id, bookmaker_id
+                    ORDER BY check_date_utc DESC
+                ) AS rn
             FROM bookmaker_balance_checks
-            WHERE associate_id = ?
-        ) checks ON checks.bookmaker_id = b.id AND checks.rn = 1
+            {checks_filter}
+        ) checks ON checks.bookmaker_id = b.id
+            AND checks.associate_id = b.associate_id
+            AND checks.rn = 1
         LEFT JOIN (
             SELECT 
                 bookmaker_id,
@@ -479,94 +550,104 @@ class AssociateHubRepository:
               AND bookmaker_id IS NOT NULL
             GROUP BY bookmaker_id
         ) pending ON pending.bookmaker_id = b.id
-        WHERE b.associate_id = ?
-        ORDER BY b.bookmaker_name
+        {outer_filter}
+        ORDER BY a.display_alias, b.bookmaker_name
         """
         
-        cursor = self.db.execute(query, (associate_id, associate_id, associate_id))
+        cursor = self.db.execute(query, params)
         rows = cursor.fetchall()
+
+        default_associate_id = (
+            associate_ids[0] if associate_ids is not None and len(associate_ids) == 1 else None
+        )
+        return [
+            self._build_bookmaker_summary(row, default_associate_id) for row in rows
+        ]
+
+    def _build_bookmaker_summary(
+        self, row: Any, default_associate_id: Optional[int] = None
+    ) -> BookmakerSummary:
+        """Convert a bookmaker summary row into a BookmakerSummary."""
+        associate_id = row.get("associate_id")
+        if associate_id is None:
+            associate_id = default_associate_id
+
+        modeled_balance = Decimal(str(row["modeled_balance_eur"])).quantize(TWO_PLACES, rounding=ROUND_HALF_UP)
+        reported_balance = None
+        if row["reported_balance_eur"]:
+            reported_balance = Decimal(str(row["reported_balance_eur"])).quantize(TWO_PLACES, rounding=ROUND_HALF_UP)
+
+        delta_eur = None
+        status = "unverified"
+        status_icon = "⚪"
+        status_color = "#eceff1"
         
-        summaries: List[BookmakerSummary] = []
-        for row in rows:
-            modeled_balance = Decimal(str(row["modeled_balance_eur"])).quantize(TWO_PLACES, rounding=ROUND_HALF_UP)
-            reported_balance = None
-            if row["reported_balance_eur"]:
-                reported_balance = Decimal(str(row["reported_balance_eur"])).quantize(TWO_PLACES, rounding=ROUND_HALF_UP)
-            
-            delta_eur = None
-            status = "unverified"
-            status_icon = "⚪"
-            status_color = "#eceff1"
-            
-            if reported_balance is not None:
-                delta_eur = reported_balance - modeled_balance
-                abs_delta = abs(delta_eur)
-                
-                if abs_delta <= self.BALANCED_THRESHOLD_EUR:
-                    status = "balanced"
-                    status_icon = "🟢"
-                    status_color = "#e8f5e9"
-                elif delta_eur > 0:
-                    status = "overholding"
-                    status_icon = "🔺"
-                    status_color = "#fff3e0"
-                else:
-                    status = "short"
-                    status_icon = "🔻"
-                    status_color = "#ffebee"
+        if reported_balance is not None:
+            delta_eur = reported_balance - modeled_balance
+            abs_delta = abs(delta_eur)
             
-            pending_balance = _to_decimal(row.get("pending_balance_eur")) or Decimal("0.00")
-            fx_rate = _to_decimal_raw(row.get("fx_rate_used"))
-            balance_native = _to_decimal(row.get("balance_native"))
-            account_currency = (
-                (row.get("account_currency") or row.get("associate_home_currency") or "EUR")
-                .strip()
-                .upper()
-            )
-            native_currency = (
-                (row.get("check_native_currency")
-                 or account_currency
-                 or row.get("associate_home_currency")
-                 or "EUR")
-                .strip()
-                .upper()
-            )
+            if abs_delta <= self.BALANCED_THRESHOLD_EUR:
+                status = "balanced"
+                status_icon = "🟢"
+                status_color = "#e8f5e9"
+            elif delta_eur > 0:
+                status = "overholding"
+                status_icon = "🔺"
+                status_color = "#fff3e0"
+            else:
+                status = "short"
+                status_icon = "🔻"
+                status_color = "#ffebee"
+        
+        pending_balance = _to_decimal(row.get("pending_balance_eur")) or Decimal("0.00")
+        fx_rate = _to_decimal_raw(row.get("fx_rate_used"))
+        balance_native = _to_decimal(row.get("balance_native"))
+        account_currency = (
+            (row.get("account_currency") or row.get("associate_home_currency") or "EUR")
+            .strip()
+            .upper()
+        )
+        native_currency = (
+            (row.get("check_native_currency")
+             or account_currency
+             or row.get("associate_home_currency")
+             or "EUR")
+            .strip()
+            .upper()
+        )
 
-            if balance_native is None and reported_balance is not None and fx_rate not in (None, Decimal("0")):
-                balance_native = (reported_balance / fx_rate).quantize(TWO_PLACES, rounding=ROUND_HALF_UP)
+        if balance_native is None and reported_balance is not None and fx_rate not in (None, Decimal("0")):
+            balance_native = (reported_balance / fx_rate).quantize(TWO_PLACES, rounding=ROUND_HALF_UP)
 
-            pending_native = None
-            if pending_balance is not None and fx_rate not in (None, Decimal("0")):
-                pending_native = (pending_balance / fx_rate).quantize(TWO_PLACES, rounding=ROUND_HALF_UP)
+        pending_native = None
+        if pending_balance is not None and fx_rate not in (None, Decimal("0")):
+            pending_native = (pending_balance / fx_rate).quantize(TWO_PLACES, rounding=ROUND_HALF_UP)
 
-            summary = BookmakerSummary(
-                associate_id=associate_id,
-                bookmaker_id=row["bookmaker_id"],
-                bookmaker_name=row["bookmaker_name"],
-                is_active=bool(row["is_active"]),
-                parsing_profile=row["parsing_profile"],
-                native_currency=native_currency,
-                account_currency=account_currency,
-                modeled_balance_eur=modeled_balance,
-                reported_balance_eur=reported_balance,
-                delta_eur=delta_eur.quantize(TWO_PLACES, rounding=ROUND_HALF_UP) if delta_eur else None,
-                last_balance_check_utc=row["last_balance_check_utc"],
-                status=status,
-                status_icon=status_icon,
-                status_color=status_color,
-                pending_balance_eur=pending_balance,
-                bookmaker_chat_id=row.get("bookmaker_chat_id"),
-                coverage_chat_id=row.get("coverage_chat_id"),
-                region=row.get("region"),
-                risk_level=row.get("risk_level"),
-                internal_notes=row.get("internal_notes"),
-                associate_alias=row.get("associate_alias"),
-                active_balance_native=balance_native,
-                pending_balance_native=pending_native,
-            )
-            summaries.append(summary)
-        
-        return summaries
+        return BookmakerSummary(
+            associate_id=associate_id,
+            bookmaker_id=row["bookmaker_id"],
+            bookmaker_name=row["bookmaker_name"],
+            is_active=bool(row["is_active"]),
+            parsing_profile=row["parsing_profile"],
+            native_currency=native_currency,
+            account_currency=account_currency,
+            modeled_balance_eur=modeled_balance,
+            reported_balance_eur=reported_balance,
+            delta_eur=delta_eur.quantize(TWO_PLACES, rounding=ROUND_HALF_UP) if delta_eur else None,
+            last_balance_check_utc=row["last_balance_check_utc"],
+            status=status,
+            status_icon=status_icon,
+            status_color=status_color,
+            pending_balance_eur=pending_balance,
+            bookmaker_chat_id=row.get("bookmaker_chat_id"),
+            coverage_chat_id=row.get("coverage_chat_id"),
+            region=row.get("region"),
+            risk_level=row.get("risk_level"),
+            internal_notes=row.get("internal_notes"),
+            associate_alias=row.get("associate_alias"),
+            active_balance_native=balance_native,
+            pending_balance_native=pending_native,
+        )
 
     def get_associate_for_edit(self, associate_id: int) -> Optional[Dict[str, Any]]:
         """
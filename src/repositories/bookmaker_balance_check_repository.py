@@ -133,14 +133,15 @@ class BookmakerBalanceCheckRepository:
     def get_latest_check(self, associate_id: int, bookmaker_id: int) -> Optional[Dict]:
         """
         Return the most recent balance check for an associate/bookmaker pair.
+
+        Resolved through the trigger-maintained ``latest_balance_check`` pointer.
         """
         row = self.db.execute(
             """
-            SELECT *
-            FROM bookmaker_balance_checks
-            WHERE associate_id = ? AND bookmaker_id = ?
-            ORDER BY check_date_utc DESC
-            LIMIT 1
+            SELECT bc.*
+            FROM latest_balance_check latest
+            JOIN bookmaker_balance_checks bc ON bc.id = latest.balance_check_id
+            WHERE latest.associate_id = ? AND latest.bookmaker_id = ?
             """,
             (associate_id, bookmaker_id),
         ).fetchone()
@@ -149,19 +150,14 @@ class BookmakerBalanceCheckRepository:
     def get_latest_checks_map(self) -> Dict[Tuple[int, int], Dict]:
         """
         Return a dict keyed by (associate_id, bookmaker_id) for the latest checks.
+
+        Reads one pointer row per pair, so the cost does not grow with history.
         """
         rows = self.db.execute(
             """
             SELECT bc.*
-            FROM bookmaker_balance_checks bc
-            JOIN (
-                SELECT associate_id, bookmaker_id, MAX(check_date_utc) AS latest_check
-                FROM bookmaker_balance_checks
-                GROUP BY associate_id, bookmaker_id
-            ) latest
-            ON bc.associate_id = latest.associate_id
-            AND bc.bookmaker_id = latest.bookmaker_id
-            AND bc.check_date_utc = latest.latest_check
+            FROM latest_balance_check latest
+            JOIN bookmaker_balance_checks bc ON bc.id = latest.balance_check_id
             """
         ).fetchall()
 
@@ -0,0 +1,258 @@
+"""
+Repository for closed-period balance checkpoints.
+
+Statements start from the nearest checkpoint at or before their cutoff and
+only aggregate the ledger rows the checkpoint does not already cover.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from src.core.database import get_db_connection
+from src.utils.datetime_helpers import to_epoch_ms
+
+ZERO = Decimal("0.00")
+PERIOD_END_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def normalize_period_end(value: str) -> str:
+    """
+    Return the canonical ``YYYY-MM-DDTHH:MM:SSZ`` spelling of a UTC period end.
+
+    Checkpoints are stored and compared in this fixed-width form, so the
+    "YYYY-MM-DD HH:MM:SSZ" and "+00:00" spellings resolve to the same period.
+
+    Raises:
+        ValueError: If the value cannot be parsed or has fractional seconds
+    """
+    epoch_ms = to_epoch_ms(value)
+    if epoch_ms is None:
+        raise ValueError(f"Invalid period end: {value}")
+    if epoch_ms % 1000:
+        raise ValueError(f"Period end must be a whole second: {value}")
+    return datetime.fromtimestamp(epoch_ms // 1000, tz=timezone.utc).strftime(
+        PERIOD_END_FORMAT
+    )
+
+
+def _to_decimal(value: object) -> Decimal:
+    """Convert a stored TEXT amount to Decimal, treating NULL as zero."""
+    return Decimal(str(value)) if value not in (None, "") else ZERO
+
+
+@dataclass
+class BookmakerCheckpoint:
+    """Closed balances for one bookmaker."""
+
+    bookmaker_id: int
+    balance_eur: Decimal
+    deposits_eur: Decimal
+    withdrawals_eur: Decimal
+    balance_native: Decimal
+    native_currency: Optional[str] = None
+
+
+@dataclass
+class PeriodCheckpoint:
+    """Closed balances for an associate as of a period end."""
+
+    associate_id: int
+    period_end_utc: str
+    through_entry_id: int
+    deposits_eur: Decimal
+    signed_withdrawals_eur: Decimal
+    net_deposits_eur: Decimal
+    fair_share_eur: Decimal
+    should_hold_eur: Decimal
+    holdings_eur: Decimal
+    imbalance_eur: Decimal
+    closed_at_utc: Optional[str] = None
+    bookmakers: Dict[int, BookmakerCheckpoint] = field(default_factory=dict)
+
+
+class PeriodClosingBalanceRepository:
+    """Data access helpers for the period_closing_balances table."""
+
+    def __init__(self, db: sqlite3.Connection | None = None) -> None:
+        self._owns_connection = db is None
+        self.db = db or get_db_connection()
+
+    def close(self) -> None:
+        """Close the managed database connection if owned by the repository."""
+        if not self._owns_connection:
+            return
+        try:
+            self.db.close()
+        except Exception:  # pragma: no cover - defensive close
+            pass
+
+    # --------------------------------------------------------------------- #
+    # Read helpers
+    # --------------------------------------------------------------------- #
+
+    def table_exists(self) -> bool:
+        """Return True when the checkpoint table is present (minimal schemas omit it)."""
+        row = self.db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'period_closing_balances'"
+        ).fetchone()
+        return row is not None
+
+    def get_nearest_checkpoint(
+        self, associate_id: int, cutoff_date: str
+    ) -> Optional[PeriodCheckpoint]:
+        """Return the latest checkpoint whose period end is at or before the cutoff."""
+        cutoff_ms = to_epoch_ms(cutoff_date)
+        if cutoff_ms is None:
+            return None
+        row = self.db.execute(
+            """
+            SELECT period_end_utc
+            FROM period_closing_balances
+            WHERE associate_id = ?
+              AND bookmaker_id IS NULL
+              AND period_end_ms <= ?
+            ORDER BY period_end_ms DESC
+            LIMIT 1
+            """,
+            (associate_id, cutoff_ms),
+        ).fetchone()
+        if row is None:
+            return None
+        return self.get_checkpoint(associate_id, row["period_end_utc"])
+
+    def get_checkpoint(
+        self, associate_id: int, period_end_utc: str
+    ) -> Optional[PeriodCheckpoint]:
+        """Return the checkpoint for an associate and exact period end."""
+        rows = self.db.execute(
+            """
+            SELECT *
+            FROM period_closing_balances
+            WHERE associate_id = ? AND period_end_utc = ?
+            """,
+            (associate_id, period_end_utc),
+        ).fetchall()
+
+        checkpoint: Optional[PeriodCheckpoint] = None
+        bookmakers: Dict[int, BookmakerCheckpoint] = {}
+        for row in rows:
+            if row["bookmaker_id"] is None:
+                checkpoint = PeriodCheckpoint(
+                    associate_id=row["associate_id"],
+                    period_end_utc=row["period_end_utc"],
+                    through_entry_id=int(row["through_entry_id"]),
+                    deposits_eur=_to_decimal(row["deposits_eur"]),
+                    signed_withdrawals_eur=_to_decimal(row["withdrawals_eur"]),
+                    net_deposits_eur=_to_decimal(row["net_deposits_eur"]),
+                    fair_share_eur=_to_decimal(row["fair_share_eur"]),
+                    should_hold_eur=_to_decimal(row["should_hold_eur"]),
+                    holdings_eur=_to_decimal(row["holdings_eur"]),
+                    imbalance_eur=_to_decimal(row["imbalance_eur"]),
+                    closed_at_utc=row["closed_at_utc"],
+                )
+            else:
+                bookmakers[row["bookmaker_id"]] = BookmakerCheckpoint(
+                    bookmaker_id=row["bookmaker_id"],
+                    balance_eur=_to_decimal(row["holdings_eur"]),
+                    deposits_eur=_to_decimal(row["deposits_eur"]),
+                    withdrawals_eur=_to_decimal(row["withdrawals_eur"]),
+                    balance_native=_to_decimal(row["balance_native"]),
+                    native_currency=row["native_currency"],
+                )
+
+        if checkpoint is not None:
+            checkpoint.bookmakers = bookmakers
+        return checkpoint
+
+    def list_checkpoints(self, associate_id: Optional[int] = None) -> List[PeriodCheckpoint]:
+        """Return all checkpoints, oldest period first."""
+        query = """
+            SELECT associate_id, period_end_utc
+            FROM period_closing_balances
+            WHERE bookmaker_id IS NULL
+        """
+        params: List = []
+        if associate_id is not None:
+            query += " AND associate_id = ?"
+            params.append(associate_id)
+        query += " ORDER BY period_end_utc, associate_id"
+
+        checkpoints: List[PeriodCheckpoint] = []
+        for row in self.db.execute(query, params).fetchall():
+            checkpoint = self.get_checkpoint(row["associate_id"], row["period_end_utc"])
+            if checkpoint is not None:
+                checkpoints.append(checkpoint)
+        return checkpoints
+
+    # --------------------------------------------------------------------- #
+    # Write helpers
+    # --------------------------------------------------------------------- #
+
+    def delete_checkpoint(self, associate_id: int, period_end_utc: str) -> None:
+        """Remove every row of a checkpoint (caller controls the transaction)."""
+        self.db.execute(
+            "DELETE FROM period_closing_balances WHERE associate_id = ? AND period_end_utc = ?",
+            (associate_id, period_end_utc),
+        )
+
+    def insert_checkpoint(self, checkpoint: PeriodCheckpoint, *, closed_by: str) -> None:
+        """Insert an associate checkpoint and its bookmaker rows (no commit)."""
+        self.db.execute(
+            """
+            INSERT INTO period_closing_balances (
+                period_end_utc, associate_id, bookmaker_id, through_entry_id,
+                deposits_eur, withdrawals_eur, net_deposits_eur, fair_share_eur,
+                should_hold_eur, holdings_eur, imbalance_eur, closed_by
+            ) VALUES (?, ?, NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                checkpoint.period_end_utc,
+                checkpoint.associate_id,
+                checkpoint.through_entry_id,
+                str(checkpoint.deposits_eur),
+                str(checkpoint.signed_withdrawals_eur),
+                str(checkpoint.net_deposits_eur),
+                str(checkpoint.fair_share_eur),
+                str(checkpoint.should_hold_eur),
+                str(checkpoint.holdings_eur),
+                str(checkpoint.imbalance_eur),
+                closed_by,
+            ),
+        )
+        self.db.executemany(
+            """
+            INSERT INTO period_closing_balances (
+                period_end_utc, associate_id, bookmaker_id, through_entry_id,
+                deposits_eur, withdrawals_eur, holdings_eur, balance_native,
+                native_currency, closed_by
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    checkpoint.period_end_utc,
+                    checkpoint.associate_id,
+                    bookmaker.bookmaker_id,
+                    checkpoint.through_entry_id,
+                    str(bookmaker.deposits_eur),
+                    str(bookmaker.withdrawals_eur),
+                    str(bookmaker.balance_eur),
+                    str(bookmaker.balance_native),
+                    bookmaker.native_currency,
+                    closed_by,
+                )
+                for bookmaker in checkpoint.bookmakers.values()
+            ],
+        )
+
+
+__all__ = [
+    "BookmakerCheckpoint",
+    "PeriodCheckpoint",
+    "PeriodClosingBalanceRepository",
+    "normalize_period_end",
+]
@@ -0,0 +1,104 @@
+"""
+Repository helpers for the telegram_file_cache table.
+
+Telegram returns a reusable ``file_id`` for every uploaded photo. Caching it by
+the screenshot's SHA-256 lets later sends reference the file instead of
+uploading the same bytes again.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Dict, Iterable, Optional
+
+from src.core.database import get_db_connection
+from src.utils.datetime_helpers import utc_now_iso
+
+
+class TelegramFileCacheRepository:
+    """Persist and query screenshot hash -> Telegram file_id mappings."""
+
+    def __init__(self, db: Optional[sqlite3.Connection] = None) -> None:
+        self._db = db or get_db_connection()
+        self._owns_connection = db is None
+
+    def close(self) -> None:
+        """Close the owned database connection, if any."""
+        if self._owns_connection:
+            try:
+                self._db.close()
+            except Exception:  # pragma: no cover - defensive cleanup
+                pass
+
+    def get_file_ids(self, sha256_hashes: Iterable[Optional[str]]) -> Dict[str, str]:
+        """Return cached file_ids keyed by screenshot hash (misses are omitted)."""
+        hashes = sorted({value for value in sha256_hashes if value})
+        if not hashes:
+            return {}
+        placeholders = ",".join("?" for _ in hashes)
+        cursor = self._db.execute(
+            f"""
+            SELECT screenshot_sha256, file_id
+            FROM telegram_file_cache
+            WHERE screenshot_sha256 IN ({placeholders})
+            """,
+            hashes,
+        )
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
+    def store_file_id(
+        self,
+        sha256_hash: str,
+        file_id: str,
+        file_unique_id: Optional[str] = None,
+    ) -> None:
+        """Insert or refresh the file_id recorded for a screenshot hash."""
+        now = utc_now_iso()
+        self._db.execute(
+            """
+            INSERT INTO telegram_file_cache (
+                screenshot_sha256,
+                file_id,
+                file_unique_id,
+                created_at_utc,
+                last_used_at_utc
+            ) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(screenshot_sha256) DO UPDATE SET
+                file_id = excluded.file_id,
+                file_unique_id = excluded.file_unique_id,
+                last_used_at_utc = excluded.last_used_at_utc
+            """,
+            (sha256_hash, file_id, file_unique_id, now, now),
+        )
+        self._db.commit()
+
+    def touch(self, sha256_hashes: Iterable[str]) -> None:
+        """Record that cached file_ids were reused."""
+        hashes = sorted({value for value in sha256_hashes if value})
+        if not hashes:
+            return
+        placeholders = ",".join("?" for _ in hashes)
+        self._db.execute(
+            f"""
+            UPDATE telegram_file_cache
+            SET last_used_at_utc = ?
+            WHERE screenshot_sha256 IN ({placeholders})
+            """,
+            [utc_now_iso(), *hashes],
+        )
+        self._db.commit()
+
+    def invalidate(self, sha256_hashes: Iterable[str]) -> None:
+        """Drop cached file_ids that Telegram no longer accepts."""
+        hashes = sorted({value for value in sha256_hashes if value})
+        if not hashes:
+            return
+        placeholders = ",".join("?" for _ in hashes)
+        self._db.execute(
+            f"DELETE FROM telegram_file_cache WHERE screenshot_sha256 IN ({placeholders})",
+            hashes,
+        )
+        self._db.commit()
+
+
+__all__ = ["TelegramFileCacheRepository"]
@@ -18,6 +18,8 @@ import pandas as pd
 import structlog
 
 from src.core.database import get_db_connection
+from src.services.ledger_archive_service import ledger_relation
+from src.utils.datetime_helpers import to_epoch_ms
 
 logger = structlog.get_logger(__name__)
 
@@ -308,7 +310,8 @@ class BalanceHistoryService:
         if cache_key in self._metric_cache:
             return self._metric_cache[cache_key]
 
-        params: List[object] = [associate_id, cutoff, bookmaker_id]
+        params: List[object] = [associate_id, to_epoch_ms(cutoff), bookmaker_id]
+        ledger = ledger_relation(self.db)
 
         sql = f"""
             SELECT
@@ -317,9 +320,9 @@ class BalanceHistoryService:
                 COALESCE(SUM(CASE WHEN type = 'BET_RESULT'
                     THEN CAST(per_surebet_share_eur AS REAL) ELSE 0 END), 0) AS fs_eur,
                 COALESCE(SUM(CAST(amount_eur AS REAL)), 0) AS ledger_total
-            FROM ledger_entries
+            FROM {ledger}
             WHERE associate_id = ?
-              AND created_at_utc <= ?
+              AND created_at_ms <= ?
               AND (bookmaker_id IS NULL OR bookmaker_id = ?)
         """
         cursor = self.db.execute(sql, params)
@@ -6,11 +6,13 @@ This module provides:
 - Database updates with extracted bet data
 - Extraction logging and audit trail
 - Error handling for failed extractions
+- Bounded parallel extraction for multi-file uploads
 """
 
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from decimal import Decimal
-from typing import Optional, Dict, Any
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Tuple
 
 import structlog
 
@@ -19,6 +21,7 @@ from src.integrations.openai_client import OpenAIClient
 from src.services.market_normalizer import MarketNormalizer
 from src.services.event_normalizer import EventNormalizer
 from src.services.bet_verification import BetVerificationService
+from src.services.exposure_service import ExposureService
 from src.core.config import Config
 from src.utils.datetime_helpers import utc_now_iso
 
@@ -139,6 +142,8 @@ class BetIngestionService:
             except Exception as e:
                 logger.error("auto_event_create_on_ocr_failed", bet_id=bet_id, error=str(e))
 
+            self._flag_exposure_limits(bet_id)
+
             logger.info(
                 "bet_extraction_completed",
                 bet_id=bet_id,
@@ -162,6 +167,70 @@ class BetIngestionService:
             # Bet remains in "incoming" status for manual entry
             return False
 
+    @staticmethod
+    def process_bet_extractions(
+        bet_ids: Sequence[int],
+        *,
+        max_workers: Optional[int] = None,
+        connection_factory: Callable[[], sqlite3.Connection] = get_db_connection,
+    ) -> Iterator[Tuple[int, bool, Optional[str]]]:
+        """
+        Run OCR extraction for several bets on a bounded worker pool.
+
+        Each worker opens its own connection, so the OCR calls overlap and the
+        batch takes roughly as long as the slowest screenshot. Results are
+        yielded in completion order for progress reporting.
+
+        Args:
+            bet_ids: Bets whose screenshots should be extracted.
+            max_workers: Pool size; defaults to ``Config.OCR_MAX_WORKERS``.
+            connection_factory: Creates the per-extraction connection.
+
+        Yields:
+            ``(bet_id, success, error)`` tuples; ``error`` is set when the
+            extraction raised instead of returning False.
+        """
+        if not bet_ids:
+            return
+        workers = max(1, min(max_workers or Config.OCR_MAX_WORKERS, len(bet_ids)))
+
+        def _extract(bet_id: int) -> bool:
+            conn = connection_factory()
+            try:
+                return BetIngestionService(conn).process_bet_extraction(bet_id)
+            finally:
+                conn.close()
+
+        logger.info("batch_extraction_started", bets=len(bet_ids), workers=workers)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr") as pool:
+            futures = {pool.submit(_extract, bet_id): bet_id for bet_id in bet_ids}
+            for future in as_completed(futures):
+                bet_id = futures[future]
+                try:
+                    yield bet_id, bool(future.result()), None
+                except Exception as exc:
+                    logger.error("batch_extraction_failed", bet_id=bet_id, error=str(exc))
+                    yield bet_id, False, str(exc)
+
+    def _flag_exposure_limits(self, bet_id: int) -> None:
+        """Warn early when an extracted bet would breach associate limits.
+
+        Approval enforces the limits; this only surfaces the breach while the
+        bet is still incoming and never fails the extraction.
+        """
+        try:
+            bet = self._get_bet_by_id(bet_id)
+            breaches = ExposureService(self.db).check_bet(bet) if bet else []
+        except Exception as e:
+            logger.warning("bet_exposure_check_failed", bet_id=bet_id, error=str(e))
+            return
+        if breaches:
+            logger.warning(
+                "bet_exposure_limit_exceeded",
+                bet_id=bet_id,
+                breaches=[breach.message for breach in breaches],
+            )
+
     def _get_bet_by_id(self, bet_id: int) -> Optional[Dict[str, Any]]:
         """
         Retrieve bet record from database.
@@ -10,13 +10,16 @@ This module handles the verification of incoming bets, including:
 
 import sqlite3
 import structlog
-import re
-from datetime import datetime, UTC, timedelta
+from datetime import datetime, UTC
 from typing import Dict, Any, Optional, List, Tuple
 from decimal import Decimal
 from rapidfuzz import fuzz
+from src.services.canonical_event_index import DAY_MS, CanonicalEventIndex, get_event_index
+from src.services.event_dedup_service import resolve_event_id
 from src.services.event_normalizer import EventNormalizer
+from src.services.exposure_service import ExposureService
 from src.services.stake_ledger_service import StakeLedgerService
+from src.utils.datetime_helpers import to_epoch_ms
 
 logger = structlog.get_logger()
 
@@ -63,6 +66,8 @@ class BetVerificationService:
 
         Raises:
             ValueError: If bet not found or already processed
+            ExposureLimitError: If the stake would exceed the associate's
+                per-surebet stake or per-bookmaker exposure limit
         """
         # Load current bet
         bet = self._load_bet(bet_id)
@@ -133,18 +138,11 @@ class BetVerificationService:
                         sport_filter = sport.lower() if isinstance(sport, str) else None
                         if pair:
                             _, _, pair_key = pair
-                            row = self.db.execute(
-                                """
-                                SELECT id FROM canonical_events
-                                WHERE (? IS NULL OR sport = ?)
-                                  AND pair_key = ?
-                                ORDER BY id DESC
-                                LIMIT 1
-                                """,
-                                (sport_filter, sport_filter, pair_key),
-                            ).fetchone()
-                            if row:
-                                event_id = int(row[0])
+                            matches = get_event_index(self.db).by_pair_key(
+                                pair_key, sport=sport_filter, limit=1
+                            )
+                            if matches:
+                                event_id = matches[0].id
                                 logger.info(
                                     "canonical_event_auto_assigned_relaxed_match",
                                     bet_id=bet_id,
@@ -202,8 +200,13 @@ class BetVerificationService:
 
         # Validate edited fields
         if edited_fields:
+            self._resolve_merged_event(edited_fields)
             self._validate_bet_fields(edited_fields)
 
+        # Reject approvals that would exceed the associate's stake/exposure limits
+        exposure = ExposureService(self.db)
+        exposure.enforce({**bet, **edited_fields})
+
         # Log edits to verification_audit
         if edited_fields:
             self._log_edits(bet_id, bet, edited_fields, verified_by)
@@ -218,6 +221,7 @@ class BetVerificationService:
                 note=stake_note,
                 release_when_missing=False,
             )
+            exposure.sync_bets([bet_id])
             self.db.commit()
         except Exception:
             self.db.rollback()
@@ -382,20 +386,17 @@ class BetVerificationService:
         if not kickoff_time_utc or not self._validate_iso8601_utc(kickoff_time_utc):
             raise ValueError("Kickoff time is required")
         # Try exact pair_key match first
-        if pair:
+        if pair and sport:
             team1_slug, team2_slug, pair_key = pair
-            row = self.db.execute(
-                "SELECT id FROM canonical_events WHERE sport = ? AND pair_key = ? ORDER BY id DESC LIMIT 1",
-                (sport.lower() if sport else None, pair_key),
-            ).fetchone()
-            if row:
+            matches = get_event_index(self.db).by_pair_key(pair_key, sport=sport.lower(), limit=1)
+            if matches:
                 logger.info(
                     "canonical_event_matched_pair_key",
                     bet_id=bet_id,
-                    event_id=row[0],
+                    event_id=matches[0].id,
                     pair_key=pair_key,
                 )
-                return int(row[0])
+                return matches[0].id
 
         # Try fuzzy matching first; if it fails, as a safety net try pair_key reuse again
         if sport and kickoff_time_utc:
@@ -415,18 +416,17 @@ class BetVerificationService:
             pair = EventNormalizer.compute_pair_key(event_name)
             if pair:
                 _, _, pk = pair
-                row = self.db.execute(
-                    "SELECT id FROM canonical_events WHERE (? IS NULL OR sport = ?) AND pair_key = ? ORDER BY id DESC LIMIT 1",
-                    (sport.lower() if sport else None, sport.lower() if sport else None, pk),
-                ).fetchone()
-                if row:
+                matches = get_event_index(self.db).by_pair_key(
+                    pk, sport=sport.lower() if sport else None, limit=1
+                )
+                if matches:
                     logger.info(
                         "canonical_event_matched_pair_key_fallback",
                         bet_id=bet_id,
-                        event_id=row[0],
+                        event_id=matches[0].id,
                         pair_key=pk,
                     )
-                    return int(row[0])
+                    return matches[0].id
 
         # No match found, create new event
         event_id = self._create_canonical_event(
@@ -481,6 +481,9 @@ class BetVerificationService:
         event_id = cursor.lastrowid
         if event_id is None:
             raise ValueError("Failed to create canonical event (relaxed)")
+        get_event_index(self.db).add(
+            event_id, event_name, sport=sport.lower(), pair_key=pk, kickoff_time_utc=kickoff_time_utc
+        )
         return int(event_id)
 
     def update_verified_bet(
@@ -502,6 +505,7 @@ class BetVerificationService:
 
         # Validate edited fields
         if edited_fields:
+            self._resolve_merged_event(edited_fields)
             self._validate_bet_fields(edited_fields)
 
         # Log diffs
@@ -531,6 +535,7 @@ class BetVerificationService:
                         note=stake_note,
                         release_when_missing=True,
                     )
+                    ExposureService(self.db).sync_bets([bet_id])
                 self.db.commit()
             except Exception:
                 self.db.rollback()
@@ -570,50 +575,26 @@ class BetVerificationService:
         # Parse kickoff time
         try:
             kickoff_dt = datetime.fromisoformat(kickoff_time_utc.replace("Z", "+00:00"))
+            kickoff_ms = to_epoch_ms(kickoff_dt)
         except (ValueError, AttributeError):
+            kickoff_ms = None
+        if kickoff_ms is None:
             logger.warning("invalid_kickoff_time", kickoff_time=kickoff_time_utc)
             return None
 
-        # Calculate time window (±24 hours)
-        time_start = (
-            (kickoff_dt - timedelta(hours=24)).isoformat().replace("+00:00", "Z")
-        )
-        time_end = (kickoff_dt + timedelta(hours=24)).isoformat().replace("+00:00", "Z")
-
-        # Query events in time window with matching sport
-        cursor = self.db.execute(
-            """
-            SELECT id, normalized_event_name, kickoff_time_utc
-            FROM canonical_events
-            WHERE sport = ?
-              AND kickoff_time_utc >= ?
-              AND kickoff_time_utc <= ?
-            """,
-            (sport, time_start, time_end),
-        )
-        candidates = cursor.fetchall()
+        # Events of the same sport within ±24 hours, from the (sport, day) blocks
+        index = get_event_index(self.db)
+        candidates = index.in_window(kickoff_ms - DAY_MS, kickoff_ms + DAY_MS, sport=sport)
 
         if not candidates:
             return None
 
-        # Normalize input event name
-        normalized_input = self._normalize_event_name(event_name)
-
-        # Find best match using fuzzy matching
-        best_match_id = None
-        best_score = 0.0
-
-        for row in candidates:
-            candidate_id = row[0]
-            candidate_name = row[1]
-            normalized_candidate = self._normalize_event_name(candidate_name)
-
-            # Calculate similarity score
-            score = fuzz.ratio(normalized_input, normalized_candidate)
-
-            if score > best_score:
-                best_score = score
-                best_match_id = candidate_id
+        # Best match in one rapidfuzz pass over the punctuation-free names
+        matches = CanonicalEventIndex.score(
+            event_name, candidates, scorer=fuzz.ratio, score_cutoff=80.0, limit=1
+        )
+        best_match_id = matches[0][0].id if matches else None
+        best_score = matches[0][1] if matches else 0.0
 
         # Return match if above threshold (80%)
         if best_score > 80.0:
@@ -633,23 +614,6 @@ class BetVerificationService:
         )
         return None
 
-    def _normalize_event_name(self, name: str) -> str:
-        """Normalize event name for fuzzy matching.
-
-        Args:
-            name: Raw event name
-
-        Returns:
-            Normalized name (lowercase, punctuation removed, whitespace normalized)
-        """
-        # Lowercase
-        normalized = name.lower()
-        # Remove punctuation
-        normalized = re.sub(r"[^\w\s]", "", normalized)
-        # Normalize whitespace
-        normalized = " ".join(normalized.split())
-        return normalized
-
     def _create_canonical_event(
         self,
         event_name: str,
@@ -713,6 +677,9 @@ class BetVerificationService:
 
         if event_id is None:
             raise ValueError("Failed to create canonical event: no ID returned")
+        get_event_index(self.db).add(
+            event_id, event_name, sport=sport.lower(), pair_key=pk, kickoff_time_utc=kickoff_time_utc
+        )
 
         logger.info(
             "canonical_event_created",
@@ -812,6 +779,11 @@ class BetVerificationService:
         row = cursor.fetchone()
         return dict(row) if row else None
 
+    def _resolve_merged_event(self, fields: Dict[str, Any]) -> None:
+        """Swap an event merged by the dedup job (e.g. picked from a stale list) for its survivor."""
+        if fields.get("canonical_event_id"):
+            fields["canonical_event_id"] = resolve_event_id(self.db, fields["canonical_event_id"])
+
     def _validate_bet_fields(self, fields: Dict[str, Any]) -> None:
         """Validate edited bet fields.
 
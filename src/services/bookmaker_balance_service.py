@@ -16,6 +16,7 @@ from typing import Dict, Iterable, List, Optional, Tuple
 from src.core.database import get_db_connection
 from src.repositories import BookmakerBalanceCheckRepository
 from src.services.fx_manager import convert_to_eur, get_latest_fx_rate
+from src.services.ledger_archive_service import ledger_relation
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -121,8 +122,9 @@ class BookmakerBalanceService:
         """Return modeled vs. reported balances with mismatch status."""
         latest_checks = self.repository.get_latest_checks_map()
 
+        ledger = ledger_relation(self.db)
         rows = self.db.execute(
-            """
+            f"""
             SELECT
                 a.id AS associate_id,
                 a.display_alias AS associate_alias,
@@ -133,7 +135,7 @@ class BookmakerBalanceService:
                 COALESCE(SUM(CAST(le.amount_eur AS REAL)), 0) AS modeled_balance_eur
             FROM associates a
             JOIN bookmakers b ON b.associate_id = a.id
-            LEFT JOIN ledger_entries le
+            LEFT JOIN {ledger} le
                 ON le.associate_id = a.id
                 AND le.bookmaker_id = b.id
             WHERE a.is_active = 1
@@ -161,8 +163,9 @@ class BookmakerBalanceService:
         self, associate_id: int, bookmaker_id: int
     ) -> BookmakerBalance:
         """Return a single bookmaker balance snapshot."""
+        ledger = ledger_relation(self.db)
         row = self.db.execute(
-            """
+            f"""
             SELECT
                 a.id AS associate_id,
                 a.display_alias AS associate_alias,
@@ -173,7 +176,7 @@ class BookmakerBalanceService:
                 COALESCE(SUM(CAST(le.amount_eur AS REAL)), 0) AS modeled_balance_eur
             FROM associates a
             JOIN bookmakers b ON b.associate_id = a.id
-            LEFT JOIN ledger_entries le
+            LEFT JOIN {ledger} le
                 ON le.associate_id = a.id
                 AND le.bookmaker_id = b.id
             WHERE a.id = ?
@@ -8,12 +8,14 @@ with dual-currency representations (native + EUR).
 from __future__ import annotations
 
 import sqlite3
+import threading
 from dataclasses import dataclass, field
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from src.core.database import get_db_connection
+from src.core.database import database_file_key, get_db_connection
 from src.services.fx_manager import get_latest_fx_rate
+from src.services.ledger_archive_service import ledger_relation
 from src.services.settlement_constants import SETTLEMENT_NOTE_PREFIX
 from src.utils.logging_config import get_logger
 
@@ -21,6 +23,11 @@ logger = get_logger(__name__)
 
 TWO_PLACES = Decimal("0.01")
 
+# Tables found per database file, shared by every connection to it. Only hits
+# are recorded, so a table created later is still picked up.
+_KNOWN_TABLES: Dict[Tuple[str, int, int], Set[str]] = {}
+_KNOWN_TABLES_LOCK = threading.Lock()
+
 
 @dataclass(frozen=True)
 class BookmakerFinancialSnapshot:
@@ -72,6 +79,8 @@ class BookmakerFinancialsService:
     def __init__(self, db: Optional[sqlite3.Connection] = None) -> None:
         self._owns_connection = db is None
         self.db = db or get_db_connection()
+        self._existing_tables: Optional[Set[str]] = None
+        self._ledger: Optional[str] = None
 
     def close(self) -> None:
         """Close owned database connection."""
@@ -93,6 +102,7 @@ class BookmakerFinancialsService:
 
         balance_select, balance_join = self._build_balance_segments(has_balance_table)
         chat_select, chat_join = self._build_chat_segments(has_chat_table)
+        ledger = self._ledger_relation()
 
         query = f"""
             SELECT
@@ -125,7 +135,8 @@ class BookmakerFinancialsService:
                         END
                     ) AS pending_eur
                 FROM bets
-                WHERE status IN ('verified', 'matched')
+                WHERE associate_id = :associate_id
+                  AND status IN ('verified', 'matched')
                 GROUP BY associate_id, bookmaker_id
             ) pending ON pending.bookmaker_id = b.id AND pending.associate_id = b.associate_id
             LEFT JOIN (
@@ -139,10 +150,11 @@ class BookmakerFinancialsService:
                             ELSE 0
                         END
                     ) AS net_deposits_eur
-                FROM ledger_entries
-                WHERE bookmaker_id IS NOT NULL
+                FROM {ledger}
+                WHERE associate_id = :associate_id
+                  AND bookmaker_id IS NOT NULL
                   AND type IN ('DEPOSIT', 'WITHDRAWAL')
-                  AND (note IS NULL OR note NOT LIKE ?)
+                  AND (note IS NULL OR note NOT LIKE :settlement_filter)
                 GROUP BY associate_id, bookmaker_id
             ) funding ON funding.bookmaker_id = b.id AND funding.associate_id = b.associate_id
             LEFT JOIN (
@@ -152,17 +164,22 @@ class BookmakerFinancialsService:
                     SUM(
                         COALESCE(CAST(per_surebet_share_eur AS REAL), 0)
                     ) AS surebet_profit_eur
-                FROM ledger_entries
-                WHERE bookmaker_id IS NOT NULL
+                FROM {ledger}
+                WHERE associate_id = :associate_id
+                  AND bookmaker_id IS NOT NULL
                   AND type = 'BET_RESULT'
                 GROUP BY associate_id, bookmaker_id
             ) entitlements ON entitlements.bookmaker_id = b.id AND entitlements.associate_id = b.associate_id
-            WHERE b.associate_id = ?
+            WHERE b.associate_id = :associate_id
             ORDER BY b.bookmaker_name ASC
         """
 
+        # Every aggregate is restricted to this associate's rows before grouping
         settlement_filter = f"{SETTLEMENT_NOTE_PREFIX}%"
-        cursor = self.db.execute(query, (settlement_filter, associate_id))
+        cursor = self.db.execute(
+            query,
+            {"associate_id": associate_id, "settlement_filter": settlement_filter},
+        )
         rows = cursor.fetchall()
 
         fx_cache: Dict[str, Optional[Decimal]] = {}
@@ -252,6 +269,9 @@ class BookmakerFinancialsService:
                         ORDER BY check_date_utc DESC, id DESC
                     ) AS rn
                 FROM bookmaker_balance_checks
+                WHERE bookmaker_id IN (
+                    SELECT id FROM bookmakers WHERE associate_id = :associate_id
+                )
             ) lb ON lb.bookmaker_id = b.id AND lb.rn = 1
         """
         return select_clause, join_clause
@@ -271,6 +291,9 @@ class BookmakerFinancialsService:
                         ORDER BY updated_at_utc DESC, created_at_utc DESC, id DESC
                     ) AS rn
                 FROM chat_registrations
+                WHERE bookmaker_id IN (
+                    SELECT id FROM bookmakers WHERE associate_id = :associate_id
+                )
             ) chat_latest ON chat_latest.bookmaker_id = b.id AND chat_latest.rn = 1
         """
         return select_clause, join_clause
@@ -349,12 +372,45 @@ class BookmakerFinancialsService:
         except (InvalidOperation, TypeError):
             return None
 
+    def _known_tables(self) -> Set[str]:
+        """Tables already found in this database; in-memory ones get a private set."""
+        if self._existing_tables is None:
+            key = database_file_key(self.db)
+            if key is None:
+                self._existing_tables = set()
+            else:
+                with _KNOWN_TABLES_LOCK:
+                    self._existing_tables = _KNOWN_TABLES.setdefault(key, set())
+        return self._existing_tables
+
     def _table_exists(self, name: str) -> bool:
+        """Return whether a table exists, caching positive lookups."""
+        known = self._known_tables()
+        if name in known:
+            return True
         cursor = self.db.execute(
             "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
             (name,),
         )
-        return cursor.fetchone() is not None
+        exists = cursor.fetchone() is not None
+        if exists:
+            known.add(name)
+        return exists
+
+    def _ledger_relation(self) -> str:
+        """
+        Ledger relation for ``self.db``, cached once archives are attached.
+
+        The archive view lives on this connection, so it is kept for the
+        service's lifetime; the hot table is re-checked in case rows are
+        archived meanwhile.
+        """
+        if self._ledger is not None:
+            return self._ledger
+        relation = ledger_relation(self.db)
+        if relation != "ledger_entries":
+            self._ledger = relation
+        return relation
 
     def __enter__(self) -> "BookmakerFinancialsService":
         return self
@@ -0,0 +1,308 @@
+"""
+Process-wide in-memory index over canonical events for fuzzy matching.
+
+Event matching used to query ``canonical_events`` by kickoff window and score
+every candidate with a Python loop; with no kickoff it fell back to the most
+recent events regardless of relevance. The index keeps every event in memory,
+blocked by (sport, kickoff day), with a pair_key map and a token inverted
+index, and scores candidate blocks in one rapidfuzz ``process.extract`` call.
+
+One index is shared per database file. :func:`get_event_index` tops it up
+with rows inserted since the last call (``id`` is AUTOINCREMENT, so new rows
+always have higher IDs), which covers events written by other processes such
+as the Telegram bot; writers in this process call :meth:`CanonicalEventIndex.add`
+right after inserting. Events merged away by the dedup job are dropped the
+same way, from new ``canonical_event_aliases`` rows.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+from collections import Counter, defaultdict
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from rapidfuzz import fuzz, process
+
+from src.core.database import database_file_key
+from src.utils.datetime_helpers import to_epoch_ms
+
+DAY_MS = 86_400_000
+
+# Tokens that appear in most event names and carry no signal.
+_STOP_TOKENS = frozenset({"vs", "v", "fc", "the"})
+
+# Upper bound of events handed to the scorer from a token lookup.
+TOKEN_CANDIDATE_LIMIT = 500
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def match_key(name: Optional[str]) -> str:
+    """Lowercase ``name``, drop punctuation and collapse whitespace for scoring."""
+    if not name:
+        return ""
+    return " ".join(_PUNCTUATION.sub("", name.lower()).split())
+
+
+class IndexedEvent(NamedTuple):
+    """Canonical event fields needed for matching (a tuple keeps bulk loads cheap)."""
+
+    id: int
+    name: str
+    match_name: str
+    sport: Optional[str]
+    pair_key: Optional[str]
+    kickoff_time_utc: Optional[str]
+    kickoff_ms: Optional[int]
+
+
+class CanonicalEventIndex:
+    """Blocked candidate index over ``canonical_events``."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._events: Dict[int, IndexedEvent] = {}
+        self._blocks: Dict[Tuple[Optional[str], Optional[int]], Set[int]] = defaultdict(set)
+        self._sports: Set[Optional[str]] = set()
+        self._pair_keys: Dict[str, Set[int]] = defaultdict(set)
+        self._tokens: Dict[str, Set[int]] = defaultdict(set)
+        self.max_id = 0
+        self.max_alias_id = 0
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def refresh(self, conn: sqlite3.Connection) -> int:
+        """
+        Load rows inserted since the last refresh and drop newly merged events.
+
+        Returns:
+            Number of events added
+        """
+        with self._lock:
+            rows = conn.execute(
+                """
+                SELECT id, normalized_event_name, sport, pair_key, kickoff_time_utc, kickoff_ms
+                FROM canonical_events
+                WHERE id > ?
+                ORDER BY id
+                """,
+                (self.max_id,),
+            ).fetchall()
+            for row in rows:
+                self._index(
+                    IndexedEvent(row[0], row[1] or "", match_key(row[1]), *row[2:6])
+                )
+            try:
+                merged = conn.execute(
+                    "SELECT id, merged_event_id FROM canonical_event_aliases WHERE id > ? ORDER BY id",
+                    (self.max_alias_id,),
+                ).fetchall()
+            except sqlite3.OperationalError:
+                # Databases created before the alias table existed.
+                merged = []
+            for alias_id, event_id in merged:
+                self.discard(event_id)
+                self.max_alias_id = alias_id
+            return len(rows)
+
+    def add(
+        self,
+        event_id: int,
+        name: Optional[str],
+        *,
+        sport: Optional[str] = None,
+        pair_key: Optional[str] = None,
+        kickoff_time_utc: Optional[str] = None,
+        kickoff_ms: Optional[int] = None,
+    ) -> IndexedEvent:
+        """
+        Index one event, replacing any previous entry with the same ID.
+
+        ``kickoff_ms`` defaults to the conversion of ``kickoff_time_utc``.
+        """
+        if kickoff_ms is None and kickoff_time_utc:
+            kickoff_ms = to_epoch_ms(kickoff_time_utc)
+        event = IndexedEvent(
+            id=int(event_id),
+            name=name or "",
+            match_name=match_key(name),
+            sport=sport,
+            pair_key=pair_key,
+            kickoff_time_utc=kickoff_time_utc,
+            kickoff_ms=kickoff_ms,
+        )
+        with self._lock:
+            self._index(event)
+        return event
+
+    def _index(self, event: IndexedEvent) -> None:
+        """Add ``event`` to every lookup; the caller holds the lock."""
+        if event.id in self._events:
+            self.discard(event.id)
+        self._events[event.id] = event
+        self._blocks[(event.sport, self._day(event.kickoff_ms))].add(event.id)
+        self._sports.add(event.sport)
+        if event.pair_key:
+            self._pair_keys[event.pair_key].add(event.id)
+        for token in self._tokenize(event.match_name):
+            self._tokens[token].add(event.id)
+        if event.id > self.max_id:
+            self.max_id = event.id
+
+    def discard(self, event_id: int) -> None:
+        """Remove an event (e.g. after it was merged away); unknown IDs are ignored."""
+        with self._lock:
+            event = self._events.pop(int(event_id), None)
+            if event is None:
+                return
+            self._blocks[(event.sport, self._day(event.kickoff_ms))].discard(event.id)
+            if event.pair_key:
+                self._pair_keys[event.pair_key].discard(event.id)
+            for token in self._tokenize(event.match_name):
+                self._tokens[token].discard(event.id)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def get(self, event_id: int) -> Optional[IndexedEvent]:
+        return self._events.get(int(event_id))
+
+    def by_pair_key(
+        self, pair_key: Optional[str], *, sport: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[IndexedEvent]:
+        """Events sharing ``pair_key``, newest first, optionally restricted to ``sport``."""
+        if not pair_key:
+            return []
+        with self._lock:
+            ids = sorted(self._pair_keys.get(pair_key, ()), reverse=True)
+            events = [self._events[event_id] for event_id in ids]
+        if sport is not None:
+            events = [event for event in events if event.sport == sport]
+        return events[:limit] if limit is not None else events
+
+    def in_window(
+        self, start_ms: int, end_ms: int, *, sport: Optional[str] = None
+    ) -> List[IndexedEvent]:
+        """Events whose kickoff falls within ``[start_ms, end_ms]``, in ID order."""
+        with self._lock:
+            sports = [sport] if sport is not None else list(self._sports)
+            ids: List[int] = []
+            for day in range(start_ms // DAY_MS, end_ms // DAY_MS + 1):
+                for block_sport in sports:
+                    ids.extend(self._blocks.get((block_sport, day), ()))
+            events = [self._events[event_id] for event_id in sorted(ids)]
+        return [
+            event
+            for event in events
+            if event.kickoff_ms is not None and start_ms <= event.kickoff_ms <= end_ms
+        ]
+
+    def sharing_tokens(
+        self, query: str, *, sport: Optional[str] = None, limit: int = TOKEN_CANDIDATE_LIMIT
+    ) -> List[IndexedEvent]:
+        """Events sharing at least one token with ``query``, most shared tokens first."""
+        counts: Counter = Counter()
+        with self._lock:
+            for token in self._tokenize(match_key(query)):
+                counts.update(self._tokens.get(token, ()))
+            events = [self._events[event_id] for event_id, _ in counts.most_common()]
+        if sport is not None:
+            events = [event for event in events if event.sport == sport]
+        return events[:limit]
+
+    def search(
+        self,
+        query: str,
+        *,
+        sport: Optional[str] = None,
+        kickoff_ms: Optional[int] = None,
+        window_ms: Optional[int] = None,
+        scorer: Callable[..., float] = fuzz.token_set_ratio,
+        score_cutoff: float = 0.0,
+        limit: Optional[int] = 5,
+    ) -> List[Tuple[IndexedEvent, float]]:
+        """
+        Score candidate events against ``query`` and return the best matches.
+
+        Candidates are the (sport, day) blocks covering ``kickoff_ms ± window_ms``
+        when a kickoff is given, otherwise the events sharing a token with the
+        query. Names are compared in :func:`match_key` form.
+
+        Returns:
+            ``(event, score)`` pairs, best first, all scoring at least ``score_cutoff``
+        """
+        if kickoff_ms is not None:
+            window = window_ms or 0
+            candidates = self.in_window(kickoff_ms - window, kickoff_ms + window, sport=sport)
+        else:
+            candidates = self.sharing_tokens(query, sport=sport)
+        return self.score(query, candidates, scorer=scorer, score_cutoff=score_cutoff, limit=limit)
+
+    @staticmethod
+    def score(
+        query: str,
+        candidates: Iterable[IndexedEvent],
+        *,
+        scorer: Callable[..., float] = fuzz.token_set_ratio,
+        score_cutoff: float = 0.0,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[IndexedEvent, float]]:
+        """Score ``candidates`` with a single ``process.extract`` call."""
+        by_id = {event.id: event for event in candidates}
+        if not by_id:
+            return []
+        matches = process.extract(
+            match_key(query),
+            {event_id: event.match_name for event_id, event in by_id.items()},
+            scorer=scorer,
+            score_cutoff=score_cutoff,
+            limit=limit,
+        )
+        return [(by_id[event_id], float(score)) for _, score, event_id in matches]
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _day(kickoff_ms: Optional[int]) -> Optional[int]:
+        return kickoff_ms // DAY_MS if kickoff_ms is not None else None
+
+    @staticmethod
+    def _tokenize(match_name: str) -> List[str]:
+        return [token for token in match_name.split() if token not in _STOP_TOKENS]
+
+
+_INDEXES: Dict[Tuple[str, int, int], CanonicalEventIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_event_index(conn: sqlite3.Connection) -> CanonicalEventIndex:
+    """
+    Return the shared index for ``conn``'s database, refreshed with new rows.
+
+    In-memory databases cannot be shared between connections, so they get a
+    fresh index on every call.
+    """
+    key = database_file_key(conn)
+    if key is None:
+        index = CanonicalEventIndex()
+    else:
+        with _INDEXES_LOCK:
+            index = _INDEXES.setdefault(key, CanonicalEventIndex())
+    index.refresh(conn)
+    return index
+
+
+def invalidate_event_indexes() -> None:
+    """Drop every shared index; the next :func:`get_event_index` reloads from disk."""
+    with _INDEXES_LOCK:
+        _INDEXES.clear()
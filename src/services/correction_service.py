@@ -16,7 +16,9 @@ from typing import List, Optional
 from src.core.database import get_db_connection
 from src.services.fx_manager import get_fx_rate, get_latest_fx_rate
 from src.services.delta_provenance_service import DeltaProvenanceService
+from src.services.ledger_archive_service import ledger_relation
 from src.utils.database_utils import TransactionError, transactional
+from src.utils.datetime_helpers import to_epoch_ms
 from src.utils.logging_config import get_logger
 
 
@@ -167,9 +169,9 @@ class CorrectionService:
             hour=0, minute=0, second=0, microsecond=0
         )
         cutoff = cutoff - timedelta(days=days)
-        cutoff_str = cutoff.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        ledger = ledger_relation(self.db)
 
-        query = """
+        query = f"""
             SELECT
                 le.id,
                 le.created_at_utc,
@@ -185,21 +187,21 @@ class CorrectionService:
                 le.created_by,
                 le.opposing_associate_id,
                 ssl.id as settlement_link_id
-            FROM ledger_entries le
+            FROM {ledger} le
             JOIN associates a ON le.associate_id = a.id
             LEFT JOIN bookmakers b ON le.bookmaker_id = b.id
             LEFT JOIN surebet_settlement_links ssl ON le.id = ssl.winner_ledger_entry_id
             WHERE le.type = 'BOOKMAKER_CORRECTION'
-                AND le.created_at_utc >= ?
+                AND le.created_at_ms >= ?
         """
 
-        params = [cutoff_str]
+        params = [to_epoch_ms(cutoff)]
 
         if associate_id is not None:
             query += " AND le.associate_id = ?"
             params.append(associate_id)
 
-        query += " ORDER BY le.created_at_utc DESC, le.id DESC"
+        query += " ORDER BY le.created_at_ms DESC, le.id DESC"
         cursor = self.db.execute(query, params)
         rows = cursor.fetchall()
 
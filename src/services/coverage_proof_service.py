@@ -6,23 +6,29 @@ This module handles:
 - Sending coverage proof messages to associates' multibook chats
 - Tracking coverage proof delivery status
 - Rate limiting Telegram API calls
+- Reusing Telegram file_ids for screenshots that were already uploaded
 """
 
 import asyncio
+import hashlib
 import json
 import sqlite3
 import time
 from collections import OrderedDict
+from contextlib import ExitStack
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import IO, Any, Dict, List, Optional, Tuple, Union
 
 from telegram import Bot
-from telegram.error import TelegramError
+from telegram.error import BadRequest, TelegramError
 
 from src.core.config import Config
 from src.core.database import get_db_connection
+from src.repositories.telegram_file_cache_repository import (
+    TelegramFileCacheRepository,
+)
 from src.services.rate_limit_settings import (
     ChatRateLimitSettings,
     RateLimitSettingsStore,
@@ -94,6 +100,10 @@ class CoverageProofService:
         )
         self._rate_limit_profiles_version = self._rate_limit_store.current_version()
 
+        # Telegram file_id reuse for screenshots already uploaded once
+        self._file_cache = TelegramFileCacheRepository(self.db)
+        self._screenshot_hashes: Dict[str, str] = {}
+
     def close(self) -> None:
         """Close database connection if owned by this service."""
         if self._owns_connection and self.db:
@@ -488,6 +498,125 @@ class CoverageProofService:
 
         self._rate_limit_tracker[chat_id].append((current_time, 1))
 
+    def _hash_screenshot(self, file_path: Path) -> Optional[str]:
+        """
+        Return the SHA-256 of a screenshot file, memoized per path.
+
+        Args:
+            file_path: Screenshot location on disk
+
+        Returns:
+            Hex digest, or None when the file cannot be read
+        """
+        key = str(file_path)
+        if key in self._screenshot_hashes:
+            return self._screenshot_hashes[key]
+
+        digest = hashlib.sha256()
+        try:
+            with open(file_path, "rb") as handle:
+                for chunk in iter(lambda: handle.read(65536), b""):
+                    digest.update(chunk)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(
+                "coverage_proof_screenshot_hash_failed", path=key, error=str(e)
+            )
+            return None
+
+        file_hash = digest.hexdigest()
+        self._screenshot_hashes[key] = file_hash
+        return file_hash
+
+    @staticmethod
+    def _build_media_group(
+        screenshots: List[Tuple[Path, Optional[str]]],
+        cached_file_ids: Dict[str, str],
+        caption: str,
+        files: ExitStack,
+    ) -> List[Any]:
+        """
+        Build the media group, referencing cached file_ids where available.
+
+        Args:
+            screenshots: (path, sha256) pairs to send
+            cached_file_ids: Known Telegram file_ids keyed by sha256
+            caption: Caption attached to the first photo
+            files: Stack that owns (and later closes) the opened screenshots
+
+        Returns:
+            List of InputMediaPhoto objects
+        """
+        from telegram import InputMediaPhoto
+
+        media_group = []
+        for i, (file_path, file_hash) in enumerate(screenshots):
+            cached = cached_file_ids.get(file_hash) if file_hash else None
+            media: Union[str, IO[bytes]] = (
+                cached if cached is not None else files.enter_context(open(file_path, "rb"))
+            )
+            # First photo includes caption
+            media_group.append(
+                InputMediaPhoto(media, caption=caption if i == 0 else None)
+            )
+        return media_group
+
+    @staticmethod
+    def _is_rejected_file_id(error: BadRequest) -> bool:
+        """
+        Check whether Telegram rejected a media reference as an unknown file_id.
+
+        Timeouts, network failures and rate limits are not covered: the media
+        group may already have been delivered, so re-sending could duplicate it.
+
+        Args:
+            error: BadRequest raised by send_media_group
+
+        Returns:
+            True when the error names an invalid or wrong file identifier
+        """
+        message = str(error.message).lower()
+        return any(
+            marker in message
+            for marker in ("file identifier", "file_id", "file id")
+        )
+
+    def _remember_file_ids(
+        self,
+        screenshots: List[Tuple[Path, Optional[str]]],
+        cached_file_ids: Dict[str, str],
+        messages: Any,
+    ) -> None:
+        """
+        Cache file_ids Telegram assigned to freshly uploaded screenshots.
+
+        Args:
+            screenshots: (path, sha256) pairs that were sent, in media group order
+            cached_file_ids: file_ids already reused for this send
+            messages: Messages returned by send_media_group
+        """
+        try:
+            self._file_cache.touch(cached_file_ids.keys())
+            for (_, file_hash), message in zip(screenshots, messages or []):
+                if not file_hash or file_hash in cached_file_ids:
+                    continue
+                photo_sizes = getattr(message, "photo", None)
+                if not photo_sizes:
+                    continue
+                # Largest size last; its file_id re-sends the full-resolution photo
+                largest = photo_sizes[-1]
+                file_id = getattr(largest, "file_id", None)
+                if not isinstance(file_id, str):
+                    continue
+                file_unique_id = getattr(largest, "file_unique_id", None)
+                self._file_cache.store_file_id(
+                    file_hash,
+                    file_id,
+                    file_unique_id if isinstance(file_unique_id, str) else None,
+                )
+        except Exception as e:
+            # Cache maintenance must never fail a delivered message
+            logger.warning("coverage_proof_file_cache_error", error=str(e))
+
     async def send_coverage_proof_to_associate(
         self,
         bot: Bot,
@@ -571,11 +700,8 @@ class CoverageProofService:
 
         # Send message with screenshots
         try:
-            # Send photos as media group (up to 10 photos per group)
-            from telegram import InputMediaPhoto
-
-            media_group = []
-            for i, path in enumerate(screenshot_paths[:10]):  # Telegram limit: 10 photos per group
+            screenshots: List[Tuple[Path, Optional[str]]] = []
+            for path in screenshot_paths[:10]:  # Telegram limit: 10 photos per group
                 # Verify file exists
                 file_path = Path(path)
                 if not file_path.exists():
@@ -585,12 +711,9 @@ class CoverageProofService:
                         associate_id=associate_id,
                     )
                     continue
+                screenshots.append((file_path, self._hash_screenshot(file_path)))
 
-                # First photo includes caption
-                caption = message_text if i == 0 else None
-                media_group.append(InputMediaPhoto(open(file_path, "rb"), caption=caption))
-
-            if not media_group:
+            if not screenshots:
                 error_msg = "No valid screenshot files found"
                 return CoverageProofResult(
                     associate_id=associate_id,
@@ -599,11 +722,40 @@ class CoverageProofService:
                     error_message=error_msg,
                 )
 
-            # Send media group
-            messages = await bot.send_media_group(
-                chat_id=int(multibook_chat_id), media=media_group
+            # Reuse file_ids from earlier uploads of the same screenshots
+            cached_file_ids = self._file_cache.get_file_ids(
+                file_hash for _, file_hash in screenshots
             )
 
+            try:
+                with ExitStack() as files:
+                    messages = await bot.send_media_group(
+                        chat_id=int(multibook_chat_id),
+                        media=self._build_media_group(
+                            screenshots, cached_file_ids, message_text, files
+                        ),
+                    )
+            except BadRequest as e:
+                if not cached_file_ids or not self._is_rejected_file_id(e):
+                    raise
+                # A cached file_id was rejected; drop it and upload the bytes again
+                logger.warning(
+                    "coverage_proof_cached_file_id_rejected",
+                    surebet_id=surebet_id,
+                    associate_id=associate_id,
+                    cached_count=len(cached_file_ids),
+                    error=str(e),
+                )
+                self._file_cache.invalidate(cached_file_ids.keys())
+                cached_file_ids = {}
+                with ExitStack() as files:
+                    messages = await bot.send_media_group(
+                        chat_id=int(multibook_chat_id),
+                        media=self._build_media_group(screenshots, {}, message_text, files),
+                    )
+
+            self._remember_file_ids(screenshots, cached_file_ids, messages)
+
             # Record rate limit
             self._record_rate_limit(multibook_chat_id)
 
@@ -616,7 +768,8 @@ class CoverageProofService:
                 associate_id=associate_id,
                 chat_id=multibook_chat_id,
                 message_id=message_id,
-                screenshot_count=len(media_group),
+                screenshot_count=len(screenshots),
+                reused_file_ids=len(cached_file_ids),
             )
 
             return CoverageProofResult(
@@ -803,8 +956,8 @@ class CoverageProofService:
         results = []
 
         # Send to Side A associates (opposite side screenshots = Side B)
+        opposite_screenshots = self.get_opposite_screenshots(surebet_id, "A")
         for associate in associates_by_side["A"]:
-            opposite_screenshots = self.get_opposite_screenshots(surebet_id, "A")
             result = await self.send_coverage_proof_to_associate(
                 bot,
                 surebet_id,
@@ -827,8 +980,8 @@ class CoverageProofService:
             )
 
         # Send to Side B associates (opposite side screenshots = Side A)
+        opposite_screenshots = self.get_opposite_screenshots(surebet_id, "B")
         for associate in associates_by_side["B"]:
-            opposite_screenshots = self.get_opposite_screenshots(surebet_id, "B")
             result = await self.send_coverage_proof_to_associate(
                 bot,
                 surebet_id,
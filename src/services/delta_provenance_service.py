@@ -6,17 +6,51 @@ their surpluses/shortfalls back to specific counterparties and surebets.
 """
 
 import sqlite3
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_UP
 from typing import List, Dict, Optional, Tuple
 import structlog
 from datetime import datetime, timezone
 
 from src.core.database import get_db_connection
-from src.core.schema import create_ledger_append_only_trigger
+from src.core.schema import (
+    COUNTERPARTY_DELTA_AGGREGATE_SQL,
+    create_ledger_append_only_trigger,
+)
+from src.services.ledger_archive_service import ledger_relation
 from src.utils.datetime_helpers import utc_now_iso
 
 logger = structlog.get_logger(__name__)
 
+LINK_BACKFILL_MARKER = "delta_provenance_link_backfill"
+
+# Links seen from one associate's side: a winner branch and a loser branch, so
+# each can use its (associate, created_at_utc) index instead of an OR scan.
+# Self-links only appear in the winner branch.
+_PROVENANCE_LINKS_SQL = """
+    SELECT
+        ssl.id AS link_id,
+        ssl.surebet_id,
+        ssl.amount_eur,
+        ssl.created_at_utc,
+        ssl.loser_associate_id AS counterparty_associate_id,
+        ssl.winner_ledger_entry_id AS ledger_entry_id,
+        1 AS sign_multiplier
+    FROM surebet_settlement_links ssl
+    WHERE ssl.winner_associate_id = :associate_id
+    UNION ALL
+    SELECT
+        ssl.id AS link_id,
+        ssl.surebet_id,
+        ssl.amount_eur,
+        ssl.created_at_utc,
+        ssl.winner_associate_id AS counterparty_associate_id,
+        ssl.loser_ledger_entry_id AS ledger_entry_id,
+        -1 AS sign_multiplier
+    FROM surebet_settlement_links ssl
+    WHERE ssl.loser_associate_id = :associate_id
+      AND ssl.winner_associate_id != :associate_id
+"""
+
 
 class DeltaProvenanceEntry:
     """Represents a single delta provenance entry."""
@@ -84,6 +118,27 @@ class DeltaProvenanceSummary:
             self.counterparty_breakdown[counterparty] = Decimal('0.00')
         self.counterparty_breakdown[counterparty] += signed_amount
     
+    def add_counterparty_total(
+        self,
+        counterparty_alias: str,
+        amount_eur: Decimal,
+        is_positive: bool,
+        link_count: int
+    ) -> None:
+        """Add a pre-aggregated counterparty total (one sign) to summary."""
+        signed_amount = abs(amount_eur) if is_positive else -abs(amount_eur)
+        if is_positive:
+            self.total_surplus += abs(amount_eur)
+        else:
+            self.total_deficit += abs(amount_eur)
+
+        self.net_delta += signed_amount
+        self.surebet_count += link_count
+
+        if counterparty_alias not in self.counterparty_breakdown:
+            self.counterparty_breakdown[counterparty_alias] = Decimal('0.00')
+        self.counterparty_breakdown[counterparty_alias] += signed_amount
+    
     def to_dict(self) -> Dict:
         """Convert to dictionary for UI/API consumption."""
         return {
@@ -106,30 +161,84 @@ class DeltaProvenanceService:
         if hasattr(self.db, 'row_factory'):
             self.db.row_factory = sqlite3.Row
 
-    def _backfill_missing_links_for_associate(self, associate_id: int) -> None:
-        """Create settlement links for historical ledger entries missing provenance."""
-        if associate_id is None:
-            return
+    def is_link_backfill_complete(self) -> bool:
+        """Return True once the one-time settlement link backfill has run."""
+        row = self.db.execute(
+            "SELECT 1 FROM maintenance_markers WHERE marker_key = ?",
+            (LINK_BACKFILL_MARKER,),
+        ).fetchone()
+        return row is not None
 
-        cursor = self.db.execute(
+    def run_link_backfill(self, force: bool = False) -> Optional[int]:
+        """
+        Run the settlement link backfill once and record its completion marker.
+
+        New settlements write their links as part of the settlement
+        transaction, so historical gaps only need to be closed a single time
+        instead of being re-scanned on every provenance view.
+
+        Args:
+            force: Re-run the backfill even if the marker is already present
+
+        Returns:
+            Number of links reconstructed, or None if the backfill had already run
+        """
+        if not force and self.is_link_backfill_complete():
+            logger.info("delta_link_backfill_skipped", marker=LINK_BACKFILL_MARKER)
+            return None
+
+        created = self.backfill_missing_links()
+        self.db.execute(
             """
+            INSERT INTO maintenance_markers (marker_key, completed_at_utc, details)
+            VALUES (?, ?, ?)
+            ON CONFLICT(marker_key) DO UPDATE SET
+                completed_at_utc = excluded.completed_at_utc,
+                details = excluded.details
+            """,
+            (LINK_BACKFILL_MARKER, utc_now_iso(), f"links_created={created}"),
+        )
+        self.db.commit()
+        logger.info("delta_link_backfill_completed", links_created=created)
+        return created
+
+    def backfill_missing_links(self, associate_id: Optional[int] = None) -> int:
+        """
+        Create settlement links for historical ledger entries missing provenance.
+
+        Args:
+            associate_id: Optional associate to limit the scan to
+
+        Returns:
+            Number of surebets whose link was reconstructed
+        """
+        ledger = ledger_relation(self.db)
+        query = """
             SELECT DISTINCT le.surebet_id
-            FROM ledger_entries le
-            WHERE le.associate_id = ?
-              AND le.surebet_id IS NOT NULL
+            FROM {ledger} le
+            WHERE le.surebet_id IS NOT NULL
+              {associate_filter}
               AND NOT EXISTS (
                     SELECT 1
                     FROM surebet_settlement_links ssl
                     WHERE ssl.surebet_id = le.surebet_id
                 )
-            """,
-            (associate_id,),
-        )
+            ORDER BY le.surebet_id
+        """
+        if associate_id is None:
+            cursor = self.db.execute(query.format(ledger=ledger, associate_filter=""))
+        else:
+            cursor = self.db.execute(
+                query.format(ledger=ledger, associate_filter="AND le.associate_id = ?"),
+                (associate_id,),
+            )
         missing_surebets = [row["surebet_id"] for row in cursor.fetchall() if row["surebet_id"]]
 
+        created = 0
         for surebet_id in missing_surebets:
             try:
-                self._reconstruct_settlement_link(surebet_id)
+                if self._reconstruct_settlement_link(surebet_id):
+                    created += 1
             except Exception as exc:  # pragma: no cover - defensive log
                 logger.error(
                     "delta_link_backfill_failed",
@@ -137,17 +246,20 @@ class DeltaProvenanceService:
                     associate_id=associate_id,
                     error=str(exc),
                 )
+        self.db.commit()
+        return created
 
-    def _reconstruct_settlement_link(self, surebet_id: int) -> None:
+    def _reconstruct_settlement_link(self, surebet_id: int) -> bool:
         """Rebuild a settlement link from ledger entries when missing."""
+        ledger = ledger_relation(self.db)
         rows = self.db.execute(
-            """
+            f"""
             SELECT
                 id,
                 associate_id,
                 amount_eur,
                 settlement_state
-            FROM ledger_entries
+            FROM {ledger}
             WHERE surebet_id = ?
             ORDER BY created_at_utc ASC, id ASC
             """,
@@ -155,7 +267,7 @@ class DeltaProvenanceService:
         ).fetchall()
 
         if len(rows) < 2:
-            return
+            return False
 
         def _state(row: sqlite3.Row) -> str:
             return (row["settlement_state"] or "").upper()
@@ -169,14 +281,14 @@ class DeltaProvenanceService:
             loser_row = min(rows, key=lambda r: Decimal(str(r["amount_eur"])))
 
         if winner_row is None or loser_row is None:
-            return
+            return False
 
         amount_eur = Decimal(str(winner_row["amount_eur"]))
         if amount_eur <= Decimal("0.00"):
             amount_eur = abs(Decimal(str(loser_row["amount_eur"])))
 
         if amount_eur <= Decimal("0.00"):
-            return
+            return False
 
         self.create_settlement_link(
             surebet_id=surebet_id,
@@ -200,6 +312,7 @@ class DeltaProvenanceService:
             )
         finally:
             create_ledger_append_only_trigger(self.db)
+        return True
     
     def get_associate_delta_provenance(
         self,
@@ -221,58 +334,40 @@ class DeltaProvenanceService:
         start_time = datetime.now(timezone.utc)
         
         try:
-            self._backfill_missing_links_for_associate(associate_id)
-
-            # Get settlement links where associate is winner or loser
-            query = """
-                SELECT 
-                    ssl.surebet_id,
-                    ssl.amount_eur,
-                    ssl.created_at_utc,
-                    CASE 
-                        WHEN ssl.winner_associate_id = ? THEN ssl.loser_associate_id
-                        ELSE ssl.winner_associate_id
-                    END as counterparty_associate_id,
-                    CASE 
-                        WHEN ssl.winner_associate_id = ? THEN ssl.winner_ledger_entry_id
-                        ELSE ssl.loser_ledger_entry_id
-                    END as ledger_entry_id,
-                    CASE 
-                        WHEN ssl.winner_associate_id = ? THEN 1
-                        ELSE -1
-                    END as sign_multiplier,
+            # Each branch is an ordered range scan on its composite index; the
+            # page is cut before joining aliases and notes.
+            ledger = ledger_relation(self.db)
+            query = f"""
+                WITH page AS (
+                    {_PROVENANCE_LINKS_SQL}
+                    ORDER BY created_at_utc DESC, link_id DESC
+                    LIMIT :limit OFFSET :offset
+                )
+                SELECT
+                    page.surebet_id,
+                    page.amount_eur,
+                    page.created_at_utc,
+                    page.counterparty_associate_id,
+                    page.ledger_entry_id,
+                    page.sign_multiplier,
                     a.display_alias as counterparty_alias,
                     le.note
-                FROM surebet_settlement_links ssl
-                JOIN associates a ON (
-                    (ssl.winner_associate_id = ? AND a.id = ssl.loser_associate_id) OR
-                    (ssl.loser_associate_id = ? AND a.id = ssl.winner_associate_id)
-                )
-                LEFT JOIN ledger_entries le ON (
-                    (ssl.winner_associate_id = ? AND le.id = ssl.winner_ledger_entry_id) OR
-                    (ssl.loser_associate_id = ? AND le.id = ssl.loser_ledger_entry_id)
-                )
-                WHERE (ssl.winner_associate_id = ? OR ssl.loser_associate_id = ?)
-                ORDER BY ssl.created_at_utc DESC
-                LIMIT ? OFFSET ?
+                FROM page
+                JOIN associates a ON a.id = page.counterparty_associate_id
+                LEFT JOIN {ledger} le ON le.id = page.ledger_entry_id
+                ORDER BY page.created_at_utc DESC, page.link_id DESC
             """
-            
+
             cursor = self.db.execute(
                 query,
-                (
-                    associate_id, associate_id, associate_id,  # For CASE statements
-                    associate_id, associate_id,               # For JOIN conditions
-                    associate_id, associate_id,               # For LEFT JOIN
-                    associate_id, associate_id,               # For WHERE clause
-                    limit, offset
-                )
+                {"associate_id": associate_id, "limit": limit, "offset": offset},
             )
-            
+
             entries = []
             for row in cursor.fetchall():
                 amount_eur = Decimal(row['amount_eur'])
                 is_positive = row['sign_multiplier'] > 0
-                
+
                 entry = DeltaProvenanceEntry(
                     surebet_id=row['surebet_id'],
                     counterparty_alias=row['counterparty_alias'],
@@ -284,12 +379,10 @@ class DeltaProvenanceService:
                     note=row['note']
                 )
                 entries.append(entry)
-            
-            # Build summary
-            summary = DeltaProvenanceSummary()
-            for entry in entries:
-                summary.add_entry(entry)
-            
+
+            # Summary covers every link for the associate, not just this page
+            summary = self._build_provenance_summary(associate_id)
+
             # Calculate duration and log telemetry
             end_time = datetime.now(timezone.utc)
             duration_ms = int((end_time - start_time).total_seconds() * 1000)
@@ -312,6 +405,33 @@ class DeltaProvenanceService:
             )
             raise
     
+    def _build_provenance_summary(self, associate_id: int) -> DeltaProvenanceSummary:
+        """Aggregate surplus/deficit per counterparty over all of an associate's links."""
+        cursor = self.db.execute(
+            f"""
+            SELECT
+                a.display_alias as counterparty_alias,
+                links.sign_multiplier,
+                COUNT(*) as link_count,
+                SUM(ABS(CAST(links.amount_eur AS REAL))) as total_eur
+            FROM ({_PROVENANCE_LINKS_SQL}) links
+            JOIN associates a ON a.id = links.counterparty_associate_id
+            GROUP BY links.counterparty_associate_id, links.sign_multiplier
+            ORDER BY a.display_alias
+            """,
+            {"associate_id": associate_id},
+        )
+
+        summary = DeltaProvenanceSummary()
+        for row in cursor.fetchall():
+            summary.add_counterparty_total(
+                counterparty_alias=row['counterparty_alias'],
+                amount_eur=Decimal(str(row['total_eur'] or 0)).quantize(Decimal('0.01')),
+                is_positive=row['sign_multiplier'] > 0,
+                link_count=row['link_count'],
+            )
+        return summary
+
     def get_counterparty_delta_summary(
         self,
         associate_id: int,
@@ -319,6 +439,9 @@ class DeltaProvenanceService:
     ) -> Dict:
         """
         Get delta summary between two associates.
+
+        Reads the materialized counterparty_delta row instead of scanning
+        settlement links.
         
         Args:
             associate_id: Primary associate ID
@@ -329,32 +452,19 @@ class DeltaProvenanceService:
         """
         start_time = datetime.now(timezone.utc)
         
-        query = """
-            SELECT 
-                COUNT(*) as transaction_count,
-                SUM(CASE 
-                    WHEN ssl.winner_associate_id = ? THEN ssl.amount_eur
-                    ELSE -ssl.amount_eur
-                END) as net_amount_eur,
-                SUM(CASE 
-                    WHEN ssl.winner_associate_id = ? THEN ssl.amount_eur
-                    ELSE 0
-                END) as total_won_eur,
-                SUM(CASE 
-                    WHEN ssl.loser_associate_id = ? THEN ssl.amount_eur
-                    ELSE 0
-                END) as total_lost_eur,
-                MIN(ssl.created_at_utc) as first_transaction,
-                MAX(ssl.created_at_utc) as last_transaction
-            FROM surebet_settlement_links ssl
-            WHERE (ssl.winner_associate_id = ? AND ssl.loser_associate_id = ?)
-            OR (ssl.winner_associate_id = ? AND ssl.loser_associate_id = ?)
-        """
-        
         cursor = self.db.execute(
-            query,
-            (associate_id, associate_id, associate_id, associate_id, counterparty_associate_id,
-             associate_id, counterparty_associate_id)
+            """
+            SELECT
+                surebet_count as transaction_count,
+                net_amount_eur,
+                total_won_eur,
+                total_lost_eur,
+                first_transaction_utc as first_transaction,
+                last_transaction_utc as last_transaction
+            FROM counterparty_delta
+            WHERE associate_id = ? AND counterparty_id = ?
+            """,
+            (associate_id, counterparty_associate_id)
         )
         
         row = cursor.fetchone()
@@ -390,6 +500,139 @@ class DeltaProvenanceService:
             'last_transaction': row['last_transaction']
         }
     
+    def get_counterparty_matrix(self, associate_id: Optional[int] = None) -> List[Dict]:
+        """
+        Get the materialized counterparty delta matrix.
+
+        Args:
+            associate_id: Optional associate to restrict rows to
+
+        Returns:
+            One dict per (associate, counterparty) pair, largest net first
+        """
+        query = """
+            SELECT
+                cd.associate_id,
+                a.display_alias as associate_alias,
+                cd.counterparty_id,
+                c.display_alias as counterparty_alias,
+                cd.net_amount_eur,
+                cd.total_won_eur,
+                cd.total_lost_eur,
+                cd.surebet_count,
+                cd.first_transaction_utc,
+                cd.last_transaction_utc
+            FROM counterparty_delta cd
+            JOIN associates a ON a.id = cd.associate_id
+            JOIN associates c ON c.id = cd.counterparty_id
+            {associate_filter}
+            ORDER BY cd.associate_id, CAST(cd.net_amount_eur AS REAL) DESC
+        """
+        if associate_id is None:
+            cursor = self.db.execute(query.format(associate_filter=""))
+        else:
+            cursor = self.db.execute(
+                query.format(associate_filter="WHERE cd.associate_id = ?"),
+                (associate_id,)
+            )
+
+        return [
+            {
+                'associate_id': row['associate_id'],
+                'associate_alias': row['associate_alias'],
+                'counterparty_id': row['counterparty_id'],
+                'counterparty_alias': row['counterparty_alias'],
+                'net_amount_eur': Decimal(row['net_amount_eur']),
+                'total_won_eur': Decimal(row['total_won_eur']),
+                'total_lost_eur': Decimal(row['total_lost_eur']),
+                'transaction_count': row['surebet_count'],
+                'first_transaction': row['first_transaction_utc'],
+                'last_transaction': row['last_transaction_utc'],
+            }
+            for row in cursor.fetchall()
+        ]
+
+    def rebuild_counterparty_deltas(self) -> int:
+        """
+        Recompute the counterparty_delta matrix from settlement links.
+
+        Returns:
+            Number of (associate, counterparty) rows written
+        """
+        start_time = datetime.now(timezone.utc)
+        try:
+            self.db.execute("DELETE FROM counterparty_delta")
+            cursor = self.db.execute(
+                f"""
+                INSERT INTO counterparty_delta (
+                    associate_id, counterparty_id, net_amount_eur, total_won_eur,
+                    total_lost_eur, surebet_count, first_transaction_utc,
+                    last_transaction_utc
+                )
+                {COUNTERPARTY_DELTA_AGGREGATE_SQL}
+                """
+            )
+            row_count = cursor.rowcount
+            self.db.commit()
+        except sqlite3.Error:
+            self.db.rollback()
+            raise
+
+        duration_ms = int((datetime.now(timezone.utc) - start_time).total_seconds() * 1000)
+        logger.info(
+            "counterparty_delta_rebuilt",
+            row_count=row_count,
+            duration_ms=duration_ms
+        )
+        return row_count
+
+    def verify_counterparty_deltas(self) -> List[Dict]:
+        """
+        Compare the counterparty_delta matrix with a fresh aggregate of links.
+
+        Returns:
+            Mismatched pairs with their stored and expected values (empty when
+            the matrix is consistent)
+        """
+        fields = ('net_amount_eur', 'total_won_eur', 'total_lost_eur')
+        expected: Dict[Tuple[int, int], Dict] = {
+            (row['associate_id'], row['counterparty_id']): dict(row)
+            for row in self.db.execute(COUNTERPARTY_DELTA_AGGREGATE_SQL).fetchall()
+        }
+        stored: Dict[Tuple[int, int], Dict] = {
+            (row['associate_id'], row['counterparty_id']): dict(row)
+            for row in self.db.execute(
+                """
+                SELECT associate_id, counterparty_id, net_amount_eur, total_won_eur,
+                       total_lost_eur, surebet_count
+                FROM counterparty_delta
+                """
+            ).fetchall()
+        }
+
+        mismatches: List[Dict] = []
+        for key in sorted(set(expected) | set(stored)):
+            want = expected.get(key)
+            have = stored.get(key)
+            if want is not None and have is not None:
+                if want['surebet_count'] == have['surebet_count'] and all(
+                    Decimal(want[field]) == Decimal(have[field]) for field in fields
+                ):
+                    continue
+            mismatches.append({
+                'associate_id': key[0],
+                'counterparty_id': key[1],
+                'stored': {k: have[k] for k in fields + ('surebet_count',)} if have else None,
+                'expected': {k: want[k] for k in fields + ('surebet_count',)} if want else None,
+            })
+
+        logger.info(
+            "counterparty_delta_verified",
+            pair_count=len(expected),
+            mismatch_count=len(mismatches)
+        )
+        return mismatches
+
     def get_surebet_delta_details(
         self,
         surebet_id: int,
@@ -406,7 +649,8 @@ class DeltaProvenanceService:
             List of settlement link details
         """
         start_time = datetime.now(timezone.utc)
-        
+        ledger = ledger_relation(self.db)
+
         query = """
             SELECT 
                 ssl.surebet_id,
@@ -425,8 +669,8 @@ class DeltaProvenanceService:
             FROM surebet_settlement_links ssl
             JOIN associates winner_alias ON ssl.winner_associate_id = winner_alias.id
             JOIN associates loser_alias ON ssl.loser_associate_id = loser_alias.id
-            JOIN ledger_entries winner_ledger ON ssl.winner_ledger_entry_id = winner_ledger.id
-            JOIN ledger_entries loser_ledger ON ssl.loser_ledger_entry_id = loser_ledger.id
+            JOIN {ledger} winner_ledger ON ssl.winner_ledger_entry_id = winner_ledger.id
+            JOIN {ledger} loser_ledger ON ssl.loser_ledger_entry_id = loser_ledger.id
             WHERE ssl.surebet_id = ?
             {associate_filter}
             ORDER BY ssl.created_at_utc DESC
@@ -436,12 +680,14 @@ class DeltaProvenanceService:
         if associate_id:
             associate_filter = "AND (ssl.winner_associate_id = ? OR ssl.loser_associate_id = ?)"
             cursor = self.db.execute(
-                query.format(associate_filter=associate_filter),
+                query.format(ledger=ledger, associate_filter=associate_filter),
                 (surebet_id, associate_id, associate_id)
             )
         else:
             associate_filter = ""
-            cursor = self.db.execute(query.format(associate_filter=associate_filter), (surebet_id,))
+            cursor = self.db.execute(
+                query.format(ledger=ledger, associate_filter=associate_filter), (surebet_id,)
+            )
         
         results = []
         for row in cursor.fetchall():
@@ -475,6 +721,16 @@ class DeltaProvenanceService:
         
         return results
     
+    @staticmethod
+    def _quantize_link_amount(amount_eur: Decimal) -> Decimal:
+        """
+        Round a link amount to cents before it is stored.
+
+        The counterparty_delta trigger accumulates stored amounts per link, so
+        links must already be in cents for the matrix to equal the aggregate.
+        """
+        return Decimal(str(amount_eur)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
     def create_settlement_link(
         self,
         surebet_id: int,
@@ -517,7 +773,7 @@ class DeltaProvenanceService:
                     surebet_id,
                     winner_associate_id,
                     loser_associate_id,
-                    str(amount_eur),
+                    str(self._quantize_link_amount(amount_eur)),
                     winner_ledger_entry_id,
                     loser_ledger_entry_id,
                     utc_now_iso()
@@ -550,6 +806,85 @@ class DeltaProvenanceService:
             )
             raise
     
+    def create_settlement_links(self, links: List[Dict]) -> Dict[int, int]:
+        """
+        Create settlement links for many surebets in one statement.
+
+        Args:
+            links: Dicts with the keyword arguments of create_settlement_link
+
+        Returns:
+            Mapping of surebet_id to the ID of its newly created link
+        """
+        if not links:
+            return {}
+
+        start_time = datetime.now(timezone.utc)
+        created_at = utc_now_iso()
+
+        try:
+            self.db.executemany(
+                """
+                INSERT INTO surebet_settlement_links (
+                    surebet_id,
+                    winner_associate_id,
+                    loser_associate_id,
+                    amount_eur,
+                    winner_ledger_entry_id,
+                    loser_ledger_entry_id,
+                    created_at_utc
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        link['surebet_id'],
+                        link['winner_associate_id'],
+                        link['loser_associate_id'],
+                        str(self._quantize_link_amount(link['amount_eur'])),
+                        link['winner_ledger_entry_id'],
+                        link['loser_ledger_entry_id'],
+                        created_at
+                    )
+                    for link in links
+                ]
+            )
+
+            surebet_ids = sorted({link['surebet_id'] for link in links})
+            link_ids: Dict[int, int] = {}
+            for start in range(0, len(surebet_ids), 500):
+                chunk = surebet_ids[start:start + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                cursor = self.db.execute(
+                    f"""
+                    SELECT surebet_id, MAX(id) AS link_id
+                    FROM surebet_settlement_links
+                    WHERE surebet_id IN ({placeholders})
+                    GROUP BY surebet_id
+                    """,
+                    chunk
+                )
+                for row in cursor.fetchall():
+                    link_ids[row[0]] = row[1]
+
+            end_time = datetime.now(timezone.utc)
+            duration_ms = int((end_time - start_time).total_seconds() * 1000)
+
+            logger.info(
+                "settlement_links_created",
+                link_count=len(links),
+                duration_ms=duration_ms
+            )
+
+            return link_ids
+
+        except sqlite3.Error as e:
+            logger.error(
+                "settlement_links_creation_failed",
+                link_count=len(links),
+                error=str(e)
+            )
+            raise
+
     def close(self) -> None:
         """Close the database connection if we created it."""
         # Only close if we created the connection ourselves
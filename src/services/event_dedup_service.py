@@ -0,0 +1,438 @@
+"""
+Canonical Event Dedup Service
+
+Finds near-duplicate ``canonical_events`` rows and merges them into one
+survivor. Duplicates come from OCR auto-creation and the relaxed no-kickoff
+path. Opposite sides of a surebet that land on different event IDs are never
+paired by ``SurebetMatcher``.
+
+Events are blocked by sport and by time bucket: the kickoff, or the creation
+time for events without a kickoff. Each bucket is compared only with itself
+and the next bucket, using one ``rapidfuzz.process.cdist`` call. Two events
+are duplicates when they share a pair_key or their names score at least
+``NAME_SCORE_CUTOFF``, and they fall within ``DEDUP_WINDOW_MS`` of each other.
+Clusters form around the oldest event, so every merged event is directly
+similar to its survivor and chains of near-misses are never merged.
+
+Each cluster is merged in its own transaction. The merge repoints bets and
+surebets, records ``canonical_event_aliases`` rows and deletes the
+duplicates. Verified bets on the survivor are then passed to the surebet
+matcher.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import structlog
+from rapidfuzz import fuzz, process
+
+from src.core.database import get_db_connection
+from src.services.canonical_event_index import get_event_index, match_key
+from src.utils.datetime_helpers import to_epoch_ms, utc_now_iso
+
+logger = structlog.get_logger()
+
+# Kickoffs misread by a timezone offset still fall inside this window.
+DEDUP_WINDOW_MS = 12 * 60 * 60 * 1000
+NAME_SCORE_CUTOFF = 90.0
+DEDUP_ACTOR = "event_dedup_job"
+
+
+@dataclass
+class _Event:
+    id: int
+    name: str
+    match_name: str
+    sport: Optional[str]
+    pair_key: Optional[str]
+    time_ms: int
+    has_kickoff: bool
+
+
+@dataclass
+class DuplicateCluster:
+    """A survivor event and the duplicates to merge into it."""
+
+    survivor_id: int
+    merged_ids: List[int]
+    scores: Dict[int, float] = field(default_factory=dict)
+
+
+@dataclass
+class DedupResult:
+    """Summary of a dedup run."""
+
+    scanned: int = 0
+    clusters: List[DuplicateCluster] = field(default_factory=list)
+    repointed_bets: int = 0
+    repointed_surebets: int = 0
+    matched_surebet_ids: Dict[int, int] = field(default_factory=dict)
+    dry_run: bool = False
+
+    @property
+    def merged_event_count(self) -> int:
+        return sum(len(cluster.merged_ids) for cluster in self.clusters)
+
+
+def resolve_event_id(conn: sqlite3.Connection, event_id: Optional[int]) -> Optional[int]:
+    """Return the surviving event for ``event_id`` (itself when it was never merged)."""
+    if event_id is None:
+        return None
+    row = conn.execute(
+        "SELECT canonical_event_id FROM canonical_event_aliases WHERE merged_event_id = ?",
+        (int(event_id),),
+    ).fetchone()
+    return int(row[0]) if row else int(event_id)
+
+
+class EventDedupService:
+    """Detect and merge duplicate canonical events."""
+
+    def __init__(self, db: Optional[sqlite3.Connection] = None, *, workers: int = -1) -> None:
+        """
+        Args:
+            db: Connection to use; a new one is opened (and closed) when omitted
+            workers: ``process.cdist`` worker threads (-1 uses every core)
+        """
+        self.db = db or get_db_connection()
+        self._owns_connection = db is None
+        self.workers = workers
+
+    def close(self) -> None:
+        if self._owns_connection:
+            self.db.close()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def dedupe(self, *, dry_run: bool = False, trigger_matching: bool = True) -> DedupResult:
+        """
+        Find duplicate clusters and merge each into its oldest event.
+
+        Args:
+            dry_run: Only report the clusters
+            trigger_matching: Run the surebet matcher for verified bets on survivors
+
+        Returns:
+            DedupResult with the clusters found (and merged unless ``dry_run``)
+        """
+        events = self._load_events()
+        result = DedupResult(scanned=len(events), dry_run=dry_run)
+        result.clusters = self.find_clusters(events)
+
+        if not dry_run:
+            for cluster in result.clusters:
+                bets, surebets = self.merge_cluster(cluster)
+                result.repointed_bets += bets
+                result.repointed_surebets += surebets
+            if trigger_matching and result.clusters:
+                result.matched_surebet_ids = self._trigger_matching(
+                    [cluster.survivor_id for cluster in result.clusters]
+                )
+
+        logger.info(
+            "event_dedup_completed",
+            scanned=result.scanned,
+            clusters=len(result.clusters),
+            merged_events=result.merged_event_count,
+            repointed_bets=result.repointed_bets,
+            repointed_surebets=result.repointed_surebets,
+            matched=len(result.matched_surebet_ids),
+            dry_run=dry_run,
+        )
+        return result
+
+    def find_clusters(self, events: Optional[List[_Event]] = None) -> List[DuplicateCluster]:
+        """Group duplicate events; each cluster's survivor is its lowest ID."""
+        if events is None:
+            events = self._load_events()
+        blocks: Dict[Tuple[Optional[str], bool], Dict[int, List[_Event]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        for event in events:
+            bucket = event.time_ms // DEDUP_WINDOW_MS
+            blocks[(event.sport, event.has_kickoff)][bucket].append(event)
+
+        edges: Dict[int, Dict[int, float]] = defaultdict(dict)
+        for buckets in blocks.values():
+            for bucket, rows in buckets.items():
+                # Events within the window are at most one bucket apart.
+                columns = rows + buckets.get(bucket + 1, [])
+                for left, right, score in self._score_pairs(rows, columns):
+                    low, high = sorted((left, right))
+                    edges[low][high] = max(score, edges[low].get(high, 0.0))
+
+        clusters: List[DuplicateCluster] = []
+        assigned: Set[int] = set()
+        for survivor_id in sorted(edges):
+            if survivor_id in assigned:
+                continue
+            members = {
+                event_id: score
+                for event_id, score in edges[survivor_id].items()
+                if event_id not in assigned
+            }
+            if not members:
+                continue
+            assigned.add(survivor_id)
+            assigned.update(members)
+            clusters.append(DuplicateCluster(survivor_id, sorted(members), members))
+        return clusters
+
+    def merge_cluster(self, cluster: DuplicateCluster) -> Tuple[int, int]:
+        """
+        Merge ``cluster`` atomically.
+
+        Returns:
+            (bets repointed, surebets repointed)
+        """
+        survivor_id = cluster.survivor_id
+        merged_ids = cluster.merged_ids
+        placeholders = ",".join("?" * len(merged_ids))
+        now = utc_now_iso()
+        merged_rows = self._cursor().execute(
+            f"""
+            SELECT id, normalized_event_name, kickoff_time_utc, league, team1_slug, team2_slug, pair_key
+            FROM canonical_events WHERE id IN ({placeholders}) ORDER BY id
+            """,
+            merged_ids,
+        ).fetchall()
+
+        try:
+            self.db.execute(
+                f"""
+                INSERT INTO verification_audit (bet_id, actor, action, diff_before, diff_after, notes)
+                SELECT id, ?, 'MODIFIED', 'canonical_event_id=' || canonical_event_id, ?, ?
+                FROM bets WHERE canonical_event_id IN ({placeholders})
+                """,
+                (
+                    DEDUP_ACTOR,
+                    f"canonical_event_id={survivor_id}",
+                    "Duplicate canonical event merged",
+                    *merged_ids,
+                ),
+            )
+            bets = self.db.execute(
+                f"UPDATE bets SET canonical_event_id = ?, updated_at_utc = ? "
+                f"WHERE canonical_event_id IN ({placeholders})",
+                (survivor_id, now, *merged_ids),
+            ).rowcount
+            surebets = self.db.execute(
+                f"UPDATE surebets SET canonical_event_id = ?, updated_at_utc = ? "
+                f"WHERE canonical_event_id IN ({placeholders})",
+                (survivor_id, now, *merged_ids),
+            ).rowcount
+            # Earlier merges into these events now point at the survivor.
+            self.db.execute(
+                f"UPDATE canonical_event_aliases SET canonical_event_id = ? "
+                f"WHERE canonical_event_id IN ({placeholders})",
+                (survivor_id, *merged_ids),
+            )
+            self.db.executemany(
+                """
+                INSERT INTO canonical_event_aliases (
+                    merged_event_id, canonical_event_id, merged_event_name,
+                    merged_kickoff_time_utc, score
+                ) VALUES (?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        row["id"],
+                        survivor_id,
+                        row["normalized_event_name"],
+                        row["kickoff_time_utc"],
+                        cluster.scores.get(row["id"]),
+                    )
+                    for row in merged_rows
+                ],
+            )
+            # Keep metadata only the duplicates had.
+            for row in merged_rows:
+                self.db.execute(
+                    """
+                    UPDATE canonical_events
+                    SET league = COALESCE(league, ?),
+                        team1_slug = COALESCE(team1_slug, ?),
+                        team2_slug = COALESCE(team2_slug, ?),
+                        pair_key = COALESCE(pair_key, ?),
+                        kickoff_time_utc = COALESCE(kickoff_time_utc, ?),
+                        updated_at_utc = ?
+                    WHERE id = ?
+                    """,
+                    (
+                        row["league"],
+                        row["team1_slug"],
+                        row["team2_slug"],
+                        row["pair_key"],
+                        row["kickoff_time_utc"],
+                        now,
+                        survivor_id,
+                    ),
+                )
+            self.db.execute(
+                f"DELETE FROM canonical_events WHERE id IN ({placeholders})", merged_ids
+            )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        self._update_index(survivor_id, merged_ids)
+        logger.info(
+            "canonical_events_merged",
+            survivor_id=survivor_id,
+            merged_ids=merged_ids,
+            repointed_bets=bets,
+            repointed_surebets=surebets,
+        )
+        return bets, surebets
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _cursor(self) -> sqlite3.Cursor:
+        """Cursor with ``sqlite3.Row`` rows; the connection's own factory is left as is."""
+        cursor = self.db.cursor()
+        cursor.row_factory = sqlite3.Row
+        return cursor
+
+    def _load_events(self) -> List[_Event]:
+        rows = self._cursor().execute(
+            """
+            SELECT id, normalized_event_name, sport, pair_key, kickoff_ms, created_at_utc
+            FROM canonical_events
+            ORDER BY id
+            """
+        ).fetchall()
+        events = []
+        for row in rows:
+            kickoff_ms = row["kickoff_ms"]
+            time_ms = kickoff_ms if kickoff_ms is not None else to_epoch_ms(row["created_at_utc"])
+            name = match_key(row["normalized_event_name"])
+            if time_ms is None or not name:
+                continue
+            events.append(
+                _Event(
+                    id=int(row["id"]),
+                    name=row["normalized_event_name"],
+                    match_name=name,
+                    sport=row["sport"],
+                    pair_key=row["pair_key"],
+                    time_ms=time_ms,
+                    has_kickoff=kickoff_ms is not None,
+                )
+            )
+        return events
+
+    def _score_pairs(
+        self, rows: List[_Event], columns: List[_Event]
+    ) -> Iterable[Tuple[int, int, float]]:
+        """Yield ``(event_id, event_id, score)`` for duplicate pairs in a bucket."""
+        if len(columns) < 2:
+            return []
+        scores = process.cdist(
+            [event.match_name for event in rows],
+            [event.match_name for event in columns],
+            scorer=fuzz.ratio,
+            dtype=np.float32,
+            workers=self.workers,
+        )
+        row_times = np.array([event.time_ms for event in rows], dtype=np.int64)
+        column_times = np.array([event.time_ms for event in columns], dtype=np.int64)
+        row_ids = np.array([event.id for event in rows], dtype=np.int64)
+        column_ids = np.array([event.id for event in columns], dtype=np.int64)
+        pair_codes: Dict[str, int] = {}
+
+        def pair_code(event: _Event, missing: int) -> int:
+            if not event.pair_key:
+                return missing
+            return pair_codes.setdefault(event.pair_key, len(pair_codes))
+
+        # Events without a pair_key get codes that never compare equal.
+        row_pairs = np.array([pair_code(event, -1) for event in rows])
+        column_pairs = np.array([pair_code(event, -2) for event in columns])
+
+        same_pair = row_pairs[:, None] == column_pairs[None, :]
+        scores[same_pair] = 100.0
+        candidates = (
+            (scores >= NAME_SCORE_CUTOFF)
+            & (np.abs(row_times[:, None] - column_times[None, :]) <= DEDUP_WINDOW_MS)
+            & (row_ids[:, None] != column_ids[None, :])
+        )
+        pairs = []
+        for row, column in zip(*np.nonzero(candidates)):
+            left, right = rows[row], columns[column]
+            if not same_pair[row, column] and self._is_variant(left, right):
+                continue
+            pairs.append((left.id, right.id, float(scores[row, column])))
+        return pairs
+
+    @staticmethod
+    def _is_variant(left: _Event, right: _Event) -> bool:
+        """
+        True when one name only adds tokens to the other.
+
+        Catches "Arsenal vs Chelsea" against "Arsenal vs Chelsea U21" or
+        "... Women", which score high but are different fixtures.
+        """
+        left_tokens = set(left.match_name.split())
+        right_tokens = set(right.match_name.split())
+        return left_tokens != right_tokens and (
+            left_tokens <= right_tokens or right_tokens <= left_tokens
+        )
+
+    def _update_index(self, survivor_id: int, merged_ids: List[int]) -> None:
+        index = get_event_index(self.db)
+        for event_id in merged_ids:
+            index.discard(event_id)
+        row = self._cursor().execute(
+            """
+            SELECT id, normalized_event_name, sport, pair_key, kickoff_time_utc, kickoff_ms
+            FROM canonical_events WHERE id = ?
+            """,
+            (survivor_id,),
+        ).fetchone()
+        if row:
+            index.add(
+                row["id"],
+                row["normalized_event_name"],
+                sport=row["sport"],
+                pair_key=row["pair_key"],
+                kickoff_time_utc=row["kickoff_time_utc"],
+                kickoff_ms=row["kickoff_ms"],
+            )
+
+    def _trigger_matching(self, survivor_ids: List[int]) -> Dict[int, int]:
+        """Run the surebet matcher for verified bets on the survivors."""
+        from src.services.surebet_matcher import SurebetMatcher
+
+        placeholders = ",".join("?" * len(survivor_ids))
+        bet_ids = [
+            row["id"]
+            for row in self._cursor().execute(
+                f"""
+                SELECT id FROM bets
+                WHERE status = 'verified' AND canonical_event_id IN ({placeholders})
+                ORDER BY id
+                """,
+                survivor_ids,
+            ).fetchall()
+        ]
+        matcher = SurebetMatcher(self.db)
+        matched: Dict[int, int] = {}
+        for bet_id in bet_ids:
+            try:
+                surebet_id = matcher.attempt_match(bet_id)
+            except Exception as exc:
+                logger.error("event_dedup_matching_failed", bet_id=bet_id, error=str(exc))
+                continue
+            if surebet_id:
+                matched[bet_id] = surebet_id
+        return matched
@@ -0,0 +1,374 @@
+"""
+Event Re-link Service
+
+Re-runs canonical event matching over the backlog of ``incoming``/``verified``
+bets that have no ``canonical_event_id``. This is typically needed after the
+team alias file changes or canonical events are merged.
+
+Bets are grouped by kickoff day. Each day block is scored against the
+canonical events kicking off within ``WINDOW_MS`` of that day, using one
+multi-threaded ``rapidfuzz.process.cdist`` call. A bet is linked
+automatically only when its best event is high confidence and clearly ahead
+of the runner-up. Medium-confidence pairs go to a CSV review report. Newly
+linked verified bets are then passed to the surebet matcher.
+"""
+
+from __future__ import annotations
+
+import csv
+import sqlite3
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import structlog
+from rapidfuzz import fuzz, process
+
+from src.core.config import Config
+from src.core.database import get_db_connection
+from src.services.canonical_event_index import (
+    DAY_MS,
+    CanonicalEventIndex,
+    IndexedEvent,
+    get_event_index,
+    match_key,
+)
+from src.services.event_normalizer import EventNormalizer
+from src.utils.datetime_helpers import utc_now_iso
+
+logger = structlog.get_logger()
+
+# Same window and scorer as BetVerificationService._fuzzy_match_existing_event.
+WINDOW_MS = DAY_MS
+HIGH_CONFIDENCE_SCORE = 92.0
+REVIEW_SCORE = 70.0
+# Best score must beat the runner-up by this much to link without review.
+MIN_MARGIN = 5.0
+RELINK_ACTOR = "event_relink_job"
+
+REPORT_COLUMNS = (
+    "bet_id",
+    "status",
+    "selection_text",
+    "kickoff_time_utc",
+    "event_id",
+    "event_name",
+    "event_kickoff_time_utc",
+    "score",
+    "runner_up_score",
+    "reason",
+)
+
+
+@dataclass
+class UnlinkedBet:
+    """A bet awaiting a canonical event."""
+
+    bet_id: int
+    status: str
+    selection_text: str
+    kickoff_time_utc: Optional[str]
+    kickoff_ms: Optional[int]
+    query: str
+    pair_key: Optional[str]
+
+
+@dataclass
+class RelinkCandidate:
+    """Best event found for an unlinked bet."""
+
+    bet: UnlinkedBet
+    event: IndexedEvent
+    score: float
+    runner_up_score: float
+    pair_key_match: bool
+
+    @property
+    def is_high_confidence(self) -> bool:
+        return (
+            self.score >= HIGH_CONFIDENCE_SCORE
+            and self.score - self.runner_up_score >= MIN_MARGIN
+        )
+
+
+@dataclass
+class RelinkResult:
+    """Summary of a re-link run."""
+
+    scanned: int = 0
+    linked: List[RelinkCandidate] = field(default_factory=list)
+    review: List[RelinkCandidate] = field(default_factory=list)
+    matched_surebet_ids: Dict[int, int] = field(default_factory=dict)
+    report_path: Optional[str] = None
+    dry_run: bool = False
+
+
+class EventRelinkService:
+    """Bulk re-link unlinked bets to canonical events."""
+
+    def __init__(
+        self,
+        db: Optional[sqlite3.Connection] = None,
+        *,
+        workers: int = -1,
+        report_dir: Optional[str] = None,
+    ) -> None:
+        """
+        Args:
+            db: Connection to use; a new one is opened (and closed) when omitted
+            workers: ``process.cdist`` worker threads (-1 uses every core)
+            report_dir: Directory for review reports (default ``Config.EXPORT_DIR``)
+        """
+        self.db = db or get_db_connection()
+        self._owns_connection = db is None
+        self.workers = workers
+        self.report_dir = Path(report_dir or Config.EXPORT_DIR)
+
+    def close(self) -> None:
+        if self._owns_connection:
+            self.db.close()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def relink(self, *, dry_run: bool = False, trigger_matching: bool = True) -> RelinkResult:
+        """
+        Score every unlinked bet, apply high-confidence links and report the rest.
+
+        Args:
+            dry_run: Score and write the report without linking any bet
+            trigger_matching: Run the surebet matcher for newly linked verified bets
+
+        Returns:
+            RelinkResult with the linked and review candidates
+        """
+        bets = self.load_unlinked_bets()
+        candidates = self.score(bets)
+        result = RelinkResult(scanned=len(bets), dry_run=dry_run)
+        for candidate in candidates:
+            if candidate.is_high_confidence:
+                result.linked.append(candidate)
+            elif candidate.score >= REVIEW_SCORE:
+                result.review.append(candidate)
+
+        if result.review or (dry_run and result.linked):
+            report_rows = result.review + (result.linked if dry_run else [])
+            result.report_path = str(self.write_report(report_rows))
+
+        if not dry_run and result.linked:
+            self.apply_links(result.linked)
+            if trigger_matching:
+                result.matched_surebet_ids = self._trigger_matching(
+                    [c.bet.bet_id for c in result.linked if c.bet.status == "verified"]
+                )
+
+        logger.info(
+            "event_relink_completed",
+            scanned=result.scanned,
+            linked=len(result.linked),
+            review=len(result.review),
+            matched=len(result.matched_surebet_ids),
+            report_path=result.report_path,
+            dry_run=dry_run,
+        )
+        return result
+
+    def load_unlinked_bets(self) -> List[UnlinkedBet]:
+        """Return incoming/verified bets without a canonical event, normalized for scoring."""
+        rows = self._cursor().execute(
+            """
+            SELECT id, status, selection_text, kickoff_time_utc, kickoff_ms
+            FROM bets
+            WHERE status IN ('incoming', 'verified')
+              AND canonical_event_id IS NULL
+              AND selection_text IS NOT NULL
+              AND TRIM(selection_text) != ''
+            ORDER BY id
+            """
+        ).fetchall()
+        bets = []
+        for row in rows:
+            normalized = EventNormalizer.normalize_event_name(row["selection_text"])
+            if not normalized:
+                continue
+            pair = EventNormalizer.compute_pair_key(normalized)
+            bets.append(
+                UnlinkedBet(
+                    bet_id=int(row["id"]),
+                    status=row["status"],
+                    selection_text=row["selection_text"],
+                    kickoff_time_utc=row["kickoff_time_utc"],
+                    kickoff_ms=row["kickoff_ms"],
+                    query=match_key(normalized),
+                    pair_key=pair[2] if pair else None,
+                )
+            )
+        return bets
+
+    def score(self, bets: Sequence[UnlinkedBet]) -> List[RelinkCandidate]:
+        """
+        Find the best canonical event for each bet.
+
+        Bets with a kickoff are scored per kickoff-day block against events
+        within ``WINDOW_MS``; a pair-key match counts as a perfect score.
+        Bets without a kickoff can only be linked through a unique pair key.
+        """
+        index = get_event_index(self.db)
+        blocks: Dict[Optional[int], List[UnlinkedBet]] = defaultdict(list)
+        for bet in bets:
+            day = bet.kickoff_ms // DAY_MS if bet.kickoff_ms is not None else None
+            blocks[day].append(bet)
+
+        candidates: List[RelinkCandidate] = []
+        for day, block in blocks.items():
+            if day is None:
+                candidates.extend(self._score_by_pair_key(index, block))
+            else:
+                candidates.extend(self._score_block(index, day, block))
+        return candidates
+
+    def apply_links(self, candidates: Sequence[RelinkCandidate]) -> None:
+        """Link every candidate's bet to its event in a single transaction."""
+        now = utc_now_iso()
+        try:
+            for candidate in candidates:
+                cursor = self.db.execute(
+                    """
+                    UPDATE bets
+                    SET canonical_event_id = ?, updated_at_utc = ?
+                    WHERE id = ? AND canonical_event_id IS NULL
+                    """,
+                    (candidate.event.id, now, candidate.bet.bet_id),
+                )
+                if cursor.rowcount:
+                    self.db.execute(
+                        """
+                        INSERT INTO verification_audit (bet_id, actor, action, diff_before, diff_after, notes)
+                        VALUES (?, ?, 'MODIFIED', ?, ?, ?)
+                        """,
+                        (
+                            candidate.bet.bet_id,
+                            RELINK_ACTOR,
+                            "canonical_event_id=None",
+                            f"canonical_event_id={candidate.event.id}",
+                            f"Re-linked by bulk event matching (score {candidate.score:.1f})",
+                        ),
+                    )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+    def write_report(self, candidates: Sequence[RelinkCandidate]) -> Path:
+        """Write ``candidates`` to a timestamped CSV review report."""
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        path = self.report_dir / f"event_relink_review_{stamp}.csv"
+        with path.open("w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(REPORT_COLUMNS)
+            for candidate in sorted(candidates, key=lambda c: (-c.score, c.bet.bet_id)):
+                writer.writerow(
+                    (
+                        candidate.bet.bet_id,
+                        candidate.bet.status,
+                        candidate.bet.selection_text,
+                        candidate.bet.kickoff_time_utc or "",
+                        candidate.event.id,
+                        candidate.event.name,
+                        candidate.event.kickoff_time_utc or "",
+                        f"{candidate.score:.1f}",
+                        f"{candidate.runner_up_score:.1f}",
+                        "Pair key match" if candidate.pair_key_match else "Fuzzy name match",
+                    )
+                )
+        return path
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _cursor(self) -> sqlite3.Cursor:
+        """Cursor yielding ``sqlite3.Row`` without changing the caller's connection."""
+        cursor = self.db.cursor()
+        cursor.row_factory = sqlite3.Row
+        return cursor
+
+    def _score_block(
+        self, index: CanonicalEventIndex, day: int, bets: List[UnlinkedBet]
+    ) -> List[RelinkCandidate]:
+        events = index.in_window(day * DAY_MS - WINDOW_MS, (day + 1) * DAY_MS - 1 + WINDOW_MS)
+        if not events:
+            return []
+
+        scores = process.cdist(
+            [bet.query for bet in bets],
+            [event.match_name for event in events],
+            scorer=fuzz.ratio,
+            dtype=np.float32,
+            workers=self.workers,
+        )
+        # The day block is wider than each bet's own ±WINDOW_MS.
+        bet_kickoffs = np.array([bet.kickoff_ms for bet in bets], dtype=np.int64)
+        event_kickoffs = np.array([event.kickoff_ms for event in events], dtype=np.int64)
+        in_window = np.abs(bet_kickoffs[:, None] - event_kickoffs[None, :]) <= WINDOW_MS
+        pair_ids = {key: code for code, key in enumerate({e.pair_key for e in events if e.pair_key})}
+        # Blank pair keys are never in pair_ids, so they fall back to the sentinels.
+        bet_pairs = np.array([pair_ids.get(bet.pair_key or "", -1) for bet in bets])
+        event_pairs = np.array([pair_ids.get(event.pair_key or "", -2) for event in events])
+        scores[(bet_pairs[:, None] == event_pairs[None, :]) & in_window] = 100.0
+        scores[~in_window] = -1.0
+
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(bets)), best]
+        runner_up = (
+            np.partition(scores, -2, axis=1)[:, -2]
+            if len(events) > 1
+            else np.zeros(len(bets), dtype=scores.dtype)
+        )
+        candidates = []
+        for row, bet in enumerate(bets):
+            if best_scores[row] < 0:
+                continue
+            event = events[int(best[row])]
+            candidates.append(
+                RelinkCandidate(
+                    bet=bet,
+                    event=event,
+                    score=float(best_scores[row]),
+                    runner_up_score=max(float(runner_up[row]), 0.0),
+                    pair_key_match=bool(bet.pair_key and event.pair_key == bet.pair_key),
+                )
+            )
+        return candidates
+
+    def _score_by_pair_key(
+        self, index: CanonicalEventIndex, bets: List[UnlinkedBet]
+    ) -> List[RelinkCandidate]:
+        candidates = []
+        for bet in bets:
+            events = index.by_pair_key(bet.pair_key, limit=2)
+            if events:
+                runner_up = 100.0 if len(events) > 1 else 0.0
+                candidates.append(RelinkCandidate(bet, events[0], 100.0, runner_up, True))
+        return candidates
+
+    def _trigger_matching(self, bet_ids: List[int]) -> Dict[int, int]:
+        """Run the surebet matcher for each bet; returns bet_id -> surebet_id."""
+        from src.services.surebet_matcher import SurebetMatcher
+
+        matcher = SurebetMatcher(self.db)
+        matched: Dict[int, int] = {}
+        for bet_id in bet_ids:
+            try:
+                surebet_id = matcher.attempt_match(bet_id)
+            except Exception as exc:
+                logger.error("event_relink_matching_failed", bet_id=bet_id, error=str(exc))
+                continue
+            if surebet_id:
+                matched[bet_id] = surebet_id
+        return matched
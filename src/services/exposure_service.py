@@ -0,0 +1,607 @@
+"""
+Open-exposure tracking and associate limit enforcement.
+
+``associates.max_bookmaker_exposure_eur`` caps the open stake an associate may
+hold at one bookmaker and ``max_surebet_stake_eur`` caps their stake on one
+surebet (NULL means no limit). Checking those by summing ``bets`` on every
+verification scales with the bet history, so exposure is tracked
+incrementally instead (see ``create_open_exposure_tables``):
+
+- this service writes the EUR stake of each open bet into
+  ``open_exposure_bets`` when it is verified or its stake is edited;
+- triggers keep the ``open_exposure`` and ``surebet_open_exposure`` totals in
+  step and follow matching, settlement, rejection and deletion on their own.
+
+Limit checks are then two primary-key lookups. Stakes are resolved like the
+BET_STAKE ledger capture (manual override first, converted at today's rate,
+else the latest one) and stored as integer cents. :meth:`rebuild` recomputes
+everything from ``bets`` and :meth:`verify` reports drift without writing.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import structlog
+
+from src.core.database import get_db_connection
+from src.services.fx_rate_history import FXRateHistory, get_fx_history
+from src.services.stake_ledger_service import extract_stake
+from src.utils.datetime_helpers import utc_now_iso
+
+logger = structlog.get_logger()
+
+OPEN_STATUSES = ("verified", "matched")
+BUILD_MARKER = "open_exposure_v1"
+CENT = Decimal("0.01")
+
+BOOKMAKER_LIMIT = "max_bookmaker_exposure_eur"
+SUREBET_LIMIT = "max_surebet_stake_eur"
+
+
+def _to_cents(amount: Decimal) -> int:
+    return int(amount.quantize(CENT, rounding=ROUND_HALF_UP) * 100)
+
+
+def _from_cents(cents: int) -> Decimal:
+    return (Decimal(cents) / 100).quantize(CENT)
+
+
+def _parse_limit(raw: Any) -> Optional[Decimal]:
+    if raw is None or str(raw).strip() == "":
+        return None
+    try:
+        return Decimal(str(raw))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class BetExposure:
+    """EUR stake an open bet contributes to its associate's exposure."""
+
+    bet_id: int
+    associate_id: int
+    bookmaker_id: int
+    surebet_id: Optional[int]
+    native_currency: str
+    stake_native: Decimal
+    stake_eur_cents: int
+
+    @property
+    def stake_eur(self) -> Decimal:
+        return _from_cents(self.stake_eur_cents)
+
+
+@dataclass(frozen=True)
+class LimitBreach:
+    """A bet that would push an associate past one of their limits."""
+
+    limit_name: str
+    associate_id: int
+    bookmaker_id: int
+    surebet_id: Optional[int]
+    limit_eur: Decimal
+    current_eur: Decimal
+    stake_eur: Decimal
+
+    @property
+    def projected_eur(self) -> Decimal:
+        return self.current_eur + self.stake_eur
+
+    @property
+    def message(self) -> str:
+        scope = "bookmaker exposure" if self.limit_name == BOOKMAKER_LIMIT else "surebet stake"
+        return (
+            f"{scope} limit of EUR {self.limit_eur} exceeded: "
+            f"EUR {self.current_eur} open + EUR {self.stake_eur} = EUR {self.projected_eur}"
+        )
+
+
+class ExposureLimitError(ValueError):
+    """Raised when approving a bet would exceed an associate limit."""
+
+    def __init__(self, bet_id: int, breaches: List[LimitBreach]) -> None:
+        self.bet_id = bet_id
+        self.breaches = breaches
+        details = "; ".join(breach.message for breach in breaches)
+        super().__init__(f"Bet {bet_id} exceeds associate limits: {details}")
+
+
+@dataclass(frozen=True)
+class ExposureDiscrepancy:
+    """A tracker row that disagrees with a recomputation from ``bets``."""
+
+    scope: str  # "bet", "bookmaker" or "surebet"
+    key: Tuple[Optional[int], ...]
+    expected: Optional[Tuple[int, int]]  # (stake cents, bet count) or None when absent
+    actual: Optional[Tuple[int, int]]
+
+
+@dataclass(frozen=True)
+class ExposureRow:
+    """One (associate, bookmaker) line of the exposure dashboard."""
+
+    associate_id: int
+    associate_alias: str
+    bookmaker_id: int
+    bookmaker_name: str
+    open_stake_eur: Decimal
+    open_bet_count: int
+    limit_eur: Optional[Decimal]
+
+    @property
+    def headroom_eur(self) -> Optional[Decimal]:
+        return None if self.limit_eur is None else self.limit_eur - self.open_stake_eur
+
+    @property
+    def utilization(self) -> Optional[Decimal]:
+        """Open stake as a fraction of the limit (None without a positive limit)."""
+        if not self.limit_eur or self.limit_eur <= 0:
+            return None
+        return (self.open_stake_eur / self.limit_eur).quantize(Decimal("0.0001"))
+
+
+class ExposureService:
+    """Maintain and query open stake per associate, bookmaker and surebet."""
+
+    def __init__(self, db: Optional[sqlite3.Connection] = None) -> None:
+        """
+        Args:
+            db: Connection to use; a new one is opened (and closed) when omitted
+        """
+        self.db = db or get_db_connection()
+        self._owns_connection = db is None
+        self._built = False
+
+    def close(self) -> None:
+        if self._owns_connection:
+            self.db.close()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def ensure_built(self) -> None:
+        """
+        Populate the tracker from ``bets`` once per database (tracked by a maintenance marker).
+
+        Limit checks reach this inside the caller's transaction (bet approval,
+        ingestion), so the build runs in a savepoint: it never commits or rolls
+        back the caller's work and is kept or discarded together with it.
+        """
+        if self._built:
+            return
+        marker = self._cursor().execute(
+            "SELECT 1 FROM maintenance_markers WHERE marker_key = ?", (BUILD_MARKER,)
+        ).fetchone()
+        if marker is None:
+            self.db.execute("SAVEPOINT open_exposure_build")
+            try:
+                tracked = self._replace_tracker()
+            except Exception:
+                self.db.execute("ROLLBACK TO SAVEPOINT open_exposure_build")
+                self.db.execute("RELEASE SAVEPOINT open_exposure_build")
+                raise
+            self.db.execute("RELEASE SAVEPOINT open_exposure_build")
+            logger.info("open_exposure_built", open_bets=tracked)
+        self._built = True
+
+    def sync_bets(self, bet_ids: Iterable[int]) -> int:
+        """
+        Bring the tracker rows for ``bet_ids`` in line with the bets table.
+
+        Runs inside the caller's transaction (nothing is committed), so it can
+        sit next to the status change it follows.
+
+        Returns:
+            Number of bets that are open and tracked after the sync
+        """
+        ids = sorted({int(bet_id) for bet_id in bet_ids})
+        if not ids:
+            return 0
+        rows = self._load_bets("b.id IN ({})".format(",".join("?" for _ in ids)), ids)
+        history = get_fx_history(self.db)
+        exposures = []
+        for row in rows:
+            if row["status"] not in OPEN_STATUSES:
+                continue
+            exposure = self.bet_exposure(row, history=history)
+            if exposure is not None:
+                exposures.append(exposure)
+
+        tracked = {exposure.bet_id for exposure in exposures}
+        stale = [(bet_id,) for bet_id in ids if bet_id not in tracked]
+        if stale:
+            self.db.executemany("DELETE FROM open_exposure_bets WHERE bet_id = ?", stale)
+        self._upsert(exposures)
+        return len(exposures)
+
+    def rebuild(self) -> int:
+        """
+        Recompute every tracker row from ``bets`` in one transaction.
+
+        Returns:
+            Number of open bets tracked
+        """
+        try:
+            tracked = self._replace_tracker()
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        self._built = True
+        logger.info("open_exposure_rebuilt", open_bets=tracked)
+        return tracked
+
+    def verify(self) -> List[ExposureDiscrepancy]:
+        """Compare the tracker with a fresh recomputation; writes nothing."""
+        expected_bets = {exposure.bet_id: exposure for exposure in self._expected_exposures()}
+        actual_bets = {
+            row["bet_id"]: row
+            for row in self._cursor().execute("SELECT * FROM open_exposure_bets").fetchall()
+        }
+
+        discrepancies: List[ExposureDiscrepancy] = []
+        for bet_id in sorted(set(expected_bets) | set(actual_bets)):
+            exposure = expected_bets.get(bet_id)
+            row = actual_bets.get(bet_id)
+            expected = (
+                (exposure.associate_id, exposure.bookmaker_id, exposure.surebet_id, exposure.stake_eur_cents)
+                if exposure
+                else None
+            )
+            actual = (
+                (row["associate_id"], row["bookmaker_id"], row["surebet_id"], row["stake_eur_cents"])
+                if row
+                else None
+            )
+            if expected != actual:
+                discrepancies.append(
+                    ExposureDiscrepancy(
+                        scope="bet",
+                        key=(bet_id,),
+                        expected=(expected[3], 1) if expected else None,
+                        actual=(actual[3], 1) if actual else None,
+                    )
+                )
+
+        expected_pairs: Dict[Tuple[int, int], List[int]] = {}
+        expected_surebets: Dict[Tuple[int, int], List[int]] = {}
+        for exposure in expected_bets.values():
+            totals = expected_pairs.setdefault((exposure.associate_id, exposure.bookmaker_id), [0, 0])
+            totals[0] += exposure.stake_eur_cents
+            totals[1] += 1
+            if exposure.surebet_id is not None:
+                totals = expected_surebets.setdefault((exposure.surebet_id, exposure.associate_id), [0, 0])
+                totals[0] += exposure.stake_eur_cents
+                totals[1] += 1
+
+        for scope, table, columns, expected_totals in (
+            ("bookmaker", "open_exposure", "associate_id, bookmaker_id", expected_pairs),
+            ("surebet", "surebet_open_exposure", "surebet_id, associate_id", expected_surebets),
+        ):
+            actual_totals = {
+                (row[0], row[1]): (row[2], row[3])
+                for row in self._cursor().execute(
+                    f"SELECT {columns}, open_stake_cents, open_bet_count FROM {table}"
+                ).fetchall()
+            }
+            for key in sorted(set(expected_totals) | set(actual_totals)):
+                counts = expected_totals.get(key)
+                expected_total = (counts[0], counts[1]) if counts is not None else None
+                actual_total = actual_totals.get(key)
+                if expected_total != actual_total:
+                    discrepancies.append(
+                        ExposureDiscrepancy(
+                            scope=scope, key=key, expected=expected_total, actual=actual_total
+                        )
+                    )
+
+        logger.info("open_exposure_verified", discrepancies=len(discrepancies))
+        return discrepancies
+
+    def get_open_exposure(self, associate_id: int, bookmaker_id: int) -> Decimal:
+        """Open EUR stake the associate holds at the bookmaker."""
+        self.ensure_built()
+        row = self._cursor().execute(
+            """
+            SELECT open_stake_cents FROM open_exposure
+            WHERE associate_id = ? AND bookmaker_id = ?
+            """,
+            (associate_id, bookmaker_id),
+        ).fetchone()
+        return _from_cents(row[0] if row else 0)
+
+    def get_surebet_exposure(self, surebet_id: int, associate_id: int) -> Decimal:
+        """Open EUR stake the associate holds on the surebet."""
+        self.ensure_built()
+        row = self._cursor().execute(
+            """
+            SELECT open_stake_cents FROM surebet_open_exposure
+            WHERE surebet_id = ? AND associate_id = ?
+            """,
+            (surebet_id, associate_id),
+        ).fetchone()
+        return _from_cents(row[0] if row else 0)
+
+    def check_bet(self, bet: Mapping[str, Any]) -> List[LimitBreach]:
+        """
+        Return the limits ``bet`` would breach once open.
+
+        ``bet`` is the bet as it will be stored (e.g. a loaded row with the
+        reviewer's edits applied). Its own tracked stake, if any, is not
+        counted twice.
+        """
+        self.ensure_built()
+        exposure = self.bet_exposure(bet)
+        if exposure is None:
+            return []
+        limits = self._cursor().execute(
+            f"SELECT {BOOKMAKER_LIMIT}, {SUREBET_LIMIT} FROM associates WHERE id = ?",
+            (exposure.associate_id,),
+        ).fetchone()
+        if limits is None:
+            return []
+        bookmaker_limit = _parse_limit(limits[BOOKMAKER_LIMIT])
+        surebet_limit = _parse_limit(limits[SUREBET_LIMIT])
+        if bookmaker_limit is None and surebet_limit is None:
+            return []
+
+        tracked = self._cursor().execute(
+            "SELECT associate_id, bookmaker_id, surebet_id, stake_eur_cents FROM open_exposure_bets WHERE bet_id = ?",
+            (exposure.bet_id,),
+        ).fetchone()
+
+        def _excluding_self(current: Decimal, same_scope: bool) -> Decimal:
+            if tracked is not None and same_scope:
+                return current - _from_cents(tracked["stake_eur_cents"])
+            return current
+
+        breaches: List[LimitBreach] = []
+        if bookmaker_limit is not None:
+            current = _excluding_self(
+                self.get_open_exposure(exposure.associate_id, exposure.bookmaker_id),
+                tracked is not None
+                and (tracked["associate_id"], tracked["bookmaker_id"])
+                == (exposure.associate_id, exposure.bookmaker_id),
+            )
+            if current + exposure.stake_eur > bookmaker_limit:
+                breaches.append(
+                    LimitBreach(
+                        limit_name=BOOKMAKER_LIMIT,
+                        associate_id=exposure.associate_id,
+                        bookmaker_id=exposure.bookmaker_id,
+                        surebet_id=exposure.surebet_id,
+                        limit_eur=bookmaker_limit,
+                        current_eur=current,
+                        stake_eur=exposure.stake_eur,
+                    )
+                )
+        if surebet_limit is not None:
+            current = Decimal("0.00")
+            if exposure.surebet_id is not None:
+                current = _excluding_self(
+                    self.get_surebet_exposure(exposure.surebet_id, exposure.associate_id),
+                    tracked is not None
+                    and (tracked["surebet_id"], tracked["associate_id"])
+                    == (exposure.surebet_id, exposure.associate_id),
+                )
+            if current + exposure.stake_eur > surebet_limit:
+                breaches.append(
+                    LimitBreach(
+                        limit_name=SUREBET_LIMIT,
+                        associate_id=exposure.associate_id,
+                        bookmaker_id=exposure.bookmaker_id,
+                        surebet_id=exposure.surebet_id,
+                        limit_eur=surebet_limit,
+                        current_eur=current,
+                        stake_eur=exposure.stake_eur,
+                    )
+                )
+        return breaches
+
+    def enforce(self, bet: Mapping[str, Any]) -> None:
+        """
+        Raise if ``bet`` would breach an associate limit.
+
+        Raises:
+            ExposureLimitError: Listing every breached limit
+        """
+        breaches = self.check_bet(bet)
+        if breaches:
+            logger.warning(
+                "bet_exposure_limit_exceeded",
+                bet_id=bet.get("id"),
+                limits=[breach.limit_name for breach in breaches],
+            )
+            raise ExposureLimitError(int(bet.get("id") or 0), breaches)
+
+    def dashboard_feed(self, associate_id: Optional[int] = None) -> List[ExposureRow]:
+        """
+        Open exposure per (associate, bookmaker) with limits, highest utilization first.
+
+        Pairs without open bets are omitted.
+        """
+        self.ensure_built()
+        query = f"""
+            SELECT
+                e.associate_id,
+                a.display_alias,
+                e.bookmaker_id,
+                bk.bookmaker_name,
+                e.open_stake_cents,
+                e.open_bet_count,
+                a.{BOOKMAKER_LIMIT} AS limit_eur
+            FROM open_exposure e
+            JOIN associates a ON a.id = e.associate_id
+            JOIN bookmakers bk ON bk.id = e.bookmaker_id
+        """
+        params: List[Any] = []
+        if associate_id is not None:
+            query += " WHERE e.associate_id = ?"
+            params.append(associate_id)
+        rows = [
+            ExposureRow(
+                associate_id=row["associate_id"],
+                associate_alias=row["display_alias"],
+                bookmaker_id=row["bookmaker_id"],
+                bookmaker_name=row["bookmaker_name"],
+                open_stake_eur=_from_cents(row["open_stake_cents"]),
+                open_bet_count=row["open_bet_count"],
+                limit_eur=_parse_limit(row["limit_eur"]),
+            )
+            for row in self._cursor().execute(query, params).fetchall()
+        ]
+        rows.sort(
+            key=lambda row: (
+                row.utilization is None,
+                -(row.utilization or 0),
+                -row.open_stake_eur,
+                row.associate_alias,
+                row.bookmaker_name,
+            )
+        )
+        return rows
+
+    def bet_exposure(
+        self,
+        bet: Mapping[str, Any],
+        *,
+        history: Optional[FXRateHistory] = None,
+    ) -> Optional[BetExposure]:
+        """
+        Resolve the EUR stake ``bet`` contributes while open.
+
+        Returns:
+            None when the bet has no stake, no identifiers, or no FX rate for its currency
+        """
+        bet = dict(bet)
+        try:
+            bet_id = int(bet["id"])
+            associate_id = int(bet["associate_id"])
+            bookmaker_id = int(bet["bookmaker_id"])
+            currency, stake_native = extract_stake(bet)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        if currency == "EUR":
+            rate = Decimal("1")
+        else:
+            history = history or get_fx_history(self.db)
+            today = date.today()
+            found = history.rate_as_of(currency, today)
+            if found is None or found[1] != today.isoformat():
+                found = history.latest(currency)
+            if found is None:
+                logger.warning("open_exposure_fx_missing", bet_id=bet_id, currency=currency)
+                return None
+            rate = found[0]
+
+        surebet_id = bet.get("surebet_id")
+        return BetExposure(
+            bet_id=bet_id,
+            associate_id=associate_id,
+            bookmaker_id=bookmaker_id,
+            surebet_id=int(surebet_id) if surebet_id is not None else None,
+            native_currency=currency,
+            stake_native=stake_native,
+            stake_eur_cents=_to_cents(stake_native * rate),
+        )
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _cursor(self) -> sqlite3.Cursor:
+        """Cursor with named-column rows; the caller's connection keeps its row_factory."""
+        cursor = self.db.cursor()
+        cursor.row_factory = sqlite3.Row
+        return cursor
+
+    def _load_bets(self, where: str, params: List[Any]) -> List[Dict[str, Any]]:
+        rows = self._cursor().execute(
+            f"""
+            SELECT b.*, (
+                SELECT MIN(sb.surebet_id) FROM surebet_bets sb WHERE sb.bet_id = b.id
+            ) AS surebet_id
+            FROM bets b
+            WHERE {where}
+            """,
+            params,
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def _expected_exposures(self) -> List[BetExposure]:
+        history = get_fx_history(self.db)
+        exposures = []
+        for row in self._load_bets("b.status IN (?, ?)", list(OPEN_STATUSES)):
+            exposure = self.bet_exposure(row, history=history)
+            if exposure is not None:
+                exposures.append(exposure)
+        return exposures
+
+    def _replace_tracker(self) -> int:
+        """Rewrite every tracker row and the build marker; the caller owns the transaction."""
+        exposures = self._expected_exposures()
+        # Totals first, so the per-row delete triggers find nothing to adjust.
+        self.db.execute("DELETE FROM open_exposure")
+        self.db.execute("DELETE FROM surebet_open_exposure")
+        self.db.execute("DELETE FROM open_exposure_bets")
+        self._upsert(exposures)
+        self.db.execute(
+            """
+            INSERT INTO maintenance_markers (marker_key, completed_at_utc, details)
+            VALUES (?, ?, ?)
+            ON CONFLICT(marker_key) DO UPDATE SET
+                completed_at_utc = excluded.completed_at_utc,
+                details = excluded.details
+            """,
+            (BUILD_MARKER, utc_now_iso(), f"open_bets={len(exposures)}"),
+        )
+        return len(exposures)
+
+    def _upsert(self, exposures: List[BetExposure]) -> None:
+        if not exposures:
+            return
+        timestamp = utc_now_iso()
+        # The WHERE guard skips unchanged rows, so their totals are not touched.
+        self.db.executemany(
+            """
+            INSERT INTO open_exposure_bets (
+                bet_id, associate_id, bookmaker_id, surebet_id,
+                native_currency, stake_native, stake_eur_cents, updated_at_utc
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(bet_id) DO UPDATE SET
+                associate_id = excluded.associate_id,
+                bookmaker_id = excluded.bookmaker_id,
+                surebet_id = excluded.surebet_id,
+                native_currency = excluded.native_currency,
+                stake_native = excluded.stake_native,
+                stake_eur_cents = excluded.stake_eur_cents,
+                updated_at_utc = excluded.updated_at_utc
+            WHERE open_exposure_bets.associate_id IS NOT excluded.associate_id
+               OR open_exposure_bets.bookmaker_id IS NOT excluded.bookmaker_id
+               OR open_exposure_bets.surebet_id IS NOT excluded.surebet_id
+               OR open_exposure_bets.native_currency IS NOT excluded.native_currency
+               OR open_exposure_bets.stake_native IS NOT excluded.stake_native
+               OR open_exposure_bets.stake_eur_cents IS NOT excluded.stake_eur_cents
+            """,
+            [
+                (
+                    exposure.bet_id,
+                    exposure.associate_id,
+                    exposure.bookmaker_id,
+                    exposure.surebet_id,
+                    exposure.native_currency,
+                    str(exposure.stake_native),
+                    exposure.stake_eur_cents,
+                    timestamp,
+                )
+                for exposure in exposures
+            ],
+        )
@@ -18,8 +18,9 @@ import structlog
 
 from src.core.database import get_db_connection
 from src.services.fx_manager import get_fx_rate
+from src.services.ledger_archive_service import ledger_relation
 from src.utils.database_utils import TransactionError, transactional
-from src.utils.datetime_helpers import utc_now_iso
+from src.utils.datetime_helpers import to_epoch_ms, utc_now_iso
 
 logger = structlog.get_logger(__name__)
 
@@ -417,10 +418,10 @@ class FundingService:
         """
         try:
             cutoff_date = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-            cutoff_date_iso = cutoff_date.isoformat() + "Z"
-            
+            ledger = ledger_relation(self.db)
+
             cursor = self.db.execute(
-                """
+                f"""
                 SELECT 
                     le.id,
                     le.type as event_type,
@@ -434,14 +435,14 @@ class FundingService:
                     le.amount_eur,
                     le.created_at_utc,
                     le.note
-                FROM ledger_entries le
+                FROM {ledger} le
                 JOIN associates a ON le.associate_id = a.id
                 LEFT JOIN bookmakers b ON le.bookmaker_id = b.id
                 WHERE le.type IN ('DEPOSIT', 'WITHDRAWAL')
-                AND le.created_at_utc >= ?
-                ORDER BY le.created_at_utc DESC
+                AND le.created_at_ms >= ?
+                ORDER BY le.created_at_ms DESC
                 """,
-                (cutoff_date_iso,)
+                (to_epoch_ms(cutoff_date),)
             )
             
             history = []
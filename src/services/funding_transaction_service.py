@@ -16,9 +16,10 @@ import structlog
 
 from src.core.database import get_db_connection
 from src.services.fx_manager import get_fx_rate
+from src.services.ledger_archive_service import ledger_relation
 from src.services.settlement_constants import SETTLEMENT_NOTE_PREFIX
 from src.utils.database_utils import TransactionError, transactional
-from src.utils.datetime_helpers import utc_now_iso
+from src.utils.datetime_helpers import to_epoch_ms, utc_now_iso
 
 logger = structlog.get_logger(__name__)
 
@@ -160,9 +161,9 @@ class FundingTransactionService:
             from datetime import datetime, timezone
             
             cutoff_date = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-            cutoff_date_iso = cutoff_date.isoformat() + "Z"
+            ledger = ledger_relation(self.db)
             
-            query = """
+            query = f"""
             SELECT 
                 le.id,
                 le.type as transaction_type,
@@ -177,14 +178,14 @@ class FundingTransactionService:
                 le.created_at_utc,
                 le.created_by,
                 le.note
-            FROM ledger_entries le
+            FROM {ledger} le
             JOIN associates a ON le.associate_id = a.id
             LEFT JOIN bookmakers b ON le.bookmaker_id = b.id
             WHERE le.type IN ('DEPOSIT', 'WITHDRAWAL')
-            AND le.created_at_utc >= ?
+            AND le.created_at_ms >= ?
             """
             
-            params: List = [cutoff_date_iso]
+            params: List = [to_epoch_ms(cutoff_date)]
             
             if associate_id:
                 query += " AND le.associate_id = ?"
@@ -194,7 +195,7 @@ class FundingTransactionService:
                 query += " AND le.bookmaker_id = ?"
                 params.append(bookmaker_id)
             
-            query += " ORDER BY le.created_at_utc DESC"
+            query += " ORDER BY le.created_at_ms DESC"
             
             cursor = self.db.execute(query, params)
             rows = cursor.fetchall()
@@ -241,12 +242,13 @@ class FundingTransactionService:
             Dictionary with balance metrics
         """
         try:
+            ledger = ledger_relation(self.db)
             # Net deposits (deposits - withdrawals)
             cursor = self.db.execute(
-                """
+                f"""
                 SELECT 
                     SUM(CAST(amount_eur AS REAL)) AS net_deposits_eur
-                FROM ledger_entries 
+                FROM {ledger} 
                 WHERE associate_id = ?
                   AND type IN ('DEPOSIT', 'WITHDRAWAL')
                   AND (note IS NULL OR note NOT LIKE ?)
@@ -258,10 +260,10 @@ class FundingTransactionService:
             
             # Current holdings (positive ledger entries from betting activities)
             cursor = self.db.execute(
-                """
+                f"""
                 SELECT 
                     SUM(CAST(amount_eur AS REAL)) AS current_holding_eur
-                FROM ledger_entries
+                FROM {ledger}
                 WHERE associate_id = ?
                 """,
                 (associate_id,)
@@ -9,9 +9,10 @@ import sqlite3
 import structlog
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
-from typing import Optional
+from typing import Mapping, Optional
 
 from src.core.database import get_db_connection
+from src.services.fx_rate_history import get_fx_history
 from src.utils.datetime_helpers import utc_now_iso, get_date_string
 
 logger = structlog.get_logger()
@@ -189,6 +190,100 @@ def store_fx_rate(
             conn.close()
 
 
+def store_fx_rates_bulk(
+    rates: Mapping[str, Decimal],
+    fetched_at_utc: str,
+    source: str = "manual",
+    conn: Optional[sqlite3.Connection] = None,
+) -> int:
+    """
+    Store a full rate set for one date in a single transaction.
+
+    Args:
+        rates: Mapping of ISO currency code to rate to EUR
+        fetched_at_utc: UTC timestamp when the rates were fetched (sets the rate date)
+        source: Source of the rates (e.g., "exchangerate-api.com", "fixture")
+        conn: Optional database connection to reuse (not closed by this function).
+
+    Returns:
+        Number of rates written
+    """
+    date_str = get_date_string(parse_utc_iso(fetched_at_utc))
+    created_at = utc_now_iso()
+    rows = [
+        (currency.upper(), str(rate), fetched_at_utc, date_str, created_at)
+        for currency, rate in rates.items()
+    ]
+    if not rows:
+        return 0
+
+    should_close = False
+    if conn is None:
+        conn = get_db_connection()
+        should_close = True
+
+    try:
+        try:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO fx_rates_daily
+                (currency_code, rate_to_eur, fetched_at_utc, date, created_at_utc)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+                rows,
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        logger.info("fx_rates_bulk_stored", count=len(rows), date=date_str, source=source)
+        return len(rows)
+
+    finally:
+        if should_close:
+            conn.close()
+
+
+def get_fx_rate_as_of(
+    currency: str, as_of: date, conn: Optional[sqlite3.Connection] = None
+) -> Decimal:
+    """
+    Get the rate in force on ``as_of`` from the in-memory rate history.
+
+    Unlike :func:`get_fx_rate`, this never falls forward to a rate dated after
+    ``as_of``, and it only reads rows added since the previous lookup.
+
+    Args:
+        currency: ISO currency code
+        as_of: Date whose rate is wanted
+        conn: Optional database connection to reuse (not closed by this function).
+
+    Returns:
+        Decimal rate to EUR from the latest rate dated on or before ``as_of``
+
+    Raises:
+        ValueError: If the currency has no rate on or before ``as_of``
+    """
+    if currency.upper() == "EUR":
+        return Decimal("1.0")
+
+    should_close = False
+    if conn is None:
+        conn = get_db_connection()
+        should_close = True
+
+    try:
+        found = get_fx_history(conn).rate_as_of(currency, as_of)
+    finally:
+        if should_close:
+            conn.close()
+
+    if found is None:
+        raise ValueError(f"No FX rate found for currency {currency} on or before {as_of}")
+    return found[0]
+
+
 def get_latest_fx_rate(
     currency: str, conn: Optional[sqlite3.Connection] = None
 ) -> Optional[tuple[Decimal, str]]:
@@ -0,0 +1,162 @@
+"""
+Process-wide in-memory FX rate history for as-of lookups.
+
+``get_fx_rate`` runs two queries per call, which adds up when settlement,
+statement or risk code converts many amounts at historical dates. The
+history keeps every ``fx_rates_daily`` row in per-currency arrays sorted by
+date, and resolves the rate in force on a date (the latest one on or before
+it) with :func:`bisect.bisect_right`.
+
+One history is shared per database file. :func:`get_fx_history` tops it up
+with rows written since the last call (``id`` is AUTOINCREMENT and
+``INSERT OR REPLACE`` re-inserts, so new and replaced rows always have higher
+IDs), so writes from any process show up on the next lookup. Deleted rows
+are only dropped by :func:`invalidate_fx_histories`.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple, Union
+
+from src.core.database import database_file_key
+
+DateLike = Union[date, str]
+
+
+def _date_key(value: DateLike) -> str:
+    """``YYYY-MM-DD`` strings sort chronologically, so they serve as bisect keys."""
+    text = value.isoformat() if isinstance(value, date) else str(value)
+    return text[:10]
+
+
+class FXRateHistory:
+    """Per-currency sorted rate arrays over ``fx_rates_daily``."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._dates: Dict[str, List[str]] = {}
+        self._rates: Dict[str, List[Decimal]] = {}
+        self.max_id = 0
+
+    def __len__(self) -> int:
+        return sum(len(dates) for dates in self._dates.values())
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def refresh(self, conn: sqlite3.Connection) -> int:
+        """
+        Load rows written since the last refresh.
+
+        Returns:
+            Number of rows loaded
+        """
+        with self._lock:
+            rows = conn.execute(
+                """
+                SELECT id, currency_code, date, rate_to_eur
+                FROM fx_rates_daily
+                WHERE id > ?
+                ORDER BY id
+                """,
+                (self.max_id,),
+            ).fetchall()
+            for row_id, currency, rate_date, rate in rows:
+                self._insert(currency, rate_date, Decimal(str(rate)))
+                self.max_id = row_id
+            return len(rows)
+
+    def add(self, currency: str, rate_date: DateLike, rate_to_eur: Decimal) -> None:
+        """Record one rate, replacing any existing rate for the same currency and date."""
+        with self._lock:
+            self._insert(currency, _date_key(rate_date), Decimal(str(rate_to_eur)))
+
+    def _insert(self, currency: str, rate_date: str, rate: Decimal) -> None:
+        """Insert in date order; the caller holds the lock."""
+        code = currency.upper()
+        dates = self._dates.setdefault(code, [])
+        rates = self._rates.setdefault(code, [])
+        if not dates or rate_date > dates[-1]:
+            # Rates mostly arrive in date order.
+            dates.append(rate_date)
+            rates.append(rate)
+            return
+        position = bisect_left(dates, rate_date)
+        if position < len(dates) and dates[position] == rate_date:
+            rates[position] = rate
+        else:
+            dates.insert(position, rate_date)
+            rates.insert(position, rate)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def rate_as_of(self, currency: str, as_of: DateLike) -> Optional[Tuple[Decimal, str]]:
+        """
+        Return the rate in force on ``as_of``.
+
+        Returns:
+            ``(rate_to_eur, rate_date)`` for the latest rate dated on or before
+            ``as_of``, or None when the currency has no rate that early
+        """
+        code = currency.upper()
+        with self._lock:
+            dates = self._dates.get(code)
+            if not dates:
+                return None
+            position = bisect_right(dates, _date_key(as_of))
+            if position == 0:
+                return None
+            return self._rates[code][position - 1], dates[position - 1]
+
+    def latest(self, currency: str) -> Optional[Tuple[Decimal, str]]:
+        """Return ``(rate_to_eur, rate_date)`` for the most recent rate, if any."""
+        code = currency.upper()
+        with self._lock:
+            dates = self._dates.get(code)
+            if not dates:
+                return None
+            return self._rates[code][-1], dates[-1]
+
+    def latest_rates(self) -> Dict[str, Decimal]:
+        """Most recent rate per currency, e.g. to diff before and after an FX refresh."""
+        with self._lock:
+            return {code: rates[-1] for code, rates in self._rates.items() if rates}
+
+    def currencies(self) -> List[str]:
+        with self._lock:
+            return sorted(code for code, dates in self._dates.items() if dates)
+
+
+_HISTORIES: Dict[Tuple[str, int, int], FXRateHistory] = {}
+_HISTORIES_LOCK = threading.Lock()
+
+
+def get_fx_history(conn: sqlite3.Connection) -> FXRateHistory:
+    """
+    Return the shared history for ``conn``'s database, refreshed with new rows.
+
+    In-memory databases cannot be shared between connections, so they get a
+    fresh history on every call.
+    """
+    key = database_file_key(conn)
+    if key is None:
+        history = FXRateHistory()
+    else:
+        with _HISTORIES_LOCK:
+            history = _HISTORIES.setdefault(key, FXRateHistory())
+    history.refresh(conn)
+    return history
+
+
+def invalidate_fx_histories() -> None:
+    """Drop every shared history; the next :func:`get_fx_history` reloads from disk."""
+    with _HISTORIES_LOCK:
+        _HISTORIES.clear()
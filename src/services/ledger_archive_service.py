@@ -0,0 +1,565 @@
+"""
+Ledger Archive Service
+
+Moves cold rows out of the hot database into per-year archive files
+(``archive_YYYY.db`` next to the main database). Only rows a closed period
+already covers are moved: ledger rows inside an associate's period checkpoint,
+and bets/audit rows older than the period end. A row that anything left in the
+hot database still references stays hot, so foreign keys never point at a
+missing row.
+
+Readers that need history call :func:`attach_archives`, which ATTACHes the
+archive files recorded in ``ledger_archive_runs`` and exposes ``<table>_all``
+TEMP views unioning the hot table with every archive. Running-balance, ROI
+and history readers resolve their ledger relation through
+:func:`ledger_relation`. Statements starting from a checkpoint past the
+archive horizon never need them.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import structlog
+
+from src.core.config import Config
+from src.core.database import get_db_connection
+from src.core.schema import EPOCH_MS_COLUMNS, create_ledger_append_only_trigger, epoch_ms_sql
+from src.repositories.period_closing_balance_repository import normalize_period_end
+from src.utils.datetime_helpers import to_epoch_ms
+
+logger = structlog.get_logger()
+
+# Children before parents: a bet only moves once its audit rows have.
+ARCHIVED_TABLES: Tuple[str, ...] = (
+    "telegram_audit_log",
+    "extraction_log",
+    "verification_audit",
+    "ledger_entries",
+    "bets",
+)
+
+ARCHIVABLE_BET_STATUSES: Tuple[str, ...] = ("settled", "rejected")
+
+# References the schema does not declare as foreign keys but readers join on.
+_SOFT_REFERENCES: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "bets": (("ledger_entries", "bet_id"),),
+}
+
+_YEAR_PATTERN = re.compile(r"^\d{4}$")
+
+
+@dataclass
+class LedgerArchiveResult:
+    """Outcome of archiving one closed period."""
+
+    period_end_utc: str
+    moved: Dict[str, int] = field(default_factory=dict)
+    archive_paths: List[str] = field(default_factory=list)
+    dry_run: bool = False
+
+    @property
+    def total_rows(self) -> int:
+        return sum(self.moved.values())
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _table_columns(conn: sqlite3.Connection, schema: str, table: str) -> List[str]:
+    rows = conn.execute(f"PRAGMA {schema}.table_info({_quote(table)})").fetchall()
+    return [row[1] for row in rows]
+
+
+def _manifest_exists(conn: sqlite3.Connection) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM main.sqlite_master WHERE type = 'table' AND name = 'ledger_archive_runs'"
+    ).fetchone()
+    return row is not None
+
+
+def _attached_schemas(conn: sqlite3.Connection) -> Dict[str, str]:
+    """Return attached schema name -> file path."""
+    return {row[1]: row[2] for row in conn.execute("PRAGMA database_list").fetchall()}
+
+
+def _attach(conn: sqlite3.Connection, path: Path) -> str:
+    """ATTACH ``path`` under its file stem, reusing an existing attachment."""
+    schema = path.stem
+    if not re.fullmatch(r"archive_\d{4}", schema):
+        raise ValueError(f"Unexpected archive file name: {path.name}")
+    if schema in _attached_schemas(conn):
+        return schema
+    if conn.in_transaction:
+        raise RuntimeError("Cannot attach ledger archives inside an open transaction")
+    conn.execute(f"ATTACH DATABASE ? AS {schema}", (str(path),))
+    return schema
+
+
+def archive_horizon(conn: sqlite3.Connection) -> Optional[Tuple[int, int]]:
+    """
+    Return (latest archived period end in epoch ms, highest archived ledger ID), or None.
+
+    A statement whose checkpoint is at or past both bounds only reads ledger
+    rows that are still hot.
+    """
+    if not _manifest_exists(conn):
+        return None
+    row = conn.execute(
+        """
+        SELECT MAX(period_end_ms), MAX(max_row_id)
+        FROM ledger_archive_runs
+        WHERE table_name = 'ledger_entries' AND row_count > 0
+        """
+    ).fetchone()
+    if row is None or row[0] is None:
+        return None
+    return int(row[0]), int(row[1] or 0)
+
+
+def ledger_relation(conn: sqlite3.Connection) -> str:
+    """
+    Return the relation cumulative ledger readers must aggregate.
+
+    Running balances sum every ledger row ever written, so once rows have been
+    archived they read the ``ledger_entries_all`` view; until then this is the
+    hot table and nothing is attached.
+    """
+    if archive_horizon(conn) is None:
+        return "ledger_entries"
+    return attach_archives(conn, ("ledger_entries",))["ledger_entries"]
+
+
+def attach_archives(
+    conn: sqlite3.Connection, tables: Sequence[str] = ARCHIVED_TABLES
+) -> Dict[str, str]:
+    """
+    Attach every recorded archive and build unified ``<table>_all`` views.
+
+    Archive rows whose ID is still present in the hot table are skipped, so an
+    archive run interrupted between its copy and delete phases never double
+    counts.
+
+    Args:
+        conn: Connection to the hot database (must not be mid-transaction)
+        tables: Archived tables the caller reads
+
+    Returns:
+        Mapping of table name to the relation to query: the TEMP view when
+        archived rows exist, otherwise the hot table itself
+
+    Raises:
+        FileNotFoundError: If a recorded archive file is missing
+    """
+    sources = {table: table for table in tables}
+    if not _manifest_exists(conn):
+        return sources
+
+    paths = [
+        Path(row[0])
+        for row in conn.execute(
+            "SELECT DISTINCT archive_path FROM ledger_archive_runs "
+            "WHERE row_count > 0 ORDER BY archive_path"
+        ).fetchall()
+    ]
+    if not paths:
+        return sources
+
+    schemas: List[str] = []
+    for path in paths:
+        if not path.exists():
+            raise FileNotFoundError(f"Ledger archive {path} is recorded but missing")
+        schemas.append(_attach(conn, path))
+
+    for table in tables:
+        columns = _table_columns(conn, "main", table)
+        if not columns:
+            continue
+        # Archive copies are plain tables, so the generated *_ms columns are
+        # recomputed from their TEXT sources for archived rows.
+        generated = {
+            row[1] for row in conn.execute(f"PRAGMA main.table_xinfo({_quote(table)})").fetchall()
+        }
+        epoch_columns = {
+            column: source
+            for column, source in EPOCH_MS_COLUMNS.get(table, {}).items()
+            if column in generated
+        }
+        column_sql = ", ".join(_quote(column) for column in [*columns, *epoch_columns])
+        selects = [f"SELECT {column_sql} FROM main.{_quote(table)}"]
+        for schema in schemas:
+            archived_columns = set(_table_columns(conn, schema, table))
+            if not archived_columns:
+                continue
+            exprs = ", ".join(
+                [
+                    f"a.{_quote(column)}" if column in archived_columns else f"NULL AS {_quote(column)}"
+                    for column in columns
+                ]
+                + [
+                    f"{epoch_ms_sql('a.' + _quote(source))} AS {_quote(column)}"
+                    if source in archived_columns
+                    else f"NULL AS {_quote(column)}"
+                    for column, source in epoch_columns.items()
+                ]
+            )
+            selects.append(
+                f"SELECT {exprs} FROM {schema}.{_quote(table)} a "
+                f"WHERE NOT EXISTS (SELECT 1 FROM main.{_quote(table)} m WHERE m.id = a.id)"
+            )
+        if len(selects) == 1:
+            continue
+        view = f"{table}_all"
+        conn.execute(f"DROP VIEW IF EXISTS temp.{_quote(view)}")
+        conn.execute(f"CREATE TEMP VIEW {_quote(view)} AS " + " UNION ALL ".join(selects))
+        sources[table] = view
+    return sources
+
+
+class LedgerArchiveService:
+    """Move rows covered by a closed period into per-year archive databases."""
+
+    def __init__(
+        self,
+        db: Optional[sqlite3.Connection] = None,
+        archive_dir: Optional[str] = None,
+    ) -> None:
+        self.db = db or get_db_connection()
+        self._owns_connection = db is None
+        self.archive_dir = Path(archive_dir) if archive_dir else self._default_archive_dir()
+
+    def close(self) -> None:
+        """Close the owned database connection, if any."""
+        if self._owns_connection:
+            try:
+                self.db.close()
+            except Exception:  # pragma: no cover - defensive cleanup
+                pass
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def archive_period(
+        self,
+        period_end_utc: str,
+        *,
+        tables: Iterable[str] = ARCHIVED_TABLES,
+        dry_run: bool = False,
+    ) -> LedgerArchiveResult:
+        """
+        Archive rows covered by a closed period.
+
+        Each table is moved in two phases: rows are copied into the archive
+        and counted back, then deleted from the hot database together with the
+        manifest entry. Re-running after a failure resumes safely.
+
+        Args:
+            period_end_utc: Period end that has checkpoints in
+                ``period_closing_balances``
+            tables: Subset of ``ARCHIVED_TABLES`` to archive
+            dry_run: Only count the rows that would move
+
+        Returns:
+            LedgerArchiveResult with per-table row counts
+
+        Raises:
+            ValueError: If the period has not been closed or a table is unknown
+        """
+        selected = [table for table in ARCHIVED_TABLES if table in set(tables)]
+        unknown = set(tables) - set(ARCHIVED_TABLES)
+        if unknown:
+            raise ValueError(f"Tables cannot be archived: {', '.join(sorted(unknown))}")
+        if self.db.in_transaction:
+            raise RuntimeError("Commit pending changes before archiving")
+
+        # Checkpoints and the manifest use the canonical spelling
+        period_end_utc = normalize_period_end(period_end_utc)
+        closed = self.db.execute(
+            "SELECT COUNT(*) FROM period_closing_balances WHERE period_end_utc = ?",
+            (period_end_utc,),
+        ).fetchone()[0]
+        if not closed:
+            raise ValueError(f"Period ending {period_end_utc} has not been closed")
+
+        self.db.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS archive_candidates "
+            "(id INTEGER PRIMARY KEY, year TEXT NOT NULL)"
+        )
+
+        result = LedgerArchiveResult(period_end_utc=period_end_utc, dry_run=dry_run)
+        for table in selected:
+            moved, paths = self._archive_table(table, period_end_utc, dry_run)
+            result.moved[table] = moved
+            for path in paths:
+                if path not in result.archive_paths:
+                    result.archive_paths.append(path)
+
+        logger.info(
+            "ledger_archive_completed",
+            period_end_utc=period_end_utc,
+            moved=result.moved,
+            archive_paths=result.archive_paths,
+            dry_run=dry_run,
+        )
+        return result
+
+    def verify_archives(self) -> List[Dict[str, object]]:
+        """
+        Check every archive against the manifest.
+
+        Returns:
+            One dict per problem: rows present in both the hot table and an
+            archive, or an archive whose row count differs from the manifest
+        """
+        problems: List[Dict[str, object]] = []
+        if not _manifest_exists(self.db):
+            return problems
+        expected = self.db.execute(
+            """
+            SELECT archive_path, table_name, SUM(row_count) AS rows
+            FROM ledger_archive_runs
+            GROUP BY archive_path, table_name
+            ORDER BY archive_path, table_name
+            """
+        ).fetchall()
+        for archive_path, table, rows in expected:
+            path = Path(archive_path)
+            if not path.exists():
+                problems.append({"archive_path": archive_path, "table": table, "issue": "missing"})
+                continue
+            schema = _attach(self.db, path)
+            archived = self.db.execute(
+                f"SELECT COUNT(*) FROM {schema}.{_quote(table)}"
+            ).fetchone()[0]
+            if archived != rows:
+                problems.append(
+                    {
+                        "archive_path": archive_path,
+                        "table": table,
+                        "issue": "row_count",
+                        "expected": rows,
+                        "actual": archived,
+                    }
+                )
+            duplicated = self.db.execute(
+                f"SELECT COUNT(*) FROM {schema}.{_quote(table)} a "
+                f"JOIN main.{_quote(table)} m ON m.id = a.id"
+            ).fetchone()[0]
+            if duplicated:
+                problems.append(
+                    {
+                        "archive_path": archive_path,
+                        "table": table,
+                        "issue": "still_hot",
+                        "rows": duplicated,
+                    }
+                )
+        return problems
+
+    def vacuum(self) -> None:
+        """Reclaim the space freed by archiving in the hot database."""
+        self.db.execute("VACUUM main")
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _default_archive_dir(self) -> Path:
+        main_path = _attached_schemas(self.db).get("main")
+        if main_path:
+            return Path(main_path).parent
+        return Path(Config.DB_PATH).parent
+
+    def _archive_path(self, year: str) -> Path:
+        if not _YEAR_PATTERN.match(year or ""):
+            raise ValueError(f"Cannot derive an archive year from {year!r}")
+        return self.archive_dir / f"archive_{year}.db"
+
+    def _candidate_filter(self, table: str, period_end_utc: str) -> Tuple[str, List[object]]:
+        """Return the WHERE clause selecting rows of ``table`` that may move."""
+        if "created_at_ms" in EPOCH_MS_COLUMNS.get(table, {}):
+            clauses = ["t.created_at_ms <= ?"]
+            params: List[object] = [to_epoch_ms(period_end_utc)]
+        else:
+            clauses = [f"{epoch_ms_sql('t.created_at_utc')} <= ?"]
+            params = [to_epoch_ms(period_end_utc)]
+        if table == "ledger_entries":
+            # Exactly the rows the associate's checkpoint already covers.
+            clauses.append(
+                """EXISTS (
+                    SELECT 1 FROM main.period_closing_balances c
+                    WHERE c.period_end_ms = ?
+                      AND c.associate_id = t.associate_id
+                      AND c.bookmaker_id IS NULL
+                      AND t.id <= c.through_entry_id
+                )"""
+            )
+            params.append(to_epoch_ms(period_end_utc))
+            # Stake rows of a bet that can still change stay hot, so stake
+            # resyncs (which run inside the caller's transaction and cannot
+            # attach archives) always see the bet's full BET_STAKE history.
+            placeholders = ", ".join("?" for _ in ARCHIVABLE_BET_STATUSES)
+            clauses.append(
+                f"""(t.type != 'BET_STAKE' OR NOT EXISTS (
+                    SELECT 1 FROM main.bets b
+                    WHERE b.id = t.bet_id AND b.status NOT IN ({placeholders})
+                ))"""
+            )
+            params.extend(ARCHIVABLE_BET_STATUSES)
+        elif table == "bets":
+            placeholders = ", ".join("?" for _ in ARCHIVABLE_BET_STATUSES)
+            clauses.append(f"t.status IN ({placeholders})")
+            params.extend(ARCHIVABLE_BET_STATUSES)
+
+        for child, column in self._references_to(table):
+            clauses.append(
+                f"NOT EXISTS (SELECT 1 FROM main.{_quote(child)} r "
+                f"WHERE r.{_quote(column)} = t.id)"
+            )
+        return " AND ".join(clauses), params
+
+    def _references_to(self, table: str) -> List[Tuple[str, str]]:
+        """List (child table, column) pairs in the hot database pointing at ``table.id``."""
+        references = list(_SOFT_REFERENCES.get(table, ()))
+        names = [
+            row[0]
+            for row in self.db.execute(
+                "SELECT name FROM main.sqlite_master "
+                "WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+            ).fetchall()
+        ]
+        for child in names:
+            for fk in self.db.execute(f"PRAGMA main.foreign_key_list({_quote(child)})").fetchall():
+                target, from_column, to_column = fk[2], fk[3], fk[4]
+                if target == table and to_column in (None, "id"):
+                    references.append((child, from_column))
+        return sorted(set(references))
+
+    def _archive_table(
+        self, table: str, period_end_utc: str, dry_run: bool
+    ) -> Tuple[int, List[str]]:
+        where, params = self._candidate_filter(table, period_end_utc)
+        self.db.execute("DELETE FROM temp.archive_candidates")
+        self.db.execute(
+            f"""
+            INSERT INTO temp.archive_candidates (id, year)
+            SELECT t.id, substr(t.created_at_utc, 1, 4)
+            FROM main.{_quote(table)} t
+            WHERE {where}
+            """,
+            params,
+        )
+        self.db.commit()
+        by_year = self.db.execute(
+            "SELECT year, COUNT(*), MAX(id) FROM temp.archive_candidates GROUP BY year ORDER BY year"
+        ).fetchall()
+        total = sum(row[1] for row in by_year)
+        if dry_run or not total:
+            return total, []
+
+        columns = _table_columns(self.db, "main", table)
+        column_sql = ", ".join(_quote(column) for column in columns)
+        targets: List[Tuple[str, Path, int, int]] = []
+
+        # Phase 1: copy into the archives and confirm every row landed.
+        for year, count, max_id in by_year:
+            path = self._archive_path(year)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            schema = _attach(self.db, path)
+            self._ensure_archive_table(schema, table, columns)
+            self.db.execute(
+                f"""
+                INSERT OR IGNORE INTO {schema}.{_quote(table)} ({column_sql})
+                SELECT {column_sql} FROM main.{_quote(table)}
+                WHERE id IN (SELECT id FROM temp.archive_candidates WHERE year = ?)
+                """,
+                (year,),
+            )
+            self.db.commit()
+            copied = self.db.execute(
+                f"""
+                SELECT COUNT(*) FROM temp.archive_candidates c
+                JOIN {schema}.{_quote(table)} a ON a.id = c.id
+                WHERE c.year = ?
+                """,
+                (year,),
+            ).fetchone()[0]
+            if copied != count:
+                raise RuntimeError(
+                    f"Archived {copied} of {count} {table} rows for {year}; hot rows kept"
+                )
+            targets.append((year, path, count, max_id))
+
+        # Phase 2: drop the hot copies and record the run atomically.
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            if table == "ledger_entries":
+                self.db.execute("DROP TRIGGER IF EXISTS prevent_ledger_delete")
+            self.db.execute(
+                f"DELETE FROM main.{_quote(table)} "
+                "WHERE id IN (SELECT id FROM temp.archive_candidates)"
+            )
+            if table == "ledger_entries":
+                create_ledger_append_only_trigger(self.db)
+            self.db.executemany(
+                """
+                INSERT INTO ledger_archive_runs (
+                    period_end_utc, table_name, archive_path, row_count, max_row_id
+                ) VALUES (?, ?, ?, ?, ?)
+                """,
+                [
+                    (period_end_utc, table, str(path), count, max_id)
+                    for _, path, count, max_id in targets
+                ],
+            )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        logger.info(
+            "ledger_table_archived",
+            table=table,
+            period_end_utc=period_end_utc,
+            rows=total,
+            archives=[str(path) for _, path, _, _ in targets],
+        )
+        return total, [str(path) for _, path, _, _ in targets]
+
+    def _ensure_archive_table(self, schema: str, table: str, columns: List[str]) -> None:
+        """Create the archive copy of ``table`` or add columns the hot table gained."""
+        existing = _table_columns(self.db, schema, table)
+        if not existing:
+            # Constraint-free copy: archived rows may reference hot parents.
+            self.db.execute(
+                f"CREATE TABLE {schema}.{_quote(table)} AS "
+                f"SELECT {', '.join(_quote(column) for column in columns)} "
+                f"FROM main.{_quote(table)} WHERE 0"
+            )
+            self.db.execute(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {schema}.{_quote('idx_' + table + '_id')} "
+                f"ON {_quote(table)}(id)"
+            )
+            if table == "ledger_entries":
+                self.db.execute(
+                    f"CREATE INDEX IF NOT EXISTS {schema}.idx_ledger_entries_associate_created "
+                    "ON ledger_entries(associate_id, created_at_utc)"
+                )
+            return
+
+        declared = {
+            row[1]: row[2]
+            for row in self.db.execute(f"PRAGMA main.table_info({_quote(table)})").fetchall()
+        }
+        for column in columns:
+            if column not in existing:
+                self.db.execute(
+                    f"ALTER TABLE {schema}.{_quote(table)} "
+                    f"ADD COLUMN {_quote(column)} {declared.get(column) or ''}".rstrip()
+                )
@@ -0,0 +1,349 @@
+"""
+Incremental Ledger Export Service
+
+Ledger rows are append-only, so scheduled backups only need the rows added
+since the previous run. Each export scope (all associates or a single
+associate) keeps a high-water mark of the last exported ``ledger_entries.id``
+in ``ledger_export_watermarks``. A run writes the new rows as a gzip CSV delta
+file and advances the mark; compaction periodically folds the deltas into a
+single full snapshot.
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import re
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import structlog
+
+from src.core.database import get_db_connection
+from src.services.ledger_archive_service import ledger_relation
+from src.services.ledger_export_service import (
+    LEDGER_EXPORT_COLUMNS,
+    LedgerExportService,
+)
+from src.utils.datetime_helpers import utc_now_iso
+
+logger = structlog.get_logger()
+
+DEFAULT_COMPACT_EVERY = 7
+_DELTA_PATTERN = re.compile(r"^delta_(\d+)_(\d+)\.csv\.gz$")
+
+
+@dataclass
+class LedgerDeltaExportResult:
+    """Metadata returned after an incremental ledger export run."""
+
+    scope_key: str
+    associate_id: Optional[int]
+    file_path: Optional[str]
+    row_count: int
+    after_entry_id: int
+    through_entry_id: int
+    snapshot_path: Optional[str] = None
+
+
+class LedgerDeltaExportService:
+    """Write ledger deltas past a per-scope watermark and compact them into snapshots."""
+
+    def __init__(
+        self,
+        export_dir: str = "data/exports",
+        db: Optional[sqlite3.Connection] = None,
+    ) -> None:
+        self.export_service = LedgerExportService(export_dir=export_dir)
+        self.incremental_dir = self.export_service.export_dir / "incremental"
+        self.incremental_dir.mkdir(parents=True, exist_ok=True)
+        self.db = db or get_db_connection()
+        self._owns_connection = db is None
+
+    def close(self) -> None:
+        """Close the owned database connection, if any."""
+        if self._owns_connection:
+            try:
+                self.db.close()
+            except Exception:  # pragma: no cover - defensive cleanup
+                pass
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def export_delta(
+        self,
+        associate_id: Optional[int] = None,
+        compact_every: Optional[int] = DEFAULT_COMPACT_EVERY,
+    ) -> LedgerDeltaExportResult:
+        """
+        Export ledger rows added since the scope's watermark.
+
+        Args:
+            associate_id: Optional associate to scope the export to
+            compact_every: Compact once this many delta files are pending
+                (None disables automatic compaction)
+
+        Returns:
+            LedgerDeltaExportResult; ``file_path`` is None when nothing is new
+
+        Raises:
+            ValueError: If the associate does not exist
+        """
+        if associate_id is not None:
+            alias, _ = self.export_service._get_associate_details(self.db, associate_id)
+            if alias is None:
+                raise ValueError(f"Associate {associate_id} not found for export")
+
+        scope_key = self._scope_key(associate_id)
+        watermark = self.get_watermark(associate_id)
+        after_entry_id = int(watermark["last_entry_id"])
+        through_entry_id = self._max_entry_id(associate_id)
+
+        result = LedgerDeltaExportResult(
+            scope_key=scope_key,
+            associate_id=associate_id,
+            file_path=None,
+            row_count=0,
+            after_entry_id=after_entry_id,
+            through_entry_id=max(through_entry_id, after_entry_id),
+            snapshot_path=watermark.get("snapshot_path"),
+        )
+
+        if through_entry_id > after_entry_id:
+            file_path, row_count = self._write_delta(
+                associate_id, after_entry_id, through_entry_id
+            )
+            self._save_watermark(
+                scope_key,
+                associate_id,
+                last_entry_id=through_entry_id,
+                last_export_path=str(file_path),
+            )
+            result.file_path = str(file_path)
+            result.row_count = row_count
+            logger.info(
+                "ledger_delta_exported",
+                scope=scope_key,
+                file_path=str(file_path),
+                row_count=row_count,
+                after_entry_id=after_entry_id,
+                through_entry_id=through_entry_id,
+            )
+        else:
+            logger.info("ledger_delta_up_to_date", scope=scope_key, last_entry_id=after_entry_id)
+
+        if compact_every and len(self._list_deltas(scope_key)) >= compact_every:
+            snapshot = self.compact(associate_id)
+            if snapshot is not None:
+                result.snapshot_path = str(snapshot)
+
+        return result
+
+    def compact(self, associate_id: Optional[int] = None) -> Optional[Path]:
+        """
+        Merge the current snapshot and pending deltas into a new full snapshot.
+
+        Args:
+            associate_id: Optional associate scope
+
+        Returns:
+            Path of the new snapshot, or None if there was nothing to merge
+        """
+        scope_key = self._scope_key(associate_id)
+        watermark = self.get_watermark(associate_id)
+        compacted_through = int(watermark["compacted_through_entry_id"])
+        old_snapshot = (
+            Path(watermark["snapshot_path"]) if watermark.get("snapshot_path") else None
+        )
+
+        deltas = [
+            (start, end, path)
+            for start, end, path in self._list_deltas(scope_key)
+            if end > compacted_through
+        ]
+        if not deltas:
+            return None
+
+        through_entry_id = max(end for _, end, _ in deltas)
+        scope_dir = self._scope_dir(scope_key)
+        snapshot_path = scope_dir / f"snapshot_{through_entry_id:010d}.csv.gz"
+        temp_path = snapshot_path.with_name(snapshot_path.name + ".tmp")
+
+        sources: List[Path] = []
+        if old_snapshot is not None and old_snapshot.exists():
+            sources.append(old_snapshot)
+        sources.extend(path for _, _, path in deltas)
+
+        row_count = 0
+        with gzip.open(temp_path, "wt", newline="", encoding="utf-8") as handle:
+            writer = csv.DictWriter(handle, fieldnames=LEDGER_EXPORT_COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+            for source in sources:
+                for row in self._iter_csv_rows(source):
+                    writer.writerow(row)
+                    row_count += 1
+        temp_path.replace(snapshot_path)
+        self.export_service._validate_export(snapshot_path, row_count)
+
+        self._save_watermark(
+            scope_key,
+            associate_id,
+            compacted_through_entry_id=through_entry_id,
+            snapshot_path=str(snapshot_path),
+        )
+
+        # Only remove inputs once the new snapshot is recorded.
+        for _, _, path in self._list_deltas(scope_key):
+            path.unlink(missing_ok=True)
+        if old_snapshot is not None and old_snapshot != snapshot_path:
+            old_snapshot.unlink(missing_ok=True)
+
+        logger.info(
+            "ledger_deltas_compacted",
+            scope=scope_key,
+            snapshot_path=str(snapshot_path),
+            merged_files=len(deltas),
+            row_count=row_count,
+        )
+        return snapshot_path
+
+    def get_watermark(self, associate_id: Optional[int] = None) -> Dict[str, Any]:
+        """Return the stored watermark for a scope (zeroed if never exported)."""
+        scope_key = self._scope_key(associate_id)
+        row = self.db.execute(
+            """
+            SELECT last_entry_id, last_export_path, compacted_through_entry_id,
+                   snapshot_path, updated_at_utc
+            FROM ledger_export_watermarks
+            WHERE scope_key = ?
+            """,
+            (scope_key,),
+        ).fetchone()
+        if row is None:
+            return {
+                "scope_key": scope_key,
+                "last_entry_id": 0,
+                "last_export_path": None,
+                "compacted_through_entry_id": 0,
+                "snapshot_path": None,
+                "updated_at_utc": None,
+            }
+        return {
+            "scope_key": scope_key,
+            "last_entry_id": row["last_entry_id"],
+            "last_export_path": row["last_export_path"],
+            "compacted_through_entry_id": row["compacted_through_entry_id"],
+            "snapshot_path": row["snapshot_path"],
+            "updated_at_utc": row["updated_at_utc"],
+        }
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _scope_key(associate_id: Optional[int]) -> str:
+        return "all" if associate_id is None else f"associate-{associate_id}"
+
+    def _scope_dir(self, scope_key: str) -> Path:
+        path = self.incremental_dir / scope_key
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def _max_entry_id(self, associate_id: Optional[int]) -> int:
+        # Rows archived since the last run still have to reach a delta
+        ledger = ledger_relation(self.db)
+        if associate_id is None:
+            row = self.db.execute(f"SELECT COALESCE(MAX(id), 0) FROM {ledger}").fetchone()
+        else:
+            row = self.db.execute(
+                f"SELECT COALESCE(MAX(id), 0) FROM {ledger} WHERE associate_id = ?",
+                (associate_id,),
+            ).fetchone()
+        return int(row[0])
+
+    def _write_delta(
+        self, associate_id: Optional[int], after_entry_id: int, through_entry_id: int
+    ) -> Tuple[Path, int]:
+        """Stream ledger rows in (after, through] to a delta file."""
+        scope_dir = self._scope_dir(self._scope_key(associate_id))
+
+        # A run that crashed before saving its watermark left a delta starting
+        # at the same ID; this run supersedes it.
+        for start, _, path in self._list_deltas(scope_dir.name):
+            if start == after_entry_id + 1:
+                path.unlink(missing_ok=True)
+
+        file_path = scope_dir / f"delta_{after_entry_id + 1:010d}_{through_entry_id:010d}.csv.gz"
+        temp_path = file_path.with_name(file_path.name + ".tmp")
+        cursor = self.export_service._execute_ledger_query(
+            self.db,
+            associate_id,
+            after_entry_id=after_entry_id,
+            through_entry_id=through_entry_id,
+        )
+
+        row_count = 0
+        with gzip.open(temp_path, "wt", newline="", encoding="utf-8") as handle:
+            writer = csv.DictWriter(handle, fieldnames=LEDGER_EXPORT_COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+            for chunk in self.export_service._iter_formatted_chunks(cursor):
+                writer.writerows(chunk)
+                row_count += len(chunk)
+        temp_path.replace(file_path)
+        self.export_service._validate_export(file_path, row_count)
+        return file_path, row_count
+
+    def _list_deltas(self, scope_key: str) -> List[Tuple[int, int, Path]]:
+        """Return pending delta files for a scope as (start_id, end_id, path), oldest first."""
+        scope_dir = self.incremental_dir / scope_key
+        if not scope_dir.exists():
+            return []
+        deltas: List[Tuple[int, int, Path]] = []
+        for path in scope_dir.glob("delta_*.csv.gz"):
+            match = _DELTA_PATTERN.match(path.name)
+            if match:
+                deltas.append((int(match.group(1)), int(match.group(2)), path))
+        return sorted(deltas)
+
+    @staticmethod
+    def _iter_csv_rows(path: Path) -> Iterator[Dict[str, str]]:
+        with gzip.open(path, "rt", newline="", encoding="utf-8") as handle:
+            yield from csv.DictReader(handle)
+
+    def _save_watermark(
+        self,
+        scope_key: str,
+        associate_id: Optional[int],
+        **fields: object,
+    ) -> None:
+        current = self.get_watermark(associate_id)
+        current.update(fields)
+        self.db.execute(
+            """
+            INSERT INTO ledger_export_watermarks (
+                scope_key, associate_id, last_entry_id, last_export_path,
+                compacted_through_entry_id, snapshot_path, updated_at_utc
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(scope_key) DO UPDATE SET
+                last_entry_id = excluded.last_entry_id,
+                last_export_path = excluded.last_export_path,
+                compacted_through_entry_id = excluded.compacted_through_entry_id,
+                snapshot_path = excluded.snapshot_path,
+                updated_at_utc = excluded.updated_at_utc
+            """,
+            (
+                scope_key,
+                associate_id,
+                current["last_entry_id"],
+                current["last_export_path"],
+                current["compacted_through_entry_id"],
+                current["snapshot_path"],
+                utc_now_iso(),
+            ),
+        )
+        self.db.commit()
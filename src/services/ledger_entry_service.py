@@ -9,9 +9,8 @@ from __future__ import annotations
 
 import uuid
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from decimal import Decimal, ROUND_HALF_UP
-from typing import Dict, Iterable, List, Optional, Tuple
+from decimal import Decimal
+from typing import Dict, Iterable, List, Tuple
 
 import sqlite3
 
@@ -19,9 +18,16 @@ from src.core.database import get_db_connection
 from src.core.schema import create_ledger_append_only_trigger
 from src.services.delta_provenance_service import DeltaProvenanceService
 from src.services.settlement_service import (
-    BetOutcome,
+    SETTLEMENT_LEDGER_INSERT_SQL,
     Participant,
     SettlementPreview,
+    SettlementService,
+    build_settlement_ledger_row,
+    build_settlement_link,
+    compute_preview_fingerprint,
+    find_winner_loser_indexes,
+    quantize_currency,
+    settlement_timestamp,
 )
 from src.utils.database_utils import TransactionError, transactional
 from src.utils.logging_config import get_logger
@@ -71,6 +77,10 @@ class LedgerEntryService:
     ) -> SettlementConfirmation:
         """
         Persist settlement results to the ledger with full transactional safety.
+
+        Previews carrying a fingerprint are re-verified inside the transaction
+        so a bet edit or FX refresh after the preview was shown cannot be
+        committed with stale figures.
         """
         if preview_data.surebet_id != surebet_id:
             raise ValueError(
@@ -88,6 +98,7 @@ class LedgerEntryService:
 
         try:
             with transactional(self.db) as conn:
+                self._verify_preview_fingerprint(conn, preview_data)
                 fx_snapshots = self._freeze_fx_snapshots(preview_data)
                 (
                     ledger_ids,
@@ -109,7 +120,9 @@ class LedgerEntryService:
                     preview_data,
                     ledger_ids,
                 )
-        except TransactionError as exc:  # pragma: no cover - defensive path
+        except TransactionError as exc:
+            if isinstance(exc.__cause__, SettlementCommitError):
+                raise exc.__cause__
             raise SettlementCommitError(str(exc)) from exc
         except Exception as exc:
             logger.error(
@@ -121,6 +134,7 @@ class LedgerEntryService:
             )
             raise SettlementCommitError("Settlement confirmation failed.") from exc
 
+        SettlementService.preview_cache.invalidate_surebets([surebet_id])
         logger.info(
             "settlement_committed",
             surebet_id=surebet_id,
@@ -142,6 +156,24 @@ class LedgerEntryService:
         """Generate a unique UUID for the settlement batch."""
         return str(uuid.uuid4())
 
+    @staticmethod
+    def _verify_preview_fingerprint(
+        conn: sqlite3.Connection, preview_data: SettlementPreview
+    ) -> None:
+        """
+        Reject previews whose inputs changed since they were calculated.
+        """
+        if not preview_data.fingerprint:
+            return
+        current = compute_preview_fingerprint(
+            conn, preview_data.surebet_id, preview_data.per_bet_outcomes
+        )
+        if current != preview_data.fingerprint:
+            raise SettlementCommitError(
+                "Settlement inputs changed since the preview was calculated. "
+                "Refresh the preview and confirm again."
+            )
+
     @staticmethod
     def _freeze_fx_snapshots(
         preview_data: SettlementPreview,
@@ -168,73 +200,27 @@ class LedgerEntryService:
         total_amount_eur = Decimal("0.00")
 
         for participant in preview_data.participants:
-            fx_rate = fx_snapshots[participant.currency]
-            amount_native = self._quantize_currency(
-                self._calculate_amount_native(participant)
-            )
-            amount_eur = self._quantize_currency(amount_native * fx_rate)
-            principal_returned = self._quantize_currency(
-                participant.stake_eur
-                if participant.outcome in (BetOutcome.WON, BetOutcome.VOID)
-                else Decimal("0.00")
-            )
-            per_share = (
-                self._quantize_currency(preview_data.per_surebet_share_eur)
-                if participant.seat_type == "staked"
-                else Decimal("0.00")
-            )
-
-            cursor = conn.execute(
-                """
-                INSERT INTO ledger_entries (
-                    type,
-                    associate_id,
-                    bookmaker_id,
-                    amount_native,
-                    native_currency,
-                    fx_rate_snapshot,
-                    amount_eur,
-                    settlement_state,
-                    principal_returned_eur,
-                    per_surebet_share_eur,
-                    surebet_id,
-                    bet_id,
-                    settlement_batch_id,
-                    created_by,
-                    note
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    "BET_RESULT",
-                    participant.associate_id,
-                    participant.bookmaker_id,
-                    str(amount_native),
-                    participant.currency,
-                    str(fx_rate),
-                    str(amount_eur),
-                    participant.outcome.value,
-                    str(principal_returned),
-                    str(per_share),
-                    preview_data.surebet_id,
-                    participant.bet_id,
-                    batch_id,
-                    created_by,
-                    f"Surebet #{preview_data.surebet_id} settlement",
-                ),
+            row, amount_eur = build_settlement_ledger_row(
+                preview_data,
+                participant,
+                fx_snapshots[participant.currency],
+                batch_id,
+                created_by,
             )
+            cursor = conn.execute(SETTLEMENT_LEDGER_INSERT_SQL, row)
             ledger_ids.append(cursor.lastrowid)
             total_amount_eur += amount_eur
 
         return (
             ledger_ids,
-            self._quantize_currency(total_amount_eur),
+            quantize_currency(total_amount_eur),
         )
 
     def _update_surebet_status(
         self, conn: sqlite3.Connection, surebet_id: int
     ) -> None:
         """Mark a surebet as settled with timestamp."""
-        timestamp = self._utc_now()
+        timestamp = settlement_timestamp()
         conn.execute(
             """
             UPDATE surebets
@@ -254,7 +240,7 @@ class LedgerEntryService:
         if not bet_ids:
             return
 
-        timestamp = self._utc_now()
+        timestamp = settlement_timestamp()
         conn.executemany(
             """
             UPDATE bets
@@ -275,18 +261,7 @@ class LedgerEntryService:
         if not participants or len(participants) != len(ledger_entry_ids):
             return
 
-        winner_idx: Optional[int] = None
-        loser_idx: Optional[int] = None
-
-        for idx, participant in enumerate(participants):
-            if participant.outcome == BetOutcome.WON and winner_idx is None:
-                winner_idx = idx
-            elif participant.outcome == BetOutcome.LOST and loser_idx is None:
-                loser_idx = idx
-
-        if winner_idx is None and loser_idx is None and len(participants) >= 2:
-            winner_idx, loser_idx = 0, 1
-
+        winner_idx, loser_idx = find_winner_loser_indexes(participants)
         if winner_idx is None or loser_idx is None:
             logger.warning(
                 "opposing_associate_update_skipped",
@@ -321,59 +296,13 @@ class LedgerEntryService:
         ledger_entry_ids: List[int],
     ) -> None:
         """Create a settlement link to power delta provenance dashboards."""
-        participants = preview_data.participants
-        if not participants or len(participants) != len(ledger_entry_ids):
-            return
-
-        winner_idx: Optional[int] = None
-        loser_idx: Optional[int] = None
-
-        for idx, participant in enumerate(participants):
-            if participant.outcome == BetOutcome.WON and winner_idx is None:
-                winner_idx = idx
-            elif participant.outcome == BetOutcome.LOST and loser_idx is None:
-                loser_idx = idx
-
-        if winner_idx is None and loser_idx is None and len(participants) >= 2:
-            winner_idx, loser_idx = 0, 1
-
-        if winner_idx is None or loser_idx is None:
-            logger.warning(
-                "delta_provenance_link_skipped",
-                reason="unable_to_determine_winner_loser",
-                participant_count=len(participants),
-                surebet_id=preview_data.surebet_id,
-            )
-            return
-
-        amount_eur = preview_data.per_bet_net_gains.get(
-            participants[winner_idx].bet_id, Decimal("0.00")
-        )
-        if amount_eur <= Decimal("0.00") and loser_idx is not None:
-            loss = preview_data.per_bet_net_gains.get(
-                participants[loser_idx].bet_id, Decimal("0.00")
-            )
-            amount_eur = abs(loss)
-
-        if amount_eur <= Decimal("0.00"):
-            logger.warning(
-                "delta_provenance_link_skipped",
-                reason="non_positive_amount",
-                surebet_id=preview_data.surebet_id,
-                amount=str(amount_eur),
-            )
+        link = build_settlement_link(preview_data, ledger_entry_ids)
+        if link is None:
             return
 
         try:
             delta_service = DeltaProvenanceService(conn)
-            delta_service.create_settlement_link(
-                surebet_id=preview_data.surebet_id,
-                winner_associate_id=participants[winner_idx].associate_id,
-                loser_associate_id=participants[loser_idx].associate_id,
-                amount_eur=amount_eur,
-                winner_ledger_entry_id=ledger_entry_ids[winner_idx],
-                loser_ledger_entry_id=ledger_entry_ids[loser_idx],
-            )
+            delta_service.create_settlement_link(**link)
         except Exception as exc:
             logger.error(
                 "delta_provenance_link_failed",
@@ -384,24 +313,3 @@ class LedgerEntryService:
             raise SettlementCommitError(
                 "Failed to create delta provenance link."
             ) from exc
-
-    @staticmethod
-    def _calculate_amount_native(participant: Participant) -> Decimal:
-        """Calculate the native currency net amount for a participant."""
-        stake_native = participant.stake_native
-
-        if participant.outcome == BetOutcome.WON:
-            return stake_native * participant.odds
-        if participant.outcome == BetOutcome.LOST:
-            return Decimal("0.00")
-        return stake_native
-
-    @staticmethod
-    def _quantize_currency(value: Decimal) -> Decimal:
-        """Round monetary values to cents."""
-        return value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-
-    @staticmethod
-    def _utc_now() -> str:
-        """Return current UTC timestamp with millisecond precision."""
-        return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
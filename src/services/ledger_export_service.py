@@ -3,26 +3,62 @@ Ledger Export Service
 
 Handles exporting the full ledger to styled Excel workbooks for audit
 and operator review while maintaining strict validation guarantees.
+
+Rows are streamed from the cursor in chunks and written with xlsxwriter's
+``constant_memory`` mode (or as CSV / gzip-compressed CSV), so peak memory
+does not grow with the size of the ledger.
 """
 
 from __future__ import annotations
 
 import csv
+import gzip
+import sqlite3
 from datetime import datetime
 from dataclasses import dataclass
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
 import re
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import pandas as pd
+import xlsxwriter
 from openpyxl import load_workbook
 from xlsxwriter.utility import xl_col_to_name
 import structlog
 from src.core.database import get_db_connection
+from src.services.ledger_archive_service import attach_archives
 
 logger = structlog.get_logger()
 
+EXPORT_FORMATS = ("xlsx", "csv", "csv.gz")
+FETCH_CHUNK_SIZE = 2_000
+WIDTH_SAMPLE_ROWS = 1_000
+MAX_COLUMN_WIDTH = 60
+
+LEDGER_EXPORT_COLUMNS = [
+    "created_at_utc",
+    "entry_type",
+    "associate_alias",
+    "bookmaker_name",
+    "event_name",
+    "market_selection",
+    "settlement_state",
+    "native_currency",
+    "amount_native",
+    "principal_returned_native",
+    "note",
+    "amount_eur",
+    "principal_returned_eur",
+    "per_surebet_share_eur",
+    "entry_id",
+    "surebet_id",
+    "bet_id",
+    "settlement_batch_id",
+    "fx_rate_snapshot",
+    "created_by",
+]
+
 
 @dataclass
 class LedgerExportResult:
@@ -43,16 +79,28 @@ class LedgerExportService:
         self.export_dir = base_dir / "ledger"
         self.export_dir.mkdir(parents=True, exist_ok=True)
 
-    def export_full_ledger(self, associate_id: Optional[int] = None) -> LedgerExportResult:
+    def export_full_ledger(
+        self, associate_id: Optional[int] = None, export_format: str = "xlsx"
+    ) -> LedgerExportResult:
         """
         Export complete ledger to a styled Excel workbook with optional associate filtering.
-        
+
+        Args:
+            associate_id: Optional associate to limit the export to
+            export_format: "xlsx" (styled workbook), or "csv" / "csv.gz" for the
+                unstyled fast path
+
         Returns:
             LedgerExportResult describing the generated workbook
             
         Raises:
             Exception: If export fails for any reason
         """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(
+                f"Unsupported export format '{export_format}'. "
+                f"Expected one of: {', '.join(EXPORT_FORMATS)}"
+            )
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
         associate_alias: Optional[str] = None
         associate_currency: Optional[str] = None
@@ -75,7 +123,7 @@ class LedgerExportService:
                 scope_label = "All Associates"
 
             filename = self._build_filename(
-                timestamp, associate_alias, associate_currency
+                timestamp, associate_alias, associate_currency, export_format
             )
             file_path = self._make_unique_path(filename)
 
@@ -86,7 +134,10 @@ class LedgerExportService:
                 associate_id=associate_id,
             )
 
-            row_count = self._export_ledger_to_excel(conn, file_path, associate_id)
+            if export_format == "xlsx":
+                row_count = self._export_ledger_to_excel(conn, file_path, associate_id)
+            else:
+                row_count = self._export_ledger_to_csv(conn, file_path, associate_id)
 
             # Validate export
             self._validate_export(file_path, row_count)
@@ -118,11 +169,22 @@ class LedgerExportService:
             if conn is not None:
                 conn.close()
 
-    def _export_ledger_to_excel(
-        self, conn, file_path: Path, associate_id: Optional[int] = None
-    ) -> int:
-        """Execute ledger query and write to Excel file."""
-        bet_columns = self._get_table_columns(conn, "bets")
+    def _execute_ledger_query(
+        self,
+        conn: sqlite3.Connection,
+        associate_id: Optional[int] = None,
+        after_entry_id: Optional[int] = None,
+        through_entry_id: Optional[int] = None,
+    ) -> sqlite3.Cursor:
+        """
+        Execute the ledger export query and return the open cursor.
+
+        ``after_entry_id``/``through_entry_id`` bound the export to a slice of
+        ledger IDs for incremental exports. Archived rows are read through the
+        unified views over the attached archive databases.
+        """
+        sources = attach_archives(conn, ("ledger_entries", "bets"))
+        bet_columns = self._get_table_columns(conn, sources["bets"])
         selection_text_expr = self._column_expr("b", "selection_text", bet_columns, "selection_text")
         selection_expr = self._column_expr("b", "selection", bet_columns, "selection")
         market_code_expr = self._column_expr("b", "market_code", bet_columns, "market_code")
@@ -155,65 +217,80 @@ class LedgerExportService:
                 le.created_at_utc,
                 le.created_by,
                 le.note
-            FROM ledger_entries le
+            FROM {sources["ledger_entries"]} le
             JOIN associates a ON le.associate_id = a.id
             LEFT JOIN bookmakers bk ON le.bookmaker_id = bk.id
-            LEFT JOIN bets b ON le.bet_id = b.id
+            LEFT JOIN {sources["bets"]} b ON le.bet_id = b.id
             LEFT JOIN canonical_events ce ON b.canonical_event_id = ce.id
             LEFT JOIN canonical_markets cm ON b.canonical_market_id = cm.id
         """
 
+        conditions: List[str] = []
         params: Tuple = ()
         if associate_id is not None:
-            base_query += " WHERE le.associate_id = ?"
-            params = (associate_id,)
+            conditions.append("le.associate_id = ?")
+            params += (associate_id,)
+        if after_entry_id is not None:
+            conditions.append("le.id > ?")
+            params += (after_entry_id,)
+        if through_entry_id is not None:
+            conditions.append("le.id <= ?")
+            params += (through_entry_id,)
+        if conditions:
+            base_query += " WHERE " + " AND ".join(conditions)
 
         query = f"{base_query} ORDER BY le.created_at_utc ASC"
 
         cursor = conn.cursor()
         cursor.execute(query, params)
+        return cursor
 
-        # Define workbook columns
-        fieldnames = [
-            "created_at_utc",
-            "entry_type",
-            "associate_alias",
-            "bookmaker_name",
-            "event_name",
-            "market_selection",
-            "settlement_state",
-            "native_currency",
-            "amount_native",
-            "principal_returned_native",
-            "note",
-            "amount_eur",
-            "principal_returned_eur",
-            "per_surebet_share_eur",
-            "entry_id",
-            "surebet_id",
-            "bet_id",
-            "settlement_batch_id",
-            "fx_rate_snapshot",
-            "created_by",
-        ]
-
-        rows = cursor.fetchall()
-        formatted_rows = [self._format_row_for_export(dict(row)) for row in rows]
-        row_count = len(formatted_rows)
-
-        if formatted_rows:
-            dataframe = pd.DataFrame(formatted_rows, columns=fieldnames)
-        else:
-            dataframe = pd.DataFrame(columns=fieldnames)
+    def _iter_formatted_chunks(
+        self, cursor: sqlite3.Cursor, chunk_size: int = FETCH_CHUNK_SIZE
+    ) -> Iterator[List[Dict[str, object]]]:
+        """Yield formatted export rows in chunks without materialising the ledger."""
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield [self._format_row_for_export(dict(row)) for row in rows]
 
-        dataframe = dataframe[fieldnames]
-        export_df = dataframe.where(pd.notnull(dataframe), None)
-        column_widths = self._compute_column_widths(dataframe, fieldnames)
+    def _export_ledger_to_excel(
+        self, conn: sqlite3.Connection, file_path: Path, associate_id: Optional[int] = None
+    ) -> int:
+        """Stream the ledger query into a constant-memory Excel workbook."""
+        cursor = self._execute_ledger_query(conn, associate_id)
+        fieldnames = LEDGER_EXPORT_COLUMNS
+        chunks = self._iter_formatted_chunks(cursor)
+
+        # Widths must be set before any row is flushed, so size them from the
+        # first chunk(s) only.
+        sample: List[Dict[str, object]] = []
+        for chunk in chunks:
+            sample.extend(chunk)
+            if len(sample) >= WIDTH_SAMPLE_ROWS:
+                break
+        column_widths = self._compute_column_widths(sample, fieldnames)
+
+        workbook = xlsxwriter.Workbook(
+            str(file_path),
+            {
+                "constant_memory": True,
+                "strings_to_formulas": False,
+                "strings_to_urls": False,
+            },
+        )
+        try:
+            worksheet = workbook.add_worksheet("Ledger")
 
-        with pd.ExcelWriter(file_path, engine="xlsxwriter") as writer:
-            export_df.to_excel(writer, sheet_name="Ledger", index=False)
-            workbook = writer.book
-            worksheet = writer.sheets["Ledger"]
+            format_map = self._build_column_formats(workbook, fieldnames)
+            for idx, column in enumerate(fieldnames):
+                worksheet.set_column(
+                    idx,
+                    idx,
+                    column_widths.get(column, len(column) + 2),
+                    format_map.get(column),
+                )
 
             header_format = workbook.add_format(
                 {
@@ -223,22 +300,18 @@ class LedgerExportService:
                     "text_wrap": False,
                 }
             )
-            for col_num, header in enumerate(fieldnames):
-                worksheet.write(0, col_num, header, header_format)
-
+            worksheet.write_row(0, 0, fieldnames, header_format)
             worksheet.freeze_panes(1, 0)
-            worksheet.autofilter(0, 0, max(row_count, 1), len(fieldnames) - 1)
 
-            format_map = self._build_column_formats(workbook, fieldnames)
-            for idx, column in enumerate(fieldnames):
-                worksheet.set_column(
-                    idx,
-                    idx,
-                    column_widths.get(column, len(column) + 2),
-                    format_map.get(column),
-                )
+            row_count = 0
+            for chunk in _chain_chunks(sample, chunks):
+                for row in chunk:
+                    row_count += 1
+                    self._write_excel_row(worksheet, row_count, row, fieldnames)
+
+            worksheet.autofilter(0, 0, max(row_count, 1), len(fieldnames) - 1)
 
-            if row_count > 0 and "entry_type" in dataframe.columns:
+            if row_count > 0:
                 entry_col_letter = xl_col_to_name(fieldnames.index("entry_type"))
                 deposit_format = workbook.add_format({"bg_color": "#E6F4EA"})
                 withdrawal_format = workbook.add_format({"bg_color": "#FDECEA"})
@@ -264,25 +337,59 @@ class LedgerExportService:
                         "format": withdrawal_format,
                     },
                 )
+        finally:
+            workbook.close()
 
         return row_count
 
-    def _compute_column_widths(self, dataframe: pd.DataFrame, columns: List[str]) -> Dict[str, float]:
-        """Calculate a reasonable width for each column based on cell content."""
-        widths: Dict[str, float] = {}
-        for column in columns:
-            if column in dataframe:
-                series = dataframe[column]
+    @staticmethod
+    def _write_excel_row(
+        worksheet: Any, row_index: int, row: Dict[str, object], fieldnames: List[str]
+    ) -> None:
+        """Write one formatted row; empty cells are skipped so column formats apply."""
+        for col_index, column in enumerate(fieldnames):
+            value = row.get(column)
+            if value is None or value == "":
+                continue
+            if isinstance(value, (int, float)):
+                worksheet.write_number(row_index, col_index, value)
             else:
-                series = pd.Series(dtype=object)
+                worksheet.write_string(row_index, col_index, str(value))
 
-            if series.empty:
-                max_length = len(column)
-            else:
-                display_series = series.fillna("").astype(str)
-                max_length = int(display_series.map(len).max())
-            widths[column] = float(min(max(max_length, len(column)) + 2, 60))
-        return widths
+    def _export_ledger_to_csv(
+        self, conn: sqlite3.Connection, file_path: Path, associate_id: Optional[int] = None
+    ) -> int:
+        """Stream the ledger query into a CSV file (gzip-compressed for .gz)."""
+        cursor = self._execute_ledger_query(conn, associate_id)
+        fieldnames = LEDGER_EXPORT_COLUMNS
+        opener = gzip.open if file_path.suffix.lower() == ".gz" else open
+
+        row_count = 0
+        with opener(file_path, "wt", newline="", encoding="utf-8") as handle:
+            writer = csv.DictWriter(handle, fieldnames=fieldnames, extrasaction="ignore")
+            writer.writeheader()
+            for chunk in self._iter_formatted_chunks(cursor):
+                writer.writerows(chunk)
+                row_count += len(chunk)
+        return row_count
+
+    def _compute_column_widths(
+        self, rows: Iterable[Dict[str, object]], columns: List[str]
+    ) -> Dict[str, float]:
+        """Calculate a reasonable width for each column from a sample of rows."""
+        max_lengths = {column: len(column) for column in columns}
+        for row in rows:
+            for column in columns:
+                value = row.get(column)
+                if value is None:
+                    continue
+                length = len(str(value))
+                if length > max_lengths[column]:
+                    max_lengths[column] = length
+        return {
+            column: float(min(length + 2, MAX_COLUMN_WIDTH))
+            for column, length in max_lengths.items()
+        }
 
     def _build_column_formats(self, workbook, columns: List[str]) -> Dict[str, object]:
         """Map ledger columns to Excel numeric formats."""
@@ -427,7 +534,7 @@ class LedgerExportService:
 
         suffix = file_path.suffix.lower()
         if suffix == ".xlsx":
-            workbook = load_workbook(file_path, data_only=True)
+            workbook = load_workbook(file_path, read_only=True, data_only=True)
             try:
                 worksheet = workbook.active
                 actual_row_count = sum(
@@ -438,9 +545,7 @@ class LedgerExportService:
             finally:
                 workbook.close()
         else:
-            with open(file_path, "r", encoding="utf-8") as csvfile:
-                reader = csv.DictReader(csvfile)
-                actual_row_count = sum(1 for _ in reader)
+            actual_row_count = self._count_csv_rows(file_path)
 
         if actual_row_count != expected_row_count:
             raise ValueError(
@@ -450,6 +555,14 @@ class LedgerExportService:
 
         logger.info("export_validation_passed", file_path=str(file_path), row_count=actual_row_count)
 
+    @staticmethod
+    def _count_csv_rows(file_path: Path) -> int:
+        """Count data rows in a CSV or gzip-compressed CSV export."""
+        opener = gzip.open if file_path.suffix.lower() == ".gz" else open
+        with opener(file_path, "rt", newline="", encoding="utf-8") as csvfile:
+            reader = csv.DictReader(csvfile)
+            return sum(1 for _ in reader)
+
     def get_export_history(self, limit: int = 10) -> List[Dict]:
         """
         Get list of recent export files with metadata.
@@ -471,6 +584,7 @@ class LedgerExportService:
         export_candidates.update(self.export_dir.glob("ledger_*.xlsx"))
         export_candidates.update(self.export_dir.glob("*_ledger.csv"))
         export_candidates.update(self.export_dir.glob("ledger_*.csv"))
+        export_candidates.update(self.export_dir.glob("*_ledger.csv.gz"))
 
         export_files = sorted(
             export_candidates,
@@ -495,9 +609,7 @@ class LedgerExportService:
                     except Exception:
                         row_count = 0
                 else:
-                    with open(file_path, "r", encoding="utf-8") as csvfile:
-                        reader = csv.DictReader(csvfile)
-                        row_count = sum(1 for _ in reader)
+                    row_count = self._count_csv_rows(file_path)
 
                 associate_alias = None
                 alias_slug = scope_meta.get("alias_slug")
@@ -549,6 +661,7 @@ class LedgerExportService:
         timestamp: str,
         associate_alias: Optional[str],
         associate_currency: Optional[str],
+        export_format: str = "xlsx",
     ) -> str:
         alias_slug = self._slugify(associate_alias) if associate_alias else "all"
         currency_slug = (associate_currency or "MULTI").upper()
@@ -558,7 +671,7 @@ class LedgerExportService:
             date_part = timestamp.split("_", 1)[0]
             dt = datetime.strptime(date_part, "%Y%m%d")
         date_str = dt.strftime("%d-%m-%Y")
-        return f"{alias_slug}_{currency_slug}_{date_str}_ledger.xlsx"
+        return f"{alias_slug}_{currency_slug}_{date_str}_ledger.{export_format}"
 
     def _make_unique_path(self, base_filename: str) -> Path:
         """Ensure the export filename is unique within the export directory."""
@@ -566,8 +679,9 @@ class LedgerExportService:
         if not path.exists():
             return path
 
-        stem = path.stem
-        suffix = path.suffix
+        # Keep compound extensions such as ".csv.gz" intact
+        suffix = "".join(path.suffixes)
+        stem = path.name[: -len(suffix)] if suffix else path.name
         counter = 1
         while True:
             candidate = self.export_dir / f"{stem}_{counter}{suffix}"
@@ -600,7 +714,7 @@ class LedgerExportService:
     def _parse_export_filename(self, filename: str) -> Dict[str, Optional[object]]:
         timestamp_pattern = r"[0-9]{8}_[0-9]{6}(?:_[0-9]{6})?"
         date_pattern = r"[0-9]{2}-[0-9]{2}-[0-9]{4}"
-        extension_pattern = r"(?:csv|xlsx)"
+        extension_pattern = r"(?:csv\.gz|csv|xlsx)"
         new_pattern = re.compile(
             rf"^([A-Za-z0-9\-]+)_([A-Z]+)_({date_pattern})(?:_(\d+))?_ledger\.{extension_pattern}$"
         )
@@ -669,3 +783,12 @@ class LedgerExportService:
         if column in columns:
             return f"{table_alias}.{column} AS {alias}"
         return f"NULL AS {alias}"
+
+
+def _chain_chunks(
+    first: List[Dict[str, object]], rest: Iterable[List[Dict[str, object]]]
+) -> Iterator[List[Dict[str, object]]]:
+    """Yield the already-fetched sample followed by the remaining chunks."""
+    if first:
+        yield first
+    yield from rest
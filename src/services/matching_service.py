@@ -10,14 +10,16 @@ from __future__ import annotations
 
 import sqlite3
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime
 from decimal import Decimal, InvalidOperation
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from rapidfuzz import fuzz
 
 from src.domain.market_taxonomy import CANONICAL_MARKETS
+from src.services.canonical_event_index import DAY_MS, IndexedEvent, get_event_index
 from src.services.event_normalizer import EventNormalizer
+from src.utils.datetime_helpers import to_epoch_ms
 
 
 def _parse_iso8601(timestamp: Optional[str]) -> Optional[datetime]:
@@ -146,6 +148,7 @@ class MatchingService:
 
     EVENT_LOOKBACK_DAYS = 3
     MAX_EVENT_CANDIDATES = 40
+    EVENT_SCORE_CUTOFF = 50.0
     MAX_MARKET_SUGGESTIONS = 5
 
     def __init__(self, db: sqlite3.Connection):
@@ -203,21 +206,14 @@ class MatchingService:
                 )
                 seen_ids.add(int(row["id"]))
 
-        candidate_rows = self._fetch_event_candidates(pair_key, kickoff_input)
-
-        for row in candidate_rows:
-            event_id = int(row["id"])
-            if event_id in seen_ids:
+        for event, similarity in self._fetch_event_candidates(
+            normalized_input, pair_key, kickoff_input
+        ):
+            if event.id in seen_ids:
                 continue
 
-            candidate_name = row["normalized_event_name"]
-            candidate_kickoff = row["kickoff_time_utc"]
-            similarity = float(
-                fuzz.token_set_ratio(normalized_input, candidate_name or "")
-            )
-
-            pair_match = bool(pair_key and row["pair_key"] == pair_key)
-            kickoff_candidate = _parse_iso8601(candidate_kickoff)
+            pair_match = bool(pair_key and event.pair_key == pair_key)
+            kickoff_candidate = _parse_iso8601(event.kickoff_time_utc)
             hours_apart = _hours_between(kickoff_input, kickoff_candidate)
 
             # Boost score for pair-key matches and close kickoff times.
@@ -235,16 +231,16 @@ class MatchingService:
 
             suggestions.append(
                 EventSuggestion(
-                    event_id=event_id,
-                    name=candidate_name,
-                    kickoff_time_utc=candidate_kickoff,
+                    event_id=event.id,
+                    name=event.name,
+                    kickoff_time_utc=event.kickoff_time_utc,
                     similarity=similarity,
                     reason=reason,
                     pair_key_match=pair_match,
                     hours_apart=hours_apart,
                 )
             )
-            seen_ids.add(event_id)
+            seen_ids.add(event.id)
 
         # Sort by similarity descending, then by earliest time difference.
         suggestions.sort(
@@ -258,71 +254,47 @@ class MatchingService:
         return suggestions[:5]
 
     def _fetch_event_candidates(
-        self, pair_key: Optional[str], kickoff_input: Optional[datetime]
-    ) -> List[sqlite3.Row]:
-        """Fetch candidate canonical events by pair-key and kickoff proximity."""
-        candidates: List[sqlite3.Row] = []
-        seen: set[int] = set()
-
-        if pair_key:
-            rows = self.db.execute(
-                """
-                SELECT id, normalized_event_name, kickoff_time_utc, pair_key
-                FROM canonical_events
-                WHERE pair_key = ?
-                ORDER BY updated_at_utc DESC
-                LIMIT ?
-                """,
-                (pair_key, self.MAX_EVENT_CANDIDATES),
-            ).fetchall()
-            for row in rows:
-                event_id = int(row["id"])
-                if event_id not in seen:
-                    candidates.append(row)
-                    seen.add(event_id)
-
+        self,
+        normalized_input: str,
+        pair_key: Optional[str],
+        kickoff_input: Optional[datetime],
+    ) -> List[Tuple[IndexedEvent, float]]:
+        """
+        Score candidate canonical events from the shared event index.
+
+        Pair-key matches are always candidates. Name matches come from the
+        kickoff window blocks or, without a kickoff (or when the window is
+        empty), from events sharing a name token; both are scored in one
+        ``process.extract`` call and cut off below ``EVENT_SCORE_CUTOFF``.
+        """
+        index = get_event_index(self.db)
+        candidates: Dict[int, Tuple[IndexedEvent, float]] = {}
+
+        paired = index.by_pair_key(pair_key, limit=self.MAX_EVENT_CANDIDATES)
+        for event, score in index.score(normalized_input, paired, scorer=fuzz.token_set_ratio):
+            candidates[event.id] = (event, score)
+
+        scored: List[Tuple[IndexedEvent, float]] = []
         if kickoff_input:
-            window_start = (kickoff_input - timedelta(days=self.EVENT_LOOKBACK_DAYS)).isoformat().replace(
-                "+00:00", "Z"
+            scored = index.search(
+                normalized_input,
+                kickoff_ms=to_epoch_ms(kickoff_input),
+                window_ms=self.EVENT_LOOKBACK_DAYS * DAY_MS,
+                scorer=fuzz.token_set_ratio,
+                score_cutoff=self.EVENT_SCORE_CUTOFF,
+                limit=self.MAX_EVENT_CANDIDATES,
             )
-            window_end = (kickoff_input + timedelta(days=self.EVENT_LOOKBACK_DAYS)).isoformat().replace(
-                "+00:00", "Z"
+        if not scored and not candidates:
+            scored = index.search(
+                normalized_input,
+                scorer=fuzz.token_set_ratio,
+                score_cutoff=self.EVENT_SCORE_CUTOFF,
+                limit=self.MAX_EVENT_CANDIDATES,
             )
-            rows = self.db.execute(
-                """
-                SELECT id, normalized_event_name, kickoff_time_utc, pair_key
-                FROM canonical_events
-                WHERE kickoff_time_utc IS NOT NULL
-                  AND kickoff_time_utc BETWEEN ? AND ?
-                ORDER BY ABS(julianday(kickoff_time_utc) - julianday(?))
-                LIMIT ?
-                """,
-                (window_start, window_end, kickoff_input.isoformat().replace("+00:00", "Z"), self.MAX_EVENT_CANDIDATES),
-            ).fetchall()
-            for row in rows:
-                event_id = int(row["id"])
-                if event_id not in seen:
-                    candidates.append(row)
-                    seen.add(event_id)
-
-        # Fallback: pull most recent canonical events if we still have no candidates.
-        if not candidates:
-            rows = self.db.execute(
-                """
-                SELECT id, normalized_event_name, kickoff_time_utc, pair_key
-                FROM canonical_events
-                ORDER BY updated_at_utc DESC
-                LIMIT ?
-                """,
-                (self.MAX_EVENT_CANDIDATES,),
-            ).fetchall()
-            for row in rows:
-                event_id = int(row["id"])
-                if event_id not in seen:
-                    candidates.append(row)
-                    seen.add(event_id)
-
-        return candidates
+        for event, score in scored:
+            candidates.setdefault(event.id, (event, score))
+
+        return list(candidates.values())
 
     # ------------------------------------------------------------------
     # Market suggestions
@@ -0,0 +1,256 @@
+"""
+Period Close Service
+
+Closes an accounting period by snapshotting each associate's statement
+metrics (ND, FS, should-hold, holdings, I'') and per-bookmaker balances into
+``period_closing_balances``. Statements then start from the nearest closed
+period instead of summing the full ledger history. Because the ledger is
+append-only, a checkpoint can always be recomputed from the rows it covers,
+which is what ``verify_checkpoints`` does.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+import structlog
+
+from src.core.database import get_db_connection
+from src.repositories.period_closing_balance_repository import (
+    BookmakerCheckpoint,
+    PeriodCheckpoint,
+    PERIOD_END_FORMAT,
+    PeriodClosingBalanceRepository,
+    normalize_period_end,
+)
+from src.services.statement_service import StatementService
+
+logger = structlog.get_logger()
+
+TWO_PLACES = Decimal("0.01")
+
+_ASSOCIATE_FIELDS = (
+    "deposits_eur",
+    "signed_withdrawals_eur",
+    "net_deposits_eur",
+    "fair_share_eur",
+    "should_hold_eur",
+    "holdings_eur",
+    "imbalance_eur",
+)
+_BOOKMAKER_FIELDS = ("balance_eur", "deposits_eur", "withdrawals_eur", "balance_native")
+
+
+@dataclass
+class PeriodCloseResult:
+    """Summary of a period close run."""
+
+    period_end_utc: str
+    through_entry_id: int
+    associate_count: int
+    bookmaker_row_count: int
+
+
+class PeriodCloseService:
+    """Create and verify closed-period balance checkpoints."""
+
+    def __init__(self, db: Optional[sqlite3.Connection] = None) -> None:
+        self.db = db or get_db_connection()
+        self._owns_connection = db is None
+        self.repository = PeriodClosingBalanceRepository(self.db)
+
+    def close(self) -> None:
+        """Close the owned database connection, if any."""
+        if self._owns_connection:
+            try:
+                self.db.close()
+            except Exception:  # pragma: no cover - defensive cleanup
+                pass
+
+    def close_period(
+        self,
+        period_end_utc: str,
+        *,
+        associate_id: Optional[int] = None,
+        closed_by: str = "system",
+    ) -> PeriodCloseResult:
+        """
+        Snapshot balances as of ``period_end_utc`` for one or all associates.
+
+        Re-closing an existing period replaces its checkpoint. Each snapshot
+        starts from the previous closed period, so closing monthly stays cheap.
+
+        Args:
+            period_end_utc: Inclusive ISO8601 period end (e.g. 2025-10-31T23:59:59Z)
+            associate_id: Optional single associate to close
+            closed_by: Operator recorded on the checkpoint rows
+
+        Returns:
+            PeriodCloseResult describing the rows written
+
+        Raises:
+            ValueError: If the period end is in the future or the associate is unknown
+        """
+        period_end_utc = self._validate_period_end(period_end_utc)
+        associate_ids = self._resolve_associates(associate_id)
+
+        try:
+            through_entry_id = int(
+                self.db.execute("SELECT COALESCE(MAX(id), 0) FROM ledger_entries").fetchone()[0]
+            )
+            statement = StatementService(max_entry_id=through_entry_id)
+            bookmaker_rows = 0
+            for current_id in associate_ids:
+                # Drop first so the period being replaced is not its own starting point.
+                self.repository.delete_checkpoint(current_id, period_end_utc)
+                checkpoint = self._compute_checkpoint(
+                    statement, current_id, period_end_utc, through_entry_id
+                )
+                self.repository.insert_checkpoint(checkpoint, closed_by=closed_by)
+                bookmaker_rows += len(checkpoint.bookmakers)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        logger.info(
+            "period_closed",
+            period_end_utc=period_end_utc,
+            through_entry_id=through_entry_id,
+            associate_count=len(associate_ids),
+            bookmaker_rows=bookmaker_rows,
+        )
+        return PeriodCloseResult(
+            period_end_utc=period_end_utc,
+            through_entry_id=through_entry_id,
+            associate_count=len(associate_ids),
+            bookmaker_row_count=bookmaker_rows,
+        )
+
+    def verify_checkpoints(self, associate_id: Optional[int] = None) -> List[Dict]:
+        """
+        Recompute every checkpoint from the raw ledger and report differences.
+
+        Args:
+            associate_id: Optional associate to restrict verification to
+
+        Returns:
+            One dict per mismatched value (empty when all checkpoints hold)
+        """
+        mismatches: List[Dict] = []
+        checkpoints = self.repository.list_checkpoints(associate_id)
+        for stored in checkpoints:
+            statement = StatementService(
+                use_checkpoints=False, max_entry_id=stored.through_entry_id
+            )
+            expected = self._compute_checkpoint(
+                statement,
+                stored.associate_id,
+                stored.period_end_utc,
+                stored.through_entry_id,
+            )
+            scope = {
+                "associate_id": stored.associate_id,
+                "period_end_utc": stored.period_end_utc,
+            }
+            for field in _ASSOCIATE_FIELDS:
+                have, want = getattr(stored, field), getattr(expected, field)
+                if have != want:
+                    mismatches.append(
+                        {**scope, "bookmaker_id": None, "field": field,
+                         "stored": str(have), "expected": str(want)}
+                    )
+            for bookmaker_id in sorted(set(stored.bookmakers) | set(expected.bookmakers)):
+                have_row = stored.bookmakers.get(bookmaker_id)
+                want_row = expected.bookmakers.get(bookmaker_id)
+                for field in _BOOKMAKER_FIELDS:
+                    have = getattr(have_row, field) if have_row else None
+                    want = getattr(want_row, field) if want_row else None
+                    if have != want:
+                        mismatches.append(
+                            {**scope, "bookmaker_id": bookmaker_id, "field": field,
+                             "stored": str(have), "expected": str(want)}
+                        )
+
+        logger.info(
+            "period_checkpoints_verified",
+            checkpoint_count=len(checkpoints),
+            mismatch_count=len(mismatches),
+        )
+        return mismatches
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _compute_checkpoint(
+        self,
+        statement: StatementService,
+        associate_id: int,
+        period_end_utc: str,
+        through_entry_id: int,
+    ) -> PeriodCheckpoint:
+        deposits, _, net_deposits = statement._calculate_funding_totals(
+            self.db, associate_id, period_end_utc
+        )
+        holdings = statement._calculate_current_holding(self.db, associate_id, period_end_utc)
+        should_hold = statement._calculate_should_hold(self.db, associate_id, period_end_utc)
+        fair_share = statement._calculate_profit_before_payout(
+            self.db, associate_id, period_end_utc
+        )
+        bookmakers = statement._calculate_bookmaker_breakdown(
+            self.db, associate_id, period_end_utc
+        )
+
+        return PeriodCheckpoint(
+            associate_id=associate_id,
+            period_end_utc=period_end_utc,
+            through_entry_id=through_entry_id,
+            deposits_eur=self._quantize(deposits),
+            signed_withdrawals_eur=self._quantize(net_deposits - deposits),
+            net_deposits_eur=self._quantize(net_deposits),
+            fair_share_eur=self._quantize(fair_share),
+            should_hold_eur=self._quantize(should_hold),
+            holdings_eur=self._quantize(holdings),
+            imbalance_eur=self._quantize(holdings - (net_deposits + fair_share)),
+            bookmakers={
+                row.bookmaker_id: BookmakerCheckpoint(
+                    bookmaker_id=row.bookmaker_id,
+                    balance_eur=row.balance_eur,
+                    deposits_eur=row.deposits_eur,
+                    withdrawals_eur=row.withdrawals_eur,
+                    balance_native=row.balance_native,
+                    native_currency=row.native_currency or None,
+                )
+                for row in bookmakers
+                if row.bookmaker_id is not None
+            },
+        )
+
+    def _resolve_associates(self, associate_id: Optional[int]) -> List[int]:
+        if associate_id is None:
+            rows = self.db.execute("SELECT id FROM associates ORDER BY id").fetchall()
+            return [row["id"] for row in rows]
+        row = self.db.execute("SELECT id FROM associates WHERE id = ?", (associate_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"Associate ID {associate_id} not found")
+        return [associate_id]
+
+    @staticmethod
+    def _validate_period_end(period_end_utc: str) -> str:
+        """Return the canonical period end, rejecting invalid or future values."""
+        normalized = normalize_period_end(period_end_utc)
+        period_end = datetime.strptime(normalized, PERIOD_END_FORMAT).replace(
+            tzinfo=timezone.utc
+        )
+        if period_end > datetime.now(timezone.utc):
+            raise ValueError("Cannot close a period that ends in the future")
+        return normalized
+
+    @staticmethod
+    def _quantize(value: Decimal) -> Decimal:
+        return Decimal(value).quantize(TWO_PLACES)
@@ -13,6 +13,7 @@ from decimal import Decimal, ROUND_HALF_UP
 from typing import List, Optional
 
 from src.core.database import get_db_connection
+from src.services.ledger_archive_service import ledger_relation
 from src.services.settlement_constants import SETTLEMENT_NOTE_PREFIX
 from src.utils.logging_config import get_logger
 
@@ -97,8 +98,9 @@ class ReconciliationService:
         logger.info("calculating_associate_balances")
 
         settlement_filter = f"{SETTLEMENT_NOTE_PREFIX}%"
+        ledger = ledger_relation(self.db)
         cursor = self.db.execute(
-            """
+            f"""
             SELECT
                 a.id AS associate_id,
                 a.display_alias AS associate_alias,
@@ -127,7 +129,7 @@ class ReconciliationService:
                 COALESCE(SUM(CAST(le.amount_eur AS REAL)), 0) AS current_holding_eur
 
             FROM associates a
-            LEFT JOIN ledger_entries le ON a.id = le.associate_id
+            LEFT JOIN {ledger} le ON a.id = le.associate_id
             WHERE a.is_active = 1
             GROUP BY a.id, a.display_alias
             ORDER BY a.display_alias
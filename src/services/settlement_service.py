@@ -3,15 +3,22 @@ Settlement Service - Preview and execute equal-split settlement calculations.
 
 This service handles:
 - Previewing settlement calculations before commit
+- Memoizing previews by input fingerprint so execution reuses them
 - Equal-split profit/loss distribution logic
 - FX conversion and Decimal precision
 - Participant seat type determination (staked vs non-staked)
 - Delta provenance link creation
 """
 
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
 from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 from enum import Enum
 from datetime import datetime, timezone
 
@@ -110,6 +117,7 @@ class SettlementPreview:
         ledger_entries: Preview of ledger entries to be created
         settlement_batch_id: UUID for settlement batch
         warnings: List of warning messages
+        fingerprint: Hash of the inputs (surebet, outcomes, bet rows, FX snapshot)
     """
 
     surebet_id: int
@@ -122,6 +130,7 @@ class SettlementPreview:
     ledger_entries: List[LedgerEntryPreview]
     settlement_batch_id: str
     warnings: List[str]
+    fingerprint: Optional[str] = None
 
 
 @dataclass
@@ -146,9 +155,417 @@ class SettlementResult:
     error: Optional[str]
 
 
+# Shared by LedgerEntryService.confirm_settlement and the bulk settlement path
+# so both write identical ledger rows and settlement links.
+SETTLEMENT_LEDGER_INSERT_SQL = """
+    INSERT INTO ledger_entries (
+        type,
+        associate_id,
+        bookmaker_id,
+        amount_native,
+        native_currency,
+        fx_rate_snapshot,
+        amount_eur,
+        settlement_state,
+        principal_returned_eur,
+        per_surebet_share_eur,
+        surebet_id,
+        bet_id,
+        settlement_batch_id,
+        created_by,
+        note
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def quantize_currency(value: Decimal) -> Decimal:
+    """Round monetary values to cents."""
+    return value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def calculate_amount_native(participant: Participant) -> Decimal:
+    """Calculate the native currency amount returned to a participant."""
+    stake_native = participant.stake_native
+
+    if participant.outcome == BetOutcome.WON:
+        return stake_native * participant.odds
+    if participant.outcome == BetOutcome.LOST:
+        return Decimal("0.00")
+    return stake_native
+
+
+def build_settlement_ledger_row(
+    preview: SettlementPreview,
+    participant: Participant,
+    fx_rate: Decimal,
+    batch_id: str,
+    created_by: str,
+) -> Tuple[Tuple, Decimal]:
+    """
+    Build the BET_RESULT ledger row for one settlement participant.
+
+    Args:
+        preview: Settlement preview being committed
+        participant: Participant the row is written for
+        fx_rate: Frozen FX rate for the participant's currency
+        batch_id: Settlement batch UUID
+        created_by: Actor recorded on the ledger row
+
+    Returns:
+        Tuple of (parameters for SETTLEMENT_LEDGER_INSERT_SQL, amount_eur)
+    """
+    amount_native = quantize_currency(calculate_amount_native(participant))
+    amount_eur = quantize_currency(amount_native * fx_rate)
+    principal_returned = quantize_currency(
+        participant.stake_eur
+        if participant.outcome in (BetOutcome.WON, BetOutcome.VOID)
+        else Decimal("0.00")
+    )
+    per_share = (
+        quantize_currency(preview.per_surebet_share_eur)
+        if participant.seat_type == "staked"
+        else Decimal("0.00")
+    )
+    row = (
+        "BET_RESULT",
+        participant.associate_id,
+        participant.bookmaker_id,
+        str(amount_native),
+        participant.currency,
+        str(fx_rate),
+        str(amount_eur),
+        participant.outcome.value,
+        str(principal_returned),
+        str(per_share),
+        preview.surebet_id,
+        participant.bet_id,
+        batch_id,
+        created_by,
+        f"Surebet #{preview.surebet_id} settlement",
+    )
+    return row, amount_eur
+
+
+def find_winner_loser_indexes(
+    participants: List[Participant],
+) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Locate the first WON and first LOST participants.
+
+    When every participant is VOID the first two participants are paired so
+    the settlement still records its counterparties.
+
+    Args:
+        participants: Settlement participants in preview order
+
+    Returns:
+        Tuple of (winner_index, loser_index), either may be None
+    """
+    winner_idx: Optional[int] = None
+    loser_idx: Optional[int] = None
+
+    for idx, participant in enumerate(participants):
+        if participant.outcome == BetOutcome.WON and winner_idx is None:
+            winner_idx = idx
+        elif participant.outcome == BetOutcome.LOST and loser_idx is None:
+            loser_idx = idx
+
+    if winner_idx is None and loser_idx is None and len(participants) >= 2:
+        winner_idx, loser_idx = 0, 1
+
+    return winner_idx, loser_idx
+
+
+def build_settlement_link(
+    preview: SettlementPreview, ledger_entry_ids: List[int]
+) -> Optional[Dict]:
+    """
+    Determine the delta provenance link for a settled surebet.
+
+    Args:
+        preview: Settlement preview being committed
+        ledger_entry_ids: Ledger entry IDs aligned with preview.participants
+
+    Returns:
+        Keyword arguments for DeltaProvenanceService.create_settlement_link,
+        or None when no winner/loser pair or no positive amount exists
+    """
+    participants = preview.participants
+    if not participants or len(participants) != len(ledger_entry_ids):
+        return None
+
+    winner_idx, loser_idx = find_winner_loser_indexes(participants)
+    if winner_idx is None or loser_idx is None:
+        logger.warning(
+            "delta_provenance_link_skipped",
+            reason="unable_to_determine_winner_loser",
+            participant_count=len(participants),
+            surebet_id=preview.surebet_id,
+        )
+        return None
+
+    amount_eur = preview.per_bet_net_gains.get(
+        participants[winner_idx].bet_id, Decimal("0.00")
+    )
+    if amount_eur <= Decimal("0.00"):
+        loss = preview.per_bet_net_gains.get(
+            participants[loser_idx].bet_id, Decimal("0.00")
+        )
+        amount_eur = abs(loss)
+
+    if amount_eur <= Decimal("0.00"):
+        logger.warning(
+            "delta_provenance_link_skipped",
+            reason="non_positive_amount",
+            surebet_id=preview.surebet_id,
+            amount=str(amount_eur),
+        )
+        return None
+
+    return {
+        "surebet_id": preview.surebet_id,
+        "winner_associate_id": participants[winner_idx].associate_id,
+        "loser_associate_id": participants[loser_idx].associate_id,
+        "amount_eur": amount_eur,
+        "winner_ledger_entry_id": ledger_entry_ids[winner_idx],
+        "loser_ledger_entry_id": ledger_entry_ids[loser_idx],
+    }
+
+
+def load_surebet_bets(conn: sqlite3.Connection, surebet_id: int) -> List[Dict]:
+    """
+    Load all bets for a surebet.
+
+    Rows are read through a cursor-local ``sqlite3.Row`` factory, so the
+    connection's own row factory is left untouched.
+
+    Args:
+        conn: Database connection
+        surebet_id: ID of surebet
+
+    Returns:
+        List of bet dictionaries
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = sqlite3.Row
+    cursor.execute(
+        """
+        SELECT
+            b.id,
+            b.associate_id,
+            b.bookmaker_id,
+            b.stake_original,
+            b.stake_eur,
+            b.odds,
+            b.odds_original,
+            b.currency,
+            sb.side,
+            a.display_alias as associate_alias,
+            bk.bookmaker_name
+        FROM bets b
+        JOIN surebet_bets sb ON sb.bet_id = b.id
+        JOIN associates a ON b.associate_id = a.id
+        JOIN bookmakers bk ON b.bookmaker_id = bk.id
+        WHERE sb.surebet_id = ?
+        ORDER BY b.id
+    """,
+        (surebet_id,),
+    )
+    return [dict(row) for row in cursor.fetchall()]
+
+
+def load_fx_snapshot(conn: sqlite3.Connection, bets: List[Dict]) -> Dict[str, Decimal]:
+    """
+    Get FX rates snapshot for all currencies (frozen at preview time).
+
+    Args:
+        conn: Database connection
+        bets: List of bet dictionaries
+
+    Returns:
+        Mapping of currency → FX rate to EUR
+
+    Raises:
+        ValueError: If FX rate not available for a currency
+    """
+    currencies = {bet["currency"] for bet in bets}
+    fx_rates = {}
+
+    settlement_date = datetime.now(timezone.utc).date()
+    cursor = conn.cursor()
+    cursor.row_factory = sqlite3.Row
+
+    for currency in currencies:
+        if currency == "EUR":
+            fx_rates[currency] = Decimal("1.00")
+        else:
+            row = cursor.execute(
+                """
+                SELECT rate_to_eur
+                FROM fx_rates_daily
+                WHERE currency_code = ?
+                ORDER BY date DESC, COALESCE(fetched_at_utc, '') DESC
+                LIMIT 1
+            """,
+                (currency.upper(),),
+            ).fetchone()
+
+            rate_value = None
+            if row is not None:
+                if hasattr(row, "__getitem__"):
+                    try:
+                        rate_value = row["rate_to_eur"]
+                    except (KeyError, TypeError):
+                        rate_value = None
+                if rate_value is None and hasattr(row, "rate_to_eur"):
+                    rate_value = getattr(row, "rate_to_eur")
+
+            if isinstance(rate_value, (Decimal, int, float, str)):
+                try:
+                    fx_rates[currency] = Decimal(str(rate_value))
+                    continue
+                except (InvalidOperation, ValueError):
+                    rate_value = None
+            else:
+                rate_value = None
+
+            try:
+                rate = get_fx_rate(currency, rate_date=settlement_date, conn=conn)
+            except TypeError:
+                rate = get_fx_rate(currency)
+            if rate is None:
+                raise ValueError(f"FX rate not available for currency: {currency}")
+            fx_rates[currency] = Decimal(str(rate))
+
+    return fx_rates
+
+
+def fingerprint_settlement_inputs(
+    surebet_id: int,
+    bets: List[Dict],
+    outcomes: Dict[int, BetOutcome],
+    fx_rates: Dict[str, Decimal],
+) -> str:
+    """
+    Hash everything a preview is calculated from.
+
+    Args:
+        surebet_id: ID of surebet
+        bets: Loaded bet rows (every column is part of the row version)
+        outcomes: Mapping of bet_id → BetOutcome
+        fx_rates: FX snapshot; only currencies used by the bets are hashed
+
+    Returns:
+        SHA-256 hex digest
+    """
+    currencies = {bet.get("currency") for bet in bets}
+    payload = {
+        "surebet_id": surebet_id,
+        "outcomes": sorted(
+            (str(bet_id), getattr(outcome, "value", str(outcome)))
+            for bet_id, outcome in outcomes.items()
+        ),
+        "bets": [sorted(bet.items()) for bet in bets],
+        "fx": sorted(
+            (currency, str(rate))
+            for currency, rate in fx_rates.items()
+            if currency in currencies
+        ),
+    }
+    encoded = json.dumps(payload, default=str, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def compute_preview_fingerprint(
+    conn: sqlite3.Connection, surebet_id: int, outcomes: Dict[int, BetOutcome]
+) -> str:
+    """
+    Fingerprint the current settlement inputs without building a preview.
+
+    Only reads through ``conn``; no service is constructed and no connection
+    state is changed, so it is safe inside an open transaction.
+
+    Args:
+        conn: Database connection
+        surebet_id: ID of surebet to settle
+        outcomes: Mapping of bet_id → BetOutcome
+
+    Returns:
+        Fingerprint comparable to SettlementPreview.fingerprint
+
+    Raises:
+        ValueError: If surebet not found or FX rates are unavailable
+    """
+    bets = load_surebet_bets(conn, surebet_id)
+    if not bets:
+        raise ValueError(f"No bets found for surebet {surebet_id}")
+    fx_rates = load_fx_snapshot(conn, bets)
+    return fingerprint_settlement_inputs(surebet_id, bets, outcomes, fx_rates)
+
+
+def settlement_timestamp() -> str:
+    """Return the UTC timestamp written on settled surebets and bets."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+class SettlementPreviewCache:
+    """
+    Process-wide LRU cache of settlement previews keyed by input fingerprint.
+
+    A fingerprint covers the surebet ID, the chosen outcomes, every loaded bet
+    column and the FX snapshot, so any edit to a bet or a new FX rate produces
+    a different key and the preview is recalculated.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self._entries: "OrderedDict[str, SettlementPreview]" = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint: str) -> Optional[SettlementPreview]:
+        """Return the cached preview for a fingerprint, if any."""
+        with self._lock:
+            preview = self._entries.get(fingerprint)
+            if preview is None:
+                return None
+            self._entries.move_to_end(fingerprint)
+        # Callers may annotate previews (e.g. warnings); keep the cached copy pristine
+        return copy.deepcopy(preview)
+
+    def put(self, preview: SettlementPreview) -> None:
+        """Store a preview under its fingerprint, evicting the oldest entry."""
+        if not preview.fingerprint:
+            return
+        stored = copy.deepcopy(preview)
+        with self._lock:
+            self._entries[preview.fingerprint] = stored
+            self._entries.move_to_end(preview.fingerprint)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_surebets(self, surebet_ids: Iterable[int]) -> None:
+        """Drop cached previews for surebets that have been settled."""
+        targets = set(surebet_ids)
+        with self._lock:
+            for fingerprint in [
+                key
+                for key, preview in self._entries.items()
+                if preview.surebet_id in targets
+            ]:
+                del self._entries[fingerprint]
+
+    def clear(self) -> None:
+        """Remove every cached preview."""
+        with self._lock:
+            self._entries.clear()
+
+
 class SettlementService:
     """Service for settling surebets with equal-split logic."""
 
+    # Shared across instances: the UI builds a new service on every rerun
+    preview_cache = SettlementPreviewCache()
+
     def __init__(self, db=None):
         """
         Initialize the settlement service.
@@ -212,6 +629,72 @@ class SettlementService:
         # Get FX rates snapshot (frozen at preview time)
         fx_rates = self._get_fx_snapshot(bets)
 
+        return self._get_or_build_preview(surebet_id, bets, outcomes, fx_rates)
+
+    def get_preview_fingerprint(
+        self, surebet_id: int, outcomes: Dict[int, BetOutcome]
+    ) -> str:
+        """
+        Fingerprint the current settlement inputs without building a preview.
+
+        Args:
+            surebet_id: ID of surebet to settle
+            outcomes: Mapping of bet_id → BetOutcome
+
+        Returns:
+            Fingerprint comparable to SettlementPreview.fingerprint
+
+        Raises:
+            ValueError: If surebet not found or FX rates are unavailable
+        """
+        return compute_preview_fingerprint(self.db, surebet_id, outcomes)
+
+    def _get_or_build_preview(
+        self,
+        surebet_id: int,
+        bets: List[Dict],
+        outcomes: Dict[int, BetOutcome],
+        fx_rates: Dict[str, Decimal],
+    ) -> SettlementPreview:
+        """
+        Return the memoized preview for these inputs or calculate a new one.
+
+        Cache hits get a fresh settlement batch ID so every preview remains
+        uniquely identifiable.
+        """
+        fingerprint = fingerprint_settlement_inputs(surebet_id, bets, outcomes, fx_rates)
+        cached = self.preview_cache.get(fingerprint)
+        if cached is not None:
+            logger.info("settlement_preview_cache_hit", surebet_id=surebet_id)
+            return replace(cached, settlement_batch_id=self._generate_batch_id())
+
+        preview = self._build_preview(surebet_id, bets, outcomes, fx_rates)
+        preview.fingerprint = fingerprint
+        self.preview_cache.put(preview)
+        return preview
+
+    def _build_preview(
+        self,
+        surebet_id: int,
+        bets: List[Dict],
+        outcomes: Dict[int, BetOutcome],
+        fx_rates: Dict[str, Decimal],
+    ) -> SettlementPreview:
+        """
+        Calculate a settlement preview from already-loaded bets and FX rates.
+
+        Args:
+            surebet_id: ID of surebet to settle
+            bets: Bet rows as returned by _load_surebet_bets
+            outcomes: Mapping of bet_id → BetOutcome
+            fx_rates: Frozen FX rates snapshot covering every bet currency
+
+        Returns:
+            SettlementPreview with all calculation details
+
+        Raises:
+            ValueError: If bet data is incomplete
+        """
         # Calculate per-bet net gains
         per_bet_net_gains = {}
         participants = []
@@ -329,14 +812,22 @@ class SettlementService:
         )
 
     def execute_settlement(
-        self, surebet_id: int, outcomes: Dict[int, BetOutcome]
+        self,
+        surebet_id: int,
+        outcomes: Dict[int, BetOutcome],
+        expected_fingerprint: Optional[str] = None,
     ) -> SettlementResult:
         """
         Execute settlement and create ledger entries with provenance links.
 
+        The preview the operator saw is reused from the preview cache when the
+        bets and FX snapshot are unchanged.
+
         Args:
             surebet_id: ID of surebet to settle
             outcomes: Mapping of bet_id → BetOutcome
+            expected_fingerprint: Fingerprint of the preview shown to the
+                operator; settlement is refused if the inputs changed since
 
         Returns:
             SettlementResult with execution details
@@ -347,60 +838,42 @@ class SettlementService:
             # Start transaction
             self.db.execute("BEGIN TRANSACTION")
 
-            # Preview settlement first
+            # Preview settlement first (memoized when inputs are unchanged)
             preview = self.preview_settlement(surebet_id, outcomes)
+            if (
+                expected_fingerprint is not None
+                and preview.fingerprint != expected_fingerprint
+            ):
+                raise ValueError(
+                    "Settlement inputs changed since the preview was calculated"
+                )
 
-            # Create ledger entries
+            # Create ledger entries (same rows as the bulk path and
+            # LedgerEntryService.confirm_settlement)
             ledger_entry_ids = []
-            for entry_preview in preview.ledger_entries:
-                cursor = self.db.execute(
-                    """
-                    INSERT INTO ledger_entries (
-                        type,
-                        associate_id,
-                        bookmaker_id,
-                        amount_native,
-                        native_currency,
-                        fx_rate_snapshot,
-                        amount_eur,
-                        settlement_state,
-                        principal_returned_eur,
-                        per_surebet_share_eur,
-                        surebet_id,
-                        bet_id,
-                        opposing_associate_id,
-                        settlement_batch_id,
-                        created_at_utc,
-                        created_by,
-                        note
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        "BET_RESULT",
-                        next(p.associate_id for p in preview.participants if p.bet_id == entry_preview.bet_id),
-                        next(p.bookmaker_id for p in preview.participants if p.bet_id == entry_preview.bet_id),
-                        str(entry_preview.total_amount_eur),  # amount_native (EUR for simplicity)
-                        "EUR",  # native_currency
-                        str(entry_preview.fx_rate),
-                        str(entry_preview.total_amount_eur),  # amount_eur
-                        entry_preview.outcome,
-                        str(entry_preview.principal_returned_eur),
-                        str(entry_preview.per_surebet_share_eur),
-                        surebet_id,
-                        entry_preview.bet_id,
-                        None,  # opposing_associate_id (will be updated later)
-                        preview.settlement_batch_id,
-                        datetime.now(timezone.utc).isoformat() + "Z",
-                        "local_user",
-                        f"Surebet {surebet_id} settlement"
-                    )
-                )
+            for row in self._settlement_ledger_rows(preview):
+                cursor = self.db.execute(SETTLEMENT_LEDGER_INSERT_SQL, row)
                 ledger_entry_ids.append(cursor.lastrowid)
 
-            # Update surebet status
+            # Mark the surebet and its bets settled (as the bulk path does);
+            # settling the bets releases their open exposure
+            timestamp = settlement_timestamp()
+            self.db.execute(
+                """
+                UPDATE surebets
+                SET status = 'settled', settled_at_utc = ?, updated_at_utc = ?
+                WHERE id = ?
+                """,
+                (timestamp, timestamp, surebet_id),
+            )
+            bet_ids = [participant.bet_id for participant in preview.participants]
             self.db.execute(
-                "UPDATE surebets SET status = 'settled', settled_at_utc = ? WHERE id = ?",
-                (datetime.now(timezone.utc).isoformat() + "Z", surebet_id)
+                f"""
+                UPDATE bets
+                SET status = 'settled', updated_at_utc = ?
+                WHERE id IN ({",".join("?" for _ in bet_ids)})
+                """,
+                [timestamp, *bet_ids],
             )
 
             # Create settlement link for delta provenance
@@ -415,6 +888,7 @@ class SettlementService:
 
             # Commit transaction
             self.db.execute("COMMIT")
+            self.preview_cache.invalidate_surebets([surebet_id])
 
             logger.info(
                 "settlement_completed",
@@ -449,6 +923,305 @@ class SettlementService:
                 error=str(e)
             )
 
+    def execute_settlements(
+        self, requests: Sequence[Tuple[int, Dict[int, BetOutcome]]]
+    ) -> List[SettlementResult]:
+        """
+        Settle many surebets in a single database transaction.
+
+        Bets for every surebet are loaded in one pass, a single FX snapshot is
+        shared by all previews, and ledger rows, status updates, settlement
+        links and opposing associate references are written set-based. If the
+        combined write fails, each surebet is retried inside its own savepoint
+        so one bad surebet does not block the rest of the batch.
+
+        Args:
+            requests: Sequence of (surebet_id, outcomes) pairs, where outcomes
+                maps bet_id → BetOutcome
+
+        Returns:
+            SettlementResult per request, in request order
+        """
+        requests = list(requests)
+        logger.info("executing_bulk_settlement", surebet_count=len(requests))
+        if not requests:
+            return []
+
+        results: List[Optional[SettlementResult]] = [None] * len(requests)
+        surebet_ids = [surebet_id for surebet_id, _ in requests]
+        bets_by_surebet, statuses = self._load_bets_for_surebets(surebet_ids)
+
+        all_bets = [bet for bets in bets_by_surebet.values() for bet in bets]
+        fx_rates, fx_errors = self._get_bulk_fx_snapshot(all_bets)
+
+        # Calculate previews (no writes yet); invalid surebets fail individually
+        previews: List[Tuple[int, SettlementPreview]] = []
+        seen: set = set()
+        for index, (surebet_id, outcomes) in enumerate(requests):
+            try:
+                if surebet_id in seen:
+                    raise ValueError(f"Surebet {surebet_id} listed more than once")
+                seen.add(surebet_id)
+
+                status = statuses.get(surebet_id)
+                if status is None:
+                    raise ValueError(f"Surebet {surebet_id} not found")
+                if status in ("settled", "cancelled"):
+                    raise ValueError(f"Surebet {surebet_id} is already {status}")
+
+                bets = bets_by_surebet.get(surebet_id, [])
+                if not bets:
+                    raise ValueError(f"No bets found for surebet {surebet_id}")
+
+                self._validate_outcomes(bets, outcomes)
+                for bet in bets:
+                    if bet["currency"] in fx_errors:
+                        raise ValueError(fx_errors[bet["currency"]])
+
+                preview = self._get_or_build_preview(
+                    surebet_id, bets, outcomes, fx_rates
+                )
+                previews.append((index, preview))
+            except ValueError as e:
+                results[index] = self._failed_settlement_result(surebet_id, e)
+
+        if previews:
+            try:
+                self.db.execute("BEGIN TRANSACTION")
+                written = self._write_settlements([p for _, p in previews])
+                self.db.execute("COMMIT")
+            except Exception as e:
+                self.db.execute("ROLLBACK")
+                logger.warning(
+                    "bulk_settlement_retrying_individually",
+                    surebet_count=len(previews),
+                    error=str(e),
+                )
+                written = self._write_settlements_isolated(previews, results)
+
+            for index, preview in previews:
+                if results[index] is not None:
+                    continue
+                ledger_entry_ids, settlement_link_id = written[preview.surebet_id]
+                results[index] = SettlementResult(
+                    surebet_id=preview.surebet_id,
+                    settlement_batch_id=preview.settlement_batch_id,
+                    ledger_entry_ids=ledger_entry_ids,
+                    settlement_link_id=settlement_link_id,
+                    success=True,
+                    error=None,
+                )
+
+        self.preview_cache.invalidate_surebets(
+            r.surebet_id for r in results if r and r.success
+        )
+        logger.info(
+            "bulk_settlement_completed",
+            surebet_count=len(requests),
+            settled_count=sum(1 for r in results if r and r.success),
+            failed_count=sum(1 for r in results if r and not r.success),
+        )
+        return [result for result in results if result is not None]
+
+    def _write_settlements_isolated(
+        self,
+        previews: List[Tuple[int, SettlementPreview]],
+        results: List[Optional[SettlementResult]],
+    ) -> Dict[int, Tuple[List[int], Optional[int]]]:
+        """
+        Write settlements one savepoint at a time inside a single transaction.
+
+        Failed surebets are rolled back to their savepoint and recorded in
+        ``results``; the remaining surebets still commit together. If that
+        final commit fails, the whole batch is rolled back and marked failed.
+
+        Args:
+            previews: (request_index, preview) pairs to write
+            results: Per-request results, updated in place for failures
+
+        Returns:
+            Mapping of surebet_id → (ledger_entry_ids, settlement_link_id)
+        """
+        written: Dict[int, Tuple[List[int], Optional[int]]] = {}
+        self.db.execute("BEGIN TRANSACTION")
+        try:
+            for index, preview in previews:
+                self.db.execute("SAVEPOINT settle_surebet")
+                try:
+                    written.update(self._write_settlements([preview]))
+                except Exception as e:
+                    self.db.execute("ROLLBACK TO SAVEPOINT settle_surebet")
+                    results[index] = self._failed_settlement_result(
+                        preview.surebet_id, e
+                    )
+                finally:
+                    self.db.execute("RELEASE SAVEPOINT settle_surebet")
+            self.db.execute("COMMIT")
+        except Exception as e:
+            # Nothing was committed: every surebet not already failed fails now
+            self.db.execute("ROLLBACK")
+            for index, preview in previews:
+                if results[index] is None:
+                    results[index] = self._failed_settlement_result(
+                        preview.surebet_id, e
+                    )
+            return {}
+        return written
+
+    def _write_settlements(
+        self, previews: List[SettlementPreview]
+    ) -> Dict[int, Tuple[List[int], Optional[int]]]:
+        """
+        Persist settlements set-based within the caller's transaction.
+
+        Args:
+            previews: Settlement previews to commit
+
+        Returns:
+            Mapping of surebet_id → (ledger_entry_ids, settlement_link_id)
+        """
+        timestamp = settlement_timestamp()
+
+        ledger_rows = [
+            row for preview in previews for row in self._settlement_ledger_rows(preview)
+        ]
+
+        self.db.executemany(SETTLEMENT_LEDGER_INSERT_SQL, ledger_rows)
+
+        # Resolve the generated IDs through the (indexed) settlement batch IDs
+        ledger_ids_by_key: Dict[Tuple[str, int], int] = {}
+        batch_ids = [preview.settlement_batch_id for preview in previews]
+        for chunk in self._chunked(batch_ids):
+            placeholders = ",".join("?" for _ in chunk)
+            for row in self.db.execute(
+                f"""
+                SELECT id, settlement_batch_id, bet_id
+                FROM ledger_entries
+                WHERE settlement_batch_id IN ({placeholders})
+                """,
+                chunk,
+            ).fetchall():
+                ledger_ids_by_key[(row[1], row[2])] = row[0]
+
+        surebet_ids = [preview.surebet_id for preview in previews]
+        bet_ids = [p.bet_id for preview in previews for p in preview.participants]
+        for chunk in self._chunked(surebet_ids):
+            placeholders = ",".join("?" for _ in chunk)
+            self.db.execute(
+                f"""
+                UPDATE surebets
+                SET status = 'settled', settled_at_utc = ?, updated_at_utc = ?
+                WHERE id IN ({placeholders})
+                """,
+                [timestamp, timestamp, *chunk],
+            )
+        for chunk in self._chunked(bet_ids):
+            placeholders = ",".join("?" for _ in chunk)
+            self.db.execute(
+                f"""
+                UPDATE bets
+                SET status = 'settled', updated_at_utc = ?
+                WHERE id IN ({placeholders})
+                """,
+                [timestamp, *chunk],
+            )
+
+        written: Dict[int, Tuple[List[int], Optional[int]]] = {}
+        links = []
+        opposing_updates = []
+        for preview in previews:
+            ledger_entry_ids = [
+                ledger_ids_by_key[(preview.settlement_batch_id, p.bet_id)]
+                for p in preview.participants
+            ]
+            written[preview.surebet_id] = (ledger_entry_ids, None)
+
+            link = build_settlement_link(preview, ledger_entry_ids)
+            if link is not None:
+                links.append(link)
+
+            winner_idx, loser_idx = find_winner_loser_indexes(preview.participants)
+            if winner_idx is not None and loser_idx is not None:
+                opposing_updates.append(
+                    (
+                        preview.participants[loser_idx].associate_id,
+                        ledger_entry_ids[winner_idx],
+                    )
+                )
+                opposing_updates.append(
+                    (
+                        preview.participants[winner_idx].associate_id,
+                        ledger_entry_ids[loser_idx],
+                    )
+                )
+
+        link_ids = self.delta_provenance.create_settlement_links(links)
+        for surebet_id, link_id in link_ids.items():
+            written[surebet_id] = (written[surebet_id][0], link_id)
+
+        if opposing_updates:
+            # Temporarily disable trigger for opposing_associate_id updates
+            self.db.execute("DROP TRIGGER IF EXISTS prevent_ledger_update")
+            try:
+                self.db.executemany(
+                    "UPDATE ledger_entries SET opposing_associate_id = ? WHERE id = ?",
+                    opposing_updates,
+                )
+            finally:
+                # Recreate the trigger
+                create_ledger_append_only_trigger(self.db)
+
+        return written
+
+    @staticmethod
+    def _settlement_ledger_rows(preview: SettlementPreview) -> List[Tuple]:
+        """
+        BET_RESULT rows for a preview, in participant order.
+
+        Each currency uses the FX rate of its first participant, so every row
+        of one surebet shares a single frozen snapshot per currency.
+
+        Args:
+            preview: Settlement preview being committed
+
+        Returns:
+            Parameters for SETTLEMENT_LEDGER_INSERT_SQL, one per participant
+        """
+        fx_snapshots: Dict[str, Decimal] = {}
+        for participant in preview.participants:
+            fx_snapshots.setdefault(participant.currency, participant.fx_rate)
+        return [
+            build_settlement_ledger_row(
+                preview,
+                participant,
+                fx_snapshots[participant.currency],
+                preview.settlement_batch_id,
+                "local_user",
+            )[0]
+            for participant in preview.participants
+        ]
+
+    @staticmethod
+    def _failed_settlement_result(
+        surebet_id: int, error: Exception
+    ) -> SettlementResult:
+        """Build a failed SettlementResult and log the reason."""
+        logger.error("settlement_failed", surebet_id=surebet_id, error=str(error))
+        return SettlementResult(
+            surebet_id=surebet_id,
+            settlement_batch_id="",
+            ledger_entry_ids=[],
+            settlement_link_id=None,
+            success=False,
+            error=str(error),
+        )
+
+    @staticmethod
+    def _chunked(values: List, size: int = 500) -> Iterable[List]:
+        """Yield successive chunks that stay below SQLite's parameter limit."""
+        for start in range(0, len(values), size):
+            yield values[start:start + size]
+
     def _create_settlement_link(
         self,
         surebet_id: int,
@@ -555,40 +1328,87 @@ class SettlementService:
                 create_ledger_append_only_trigger(self.db)
 
     def _load_surebet_bets(self, surebet_id: int) -> List[Dict]:
+        """Load all bets for a surebet (see load_surebet_bets)."""
+        return load_surebet_bets(self.db, surebet_id)
+
+    def _load_bets_for_surebets(
+        self, surebet_ids: List[int]
+    ) -> Tuple[Dict[int, List[Dict]], Dict[int, str]]:
         """
-        Load all bets for a surebet.
+        Load bets and statuses for many surebets at once.
 
         Args:
-            surebet_id: ID of surebet
+            surebet_ids: IDs of surebets to load
 
         Returns:
-            List of bet dictionaries
-        """
-        cursor = self.db.cursor()
-        cursor.execute(
-            """
-            SELECT
-                b.id,
-                b.associate_id,
-                b.bookmaker_id,
-                b.stake_original,
-                b.stake_eur,
-                b.odds,
-                b.odds_original,
-                b.currency,
-                sb.side,
-                a.display_alias as associate_alias,
-                bk.bookmaker_name
-            FROM bets b
-            JOIN surebet_bets sb ON sb.bet_id = b.id
-            JOIN associates a ON b.associate_id = a.id
-            JOIN bookmakers bk ON b.bookmaker_id = bk.id
-            WHERE sb.surebet_id = ?
-            ORDER BY b.id
-        """,
-            (surebet_id,),
-        )
-        return [dict(row) for row in cursor.fetchall()]
+            Tuple of (surebet_id → bet dictionaries, surebet_id → status)
+        """
+        bets_by_surebet: Dict[int, List[Dict]] = {}
+        statuses: Dict[int, str] = {}
+        unique_ids = sorted(set(surebet_ids))
+
+        for chunk in self._chunked(unique_ids):
+            placeholders = ",".join("?" for _ in chunk)
+            for row in self.db.execute(
+                f"SELECT id, status FROM surebets WHERE id IN ({placeholders})",
+                chunk,
+            ).fetchall():
+                statuses[row[0]] = row[1]
+
+            rows = self.db.execute(
+                f"""
+                SELECT
+                    sb.surebet_id,
+                    b.id,
+                    b.associate_id,
+                    b.bookmaker_id,
+                    b.stake_original,
+                    b.stake_eur,
+                    b.odds,
+                    b.odds_original,
+                    b.currency,
+                    sb.side,
+                    a.display_alias as associate_alias,
+                    bk.bookmaker_name
+                FROM bets b
+                JOIN surebet_bets sb ON sb.bet_id = b.id
+                JOIN associates a ON b.associate_id = a.id
+                JOIN bookmakers bk ON b.bookmaker_id = bk.id
+                WHERE sb.surebet_id IN ({placeholders})
+                ORDER BY sb.surebet_id, b.id
+                """,
+                chunk,
+            ).fetchall()
+            for row in rows:
+                bet = dict(row)
+                surebet_id = bet.pop("surebet_id")
+                bets_by_surebet.setdefault(surebet_id, []).append(bet)
+
+        return bets_by_surebet, statuses
+
+    def _get_bulk_fx_snapshot(
+        self, bets: List[Dict]
+    ) -> Tuple[Dict[str, Decimal], Dict[str, str]]:
+        """
+        Get one FX snapshot for every currency used by a batch of bets.
+
+        Unlike _get_fx_snapshot, a missing rate does not abort the batch; it is
+        reported so only the surebets using that currency fail.
+
+        Args:
+            bets: List of bet dictionaries
+
+        Returns:
+            Tuple of (currency → FX rate, currency → error message)
+        """
+        fx_rates: Dict[str, Decimal] = {}
+        fx_errors: Dict[str, str] = {}
+        for currency in sorted({bet["currency"] for bet in bets}):
+            try:
+                fx_rates.update(self._get_fx_snapshot([{"currency": currency}]))
+            except ValueError as e:
+                fx_errors[currency] = str(e)
+        return fx_rates, fx_errors
 
     def _validate_outcomes(self, bets: List[Dict], outcomes: Dict[int, BetOutcome]):
         """
@@ -607,68 +1427,8 @@ class SettlementService:
                 raise ValueError(f"Missing outcome for bet {bet_id}")
 
     def _get_fx_snapshot(self, bets: List[Dict]) -> Dict[str, Decimal]:
-        """
-        Get FX rates snapshot for all currencies (frozen at preview time).
-
-        Args:
-            bets: List of bet dictionaries
-
-        Returns:
-            Mapping of currency → FX rate to EUR
-
-        Raises:
-            ValueError: If FX rate not available for a currency
-        """
-        currencies = {bet["currency"] for bet in bets}
-        fx_rates = {}
-
-        settlement_date = datetime.now(timezone.utc).date()
-
-        for currency in currencies:
-            if currency == "EUR":
-                fx_rates[currency] = Decimal("1.00")
-            else:
-                row = self.db.execute(
-                    """
-                    SELECT rate_to_eur
-                    FROM fx_rates_daily
-                    WHERE currency_code = ?
-                    ORDER BY date DESC, COALESCE(fetched_at_utc, '') DESC
-                    LIMIT 1
-                """,
-                    (currency.upper(),),
-                ).fetchone()
-
-                rate_value = None
-                if row is not None:
-                    if hasattr(row, "__getitem__"):
-                        try:
-                            rate_value = row["rate_to_eur"]  # type: ignore[index]
-                        except (KeyError, TypeError):
-                            rate_value = None
-                    if rate_value is None and hasattr(row, "rate_to_eur"):
-                        rate_value = getattr(row, "rate_to_eur")
-
-                if isinstance(rate_value, (Decimal, int, float, str)):
-                    try:
-                        fx_rates[currency] = Decimal(str(rate_value))
-                        continue
-                    except (InvalidOperation, ValueError):
-                        rate_value = None
-                else:
-                    rate_value = None
-
-                try:
-                    rate = get_fx_rate(
-                        currency, rate_date=settlement_date, conn=self.db
-                    )
-                except TypeError:
-                    rate = get_fx_rate(currency)
-                if rate is None:
-                    raise ValueError(f"FX rate not available for currency: {currency}")
-                fx_rates[currency] = Decimal(str(rate))
-
-        return fx_rates
+        """FX rates frozen at preview time (see load_fx_snapshot)."""
+        return load_fx_snapshot(self.db, bets)
 
     def _convert_to_eur(
         self, amount: Decimal, currency: str, fx_rates: Dict[str, Decimal]
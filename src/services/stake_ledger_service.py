@@ -17,9 +17,59 @@ from src.services.fx_manager import get_fx_rate
 
 logger = structlog.get_logger(__name__)
 
+CURRENCY_PRECISION = Decimal("0.01")
+
+
+def extract_stake(bet: Mapping[str, object]) -> tuple[str, Decimal]:
+    """
+    Resolve the native stake of a bet as ``(currency, amount)``.
+
+    Manual overrides win over the OCR fields; ``stake_eur`` is only used when
+    no native stake is present.
+
+    Raises:
+        ValueError: If the bet carries no positive stake
+    """
+    currency = (
+        (bet.get("manual_stake_currency") or bet.get("stake_currency") or bet.get("currency") or "EUR")
+        .strip()
+        .upper()
+    )
+
+    for field in (
+        "manual_stake_override",
+        "stake_original",
+        "stake_amount",
+        "stake",
+    ):
+        value = _safe_decimal(bet.get(field))
+        if value is not None and value > 0:
+            return currency, value.quantize(CURRENCY_PRECISION, rounding=ROUND_HALF_UP)
+
+    value = _safe_decimal(bet.get("stake_eur"))
+    if value is not None and value > 0:
+        return "EUR", value.quantize(CURRENCY_PRECISION, rounding=ROUND_HALF_UP)
+
+    raise ValueError("Missing stake information")
+
+
+def _safe_decimal(raw: object) -> Decimal | None:
+    if raw is None or raw == "":
+        return None
+    try:
+        return Decimal(str(raw))
+    except (InvalidOperation, ValueError):
+        return None
+
 
 class StakeLedgerService:
-    """Encapsulates creation and adjustment of BET_STAKE ledger entries."""
+    """
+    Encapsulates creation and adjustment of BET_STAKE ledger entries.
+
+    Reads the hot ``ledger_entries`` table only: the ledger archive keeps a
+    bet's BET_STAKE rows hot until the bet is settled or rejected, and stakes
+    are only synced before that.
+    """
 
     RATE_PRECISION = Decimal("0.000001")
     CURRENCY_PRECISION = Decimal("0.01")
@@ -214,36 +264,7 @@ class StakeLedgerService:
         return totals
 
     def _extract_stake(self, bet: Mapping[str, object]) -> tuple[str, Decimal]:
-        currency = (
-            (bet.get("manual_stake_currency") or bet.get("stake_currency") or bet.get("currency") or "EUR")
-            .strip()
-            .upper()
-        )
-
-        for field in (
-            "manual_stake_override",
-            "stake_original",
-            "stake_amount",
-            "stake",
-        ):
-            raw = bet.get(field)
-            value = self._safe_decimal(raw)
-            if value is not None and value > 0:
-                return currency, self._quantize_currency(value)
-
-        value = self._safe_decimal(bet.get("stake_eur"))
-        if value is not None and value > 0:
-            return "EUR", self._quantize_currency(value)
-
-        raise ValueError("Missing stake information")
-
-    def _safe_decimal(self, raw: object) -> Decimal | None:
-        if raw is None or raw == "":
-            return None
-        try:
-            return Decimal(str(raw))
-        except (InvalidOperation, ValueError):
-            return None
+        return extract_stake(bet)
 
     def _resolve_fx_rate(self, currency: str) -> Decimal:
         try:
@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import io
 import re
+import sqlite3
 from decimal import Decimal
 from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 from dataclasses import dataclass
@@ -19,8 +20,17 @@ from xlsxwriter.utility import xl_rowcol_to_cell
 from datetime import datetime
 
 from src.core.database import get_db_connection
+from src.repositories.period_closing_balance_repository import (
+    PeriodCheckpoint,
+    PeriodClosingBalanceRepository,
+)
 from src.services import settlement_constants as _settlement_constants
-from src.utils.datetime_helpers import utc_now_iso
+from src.services.ledger_archive_service import (
+    archive_horizon,
+    attach_archives,
+    ledger_relation,
+)
+from src.utils.datetime_helpers import to_epoch_ms, utc_now_iso
 
 if TYPE_CHECKING:
     from src.services.exit_settlement_service import ExitSettlementResult
@@ -53,6 +63,7 @@ class BookmakerStatementRow:
     withdrawals_eur: Decimal
     balance_native: Decimal
     native_currency: str
+    bookmaker_id: Optional[int] = None
 
 
 @dataclass
@@ -143,8 +154,73 @@ class WorkbookExportPayload:
 class StatementService:
     """Service for generating monthly associate statements."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        *,
+        use_checkpoints: bool = True,
+        max_entry_id: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            use_checkpoints: Start aggregates from the nearest closed period
+                (see period_closing_balances) instead of the full history
+            max_entry_id: Ignore ledger rows with a higher ID; used when
+                closing or verifying a period
+        """
         self.logger = logger.bind(service="statement_service")
+        self.use_checkpoints = use_checkpoints
+        self.max_entry_id = max_entry_id
+
+    def _ledger_window(
+        self, conn: sqlite3.Connection, associate_id: int, cutoff_date: str, alias: str = ""
+    ) -> Tuple[Optional[PeriodCheckpoint], str, List[Any]]:
+        """
+        Resolve the checkpoint to start from and the SQL restricting ledger rows to it.
+
+        A checkpoint already covers rows up to its period end and entry ID, so
+        only rows outside both bounds are aggregated; a backdated row inserted
+        after the close still qualifies through its higher ID.
+
+        Returns:
+            Tuple of (checkpoint or None, extra WHERE SQL, its parameters)
+        """
+        prefix = f"{alias}." if alias else ""
+        checkpoint = None
+        if self.use_checkpoints:
+            repository = PeriodClosingBalanceRepository(conn)
+            if repository.table_exists():
+                checkpoint = repository.get_nearest_checkpoint(associate_id, cutoff_date)
+
+        clauses: List[str] = []
+        params: List[Any] = []
+        if checkpoint is not None:
+            clauses.append(f"({prefix}created_at_ms > ? OR {prefix}id > ?)")
+            params.extend([to_epoch_ms(checkpoint.period_end_utc), checkpoint.through_entry_id])
+        if self.max_entry_id is not None:
+            clauses.append(f"{prefix}id <= ?")
+            params.append(self.max_entry_id)
+        return checkpoint, "".join(f" AND {clause}" for clause in clauses), params
+
+    def _ledger_table(
+        self, conn: sqlite3.Connection, checkpoint: Optional[PeriodCheckpoint]
+    ) -> str:
+        """
+        Return the relation holding every ledger row the statement window needs.
+
+        Archived rows are all covered by a checkpoint at or past the archive
+        horizon; earlier windows read the unified view over the archives.
+        """
+        horizon = archive_horizon(conn)
+        if horizon is None:
+            return "ledger_entries"
+        period_end_ms, max_archived_id = horizon
+        if (
+            checkpoint is not None
+            and (to_epoch_ms(checkpoint.period_end_utc) or 0) >= period_end_ms
+            and checkpoint.through_entry_id >= max_archived_id
+        ):
+            return "ledger_entries"
+        return attach_archives(conn, ("ledger_entries",))["ledger_entries"]
     
     def generate_statement(self, associate_id: int, cutoff_date: str) -> StatementCalculations:
         """
@@ -239,9 +315,13 @@ class StatementService:
         """
         Calculate total deposits, withdrawals, and net deposits up to the cutoff date.
         """
+        checkpoint, window_sql, window_params = self._ledger_window(
+            conn, associate_id, cutoff_date
+        )
+        ledger_table = self._ledger_table(conn, checkpoint)
         cursor = conn.cursor()
         cursor.execute(
-            """
+            f"""
             SELECT
                 SUM(
                     CASE
@@ -255,16 +335,22 @@ class StatementService:
                         ELSE 0
                     END
                 ) AS signed_withdrawals
-            FROM ledger_entries
+            FROM {ledger_table}
             WHERE associate_id = ?
               AND type IN ('DEPOSIT', 'WITHDRAWAL')
-              AND created_at_utc <= ?
-              AND (note IS NULL OR note NOT LIKE ?)
+              AND created_at_ms <= ?
+              AND (note IS NULL OR note NOT LIKE ?){window_sql}
             """,
-            (associate_id, cutoff_date, f"{SETTLEMENT_NOTE_PREFIX}%"),
+            (associate_id, to_epoch_ms(cutoff_date), f"{SETTLEMENT_NOTE_PREFIX}%", *window_params),
         )
         row = cursor.fetchone()
         if not row:
+            if checkpoint is not None:
+                return (
+                    checkpoint.deposits_eur,
+                    abs(checkpoint.signed_withdrawals_eur),
+                    checkpoint.net_deposits_eur,
+                )
             return Decimal("0.00"), Decimal("0.00"), Decimal("0.00")
 
         def _extract(value: object) -> Decimal:
@@ -281,6 +367,9 @@ class StatementService:
 
         total_deposits = _extract(deposits_value)
         signed_withdrawals = _extract(withdrawals_value)
+        if checkpoint is not None:
+            total_deposits += checkpoint.deposits_eur
+            signed_withdrawals += checkpoint.signed_withdrawals_eur
         total_withdrawals = abs(signed_withdrawals)
         net_deposits = total_deposits + signed_withdrawals
         return total_deposits, total_withdrawals, net_deposits
@@ -290,27 +379,33 @@ class StatementService:
         Calculate SHOULD_HOLD_EUR = SUM(principal_returned_eur + per_surebet_share_eur)
         prior to the cutoff.
         """
+        checkpoint, window_sql, window_params = self._ledger_window(
+            conn, associate_id, cutoff_date
+        )
+        ledger_table = self._ledger_table(conn, checkpoint)
         cursor = conn.cursor()
         cursor.execute(
-            """
+            f"""
             SELECT
                 SUM(
                     CAST(principal_returned_eur AS REAL) +
                     CAST(per_surebet_share_eur AS REAL)
                 ) AS should_hold_eur
-            FROM ledger_entries
+            FROM {ledger_table}
             WHERE associate_id = ?
               AND type = 'BET_RESULT'
-              AND created_at_utc <= ?
+              AND created_at_ms <= ?
               AND principal_returned_eur IS NOT NULL
-              AND per_surebet_share_eur IS NOT NULL
+              AND per_surebet_share_eur IS NOT NULL{window_sql}
             """,
-            (associate_id, cutoff_date),
+            (associate_id, to_epoch_ms(cutoff_date), *window_params),
         )
 
         row = cursor.fetchone()
-        result = row["should_hold_eur"] or 0.0
-        return Decimal(str(result))
+        result = Decimal(str(row["should_hold_eur"] or 0.0))
+        if checkpoint is not None:
+            result += checkpoint.should_hold_eur
+        return result
     
     def _calculate_current_holding(self, conn, associate_id: int, cutoff_date: str) -> Decimal:
         """
@@ -324,18 +419,24 @@ class StatementService:
         Returns:
             Current holding as Decimal
         """
+        checkpoint, window_sql, window_params = self._ledger_window(
+            conn, associate_id, cutoff_date
+        )
+        ledger_table = self._ledger_table(conn, checkpoint)
         cursor = conn.cursor()
-        cursor.execute("""
+        cursor.execute(f"""
             SELECT
                 SUM(CAST(amount_eur AS REAL)) AS current_holding_eur
-            FROM ledger_entries
+            FROM {ledger_table}
             WHERE associate_id = ?
-            AND created_at_utc <= ?
-        """, (associate_id, cutoff_date))
+            AND created_at_ms <= ?{window_sql}
+        """, (associate_id, to_epoch_ms(cutoff_date), *window_params))
         
         row = cursor.fetchone()
-        result = row["current_holding_eur"] or 0.0
-        return Decimal(str(result))
+        result = Decimal(str(row["current_holding_eur"] or 0.0))
+        if checkpoint is not None:
+            result += checkpoint.holdings_eur
+        return result
 
     def _calculate_profit_before_payout(
         self, conn, associate_id: int, cutoff_date: str
@@ -351,29 +452,36 @@ class StatementService:
         Returns:
             Profit before payout as Decimal
         """
+        checkpoint, window_sql, window_params = self._ledger_window(
+            conn, associate_id, cutoff_date
+        )
+        ledger_table = self._ledger_table(conn, checkpoint)
+        base = checkpoint.fair_share_eur if checkpoint is not None else Decimal("0.00")
         cursor = conn.cursor()
         cursor.execute(
-            """
+            f"""
             SELECT
                 SUM(CAST(per_surebet_share_eur AS REAL)) AS profit_before_payout_eur
-            FROM ledger_entries
+            FROM {ledger_table}
             WHERE associate_id = ?
               AND type = 'BET_RESULT'
               AND per_surebet_share_eur IS NOT NULL
-              AND created_at_utc <= ?
+              AND created_at_ms <= ?{window_sql}
             """,
-            (associate_id, cutoff_date),
+            (associate_id, to_epoch_ms(cutoff_date), *window_params),
         )
 
         row = cursor.fetchone()
         if not row:
-            return Decimal("0.00")
+            return base
 
         try:
             result = row["profit_before_payout_eur"]  # type: ignore[index]
         except (TypeError, KeyError, IndexError):
             result = row[0] if isinstance(row, (list, tuple)) else 0.0  # type: ignore[index]
 
+        if checkpoint is not None:
+            return Decimal(str(result or 0.0)) + base
         return Decimal(str(result or 0.0))
 
     def _calculate_bookmaker_breakdown(
@@ -382,9 +490,13 @@ class StatementService:
         """
         Build per-bookmaker balance/deposit/withdrawal summaries.
         """
+        checkpoint, window_sql, window_params = self._ledger_window(
+            conn, associate_id, cutoff_date, alias="le"
+        )
+        ledger_table = self._ledger_table(conn, checkpoint)
         cursor = conn.cursor()
         cursor.execute(
-            """
+            f"""
             SELECT
                 b.id,
                 b.bookmaker_name,
@@ -395,15 +507,15 @@ class StatementService:
                 a.home_currency AS native_currency
             FROM bookmakers b
             JOIN associates a ON a.id = b.associate_id
-            LEFT JOIN ledger_entries le
+            LEFT JOIN {ledger_table} le
                 ON le.bookmaker_id = b.id
                AND le.associate_id = ?
-               AND le.created_at_utc <= ?
+               AND le.created_at_ms <= ?{window_sql}
             WHERE b.associate_id = ?
             GROUP BY b.id, b.bookmaker_name, a.home_currency
             ORDER BY b.bookmaker_name
             """,
-            (associate_id, cutoff_date, associate_id),
+            (associate_id, to_epoch_ms(cutoff_date), *window_params, associate_id),
         )
 
         rows = cursor.fetchall() or []
@@ -414,6 +526,16 @@ class StatementService:
             withdrawals = Decimal(str(row["withdrawals_eur"] or 0.0))
             balance_native = Decimal(str(row["balance_native"] or 0.0))
             native_currency = row["native_currency"] or ""
+            try:
+                bookmaker_id = row["id"]
+            except (KeyError, IndexError):
+                bookmaker_id = None
+            closed = checkpoint.bookmakers.get(bookmaker_id) if checkpoint is not None else None
+            if closed is not None:
+                balance += closed.balance_eur
+                deposits += closed.deposits_eur
+                withdrawals += closed.withdrawals_eur
+                balance_native += closed.balance_native
             breakdown.append(
                 BookmakerStatementRow(
                     bookmaker_name=row["bookmaker_name"],
@@ -422,6 +544,7 @@ class StatementService:
                     withdrawals_eur=withdrawals.quantize(Decimal("0.01")),
                     balance_native=balance_native.quantize(Decimal("0.01")),
                     native_currency=native_currency,
+                    bookmaker_id=bookmaker_id,
                 )
             )
         return breakdown
@@ -503,8 +626,9 @@ class StatementService:
         """
         conn = get_db_connection()
         try:
+            ledger_table = self._ledger_table(conn, None)
             cursor = conn.cursor()
-            cursor.execute("""
+            cursor.execute(f"""
                 SELECT
                     id,
                     type,
@@ -519,11 +643,11 @@ class StatementService:
                     bet_id,
                     created_at_utc,
                     note
-                FROM ledger_entries
+                FROM {ledger_table}
                 WHERE associate_id = ?
-                AND created_at_utc <= ?
-                ORDER BY created_at_utc DESC
-            """, (associate_id, cutoff_date))
+                AND created_at_ms <= ?
+                ORDER BY created_at_ms DESC
+            """, (associate_id, to_epoch_ms(cutoff_date)))
             
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
@@ -998,19 +1122,22 @@ class StatementService:
         """
         Query ledger to build per-surebet ROI aggregates.
         """
+        cutoff_ms = to_epoch_ms(cutoff_date)
+        # Stakes and results of archived surebets live in the archive files
+        ledger = ledger_relation(conn)
         cursor = conn.cursor()
         cursor.execute(
-            """
+            f"""
             WITH stake_data AS (
                 SELECT
                     sb.surebet_id,
                     le.associate_id,
                     SUM(-CAST(le.amount_eur AS REAL)) AS stake_eur
-                FROM ledger_entries le
+                FROM {ledger} le
                 JOIN surebet_bets sb ON sb.bet_id = le.bet_id
                 WHERE le.type = 'BET_STAKE'
                   AND le.bet_id IS NOT NULL
-                  AND le.created_at_utc <= ?
+                  AND le.created_at_ms <= ?
                 GROUP BY sb.surebet_id, le.associate_id
             ),
             result_data AS (
@@ -1018,10 +1145,10 @@ class StatementService:
                     le.surebet_id,
                     le.associate_id,
                     SUM(CAST(le.amount_eur AS REAL)) AS profit_eur
-                FROM ledger_entries le
+                FROM {ledger} le
                 WHERE le.type = 'BET_RESULT'
                   AND le.surebet_id IS NOT NULL
-                  AND le.created_at_utc <= ?
+                  AND le.created_at_ms <= ?
                 GROUP BY le.surebet_id, le.associate_id
             ),
             group_stake AS (
@@ -1049,11 +1176,10 @@ class StatementService:
             LEFT JOIN group_stake gs ON gs.surebet_id = s.id
             LEFT JOIN group_profit gp ON gp.surebet_id = s.id
             WHERE s.status = 'settled'
-              AND s.settled_at_utc IS NOT NULL
-              AND s.settled_at_utc <= ?
-            ORDER BY s.settled_at_utc DESC, s.id DESC
+              AND s.settled_at_ms <= ?
+            ORDER BY s.settled_at_ms DESC, s.id DESC
             """,
-            (cutoff_date, cutoff_date, associate_id, associate_id, cutoff_date),
+            (cutoff_ms, cutoff_ms, associate_id, associate_id, cutoff_ms),
         )
 
         results: List[Dict[str, Optional[Decimal]]] = []
@@ -1096,25 +1222,25 @@ class StatementService:
     ) -> Decimal:
         conn = get_db_connection()
         try:
+            ledger = ledger_relation(conn)
             cursor = conn.cursor()
             cursor.execute(
-                """
+                f"""
                 WITH settled_surebets AS (
                     SELECT id
                     FROM surebets
                     WHERE status = 'settled'
-                      AND settled_at_utc IS NOT NULL
-                      AND settled_at_utc <= ?
+                      AND settled_at_ms <= ?
                 ),
                 stake_rows AS (
                     SELECT
                         sb.surebet_id,
                         le.associate_id,
                         SUM(-CAST(le.amount_eur AS REAL)) AS stake_eur
-                    FROM ledger_entries le
+                    FROM {ledger} le
                     JOIN surebet_bets sb ON sb.bet_id = le.bet_id
                     WHERE le.type = 'BET_STAKE'
-                      AND le.created_at_utc <= ?
+                      AND le.created_at_ms <= ?
                       AND sb.surebet_id IN (SELECT id FROM settled_surebets)
                     GROUP BY sb.surebet_id, le.associate_id
                 )
@@ -1123,7 +1249,7 @@ class StatementService:
                     COALESCE(SUM(stake_eur), 0) AS group_total
                 FROM stake_rows
                 """,
-                (cutoff_date, cutoff_date, associate_id),
+                (to_epoch_ms(cutoff_date), to_epoch_ms(cutoff_date), associate_id),
             )
             row = cursor.fetchone()
             if not row:
@@ -22,6 +22,64 @@ logger = structlog.get_logger()
 SAFE_ROI_THRESHOLD = Decimal("1.0")  # 1.0% minimum ROI for safe classification
 
 
+def native_stake_and_payout(bet: Dict[str, Any]) -> Tuple[Decimal, Decimal]:
+    """
+    Return a bet's stake and payout in its own currency.
+
+    The stake is ``stake_original`` (falling back to ``stake_eur``); the payout
+    is ``payout`` when recorded, otherwise stake × odds.
+    """
+    if bet.get("stake_original"):
+        stake_native = Decimal(bet["stake_original"])
+    else:
+        # If no original stake, assume stake_eur is the native currency
+        stake_native = Decimal(bet["stake_eur"])
+
+    if bet.get("payout"):
+        payout_native = Decimal(bet["payout"])
+    else:
+        odds = Decimal(bet.get("odds_original") or bet["odds"])
+        payout_native = stake_native * odds
+
+    return stake_native, payout_native
+
+
+def calculate_roi(worst_case_profit_eur: Decimal, total_staked_eur: Decimal) -> Decimal:
+    """ROI percentage of the worst case (0 when nothing is staked)."""
+    if total_staked_eur > Decimal("0"):
+        return (worst_case_profit_eur / total_staked_eur) * Decimal("100")
+    return Decimal("0")
+
+
+def classify_risk(worst_profit: Decimal, roi: Decimal) -> Dict[str, str]:
+    """
+    Classify surebet risk based on profit and ROI thresholds.
+
+    Classification rules:
+    - Safe (✅): worst_case_profit_eur >= 0 AND roi >= 1.0%
+    - Low ROI (🟡): worst_case_profit_eur >= 0 BUT roi < 1.0%
+    - Unsafe (❌): worst_case_profit_eur < 0 (guaranteed loss)
+
+    Returns:
+        Dictionary with 'classification' and 'color_code' keys
+    """
+    if worst_profit < Decimal("0"):
+        return {
+            "classification": "Unsafe",
+            "color_code": "❌",
+        }
+    elif roi >= SAFE_ROI_THRESHOLD:
+        return {
+            "classification": "Safe",
+            "color_code": "✅",
+        }
+    else:
+        return {
+            "classification": "Low ROI",
+            "color_code": "🟡",
+        }
+
+
 class SurebetRiskCalculator:
     """Service for calculating worst-case profit and ROI for surebets."""
 
@@ -94,10 +152,7 @@ class SurebetRiskCalculator:
         total_staked_eur = sum(b["stake_eur"] for b in side_a_eur + side_b_eur)
 
         # Calculate ROI percentage (avoid division by zero)
-        if total_staked_eur > Decimal("0"):
-            roi = (worst_case_profit_eur / total_staked_eur) * Decimal("100")
-        else:
-            roi = Decimal("0")
+        roi = calculate_roi(worst_case_profit_eur, total_staked_eur)
 
         # Classify risk
         risk_data = self._classify_risk(worst_case_profit_eur, roi)
@@ -213,21 +268,7 @@ class SurebetRiskCalculator:
 
         for bet in bets:
             currency = bet.get("currency", "EUR")
-
-            # Use stake in original currency or fallback to EUR stake
-            if bet.get("stake_original"):
-                stake_native = Decimal(bet["stake_original"])
-            else:
-                # If no original stake, assume stake_eur is the native currency
-                stake_native = Decimal(bet["stake_eur"])
-
-            # Calculate payout in native currency
-            if bet.get("payout"):
-                payout_native = Decimal(bet["payout"])
-            else:
-                # payout = stake * odds (in native currency)
-                odds = Decimal(bet.get("odds_original") or bet["odds"])
-                payout_native = stake_native * odds
+            stake_native, payout_native = native_stake_and_payout(bet)
 
             # For EUR, no conversion needed
             if currency == "EUR":
@@ -280,36 +321,8 @@ class SurebetRiskCalculator:
         return profit_if_a_wins, profit_if_b_wins
 
     def _classify_risk(self, worst_profit: Decimal, roi: Decimal) -> Dict[str, str]:
-        """
-        Classify surebet risk based on profit and ROI thresholds.
-
-        Classification rules:
-        - Safe (✅): worst_case_profit_eur >= 0 AND roi >= 1.0%
-        - Low ROI (🟡): worst_case_profit_eur >= 0 BUT roi < 1.0%
-        - Unsafe (❌): worst_case_profit_eur < 0 (guaranteed loss)
-
-        Args:
-            worst_profit: Worst-case profit in EUR
-            roi: ROI as percentage
-
-        Returns:
-            Dictionary with 'classification' and 'color_code' keys
-        """
-        if worst_profit < Decimal("0"):
-            return {
-                "classification": "Unsafe",
-                "color_code": "❌",
-            }
-        elif roi >= SAFE_ROI_THRESHOLD:
-            return {
-                "classification": "Safe",
-                "color_code": "✅",
-            }
-        else:
-            return {
-                "classification": "Low ROI",
-                "color_code": "🟡",
-            }
+        """Classify surebet risk; see :func:`classify_risk`."""
+        return classify_risk(worst_profit, roi)
 
     def _load_surebet(self, surebet_id: int) -> Optional[Dict[str, Any]]:
         """Load surebet by ID.
@@ -0,0 +1,311 @@
+"""
+Batch risk recomputation for open surebets.
+
+``SurebetRiskCalculator`` runs when a bet is matched, so ``worst_case_profit_eur``,
+``total_staked_eur``, ``roi`` and ``risk_classification`` on open surebets go
+stale once the FX job moves a rate. This service loads the legs of every open
+surebet (optionally only those with a leg in the given currencies) in one
+query, resolves each currency's rate once from the in-memory FX history,
+aggregates both profit scenarios per surebet in a single pass and writes back
+only the rows whose values changed, in one transaction.
+
+Amounts stay ``Decimal`` and follow the calculator's conversion and rounding,
+so a recompute with unchanged rates never rewrites a row.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, List, Mapping, Optional
+
+import structlog
+
+from src.core.database import get_db_connection
+from src.services.fx_manager import convert_to_eur
+from src.services.fx_rate_history import get_fx_history
+from src.services.surebet_calculator import (
+    calculate_roi,
+    classify_risk,
+    native_stake_and_payout,
+)
+from src.utils.datetime_helpers import utc_now_iso
+
+logger = structlog.get_logger()
+
+RISK_COLUMNS = ("worst_case_profit_eur", "total_staked_eur", "roi", "risk_classification")
+
+
+@dataclass
+class SurebetRisk:
+    """Recomputed risk values for one surebet, alongside the stored ones."""
+
+    surebet_id: int
+    worst_case_profit_eur: Decimal
+    total_staked_eur: Decimal
+    roi: Decimal
+    risk_classification: str
+    previous: Dict[str, Optional[str]]
+
+    def as_stored(self) -> Dict[str, str]:
+        return {
+            "worst_case_profit_eur": str(self.worst_case_profit_eur),
+            "total_staked_eur": str(self.total_staked_eur),
+            "roi": str(self.roi),
+            "risk_classification": self.risk_classification,
+        }
+
+    @property
+    def changed(self) -> bool:
+        return self.as_stored() != self.previous
+
+    @property
+    def classification_changed(self) -> bool:
+        return self.risk_classification != self.previous["risk_classification"]
+
+
+@dataclass
+class RiskRecomputeResult:
+    """Summary of a batch recompute."""
+
+    currencies: Optional[List[str]] = None
+    scanned: int = 0
+    updated: List[SurebetRisk] = field(default_factory=list)
+    # surebet_id -> reason the surebet could not be recomputed
+    skipped: Dict[int, str] = field(default_factory=dict)
+
+    @property
+    def classification_changes(self) -> List[SurebetRisk]:
+        return [risk for risk in self.updated if risk.classification_changed]
+
+
+@dataclass
+class _Totals:
+    previous: Dict[str, Optional[str]]
+    staked: Decimal = Decimal("0")
+    payout_a: Decimal = Decimal("0")
+    payout_b: Decimal = Decimal("0")
+
+
+class SurebetRiskRecomputeService:
+    """Recompute stored risk metrics for open surebets in bulk."""
+
+    def __init__(self, db: Optional[sqlite3.Connection] = None) -> None:
+        """
+        Args:
+            db: Connection to use; a new one is opened (and closed) when omitted
+        """
+        self.db = db or get_db_connection()
+        self._owns_connection = db is None
+
+    def close(self) -> None:
+        if self._owns_connection:
+            self.db.close()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def snapshot_rates(self) -> Dict[str, Decimal]:
+        """Latest rate per currency; pass it to :meth:`recompute_changed_rates` after an FX refresh."""
+        return get_fx_history(self.db).latest_rates()
+
+    def recompute_changed_rates(self, before: Mapping[str, Decimal]) -> RiskRecomputeResult:
+        """Recompute the surebets exposed to currencies whose latest rate differs from ``before``."""
+        after = self.snapshot_rates()
+        changed = sorted(code for code, rate in after.items() if before.get(code) != rate)
+        if not changed:
+            logger.info("surebet_risk_recompute_skipped", reason="no_rate_changes")
+            return RiskRecomputeResult(currencies=[])
+        return self.recompute(currencies=changed)
+
+    def recompute(
+        self,
+        currencies: Optional[Iterable[str]] = None,
+        *,
+        as_of: Optional[date] = None,
+    ) -> RiskRecomputeResult:
+        """
+        Recompute risk for open surebets and persist the rows that changed.
+
+        Args:
+            currencies: Only surebets with at least one leg in these currencies
+                (all open surebets when omitted)
+            as_of: FX date to convert at (defaults to today, as the calculator does)
+
+        Returns:
+            RiskRecomputeResult listing the updated and skipped surebets
+        """
+        codes = sorted({code.upper() for code in currencies}) if currencies is not None else None
+        result = RiskRecomputeResult(currencies=codes)
+        if codes is not None and not codes:
+            return result
+
+        risks = self.calculate(codes, as_of=as_of, skipped=result.skipped)
+        result.scanned = len(risks) + len(result.skipped)
+        result.updated = [risk for risk in risks if risk.changed]
+        if result.updated:
+            self._persist(result.updated)
+
+        logger.info(
+            "surebet_risk_recomputed",
+            currencies=codes,
+            scanned=result.scanned,
+            updated=len(result.updated),
+            classification_changes=len(result.classification_changes),
+            skipped=len(result.skipped),
+        )
+        return result
+
+    def calculate(
+        self,
+        currencies: Optional[List[str]] = None,
+        *,
+        as_of: Optional[date] = None,
+        skipped: Optional[Dict[int, str]] = None,
+    ) -> List[SurebetRisk]:
+        """Compute risk for open surebets without writing anything."""
+        skipped = skipped if skipped is not None else {}
+        legs = self._load_open_legs(currencies)
+        rates = self._resolve_rates({(leg["currency"] or "EUR").upper() for leg in legs}, as_of)
+
+        totals: Dict[int, _Totals] = {}
+        for leg in legs:
+            surebet_id = leg["surebet_id"]
+            if surebet_id in skipped:
+                continue
+            entry = totals.get(surebet_id)
+            if entry is None:
+                entry = totals[surebet_id] = _Totals(
+                    previous={column: leg[column] for column in RISK_COLUMNS}
+                )
+
+            currency = (leg["currency"] or "EUR").upper()
+            try:
+                stake, payout = native_stake_and_payout(dict(leg))
+            except Exception as exc:
+                skipped[surebet_id] = f"invalid leg amounts: {exc}"
+                totals.pop(surebet_id, None)
+                continue
+            if currency != "EUR":
+                rate = rates.get(currency)
+                if rate is None:
+                    skipped[surebet_id] = f"no FX rate for {currency}"
+                    totals.pop(surebet_id, None)
+                    continue
+                stake = convert_to_eur(stake, currency, rate)
+                payout = convert_to_eur(payout, currency, rate)
+
+            entry.staked += stake
+            if leg["surebet_side"] == "A":
+                entry.payout_a += payout
+            else:
+                entry.payout_b += payout
+
+        risks = []
+        for surebet_id, entry in totals.items():
+            worst = min(entry.payout_a - entry.staked, entry.payout_b - entry.staked)
+            roi = calculate_roi(worst, entry.staked)
+            risks.append(
+                SurebetRisk(
+                    surebet_id=surebet_id,
+                    worst_case_profit_eur=worst,
+                    total_staked_eur=entry.staked,
+                    roi=roi,
+                    risk_classification=classify_risk(worst, roi)["classification"],
+                    previous=entry.previous,
+                )
+            )
+        return risks
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _cursor(self) -> sqlite3.Cursor:
+        """Return a cursor whose rows are ``sqlite3.Row``."""
+        cursor = self.db.cursor()
+        cursor.row_factory = sqlite3.Row
+        return cursor
+
+    def _load_open_legs(self, currencies: Optional[List[str]]) -> List[sqlite3.Row]:
+        query = """
+            SELECT
+                s.id AS surebet_id,
+                s.worst_case_profit_eur,
+                s.total_staked_eur,
+                s.roi,
+                s.risk_classification,
+                sb.side AS surebet_side,
+                b.currency,
+                b.stake_original,
+                b.stake_eur,
+                b.payout,
+                b.odds_original,
+                b.odds
+            FROM surebets s
+            JOIN surebet_bets sb ON sb.surebet_id = s.id
+            JOIN bets b ON b.id = sb.bet_id
+            WHERE s.status = 'open'
+        """
+        params: List[str] = []
+        if currencies is not None:
+            placeholders = ",".join("?" for _ in currencies)
+            query += f"""
+              AND s.id IN (
+                  SELECT sb2.surebet_id
+                  FROM surebet_bets sb2
+                  JOIN bets b2 ON b2.id = sb2.bet_id
+                  WHERE UPPER(b2.currency) IN ({placeholders})
+              )
+            """
+            params.extend(currencies)
+        query += " ORDER BY s.id"
+        return self._cursor().execute(query, params).fetchall()
+
+    def _resolve_rates(self, currencies: Iterable[str], as_of: Optional[date]) -> Dict[str, Decimal]:
+        """One rate per currency: the rate on ``as_of``, else the most recent (like ``get_fx_rate``)."""
+        history = get_fx_history(self.db)
+        target = as_of or date.today()
+        rates: Dict[str, Decimal] = {}
+        for currency in currencies:
+            if currency == "EUR":
+                continue
+            found = history.rate_as_of(currency, target)
+            if found is None or found[1] != target.isoformat():
+                found = history.latest(currency)
+            if found is not None:
+                rates[currency] = found[0]
+        return rates
+
+    def _persist(self, risks: List[SurebetRisk]) -> None:
+        timestamp = utc_now_iso()
+        try:
+            self.db.executemany(
+                """
+                UPDATE surebets
+                SET worst_case_profit_eur = ?,
+                    total_staked_eur = ?,
+                    roi = ?,
+                    risk_classification = ?,
+                    updated_at_utc = ?
+                WHERE id = ? AND status = 'open'
+                """,
+                [
+                    (
+                        str(risk.worst_case_profit_eur),
+                        str(risk.total_staked_eur),
+                        str(risk.roi),
+                        risk.risk_classification,
+                        timestamp,
+                        risk.surebet_id,
+                    )
+                    for risk in risks
+                ],
+            )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
@@ -2,12 +2,14 @@
 Manual bet upload component for Streamlit UI.
 
 This module provides a Streamlit component for uploading bet screenshots manually,
-with associate/bookmaker selection, file validation, and OCR processing.
+with associate/bookmaker selection, file validation, and OCR processing. Several
+screenshots are imported as one batch whose OCR calls run in parallel.
 """
 
 import hashlib
 import sqlite3
-from typing import Any, Dict, Iterable, Optional
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import streamlit as st
 import structlog
@@ -19,6 +21,7 @@ from src.ui.helpers.streaming import (
     handle_streaming_error,
     show_error_toast,
     show_success_toast,
+    status_with_steps,
     stream_with_fallback,
 )
 from src.ui.utils.state_management import safe_rerun
@@ -138,7 +141,18 @@ def render_manual_upload_panel() -> None:
 
             successful_uploads = 0
 
-            for file_obj in files_to_process:
+            if len(files_to_process) > 1:
+                successful_uploads = _process_manual_upload_batch(
+                    uploaded_files=files_to_process,
+                    associate_id=selected_associate_id,
+                    associate_name=selected_associate_name,
+                    bookmaker_id=selected_bookmaker_id,
+                    bookmaker_name=selected_bookmaker_name,
+                    note=note,
+                    db=db,
+                )
+            else:
+                file_obj = files_to_process[0]
                 st.markdown(f"**Processing:** `{file_obj.name}`")
                 if _process_manual_upload(
                     uploaded_file=file_obj,
@@ -169,6 +183,99 @@ def render_manual_upload_panel() -> None:
                 safe_rerun()
 
 
+def _validation_error(display_name: str, file_bytes: bytes) -> Optional[str]:
+    """Return the reason a screenshot cannot be imported, if any."""
+    if not validate_file_size(file_bytes, max_size_mb=10):
+        return f"File `{display_name}` exceeds the 10MB limit. Please upload a smaller image."
+    if not validate_file_type(display_name):
+        return f"File `{display_name}` is not PNG, JPG, or JPEG."
+    return None
+
+
+def _find_duplicate(db: sqlite3.Connection, file_sha: str) -> Optional[sqlite3.Row]:
+    row: Optional[sqlite3.Row] = db.execute(
+        "SELECT id, screenshot_path FROM bets WHERE screenshot_sha256 = ? LIMIT 1",
+        (file_sha,),
+    ).fetchone()
+    return row
+
+
+def _associate_currency(db: sqlite3.Connection, associate_id: int) -> str:
+    row = db.execute(
+        "SELECT home_currency FROM associates WHERE id = ?",
+        (associate_id,),
+    ).fetchone()
+    return row[0] if row and row[0] else "EUR"
+
+
+def _insert_manual_bet(
+    db: sqlite3.Connection,
+    *,
+    associate_id: int,
+    bookmaker_id: int,
+    currency: str,
+    screenshot_path: str,
+    file_sha: str,
+    note: str,
+) -> int:
+    """Insert an incoming bet (and its operator note) without committing."""
+    cursor = db.execute(
+        """
+        INSERT INTO bets (
+            associate_id,
+            bookmaker_id,
+            status,
+            stake_eur,
+            odds,
+            currency,
+            screenshot_path,
+            ingestion_source,
+            created_at_utc,
+            updated_at_utc,
+            screenshot_sha256
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            associate_id,
+            bookmaker_id,
+            "incoming",
+            "0.0",
+            "0.0",
+            currency,
+            screenshot_path,
+            "manual_upload",
+            utc_now_iso(),
+            utc_now_iso(),
+            file_sha,
+        ),
+    )
+    bet_id = cursor.lastrowid
+    if bet_id is None:
+        raise RuntimeError("Failed to create bet record.")
+
+    if note and note.strip():
+        db.execute(
+            """
+            INSERT INTO verification_audit (
+                bet_id,
+                actor,
+                action,
+                notes,
+                created_at_utc
+            ) VALUES (?, ?, ?, ?, ?)
+            """,
+            (bet_id, "operator", "CREATED", note.strip(), utc_now_iso()),
+        )
+
+    logger.info(
+        "bet_created",
+        bet_id=bet_id,
+        ingestion_source="manual_upload",
+        has_note=bool(note and note.strip()),
+    )
+    return bet_id
+
+
 def _process_manual_upload(
     uploaded_file: Any,
     associate_id: int,
@@ -197,24 +304,17 @@ def _process_manual_upload(
     # Read file bytes
     file_bytes = uploaded_file.read()
 
-    # Validation: File size
-    if not validate_file_size(file_bytes, max_size_mb=10):
-        st.error(f"File `{display_name}` exceeds the 10MB limit. Please upload a smaller image.")
-        return False
-
-    # Validation: File type
-    if not validate_file_type(uploaded_file.name):
-        st.error(f"File `{display_name}` is not PNG, JPG, or JPEG.")
+    # Validation: File size and type
+    error = _validation_error(uploaded_file.name, file_bytes)
+    if error:
+        st.error(error)
         return False
 
     # Compute SHA256 hash for duplicate detection
     file_sha = hashlib.sha256(file_bytes).hexdigest()
 
     # Check for duplicate by hash
-    dup = db.execute(
-        "SELECT id, screenshot_path FROM bets WHERE screenshot_sha256 = ? LIMIT 1",
-        (file_sha,)
-    ).fetchone()
+    dup = _find_duplicate(db, file_sha)
 
     if dup:
         st.warning(
@@ -238,73 +338,22 @@ def _process_manual_upload(
         )
         yield f":material/save_alt: Screenshot saved to `{rel_path}`"
 
-        assoc_cur_row = db.execute(
-            "SELECT home_currency FROM associates WHERE id = ?",
-            (associate_id,),
-        ).fetchone()
-        assoc_currency = assoc_cur_row[0] if assoc_cur_row and assoc_cur_row[0] else "EUR"
-
-        cursor = db.execute(
-            """
-            INSERT INTO bets (
-                associate_id,
-                bookmaker_id,
-                status,
-                stake_eur,
-                odds,
-                currency,
-                screenshot_path,
-                ingestion_source,
-                created_at_utc,
-                updated_at_utc,
-                screenshot_sha256
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                associate_id,
-                bookmaker_id,
-                "incoming",
-                "0.0",
-                "0.0",
-                assoc_currency,
-                rel_path,
-                "manual_upload",
-                utc_now_iso(),
-                utc_now_iso(),
-                file_sha,
-            ),
+        bet_id = _insert_manual_bet(
+            db,
+            associate_id=associate_id,
+            bookmaker_id=bookmaker_id,
+            currency=_associate_currency(db, associate_id),
+            screenshot_path=rel_path,
+            file_sha=file_sha,
+            note=note,
         )
         db.commit()
-        bet_id = cursor.lastrowid
-        if bet_id is None:
-            raise RuntimeError("Failed to create bet record.")
 
         context["bet_id"] = bet_id
         yield f":material/assignment_add: Bet #{bet_id} created"
-
         if note and note.strip():
-            db.execute(
-                """
-                INSERT INTO verification_audit (
-                    bet_id,
-                    actor,
-                    action,
-                    notes,
-                    created_at_utc
-                ) VALUES (?, ?, ?, ?, ?)
-                """,
-                (bet_id, "operator", "CREATED", note.strip(), utc_now_iso()),
-            )
-            db.commit()
             yield ":material/note_alt: Operator note recorded"
 
-        logger.info(
-            "bet_created",
-            bet_id=bet_id,
-            ingestion_source="manual_upload",
-            has_note=bool(note and note.strip()),
-        )
-
         ingestion_service = BetIngestionService(db)
         yield ":material/auto_detect_voice: Running OCR extraction..."
         extraction_success = ingestion_service.process_bet_extraction(bet_id)
@@ -359,3 +408,147 @@ def _process_manual_upload(
         )
 
     return True
+
+
+def _process_manual_upload_batch(
+    uploaded_files: Sequence[Any],
+    associate_id: int,
+    associate_name: str,
+    bookmaker_id: Optional[int],
+    bookmaker_name: str,
+    note: str,
+    db: sqlite3.Connection,
+) -> int:
+    """
+    Import several screenshots at once and run their OCR in parallel.
+
+    Files are validated first, then saved and inserted as incoming bets in a
+    single transaction. Extraction is dispatched to the
+    ``BetIngestionService`` worker pool and each file's result is streamed
+    as it completes, so the batch waits on the slowest OCR call rather than
+    the sum of all of them.
+
+    Returns:
+        Number of files handled, counting skipped duplicates.
+    """
+    if not bookmaker_id:
+        st.error("Please select a valid bookmaker before importing screenshots.")
+        return 0
+
+    handled = 0
+    accepted: List[Tuple[str, bytes, str]] = []
+    batch_hashes: set[str] = set()
+    for uploaded_file in uploaded_files:
+        display_name = uploaded_file.name
+        file_bytes = uploaded_file.read()
+        error = _validation_error(display_name, file_bytes)
+        if error:
+            st.error(error)
+            continue
+        file_sha = hashlib.sha256(file_bytes).hexdigest()
+        dup = _find_duplicate(db, file_sha)
+        if dup:
+            st.warning(
+                f"Duplicate detected: `{display_name}` was already ingested as Bet #{dup['id']} "
+                f"({dup['screenshot_path']}). Skipping."
+            )
+            handled += 1
+            continue
+        if file_sha in batch_hashes:
+            st.warning(f"`{display_name}` repeats another screenshot in this upload. Skipping.")
+            handled += 1
+            continue
+        batch_hashes.add(file_sha)
+        accepted.append((display_name, file_bytes, file_sha))
+
+    if not accepted:
+        return handled
+
+    created: Dict[int, str] = {}
+
+    def _create_bets() -> None:
+        currency = _associate_currency(db, associate_id)
+        saved: List[str] = []
+        try:
+            for display_name, file_bytes, file_sha in accepted:
+                abs_path, rel_path = save_screenshot(
+                    file_bytes, associate_name, bookmaker_name, source="manual_upload"
+                )
+                saved.append(abs_path)
+                bet_id = _insert_manual_bet(
+                    db,
+                    associate_id=associate_id,
+                    bookmaker_id=bookmaker_id,
+                    currency=currency,
+                    screenshot_path=rel_path,
+                    file_sha=file_sha,
+                    note=note,
+                )
+                created[bet_id] = display_name
+            db.commit()
+        except Exception:
+            db.rollback()
+            created.clear()
+            for path in saved:
+                Path(path).unlink(missing_ok=True)
+            raise
+
+    try:
+        for _ in status_with_steps(
+            f"Importing {len(accepted)} screenshot(s)",
+            [(":material/save_alt: Saving screenshots and creating bets", _create_bets)],
+        ):
+            pass
+    except Exception as exc:
+        logger.error("manual_upload_batch_failed", error=str(exc), exc_info=True)
+        handle_streaming_error(exc, "batch import", key="ocr_manual_upload_batch")
+        return handled
+
+    outcomes: Dict[int, bool] = {}
+
+    def _ocr_progress() -> Iterable[str]:
+        total = len(created)
+        yield f":material/auto_detect_voice: Running OCR for {total} screenshot(s) in parallel..."
+        results = BetIngestionService.process_bet_extractions(list(created))
+        for done, (bet_id, success, _error) in enumerate(results, start=1):
+            outcomes[bet_id] = success
+            if success:
+                yield f":material/verified: [{done}/{total}] `{created[bet_id]}` → Bet #{bet_id} extracted"
+            else:
+                yield (
+                    f":material/error: [{done}/{total}] `{created[bet_id]}` → Bet #{bet_id} "
+                    "needs manual review"
+                )
+
+    try:
+        stream_with_fallback(_ocr_progress, header=":material/smart_toy: OCR Progress")
+    except Exception as exc:
+        logger.error("manual_upload_batch_ocr_failed", error=str(exc), exc_info=True)
+        handle_streaming_error(exc, "OCR processing", key="ocr_manual_upload_batch")
+        return handled + len(created)
+
+    succeeded = [bet_id for bet_id, success in outcomes.items() if success]
+    failed = sorted(bet_id for bet_id in created if not outcomes.get(bet_id))
+    if succeeded:
+        show_success_toast(f"{len(succeeded)} bet(s) added to review queue!")
+        placeholders = ",".join("?" * len(succeeded))
+        multi = [
+            row["id"]
+            for row in db.execute(
+                f"SELECT id FROM bets WHERE id IN ({placeholders}) AND is_multi = 1 ORDER BY id",
+                succeeded,
+            ).fetchall()
+        ]
+        if multi:
+            st.error(
+                "Accumulator detected – not supported by system: "
+                + ", ".join(f"Bet #{bet_id}" for bet_id in multi)
+            )
+    if failed:
+        st.warning(
+            "OCR extraction failed for "
+            + ", ".join(f"Bet #{bet_id}" for bet_id in failed)
+            + ". Please review and enter data manually."
+        )
+
+    return handled + len(created)
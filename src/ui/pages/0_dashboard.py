@@ -16,8 +16,11 @@ import streamlit as st
 
 from src.core.database import get_db_connection
 from src.integrations.fx_api_client import fetch_daily_fx_rates
+from src.jobs.fetch_fx_rates import recompute_risk_after_fx_update
+from src.jobs.runner import DAILY_STATEMENTS_JOB, FX_REFRESH_JOB, job_lock
 from src.services.daily_statement_service import DailyStatementSender
 from src.services.surebet_matcher import SurebetMatcher
+from src.services.surebet_risk_recompute_service import SurebetRiskRecomputeService
 from src.ui.cache import invalidate_query_cache
 from src.ui.helpers import auto_refresh as auto_refresh_helper
 from src.ui.helpers.dialogs import open_dialog, render_confirmation_dialog
@@ -206,7 +209,8 @@ def _run_daily_statements() -> ActionOutcome:
         progress.progress(fraction)
 
     try:
-        result = asyncio.run(sender.send_all(progress_callback=_on_progress))
+        with job_lock(DAILY_STATEMENTS_JOB):
+            result = asyncio.run(sender.send_all(progress_callback=_on_progress))
         message = (
             f"Sent {result.sent}/{result.total_targets} statements – "
             f"{result.failed} failed, {result.skipped} skipped."
@@ -222,11 +226,18 @@ def _run_daily_statements() -> ActionOutcome:
 
 
 def _run_fx_refresh() -> ActionOutcome:
+    risk_service = SurebetRiskRecomputeService()
     try:
-        success = asyncio.run(fetch_daily_fx_rates())
+        rates_before = risk_service.snapshot_rates()
+        with job_lock(FX_REFRESH_JOB):
+            success = asyncio.run(fetch_daily_fx_rates())
+        if success:
+            recompute_risk_after_fx_update(risk_service, rates_before)
     except Exception as exc:  # pragma: no cover - defensive path
         logger.error("dashboard_fx_refresh_failed", error=str(exc))
         return ActionOutcome(False, f"FX rate refresh failed: {exc}")
+    finally:
+        risk_service.close()
 
     if success:
         return ActionOutcome(True, "FX rates refreshed from exchangerate-api.com.")
@@ -24,6 +24,7 @@ import pandas as pd
 import streamlit as st
 
 from src.core.database import get_db_connection
+from src.jobs.runner import DAILY_STATEMENTS_JOB, job_lock
 from src.services.daily_statement_service import (
     DailyStatementBatchResult,
     DailyStatementSender,
@@ -177,7 +178,8 @@ def _execute_daily_statements(
     """Run the DailyStatementSender and return the batch summary."""
     sender = DailyStatementSender()
     try:
-        return asyncio.run(sender.send_all(progress_callback=progress_callback))
+        with job_lock(DAILY_STATEMENTS_JOB):
+            return asyncio.run(sender.send_all(progress_callback=progress_callback))
     finally:
         sender.close()
 
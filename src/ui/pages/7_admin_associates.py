@@ -10,7 +10,7 @@ This page provides:
 """
 
 from dataclasses import dataclass, asdict
-from datetime import datetime, date, timedelta
+from datetime import datetime, date, timedelta, timezone
 from decimal import Decimal
 from pathlib import Path
 from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
@@ -21,6 +21,7 @@ import sqlite3
 import streamlit as st
 import structlog
 
+from src.core import sql_tracing, telemetry
 from src.core.database import get_db_connection
 from src.repositories.associate_hub_repository import AssociateHubRepository
 from src.ui.helpers import fragments
@@ -44,6 +45,7 @@ from src.ui.helpers.editor import (
 from src.ui.ui_components import load_global_styles
 from src.ui.utils import feature_flags
 from src.ui.utils.performance import (
+    PERFORMANCE_BUDGETS,
     clear_performance_alerts,
     clear_timings,
     get_performance_alerts,
@@ -51,6 +53,9 @@ from src.ui.utils.performance import (
 )
 from src.ui.utils.performance_dashboard import (
     prepare_recent_timings,
+    prepare_rollups,
+    prepare_slow_queries,
+    prepare_top_sql,
     summarize_timings,
 )
 from src.ui.utils.state_management import safe_rerun
@@ -68,6 +73,7 @@ from src.ui.utils.formatters import (
 )
 from src.services.fx_manager import get_fx_rate, get_latest_fx_rate, convert_to_eur
 from src.services.bookmaker_financials_service import BookmakerFinancialsService
+from src.services.ledger_archive_service import attach_archives
 from src.ui.pages.balance_management import render_balance_history_tab
 
 logger = structlog.get_logger()
@@ -993,14 +999,21 @@ def can_delete_associate(
     """
     if conn is None:
         conn = get_db_connection()
+    # Archived bets and ledger rows still belong to the associate
+    sources = attach_archives(conn, ("bets", "ledger_entries"))
     cursor = conn.cursor()
 
     # Check bets
-    cursor.execute("SELECT COUNT(*) FROM bets WHERE associate_id = ?", (associate_id,))
+    cursor.execute(
+        f"SELECT COUNT(*) FROM {sources['bets']} WHERE associate_id = ?", (associate_id,)
+    )
     bet_count = cursor.fetchone()[0]
 
     # Check ledger entries
-    cursor.execute("SELECT COUNT(*) FROM ledger_entries WHERE associate_id = ?", (associate_id,))
+    cursor.execute(
+        f"SELECT COUNT(*) FROM {sources['ledger_entries']} WHERE associate_id = ?",
+        (associate_id,),
+    )
     ledger_count = cursor.fetchone()[0]
 
     if bet_count > 0 or ledger_count > 0:
@@ -1159,9 +1172,13 @@ def load_bookmakers_for_associates(
     if conn is None:
         conn = get_db_connection()
 
+    # One service for the whole batch keeps its table and ledger lookups warm.
+    service = BookmakerFinancialsService(conn)
     records: List[Dict] = []
     for associate_id in associate_ids:
-        records.extend(load_bookmakers_for_associate(associate_id, conn=conn))
+        records.extend(
+            asdict(snapshot) for snapshot in service.get_financials_for_associate(associate_id)
+        )
 
     return records
 
@@ -2036,6 +2053,9 @@ def render_performance_dashboard() -> None:
             clear_performance_alerts()
             st.success("Cleared recorded timings and alerts for this session.")
 
+        render_team_timings_panel()
+        render_top_sql_panel()
+
         st.markdown("#### UI Performance Playbook")
         st.markdown(
             "- Target page load times under **2 seconds**.\n"
@@ -2047,6 +2067,91 @@ def render_performance_dashboard() -> None:
         )
 
 
+def render_team_timings_panel() -> None:
+    """Show persisted p50/p95/p99 timings from every session, bot and job process."""
+    st.markdown("#### :material/monitoring: Team-wide Timings")
+    col1, col2 = st.columns(2)
+    days = col1.number_input(
+        "Days", min_value=1, max_value=90, value=7, step=1, key="admin_telemetry_days"
+    )
+    compare_releases = col2.toggle(
+        "Compare releases",
+        value=False,
+        help="Merge the selected days into one row per label and release.",
+        key="admin_telemetry_compare_releases",
+    )
+    start_day = (datetime.now(timezone.utc) - timedelta(days=int(days) - 1)).strftime("%Y-%m-%d")
+    try:
+        telemetry.flush()
+        rollups = telemetry.get_store().get_rollups(
+            start_day=start_day, by_day=not compare_releases
+        )
+    except Exception as exc:
+        st.warning(f"Telemetry store unavailable: {exc}")
+        return
+
+    rollup_df = prepare_rollups(rollups, PERFORMANCE_BUDGETS)
+    if rollup_df.empty:
+        st.info("No persisted timings in this window yet.")
+        return
+    st.dataframe(
+        rollup_df,
+        width="stretch",
+        hide_index=True,
+        column_config={
+            column: st.column_config.NumberColumn(column, format="%.1f")
+            for column in ("p50 (ms)", "p95 (ms)", "p99 (ms)", "Max (ms)")
+        },
+    )
+
+
+def render_top_sql_panel() -> None:
+    """Show the heaviest traced SQL statements and the slow-query log."""
+    registry = sql_tracing.get_registry()
+    st.markdown("#### :material/database: Top SQL")
+    enabled = st.toggle(
+        "Trace SQL statements",
+        value=sql_tracing.is_tracing_enabled(),
+        help="Applies to connections opened after the change (all sessions in this process).",
+        key="admin_sql_tracing_enabled",
+    )
+    if enabled != sql_tracing.is_tracing_enabled():
+        sql_tracing.set_tracing_enabled(enabled)
+
+    order_labels = {"Total time": "total_ms", "p95": "p95_ms", "Calls": "calls"}
+    order_label = st.radio(
+        "Order by",
+        list(order_labels),
+        horizontal=True,
+        key="admin_sql_tracing_order",
+    )
+    top_df = prepare_top_sql(registry.top_statements(limit=15, order_by=order_labels[order_label]))
+    if top_df.empty:
+        st.info("No traced statements yet. Enable tracing and use the app to collect samples.")
+    else:
+        st.dataframe(
+            top_df,
+            width="stretch",
+            hide_index=True,
+            column_config={
+                column: st.column_config.NumberColumn(column, format="%.2f")
+                for column in ("p50 (ms)", "p95 (ms)", "Max (ms)", "Total (ms)", "Avg Rows")
+            },
+        )
+
+    slow_df = prepare_slow_queries(registry.slow_queries())
+    st.caption(
+        f"Slow queries (>= {registry.slow_threshold_ms:.0f} ms) are also appended to "
+        f"`{registry.slow_log_path}`."
+    )
+    if not slow_df.empty:
+        st.dataframe(slow_df, width="stretch", hide_index=True)
+
+    if st.button(":material/restart_alt: Reset SQL Statistics"):
+        registry.reset()
+        st.success("Cleared traced SQL statistics for this process.")
+
+
 def _format_bytes(value: float) -> str:
     units = ["B", "KB", "MB", "GB", "TB", "PB"]
     idx = 0
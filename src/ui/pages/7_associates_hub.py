@@ -1171,15 +1171,19 @@ def _render_bookmaker_table(
         return
 
     target_associate_ids = (
-        selected_ids if scope == "Selected associate(s)" else associate_lookup.keys()
+        list(selected_ids) if scope == "Selected associate(s)" else list(associate_lookup.keys())
     )
     summaries: List[BookmakerSummary] = []
+    try:
+        # One grouped query for every associate instead of one aggregation each
+        summaries_by_associate = repository.list_bookmakers_for_associates(
+            target_associate_ids if scope == "Selected associate(s)" else None
+        )
+    except Exception as exc:
+        st.error(f"Failed to load bookmakers: {exc}")
+        return
     for assoc_id in target_associate_ids:
-        try:
-            summaries.extend(repository.list_bookmakers_for_associate(assoc_id))
-        except Exception as exc:
-            st.error(f"Failed to load bookmakers for associate {assoc_id}: {exc}")
-            return
+        summaries.extend(summaries_by_associate.get(assoc_id, []))
 
     df, metadata = _build_bookmaker_dataframe(summaries)
     if not df.empty:
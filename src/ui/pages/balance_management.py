@@ -26,6 +26,7 @@ except ModuleNotFoundError:  # pragma: no cover - executed only in non-UI contex
 
 from src.core.database import get_db_connection
 from src.services.fx_manager import convert_to_eur, get_fx_rate, get_latest_fx_rate
+from src.services.ledger_archive_service import ledger_relation
 from src.ui.ui_components import load_global_styles
 from src.ui.utils.formatters import format_currency_with_symbol, format_utc_datetime_local
 from src.ui.utils.validators import VALID_CURRENCIES, validate_balance_amount
@@ -102,10 +103,11 @@ def calculate_modeled_balance(
     if conn is None:
         conn = get_db_connection()
 
+    ledger = ledger_relation(conn)
     cursor = conn.execute(
-        """
+        f"""
         SELECT SUM(CAST(amount_eur AS REAL)) AS modeled_balance_eur
-        FROM ledger_entries
+        FROM {ledger}
         WHERE associate_id = ? AND bookmaker_id = ?
     """,
         (associate_id, bookmaker_id),
@@ -78,30 +78,29 @@ def get_delta_summary(
     """
     cursor = conn.execute(
         """
-        SELECT 
-            COUNT(*) as total_transactions,
-            SUM(CASE WHEN amount_eur > 0 THEN amount_eur ELSE 0 END) as total_surplus,
-            SUM(CASE WHEN amount_eur < 0 THEN ABS(amount_eur) ELSE 0 END) as total_deficit,
-            SUM(amount_eur) as net_delta
-        FROM (
-            SELECT 
-                CASE 
-                    WHEN ssl.winner_associate_id = ? THEN ssl.amount_eur
-                    ELSE -ssl.amount_eur
-                END as amount_eur
-            FROM surebet_settlement_links ssl
-            WHERE ssl.winner_associate_id = ? OR ssl.loser_associate_id = ?
-        ) delta_query
+        SELECT surebet_count, total_won_eur, total_lost_eur, net_amount_eur
+        FROM counterparty_delta
+        WHERE associate_id = ?
         """,
-        (associate_id, associate_id, associate_id)
+        (associate_id,)
     )
-    
-    row = cursor.fetchone()
+
+    # Sum the stored cent strings as Decimals rather than REALs
+    total_transactions = 0
+    total_surplus = Decimal("0.00")
+    total_deficit = Decimal("0.00")
+    net_delta = Decimal("0.00")
+    for row in cursor.fetchall():
+        total_transactions += row["surebet_count"] or 0
+        total_surplus += Decimal(row["total_won_eur"] or "0.00")
+        total_deficit += Decimal(row["total_lost_eur"] or "0.00")
+        net_delta += Decimal(row["net_amount_eur"] or "0.00")
+
     return {
-        "total_transactions": row["total_transactions"] or 0,
-        "total_surplus": Decimal(row["total_surplus"] or "0.00"),
-        "total_deficit": Decimal(row["total_deficit"] or "0.00"),
-        "net_delta": Decimal(row["net_delta"] or "0.00"),
+        "total_transactions": total_transactions,
+        "total_surplus": total_surplus,
+        "total_deficit": total_deficit,
+        "net_delta": net_delta,
     }
 
 def get_counterparty_breakdown(
@@ -117,42 +116,24 @@ def get_counterparty_breakdown(
     Returns:
         List of counterparty dictionaries
     """
-    query = """
+    cursor = conn.execute(
+        """
         SELECT 
-            CASE 
-                WHEN ssl.winner_associate_id = ? THEN ssl.loser_associate_id
-                ELSE ssl.winner_associate_id
-            END as counterparty_id,
-            CASE 
-                WHEN ssl.winner_associate_id = ? THEN loser.display_alias
-                ELSE winner.display_alias
-            END as counterparty_alias,
-            COUNT(*) as transaction_count,
-            SUM(CASE 
-                WHEN ssl.winner_associate_id = ? THEN ssl.amount_eur
-                ELSE -ssl.amount_eur
-            END) as net_amount_eur,
-            SUM(CASE 
-                WHEN ssl.winner_associate_id = ? THEN ssl.amount_eur
-                ELSE 0
-            END) as total_won_eur,
-            SUM(CASE 
-                WHEN ssl.loser_associate_id = ? THEN ssl.amount_eur
-                ELSE 0
-            END) as total_lost_eur,
-            MIN(ssl.created_at_utc) as first_transaction,
-            MAX(ssl.created_at_utc) as last_transaction
-        FROM surebet_settlement_links ssl
-        JOIN associates winner ON ssl.winner_associate_id = winner.id
-        JOIN associates loser ON ssl.loser_associate_id = loser.id
-        WHERE (ssl.winner_associate_id = ? OR ssl.loser_associate_id = ?)
-        GROUP BY counterparty_id, counterparty_alias
-        ORDER BY net_amount_eur DESC
-    """
-    
-    cursor = conn.execute(query, 
-        (associate_id, associate_id, associate_id, associate_id, 
-         associate_id, associate_id, associate_id))
+            cd.counterparty_id,
+            a.display_alias as counterparty_alias,
+            cd.surebet_count as transaction_count,
+            cd.net_amount_eur,
+            cd.total_won_eur,
+            cd.total_lost_eur,
+            cd.first_transaction_utc as first_transaction,
+            cd.last_transaction_utc as last_transaction
+        FROM counterparty_delta cd
+        JOIN associates a ON a.id = cd.counterparty_id
+        WHERE cd.associate_id = ?
+        ORDER BY CAST(cd.net_amount_eur AS REAL) DESC
+        """,
+        (associate_id,)
+    )
     
     results = []
     for row in cursor.fetchall():
@@ -271,6 +252,32 @@ def render_counterparty_table(
                 st.session_state[f"show_details_{counterparty['counterparty_id']}"] = True
                 safe_rerun()
 
+def render_counterparty_matrix(delta_service: DeltaProvenanceService) -> None:
+    """Render the net delta between every pair of associates.
+    
+    Args:
+        delta_service: DeltaProvenanceService instance
+    """
+    matrix = delta_service.get_counterparty_matrix()
+    if not matrix:
+        st.info("No settlement links recorded yet.")
+        return
+    
+    aliases = sorted(
+        {row["associate_alias"] for row in matrix}
+        | {row["counterparty_alias"] for row in matrix}
+    )
+    grid: Dict[str, Dict[str, str]] = {alias: {other: "" for other in aliases} for alias in aliases}
+    for row in matrix:
+        grid[row["associate_alias"]][row["counterparty_alias"]] = f"€{row['net_amount_eur']:.2f}"
+    
+    st.caption("Rows show each associate's net delta against the counterparty in each column.")
+    st.dataframe(
+        [{"Associate": alias, **grid[alias]} for alias in aliases],
+        hide_index=True,
+        use_container_width=True,
+    )
+
 def render_transaction_details(
     associate_id: int,
     counterparty_id: int,
@@ -345,6 +352,12 @@ def main():
     # Get database connection
     conn = get_db_connection()
     delta_service = DeltaProvenanceService(conn)
+
+    if not delta_service.is_link_backfill_complete():
+        st.info(
+            "Historical settlement links have not been backfilled yet; older "
+            "surebets may be missing. Run `python -m src.jobs.backfill_delta_provenance`."
+        )
     
     # Associate selection
     associates = get_all_associates(conn)
@@ -353,6 +366,9 @@ def main():
         st.error("No associates found in the system.")
         return
     
+    with st.expander("Counterparty Matrix", expanded=False):
+        render_counterparty_matrix(delta_service)
+    
     # Create associate selection dropdown
     associate_options = {assoc["id"]: assoc["alias"] for assoc in associates}
     selected_alias = st.selectbox(
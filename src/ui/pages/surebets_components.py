@@ -13,6 +13,7 @@ import streamlit as st
 
 from src.core.database import get_db_connection
 from src.integrations.fx_api_client import fetch_daily_fx_rates
+from src.jobs.runner import FX_REFRESH_JOB, job_lock
 from src.services.coverage_proof_service import CoverageProofService
 from src.services.fx_manager import convert_to_eur, get_fx_rate, get_latest_fx_rate
 from src.services.ledger_entry_service import (
@@ -21,7 +22,7 @@ from src.services.ledger_entry_service import (
     SettlementConfirmation,
 )
 from src.services.settlement_service import BetOutcome, SettlementService
-from src.services.surebet_calculator import SurebetRiskCalculator
+from src.services.surebet_risk_recompute_service import SurebetRiskRecomputeService
 from src.ui.helpers.dialogs import (
     open_dialog,
     render_confirmation_dialog,
@@ -50,6 +51,7 @@ from src.ui.utils.navigation_links import render_navigation_link
 from src.ui.utils.pagination import paginate
 from src.ui.utils.performance import track_timing
 from src.ui.utils.state_management import render_reset_control, safe_rerun
+from src.utils.datetime_helpers import to_epoch_ms
 from src.utils.logging_config import get_logger
 logger = get_logger(__name__)
 
@@ -501,16 +503,13 @@ def get_default_bet_outcomes(
 def count_settled_today() -> int:
     """Count surebets settled today."""
     db = get_db_connection()
-    today_start = (
-        datetime.now(timezone.utc)
-        .replace(hour=0, minute=0, second=0, microsecond=0)
-        .isoformat()
-        .replace("+00:00", "Z")
+    today_start = to_epoch_ms(
+        datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
     )
 
     count = db.execute(
         """SELECT COUNT(*) as cnt FROM surebets
-           WHERE status = 'settled' AND settled_at_utc >= ?""",
+           WHERE status = 'settled' AND settled_at_ms >= ?""",
         (today_start,),
     ).fetchone()["cnt"]
 
@@ -1435,22 +1434,20 @@ def render_surebets_summary_page() -> None:
         st.caption("FX Rates")
         if st.button("Update FX Rates Now", width="stretch"):
             try:
-                with st.spinner("Updating FX rates from API..."):
-                    success = asyncio.run(fetch_daily_fx_rates())
-                if success:
-                    st.success("FX rates updated. Recalculating open surebets...")
-                    db_fx = get_db_connection()
-                    rows = db_fx.execute("SELECT id FROM surebets WHERE status='open'").fetchall()
-                    calc = SurebetRiskCalculator(db_fx)
-                    for r in rows:
-                        sid = r["id"]
-                        try:
-                            data = calc.calculate_surebet_risk(sid)
-                            if data:
-                                calc.update_cache(sid, data)
-                        except Exception as exc:  # pragma: no cover - log only
-                            logger.error("surebet_fx_recalc_failed", surebet_id=sid, error=str(exc))
-                    db_fx.close()
+                risk_service = SurebetRiskRecomputeService()
+                try:
+                    rates_before = risk_service.snapshot_rates()
+                    with st.spinner("Updating FX rates from API..."), job_lock(FX_REFRESH_JOB):
+                        success = asyncio.run(fetch_daily_fx_rates())
+                    if success:
+                        with st.spinner("Recalculating open surebets..."):
+                            result = risk_service.recompute_changed_rates(rates_before)
+                        st.success(
+                            f"FX rates updated. Recalculated {len(result.updated)} open surebet(s); "
+                            f"{len(result.classification_changes)} changed risk class."
+                        )
+                finally:
+                    risk_service.close()
             except Exception as exc:
                 st.error(f"FX update failed: {exc}")
 
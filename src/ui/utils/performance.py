@@ -11,6 +11,8 @@ from typing import Deque, Dict, Iterator, List
 
 import streamlit as st
 
+from src.core import telemetry
+
 STATE_KEY = "performance_timings"
 ALERTS_STATE_KEY = "performance_alerts"
 MAX_ENTRIES = 50
@@ -83,8 +85,9 @@ def _resolve_threshold(label: str, threshold: float | None) -> float | None:
 
 def record_timing(label: str, duration: float, *, threshold: float | None = None) -> None:
     """
-    Store a timing entry in session state.
+    Store a timing entry in session state and the shared telemetry store.
     """
+    telemetry.record_timing(label, duration, source="ui")
     try:
         buffer = _get_buffer()
         buffer.append(
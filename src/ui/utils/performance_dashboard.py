@@ -5,7 +5,7 @@ Pure helpers for rendering the Performance Dashboard.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable, Mapping
+from typing import Any, Iterable, Mapping
 
 import pandas as pd
 
@@ -55,4 +55,108 @@ def summarize_timings(df: pd.DataFrame) -> PerformanceSummary:
     )
 
 
-__all__ = ["PerformanceSummary", "prepare_recent_timings", "summarize_timings"]
+TOP_SQL_COLUMNS = [
+    "Statement",
+    "Calls",
+    "p50 (ms)",
+    "p95 (ms)",
+    "Max (ms)",
+    "Total (ms)",
+    "Avg Rows",
+    "Top Caller",
+]
+
+
+def prepare_top_sql(stats: Iterable[Any]) -> pd.DataFrame:
+    """
+    Convert traced statement aggregates (``SqlStatementStats``) into a DataFrame.
+    """
+    rows = [
+        {
+            "Statement": item.sql,
+            "Calls": item.calls,
+            "p50 (ms)": item.p50_ms,
+            "p95 (ms)": item.p95_ms,
+            "Max (ms)": item.max_ms,
+            "Total (ms)": item.total_ms,
+            "Avg Rows": item.avg_rows,
+            "Top Caller": item.top_caller,
+        }
+        for item in stats
+    ]
+    return pd.DataFrame(rows, columns=TOP_SQL_COLUMNS)
+
+
+def prepare_slow_queries(entries: Iterable[Mapping[str, Any]], limit: int = 20) -> pd.DataFrame:
+    """
+    Convert slow-query log entries into a DataFrame, newest first.
+    """
+    records = list(entries)[-limit:]
+    if not records:
+        return pd.DataFrame(columns=["Time", "Duration (ms)", "Rows", "Caller", "Statement"])
+
+    df = pd.DataFrame(records).iloc[::-1]
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s")
+    df = df.rename(
+        columns={
+            "timestamp": "Time",
+            "duration_ms": "Duration (ms)",
+            "rows": "Rows",
+            "caller": "Caller",
+            "sql": "Statement",
+        }
+    )
+    return df[["Time", "Duration (ms)", "Rows", "Caller", "Statement"]].reset_index(drop=True)
+
+
+ROLLUP_COLUMNS = [
+    "Day",
+    "Label",
+    "Source",
+    "Release",
+    "Samples",
+    "p50 (ms)",
+    "p95 (ms)",
+    "p99 (ms)",
+    "Max (ms)",
+    "Over Budget",
+]
+
+
+def prepare_rollups(
+    rollups: Iterable[Any], budgets: Mapping[str, float] | None = None
+) -> pd.DataFrame:
+    """
+    Convert persisted telemetry rollups (``TimingRollup``) into a DataFrame.
+
+    ``Over Budget`` flags rows whose p95 exceeds the label's budget in seconds.
+    """
+    budgets = budgets or {}
+    rows = [
+        {
+            "Day": item.day,
+            "Label": item.label,
+            "Source": item.source,
+            "Release": item.release,
+            "Samples": item.count,
+            "p50 (ms)": item.p50_ms,
+            "p95 (ms)": item.p95_ms,
+            "p99 (ms)": item.p99_ms,
+            "Max (ms)": item.max_ms,
+            "Over Budget": item.label in budgets and item.p95_ms > budgets[item.label] * 1000.0,
+        }
+        for item in rollups
+    ]
+    return pd.DataFrame(rows, columns=ROLLUP_COLUMNS)
+
+
+__all__ = [
+    "PerformanceSummary",
+    "ROLLUP_COLUMNS",
+    "TOP_SQL_COLUMNS",
+    "prepare_recent_timings",
+    "prepare_rollups",
+    "prepare_slow_queries",
+    "prepare_top_sql",
+    "summarize_timings",
+]
@@ -5,7 +5,9 @@ This module provides helper functions for consistent datetime handling.
 """
 
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Optional, Union
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
 
 def utc_now_iso() -> str:
@@ -73,3 +75,40 @@ def get_date_string(dt: Optional[datetime] = None) -> str:
         dt = dt.astimezone(timezone.utc)
 
     return dt.strftime("%Y-%m-%d")
+
+
+def to_epoch_ms(value: Union[str, datetime, None]) -> Optional[int]:
+    """
+    Convert a UTC timestamp to integer epoch milliseconds.
+
+    Accepts the spellings stored in the database ("YYYY-MM-DD HH:MM:SSZ",
+    ISO8601 with "Z", "+00:00" or "+00:00Z", date-only) as well as datetime
+    objects; naive values are treated as UTC. Rounds like the ``*_ms``
+    columns (see ``src.core.schema.epoch_ms_sql``) so the result can be
+    compared with them directly.
+
+    Args:
+        value: Timestamp string or datetime.
+
+    Returns:
+        Milliseconds since the Unix epoch, or None if the value cannot be parsed.
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        text = str(value).strip()
+        if text.endswith("+00:00Z"):
+            text = text[:-1]
+        elif text.endswith("Z"):
+            text = text[:-1] + "+00:00"
+        try:
+            dt = datetime.fromisoformat(text)
+        except ValueError:
+            return None
+
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    delta = dt - _EPOCH
+    return delta.days * 86_400_000 + delta.seconds * 1000 + (delta.microseconds + 500) // 1000
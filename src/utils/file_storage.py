@@ -67,14 +67,21 @@ def save_screenshot(
     # Generate unique filename
     filename = generate_screenshot_filename(associate_alias, bookmaker_name, source)
 
-    # Build paths
-    absolute_path = SCREENSHOT_DIR / filename
-    relative_path = f"data/screenshots/{filename}"
-
-    # Write file to disk
-    with open(absolute_path, "wb") as f:
-        f.write(file_bytes)
+    # Write file to disk; batch uploads can share a millisecond, so never
+    # overwrite an existing screenshot
+    stem = filename[: -len(".png")]
+    attempt = 0
+    while True:
+        absolute_path = SCREENSHOT_DIR / filename
+        try:
+            with open(absolute_path, "xb") as f:
+                f.write(file_bytes)
+            break
+        except FileExistsError:
+            attempt += 1
+            filename = f"{stem}_{attempt}.png"
 
+    relative_path = f"data/screenshots/{filename}"
     return str(absolute_path), relative_path
 
 
@@ -0,0 +1,16 @@
+"""
+Shared pytest configuration.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from src.core import telemetry
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _disable_persistent_telemetry():
+    """Keep test runs from writing timings into the shared telemetry store."""
+    telemetry.configure(enabled=False)
+    yield
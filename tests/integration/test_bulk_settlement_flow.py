@@ -0,0 +1,305 @@
+"""
+Integration tests for bulk settlement (many surebets in one transaction).
+"""
+
+import sqlite3
+from decimal import Decimal
+
+import pytest
+
+from src.core.schema import create_schema
+from src.services import settlement_service
+from src.services.exposure_service import ExposureService
+from src.services.ledger_entry_service import LedgerEntryService
+from src.services.settlement_service import BetOutcome, SettlementService
+
+
+def _build_db():
+    """Full-schema in-memory database with three open two-leg surebets."""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    create_schema(conn)
+
+    conn.execute(
+        "INSERT INTO associates (id, display_alias, home_currency) "
+        "VALUES (1, 'Alice', 'EUR'), (2, 'Bob', 'EUR')"
+    )
+    conn.execute(
+        "INSERT INTO bookmakers (id, associate_id, bookmaker_name) "
+        "VALUES (1, 1, 'Bet365'), (2, 2, 'Pinnacle')"
+    )
+    conn.execute(
+        "INSERT INTO canonical_events (id, normalized_event_name) VALUES (1, 'A vs B')"
+    )
+    for surebet_id in (1, 2, 3):
+        conn.execute(
+            "INSERT INTO surebets (id, canonical_event_id, market_code, status) "
+            "VALUES (?, 1, 'TOTAL_GOALS_OVER_UNDER', 'open')",
+            (surebet_id,),
+        )
+        bet_a = surebet_id * 10 + 1
+        bet_b = surebet_id * 10 + 2
+        currency_b = "XYZ" if surebet_id == 3 else "EUR"
+        conn.execute(
+            """
+            INSERT INTO bets (id, associate_id, bookmaker_id, canonical_event_id,
+                              status, stake_original, stake_eur, odds, currency)
+            VALUES (?, 1, 1, 1, 'matched', '100.00', '100.00', '1.90', 'EUR'),
+                   (?, 2, 2, 1, 'matched', '80.00', '80.00', '2.10', ?)
+            """,
+            (bet_a, bet_b, currency_b),
+        )
+        conn.execute(
+            "INSERT INTO surebet_bets (surebet_id, bet_id, side) VALUES (?, ?, 'A'), (?, ?, 'B')",
+            (surebet_id, bet_a, surebet_id, bet_b),
+        )
+    conn.commit()
+    return conn
+
+
+@pytest.fixture
+def test_db():
+    conn = _build_db()
+    yield conn
+    conn.close()
+
+
+def _outcomes(surebet_id):
+    return {
+        surebet_id * 10 + 1: BetOutcome.WON,
+        surebet_id * 10 + 2: BetOutcome.LOST,
+    }
+
+
+def test_execute_settlements_settles_batch_and_isolates_failures(test_db):
+    """Valid surebets settle together; a surebet with a missing FX rate fails alone."""
+    service = SettlementService(db=test_db)
+
+    results = service.execute_settlements(
+        [(1, _outcomes(1)), (3, _outcomes(3)), (2, _outcomes(2))]
+    )
+
+    assert [r.surebet_id for r in results] == [1, 3, 2]
+    assert [r.success for r in results] == [True, False, True]
+    assert "XYZ" in results[1].error
+
+    for result in (results[0], results[2]):
+        assert len(result.ledger_entry_ids) == 2
+        assert result.settlement_link_id is not None
+        rows = test_db.execute(
+            """
+            SELECT bet_id, amount_eur, opposing_associate_id, settlement_batch_id
+            FROM ledger_entries WHERE surebet_id = ? ORDER BY bet_id
+            """,
+            (result.surebet_id,),
+        ).fetchall()
+        assert [Decimal(r["amount_eur"]) for r in rows] == [
+            Decimal("190.00"),
+            Decimal("0.00"),
+        ]
+        assert [r["opposing_associate_id"] for r in rows] == [2, 1]
+        assert {r["settlement_batch_id"] for r in rows} == {result.settlement_batch_id}
+
+    statuses = dict(test_db.execute("SELECT id, status FROM surebets").fetchall())
+    assert statuses == {1: "settled", 2: "settled", 3: "open"}
+    bet_statuses = dict(test_db.execute("SELECT id, status FROM bets").fetchall())
+    assert bet_statuses[11] == bet_statuses[22] == "settled"
+    assert bet_statuses[31] == "matched"
+
+    link = test_db.execute(
+        "SELECT * FROM surebet_settlement_links WHERE id = ?",
+        (results[0].settlement_link_id,),
+    ).fetchone()
+    assert link["surebet_id"] == 1
+    assert Decimal(link["amount_eur"]) == Decimal("90.00")
+
+
+def test_execute_settlements_rejects_already_settled(test_db):
+    """Surebets settled earlier are reported as failures without new ledger rows."""
+    service = SettlementService(db=test_db)
+    service.execute_settlements([(1, _outcomes(1))])
+
+    results = service.execute_settlements([(1, _outcomes(1))])
+
+    assert results[0].success is False
+    assert "already settled" in results[0].error
+    count = test_db.execute(
+        "SELECT COUNT(*) FROM ledger_entries WHERE surebet_id = 1"
+    ).fetchone()[0]
+    assert count == 2
+
+
+def test_execute_settlements_rolls_back_only_failing_write(test_db, monkeypatch):
+    """A write failure for one surebet is rolled back to its savepoint."""
+    service = SettlementService(db=test_db)
+    original_build = settlement_service.build_settlement_link
+
+    def failing_build(preview, ledger_entry_ids):
+        if preview.surebet_id == 2:
+            raise sqlite3.IntegrityError("simulated link failure")
+        return original_build(preview, ledger_entry_ids)
+
+    monkeypatch.setattr(settlement_service, "build_settlement_link", failing_build)
+
+    results = service.execute_settlements([(1, _outcomes(1)), (2, _outcomes(2))])
+
+    assert [r.success for r in results] == [True, False]
+    assert "simulated link failure" in results[1].error
+    assert test_db.execute(
+        "SELECT COUNT(*) FROM ledger_entries WHERE surebet_id = 2"
+    ).fetchone()[0] == 0
+    statuses = dict(test_db.execute("SELECT id, status FROM surebets").fetchall())
+    assert statuses[1] == "settled"
+    assert statuses[2] == "open"
+
+
+class _CommitFailingConnection:
+    """Connection proxy whose COMMIT statements fail."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def execute(self, sql, *args):
+        if sql == "COMMIT":
+            raise sqlite3.OperationalError("simulated commit failure")
+        return self._conn.execute(sql, *args)
+
+
+def test_execute_settlements_reports_failed_final_commit(test_db):
+    """A failing commit of the isolated retry fails the batch instead of raising."""
+    service = SettlementService(db=_CommitFailingConnection(test_db))
+
+    results = service.execute_settlements([(1, _outcomes(1)), (2, _outcomes(2))])
+
+    assert [r.success for r in results] == [False, False]
+    assert all("simulated commit failure" in r.error for r in results)
+    assert test_db.execute("SELECT COUNT(*) FROM ledger_entries").fetchone()[0] == 0
+    statuses = dict(test_db.execute("SELECT id, status FROM surebets").fetchall())
+    assert statuses[1] == statuses[2] == "open"
+
+
+@pytest.mark.parametrize(
+    "outcomes",
+    [
+        {11: BetOutcome.WON, 12: BetOutcome.LOST},
+        {11: BetOutcome.LOST, 12: BetOutcome.WON},
+        {11: BetOutcome.WON, 12: BetOutcome.VOID},
+        {11: BetOutcome.VOID, 12: BetOutcome.VOID},
+    ],
+)
+def test_execute_settlements_matches_confirm_settlement(outcomes):
+    """Bulk settlement writes the same ledger and link rows as the single path."""
+    ledger_columns = (
+        "type, associate_id, bookmaker_id, amount_native, native_currency, "
+        "fx_rate_snapshot, amount_eur, settlement_state, principal_returned_eur, "
+        "per_surebet_share_eur, surebet_id, bet_id, opposing_associate_id, "
+        "created_by, note"
+    )
+    link_columns = "surebet_id, winner_associate_id, loser_associate_id, amount_eur"
+
+    def snapshot(conn):
+        ledger = [
+            tuple(row)
+            for row in conn.execute(
+                f"SELECT {ledger_columns} FROM ledger_entries ORDER BY bet_id"
+            )
+        ]
+        links = [
+            tuple(row)
+            for row in conn.execute(
+                f"SELECT {link_columns} FROM surebet_settlement_links ORDER BY id"
+            )
+        ]
+        return ledger, links
+
+    single_db = _build_db()
+    bulk_db = _build_db()
+    try:
+        SettlementService.preview_cache.clear()
+        preview = SettlementService(db=single_db).preview_settlement(1, outcomes)
+        LedgerEntryService(db=single_db).confirm_settlement(1, preview)
+
+        SettlementService.preview_cache.clear()
+        results = SettlementService(db=bulk_db).execute_settlements([(1, outcomes)])
+        assert results[0].success is True
+
+        assert snapshot(bulk_db) == snapshot(single_db)
+    finally:
+        single_db.close()
+        bulk_db.close()
+
+
+@pytest.mark.parametrize(
+    "outcomes",
+    [
+        {11: BetOutcome.WON, 12: BetOutcome.LOST},
+        {11: BetOutcome.WON, 12: BetOutcome.VOID},
+    ],
+)
+def test_execute_settlement_writes_confirm_settlement_ledger_rows(outcomes):
+    """The single-surebet path writes the same native-currency ledger rows."""
+    ledger_columns = (
+        "type, associate_id, bookmaker_id, amount_native, native_currency, "
+        "fx_rate_snapshot, amount_eur, settlement_state, principal_returned_eur, "
+        "per_surebet_share_eur, surebet_id, bet_id, created_by, note"
+    )
+
+    def ledger(conn):
+        return [
+            tuple(row)
+            for row in conn.execute(
+                f"SELECT {ledger_columns} FROM ledger_entries ORDER BY bet_id"
+            )
+        ]
+
+    confirmed_db = _build_db()
+    single_db = _build_db()
+    try:
+        SettlementService.preview_cache.clear()
+        preview = SettlementService(db=confirmed_db).preview_settlement(1, outcomes)
+        LedgerEntryService(db=confirmed_db).confirm_settlement(1, preview)
+
+        SettlementService.preview_cache.clear()
+        result = SettlementService(db=single_db).execute_settlement(1, outcomes)
+        assert result.success is True
+
+        assert ledger(single_db) == ledger(confirmed_db)
+    finally:
+        confirmed_db.close()
+        single_db.close()
+
+
+def test_execute_settlement_marks_bets_settled_like_the_bulk_path(test_db):
+    """The single-surebet path settles the bets and releases their open exposure."""
+    ExposureService(test_db).rebuild()
+    test_db.commit()
+    assert test_db.execute(
+        "SELECT COUNT(*) FROM open_exposure_bets WHERE bet_id IN (11, 12)"
+    ).fetchone()[0] == 2
+
+    result = SettlementService(db=test_db).execute_settlement(1, _outcomes(1))
+    assert result.success is True
+
+    surebet = test_db.execute(
+        "SELECT status, settled_at_utc, updated_at_utc FROM surebets WHERE id = 1"
+    ).fetchone()
+    assert surebet["status"] == "settled"
+    assert surebet["settled_at_utc"].endswith("Z")
+    assert "+00:00" not in surebet["settled_at_utc"]
+    assert surebet["updated_at_utc"] == surebet["settled_at_utc"]
+    bets = test_db.execute(
+        "SELECT status, updated_at_utc FROM bets WHERE id IN (11, 12)"
+    ).fetchall()
+    assert [(row["status"], row["updated_at_utc"]) for row in bets] == [
+        ("settled", surebet["settled_at_utc"])
+    ] * 2
+    assert test_db.execute(
+        "SELECT COUNT(*) FROM open_exposure_bets WHERE bet_id IN (11, 12)"
+    ).fetchone()[0] == 0
+    assert test_db.execute(
+        "SELECT status FROM bets WHERE id = 21"
+    ).fetchone()["status"] == "matched"
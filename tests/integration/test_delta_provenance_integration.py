@@ -251,7 +251,6 @@ class TestDeltaProvenanceIntegration:
         
         # Should have transactions between these associates
         assert summary['transaction_count'] > 0
-        assert Decimal(summary['net_amount_eur']) != 0  # Should have some net amount
         
         # Test the reverse direction
         reverse_summary = delta_service.get_counterparty_delta_summary(
@@ -263,11 +262,11 @@ class TestDeltaProvenanceIntegration:
         net1 = Decimal(summary['net_amount_eur'])
         net2 = Decimal(reverse_summary['net_amount_eur'])
         
-        # They should be opposites (within rounding) - test expects 50 vs -50 or vice versa
-        # But our test data has both associates winning 50, so this needs to be corrected
-        # For now, just check they have transactions
-        assert summary['transaction_count'] > 0
-        assert reverse_summary['transaction_count'] > 0
+        # Each associate won 50.00 from the other, so both directions net to zero
+        assert net1 == -net2 == Decimal("0.00")
+        assert Decimal(summary['total_won_eur']) == Decimal("50.00")
+        assert Decimal(summary['total_lost_eur']) == Decimal("50.00")
+        assert summary['transaction_count'] == reverse_summary['transaction_count'] == 2
     
     def test_surebet_details_workflow(self, setup_integration_db):
         """Test surebet details query workflow."""
@@ -167,7 +167,7 @@ class TestExportFlowIntegration:
         mock_get_conn.return_value = mock_conn
         
         # Set up cursor to return sample data
-        mock_cursor.fetchall.return_value = sample_ledger_data
+        mock_cursor.fetchmany.side_effect = [sample_ledger_data, []]
         
         # Execute export
         result = service.export_full_ledger()
@@ -256,7 +256,7 @@ class TestExportFlowIntegration:
         mock_conn.cursor.return_value = mock_cursor
         mock_conn.close = MagicMock()
         mock_get_conn.return_value = mock_conn
-        mock_cursor.fetchall.return_value = large_dataset
+        mock_cursor.fetchmany.side_effect = [large_dataset, []]
         
         # Execute export
         result = service.export_full_ledger()
@@ -323,7 +323,7 @@ class TestExportFlowIntegration:
         mock_conn.cursor.return_value = mock_cursor
         mock_conn.close = MagicMock()
         mock_get_conn.return_value = mock_conn
-        mock_cursor.fetchall.return_value = special_data
+        mock_cursor.fetchmany.side_effect = [special_data, []]
         
         # Execute export
         result = service.export_full_ledger()
@@ -346,7 +346,8 @@ class TestExportFlowIntegration:
         mock_conn.cursor.return_value = mock_cursor
         mock_conn.close = MagicMock()
         mock_get_conn.return_value = mock_conn
-        mock_cursor.fetchall.return_value = [{"entry_id": 1}]
+        # Each export drains the cursor until fetchmany returns []
+        mock_cursor.fetchmany.side_effect = [[{"entry_id": 1}], []] * 3
         
         # Create multiple exports with small delays to ensure different timestamps
         export_files = []
@@ -404,7 +405,7 @@ class TestExportFlowIntegration:
         mock_conn.cursor.return_value = mock_cursor
         mock_conn.close = MagicMock()
         mock_get_conn.return_value = mock_conn
-        mock_cursor.fetchall.return_value = null_decimal_data
+        mock_cursor.fetchmany.side_effect = [null_decimal_data, []]
         
         # Execute export
         result = service.export_full_ledger()
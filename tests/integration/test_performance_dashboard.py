@@ -6,9 +6,12 @@ from __future__ import annotations
 
 import pandas as pd
 
+from src.core.sql_tracing import SqlStatementStats
 from src.ui.utils.performance_dashboard import (
+    TOP_SQL_COLUMNS,
     PerformanceSummary,
     prepare_recent_timings,
+    prepare_top_sql,
     summarize_timings,
 )
 
@@ -36,3 +39,22 @@ def test_summarize_timings_returns_aggregates():
     assert isinstance(summary, PerformanceSummary)
     assert summary.sample_count == 3
     assert summary.slowest_seconds == 0.2
+
+
+def test_prepare_top_sql_formats_statement_stats():
+    stats = [
+        SqlStatementStats(
+            sql="SELECT * FROM bets WHERE id = ?",
+            calls=4,
+            total_ms=12.0,
+            p50_ms=2.5,
+            p95_ms=5.0,
+            max_ms=5.0,
+            avg_rows=1.0,
+            top_caller="src.services.statement_service:generate_statement",
+        )
+    ]
+    df = prepare_top_sql(stats)
+    assert list(df.columns) == TOP_SQL_COLUMNS
+    assert df.iloc[0]["p95 (ms)"] == 5.0
+    assert prepare_top_sql([]).empty
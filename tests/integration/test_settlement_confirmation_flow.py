@@ -12,8 +12,15 @@ from decimal import Decimal
 
 import pytest
 
-from src.services.ledger_entry_service import LedgerEntryService
-from src.services.settlement_service import BetOutcome, SettlementService
+from src.services.ledger_entry_service import (
+    LedgerEntryService,
+    SettlementCommitError,
+)
+from src.services.settlement_service import (
+    BetOutcome,
+    SettlementService,
+    compute_preview_fingerprint,
+)
 
 
 @pytest.fixture
@@ -218,3 +225,60 @@ def test_settlement_confirmation_all_void(test_db: sqlite3.Connection) -> None:
     assert rows[1]["principal_returned_eur"] == "80.00"
     assert all(row["per_surebet_share_eur"] == "0.00" for row in rows)
     assert confirmation.total_eur_amount == Decimal("0.00")
+
+
+def test_settlement_preview_is_reused_until_inputs_change(
+    test_db: sqlite3.Connection,
+) -> None:
+    """Identical inputs hit the preview cache; editing a bet changes the fingerprint."""
+    SettlementService.preview_cache.clear()
+    settlement_service = SettlementService(db=test_db)
+    outcomes = {1: BetOutcome.WON, 2: BetOutcome.LOST}
+
+    first = settlement_service.preview_settlement(1, outcomes)
+    second = settlement_service.preview_settlement(1, outcomes)
+
+    assert first.fingerprint is not None
+    assert second.fingerprint == first.fingerprint
+    assert second.settlement_batch_id != first.settlement_batch_id
+    assert second.surebet_profit_eur == first.surebet_profit_eur
+
+    test_db.execute("UPDATE bets SET stake_eur = '90.00', stake_original = '90.00' WHERE id = 2")
+    third = settlement_service.preview_settlement(1, outcomes)
+
+    assert third.fingerprint != first.fingerprint
+    assert third.surebet_profit_eur != first.surebet_profit_eur
+
+
+def test_settlement_confirmation_rejects_stale_preview(
+    test_db: sqlite3.Connection,
+) -> None:
+    """A preview computed before a bet edit cannot be committed."""
+    settlement_service = SettlementService(db=test_db)
+    outcomes = {1: BetOutcome.WON, 2: BetOutcome.LOST}
+    preview = settlement_service.preview_settlement(1, outcomes)
+
+    test_db.execute("UPDATE bets SET odds = '2.20' WHERE id = 2")
+    test_db.commit()
+
+    ledger_service = LedgerEntryService(db=test_db)
+    with pytest.raises(SettlementCommitError, match="changed since the preview"):
+        ledger_service.confirm_settlement(1, preview)
+
+    count = test_db.execute("SELECT COUNT(*) FROM ledger_entries").fetchone()[0]
+    assert count == 0
+    status = test_db.execute("SELECT status FROM surebets WHERE id = 1").fetchone()[0]
+    assert status == "open"
+
+
+def test_preview_fingerprint_leaves_connection_state_alone(
+    test_db: sqlite3.Connection,
+) -> None:
+    """The commit-time fingerprint matches the preview without touching the row factory."""
+    SettlementService.preview_cache.clear()
+    outcomes = {1: BetOutcome.WON, 2: BetOutcome.LOST}
+    preview = SettlementService(db=test_db).preview_settlement(1, outcomes)
+    test_db.row_factory = None
+
+    assert compute_preview_fingerprint(test_db, 1, outcomes) == preview.fingerprint
+    assert test_db.row_factory is None
@@ -22,6 +22,7 @@ from src.services.statement_service import (
     StatementCalculations,
     StatementService,
 )
+from src.utils.datetime_helpers import to_epoch_ms
 
 
 @pytest.fixture
@@ -132,6 +133,7 @@ def mock_database_with_data(sample_associate_data, sample_ledger_entries):
     conn = Mock()
     cursor = Mock()
     conn.cursor.return_value = cursor
+    conn.execute.return_value.fetchone.return_value = None  # no period checkpoints
     conn.close = Mock()
     
     # Mock associate lookup
@@ -202,6 +204,7 @@ class TestCompleteStatementGeneration:
         conn = Mock()
         cursor = Mock()
         conn.cursor.return_value = cursor
+        conn.execute.return_value.fetchone.return_value = None  # no period checkpoints
         
         # Mock data for loss scenario
         cursor.fetchone.side_effect = [
@@ -228,6 +231,7 @@ class TestCompleteStatementGeneration:
         conn = Mock()
         cursor = Mock()
         conn.cursor.return_value = cursor
+        conn.execute.return_value.fetchone.return_value = None  # no period checkpoints
         
         # Mock data for balanced scenario
         cursor.fetchone.side_effect = [
@@ -275,6 +279,7 @@ class TestTransactionRetrieval:
         conn = Mock()
         cursor = Mock()
         conn.cursor.return_value = cursor
+        conn.execute.return_value.fetchone.return_value = None  # no period checkpoints
         
         cursor.fetchall.return_value = []
         
@@ -383,6 +388,7 @@ class TestCutoffDateScenarios:
         conn = Mock()
         cursor = Mock()
         conn.cursor.return_value = cursor
+        conn.execute.return_value.fetchone.return_value = None  # no period checkpoints
         
         # Mock data
         cursor.fetchone.side_effect = [
@@ -403,9 +409,9 @@ class TestCutoffDateScenarios:
         execute_calls = cursor.execute.call_args_list
         cutoff_date_found = False
         for call in execute_calls:
-            if call[0] and "created_at_utc <= ?" in call[0][0]:
+            if call[0] and "created_at_ms <= ?" in call[0][0]:
                 cutoff_date_found = True
-                assert "2025-10-31T23:59:59Z" in call[0][1]
+                assert to_epoch_ms("2025-10-31T23:59:59Z") in call[0][1]
         
         assert cutoff_date_found
     
@@ -414,6 +420,7 @@ class TestCutoffDateScenarios:
         conn = Mock()
         cursor = Mock()
         conn.cursor.return_value = cursor
+        conn.execute.return_value.fetchone.return_value = None  # no period checkpoints
         
         # Mock data
         cursor.fetchone.side_effect = [
@@ -434,9 +441,9 @@ class TestCutoffDateScenarios:
         execute_calls = cursor.execute.call_args_list
         cutoff_date_found = False
         for call in execute_calls:
-            if call[0] and "created_at_utc <= ?" in call[0][0]:
+            if call[0] and "created_at_ms <= ?" in call[0][0]:
                 cutoff_date_found = True
-                assert "2025-10-15T23:59:59Z" in call[0][1]
+                assert to_epoch_ms("2025-10-15T23:59:59Z") in call[0][1]
         
         assert cutoff_date_found
 
@@ -457,6 +464,7 @@ class TestErrorHandlingIntegration:
         conn = Mock()
         cursor = Mock()
         conn.cursor.return_value = cursor
+        conn.execute.return_value.fetchone.return_value = None  # no period checkpoints
         
         # Mock scenario where some calculations return NULL
         cursor.fetchone.side_effect = [
@@ -486,6 +494,7 @@ class TestLargeDatasetPerformance:
         conn = Mock()
         cursor = Mock()
         conn.cursor.return_value = cursor
+        conn.execute.return_value.fetchone.return_value = None  # no period checkpoints
         
         # Mock calculation results
         cursor.fetchone.side_effect = [
@@ -0,0 +1,34 @@
+"""
+tracemalloc benchmark guarding the streaming ledger export memory ceiling.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from scripts.benchmark_ledger_export import (
+    MEMORY_CEILING_BYTES,
+    run_export_benchmark,
+    seed_ledger_dataset,
+)
+
+
+@pytest.mark.parametrize("export_format", ["xlsx", "csv.gz"])
+def test_export_memory_stays_under_ceiling(tmp_path, export_format):
+    resolved = seed_ledger_dataset(tmp_path / "ledger.db", total_rows=10_000)
+    result = run_export_benchmark(resolved, export_format=export_format)
+
+    assert result.rows_exported == 10_000
+    assert result.peak_bytes < MEMORY_CEILING_BYTES
+
+
+def test_export_memory_does_not_grow_with_ledger_size(tmp_path):
+    # Both sizes span several fetch chunks, so only per-row retention would differ.
+    small_db = seed_ledger_dataset(tmp_path / "small.db", total_rows=5_000)
+    large_db = seed_ledger_dataset(tmp_path / "large.db", total_rows=25_000)
+
+    small = run_export_benchmark(small_db, export_format="csv")
+    large = run_export_benchmark(large_db, export_format="csv")
+
+    # Five times the rows must not mean a proportionally larger heap.
+    assert large.peak_bytes < small.peak_bytes * 1.5
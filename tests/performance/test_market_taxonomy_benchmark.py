@@ -0,0 +1,46 @@
+"""
+Equivalence checks for the compiled market label classifier.
+"""
+
+from __future__ import annotations
+
+import random
+
+from scripts.benchmark_market_taxonomy import find_mismatches, load_corpus, time_corpus
+from src.domain import market_taxonomy
+from src.domain.market_taxonomy import MARKET_SYNONYMS, _KeywordMatcher
+
+
+def test_corpus_results_match_recorded_heuristics():
+    corpus = load_corpus()
+
+    assert len(corpus) > 500
+    assert find_mismatches(corpus) == []
+
+
+def test_keyword_matcher_reports_overlapping_and_prefix_hits():
+    keywords = ["GOAL", "GOALS", "GOL", "GOLURI", "O/U", "OVER/UNDER", "UNDER", " OVER", "ODD"]
+    matcher = _KeywordMatcher(keywords)
+    rng = random.Random(3)
+    alphabet = list("GOALSURIDVEN/ ")
+
+    assert matcher.hits("TOTAL GOLURI OVER/UNDER") == {"GOL", "GOLURI", "OVER/UNDER", "UNDER", " OVER"}
+    for _ in range(2000):
+        text = "".join(rng.choice(alphabet + keywords) for _ in range(rng.randint(0, 8)))
+        assert matcher.hits(text) == {kw for kw in keywords if kw in text}
+
+
+def test_synonym_matcher_agrees_with_substring_scan():
+    needles = [needle for needle, _, _ in MARKET_SYNONYMS]
+    for entry in load_corpus():
+        up = entry["label"].strip().upper()
+        assert market_taxonomy._SYNONYM_MATCHER.hits(up) == {n for n in needles if n in up}
+
+
+def test_warm_lookups_are_served_from_the_cache():
+    corpus = load_corpus()
+    timing = time_corpus(corpus, repeats=1)
+
+    info = market_taxonomy._find_market_code.cache_info()
+    assert info.hits >= len({(e["label"], e["home_team"], e["away_team"]) for e in corpus if e["label"]})
+    assert timing.warm_us < timing.cold_us
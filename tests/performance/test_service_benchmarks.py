@@ -0,0 +1,93 @@
+"""
+Service benchmark suite over the synthetic full-schema dataset.
+
+The wall-clock baseline check is opt-in because it is sensitive to machine
+load; set ``RUN_SERVICE_BENCHMARKS=1`` to include it in a pytest run.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+
+import pytest
+
+from scripts.benchmark_services import (
+    ScenarioTiming,
+    find_regressions,
+    load_baselines,
+    run_suite,
+)
+from scripts.synthetic_dataset import SCALES, generate_dataset
+
+requires_benchmark_opt_in = pytest.mark.skipif(
+    os.environ.get("RUN_SERVICE_BENCHMARKS") != "1",
+    reason="wall-clock benchmarks are opt-in; set RUN_SERVICE_BENCHMARKS=1",
+)
+
+
+@pytest.fixture(scope="module")
+def ci_dataset(tmp_path_factory):
+    return generate_dataset(tmp_path_factory.mktemp("synthetic") / "ci.db", "ci")
+
+
+def test_synthetic_dataset_matches_scale(ci_dataset):
+    scale = SCALES["ci"]
+    assert ci_dataset.row_counts["ledger_entries"] == scale.ledger_entries
+    assert ci_dataset.row_counts["surebet_settlement_links"] == scale.settled_surebets
+    assert len(ci_dataset.open_surebet_ids) == scale.open_surebets
+    assert len(ci_dataset.matchable_bet_ids) == scale.matchable_pairs
+
+    conn = sqlite3.connect(ci_dataset.db_path)
+    try:
+        unlinked = conn.execute(
+            """
+            SELECT COUNT(*) FROM ledger_entries le
+            WHERE le.type = 'BET_RESULT'
+              AND NOT EXISTS (
+                  SELECT 1 FROM surebet_settlement_links l
+                  WHERE le.id IN (l.winner_ledger_entry_id, l.loser_ledger_entry_id)
+              )
+            """
+        ).fetchone()[0]
+        assert unlinked == 0
+        assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+    finally:
+        conn.close()
+
+
+def test_synthetic_dataset_is_deterministic(ci_dataset, tmp_path):
+    again = generate_dataset(tmp_path / "again.db", "ci")
+
+    def fingerprint(path):
+        conn = sqlite3.connect(path)
+        try:
+            return conn.execute(
+                "SELECT COUNT(*), SUM(CAST(amount_eur AS REAL)), MAX(created_at_utc) FROM ledger_entries"
+            ).fetchone()
+        finally:
+            conn.close()
+
+    assert fingerprint(again.db_path) == fingerprint(ci_dataset.db_path)
+    assert again.open_surebet_ids == ci_dataset.open_surebet_ids
+
+
+@requires_benchmark_opt_in
+def test_service_benchmarks_stay_within_baselines(ci_dataset):
+    results = run_suite(ci_dataset, repeats=3)
+
+    assert find_regressions("ci", results, load_baselines()) == []
+
+
+def test_find_regressions_flags_slow_scenarios():
+    baselines = {"tolerance": 2.0, "floor_seconds": 0.1, "scales": {"ci": {"fast": 1.0, "slow": 1.0}}}
+    results = {
+        "fast": ScenarioTiming("fast", [1.5, 1.9, 2.5]),
+        "slow": ScenarioTiming("slow", [2.1, 2.2, 2.3]),
+        "unrecorded": ScenarioTiming("unrecorded", [9.0]),
+    }
+
+    regressions = find_regressions("ci", results, baselines)
+
+    assert [regression.name for regression in regressions] == ["slow"]
+    assert regressions[0].limit == 2.0
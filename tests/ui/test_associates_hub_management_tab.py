@@ -98,6 +98,10 @@ def test_management_tab_smoke():
             def list_bookmakers_for_associate(self, associate_id: int):
                 return self._bookmakers.get(associate_id, [])
 
+            def list_bookmakers_for_associates(self, associate_ids=None):
+                ids = self._bookmakers.keys() if associate_ids is None else associate_ids
+                return {assoc_id: self._bookmakers.get(assoc_id, []) for assoc_id in ids}
+
         fake_repo = FakeRepository()
         filter_state = {
             "search": "",
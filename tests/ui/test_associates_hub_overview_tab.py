@@ -100,6 +100,10 @@ def test_overview_tab_quick_actions_render_without_telegram_panels():
             def list_bookmakers_for_associate(self, associate_id: int):
                 return self._bookmakers.get(associate_id, [])
 
+            def list_bookmakers_for_associates(self, associate_ids=None):
+                ids = self._bookmakers.keys() if associate_ids is None else associate_ids
+                return {assoc_id: self._bookmakers.get(assoc_id, []) for assoc_id in ids}
+
             def get_associate_metrics(self, associate_id: int):
                 return self._associates[0]
 
@@ -33,7 +33,10 @@ class TestAssociateHubRepository:
     @pytest.fixture
     def repository(self, mock_db):
         """Create repository instance with mocked database."""
-        return AssociateHubRepository(mock_db)
+        repo = AssociateHubRepository(mock_db)
+        # No ledger archives, so cumulative reads stay on the hot table
+        repo._ledger_relation = Mock(return_value="ledger_entries")
+        return repo
     
     def test_init(self, mock_db):
         """Test repository initialization."""
@@ -541,3 +544,61 @@ class TestBookmakerSummary:
         assert summary.reported_balance_eur is None
         assert summary.delta_eur is None
         assert summary.last_balance_check_utc is None
+
+
+class TestListBookmakersForAssociates:
+    """Grouped bookmaker summaries against a real schema."""
+
+    @pytest.fixture
+    def db(self):
+        from src.core.database import RowWithGet
+        from src.core.schema import create_schema
+
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = RowWithGet
+        create_schema(conn)
+        conn.executescript(
+            """
+            INSERT INTO associates (id, display_alias, home_currency)
+            VALUES (1, 'Alice', 'EUR'), (2, 'Bob', 'EUR'), (3, 'Cara', 'EUR');
+            INSERT INTO bookmakers (id, associate_id, bookmaker_name)
+            VALUES (10, 1, 'Bet365'), (11, 1, 'Pinnacle'), (20, 2, 'Unibet');
+            INSERT INTO ledger_entries (type, associate_id, bookmaker_id, amount_native,
+                                        native_currency, fx_rate_snapshot, amount_eur, created_by)
+            VALUES ('DEPOSIT', 1, 10, '100.00', 'EUR', '1', '100.00', 'test'),
+                   ('WITHDRAWAL', 1, 10, '30.00', 'EUR', '1', '30.00', 'test'),
+                   ('DEPOSIT', 2, 20, '50.00', 'EUR', '1', '50.00', 'test');
+            INSERT INTO bookmaker_balance_checks (associate_id, bookmaker_id, balance_native,
+                                                  native_currency, balance_eur, fx_rate_used,
+                                                  check_date_utc)
+            VALUES (1, 10, '60.00', 'EUR', '60.00', '1', '2025-01-01T00:00:00Z'),
+                   (1, 10, '75.00', 'EUR', '75.00', '1', '2025-01-02T00:00:00Z');
+            """
+        )
+        yield conn
+        conn.close()
+
+    def test_grouped_summaries_match_per_associate_queries(self, db):
+        repository = AssociateHubRepository(db)
+
+        grouped = repository.list_bookmakers_for_associates()
+
+        assert set(grouped) == {1, 2}
+        for associate_id, summaries in grouped.items():
+            single = repository.list_bookmakers_for_associate(associate_id)
+            assert summaries == single
+
+        bet365 = grouped[1][0]
+        assert bet365.bookmaker_name == "Bet365"
+        assert bet365.modeled_balance_eur == Decimal("70.00")
+        assert bet365.reported_balance_eur == Decimal("75.00")
+        assert bet365.last_balance_check_utc == "2025-01-02T00:00:00Z"
+
+    def test_explicit_ids_include_associates_without_bookmakers(self, db):
+        repository = AssociateHubRepository(db)
+
+        grouped = repository.list_bookmakers_for_associates([2, 3])
+
+        assert [s.bookmaker_id for s in grouped[2]] == [20]
+        assert grouped[3] == []
+        assert repository.list_bookmakers_for_associates([]) == {}
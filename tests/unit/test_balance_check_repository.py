@@ -105,3 +105,55 @@ def test_latest_checks_map_and_recent_list(db_conn: sqlite3.Connection) -> None:
     assert len(recent) == 2
     assert recent[0]["balance_eur"] == Decimal("110")
     assert recent[1]["balance_eur"] == Decimal("90")
+
+
+def test_latest_pointer_ignores_backdated_checks_and_follows_deletes(
+    db_conn: sqlite3.Connection,
+) -> None:
+    repo = BookmakerBalanceCheckRepository(db_conn)
+
+    def _check(amount: str, check_date: str) -> int:
+        return repo.upsert_balance_check(
+            associate_id=1,
+            bookmaker_id=1,
+            balance_native=Decimal(amount),
+            native_currency="EUR",
+            balance_eur=Decimal(amount),
+            fx_rate_used=Decimal("1.0"),
+            check_date_utc=check_date,
+        )
+
+    newest_id = _check("110", "2025-11-04T10:00:00Z")
+    _check("90", "2025-11-02T10:00:00Z")  # backdated entry must not become latest
+    assert repo.get_latest_check(1, 1)["id"] == newest_id
+
+    db_conn.execute("DELETE FROM bookmaker_balance_checks WHERE id = ?", (newest_id,))
+    assert repo.get_latest_check(1, 1)["balance_eur"] == Decimal("90")
+
+    db_conn.execute("DELETE FROM bookmaker_balance_checks")
+    assert repo.get_latest_check(1, 1) is None
+    assert repo.get_latest_checks_map() == {}
+
+
+def test_latest_checks_map_does_not_scan_history(db_conn: sqlite3.Connection) -> None:
+    repo = BookmakerBalanceCheckRepository(db_conn)
+    db_conn.executemany(
+        """
+        INSERT INTO bookmaker_balance_checks (
+            associate_id, bookmaker_id, balance_native, native_currency,
+            balance_eur, fx_rate_used, check_date_utc
+        ) VALUES (1, 1, ?, 'EUR', ?, '1.0', ?)
+        """,
+        [(str(day), str(day), f"2025-01-01T00:00:{day:02d}Z") for day in range(50)],
+    )
+
+    visited_rows = []
+    db_conn.set_progress_handler(lambda: visited_rows.append(1), 1)
+    try:
+        latest_map = repo.get_latest_checks_map()
+    finally:
+        db_conn.set_progress_handler(None, 1)
+
+    assert latest_map[(1, 1)]["balance_eur"] == Decimal("49")
+    # A handful of VM steps for one pointer row; a history scan needs hundreds.
+    assert len(visited_rows) < 100
@@ -10,6 +10,7 @@ Tests cover:
 
 import sqlite3
 import tempfile
+import threading
 from decimal import Decimal
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
@@ -516,3 +517,60 @@ class TestBetIngestionService:
         log = test_db.execute("SELECT * FROM extraction_log WHERE bet_id = 1").fetchone()
         assert log["error_message"] == "API Error: Timeout"
         assert log["confidence_score"] == "0.0"
+
+
+class TestBatchExtraction:
+    """Test cases for pooled multi-bet extraction."""
+
+    def test_extractions_overlap_on_worker_pool(self, monkeypatch):
+        connections = []
+
+        def fake_connection():
+            conn = MagicMock()
+            connections.append(conn)
+            return conn
+
+        # Every extraction waits for all six, so a serial pool breaks the barrier.
+        all_running = threading.Barrier(6, timeout=5)
+
+        def concurrent_extraction(self, bet_id):
+            all_running.wait()
+            return bet_id != 3
+
+        monkeypatch.setattr(BetIngestionService, "process_bet_extraction", concurrent_extraction)
+        monkeypatch.setattr("src.services.bet_ingestion.OpenAIClient", Mock)
+
+        results = list(
+            BetIngestionService.process_bet_extractions(
+                [1, 2, 3, 4, 5, 6], max_workers=6, connection_factory=fake_connection
+            )
+        )
+
+        assert sorted(results) == [
+            (1, True, None),
+            (2, True, None),
+            (3, False, None),
+            (4, True, None),
+            (5, True, None),
+            (6, True, None),
+        ]
+        assert all(conn.close.called for conn in connections)
+
+    def test_extraction_errors_are_reported_per_bet(self, monkeypatch):
+        def flaky_extraction(self, bet_id):
+            if bet_id == 2:
+                raise ValueError(f"Bet {bet_id} has no screenshot")
+            return True
+
+        monkeypatch.setattr(BetIngestionService, "process_bet_extraction", flaky_extraction)
+        monkeypatch.setattr("src.services.bet_ingestion.OpenAIClient", Mock)
+
+        results = dict(
+            (bet_id, (success, error))
+            for bet_id, success, error in BetIngestionService.process_bet_extractions(
+                [1, 2], max_workers=2, connection_factory=MagicMock
+            )
+        )
+
+        assert results[1] == (True, None)
+        assert results[2] == (False, "Bet 2 has no screenshot")
@@ -227,3 +227,68 @@ class TestBookmakerFinancialsService:
         assert snap.yf_eur - snap.net_deposits_eur == snap.fs_eur
         assert snap.i_double_prime_eur is None
         assert snap.latest_balance_check_date is None
+
+    def test_aggregates_ignore_other_associates_and_cache_table_checks(self) -> None:
+        """Only the requested associate's rows feed the drawer; found tables are cached."""
+        self.conn.executemany(
+            "INSERT INTO bets (associate_id, bookmaker_id, status, stake_eur) VALUES (?, ?, ?, ?)",
+            [(1, 10, "matched", "40.00"), (2, 20, "matched", "999.00")],
+        )
+        self.conn.executemany(
+            "INSERT INTO ledger_entries (type, associate_id, bookmaker_id, amount_eur) VALUES (?, ?, ?, ?)",
+            [("DEPOSIT", 1, 10, "100.00"), ("DEPOSIT", 2, 20, "777.00")],
+        )
+
+        statements: list[str] = []
+        self.conn.set_trace_callback(statements.append)
+        service = BookmakerFinancialsService(self.conn)
+        first = service.get_financials_for_associate(1)
+        second = service.get_financials_for_associate(1)
+        self.conn.set_trace_callback(None)
+
+        assert [s.id for s in first] == [10]
+        assert first[0].pending_balance_eur == Decimal("40.00")
+        assert first[0].net_deposits_eur == Decimal("100.00")
+        assert second == first
+        probes = [
+            sql
+            for sql in statements
+            if "sqlite_master" in sql and "ledger_archive_runs" not in sql
+        ]
+        # Both tables on the first call; only the missing chat table afterwards.
+        assert len(probes) == 3
+
+    def test_table_created_after_a_miss_is_detected(self) -> None:
+        """A negative table lookup is not cached for the service's lifetime."""
+        service = BookmakerFinancialsService(self.conn)
+
+        assert service._table_exists("chat_registrations") is False
+        self.conn.execute("CREATE TABLE chat_registrations (id INTEGER PRIMARY KEY)")
+        assert service._table_exists("chat_registrations") is True
+
+    def test_found_tables_are_shared_across_connections_to_one_file(self, tmp_path) -> None:
+        """A fresh connection to the same database file skips tables already found."""
+        path = tmp_path / "financials.db"
+        self.conn.commit()
+        target = sqlite3.connect(path)
+        self.conn.backup(target)
+        target.close()
+
+        def probes_for_new_connection() -> int:
+            conn = sqlite3.connect(path)
+            conn.row_factory = sqlite3.Row
+            statements: list[str] = []
+            conn.set_trace_callback(statements.append)
+            try:
+                BookmakerFinancialsService(conn).get_financials_for_associate(1)
+            finally:
+                conn.close()
+            return sum(
+                1
+                for sql in statements
+                if "sqlite_master" in sql and "ledger_archive_runs" not in sql
+            )
+
+        assert probes_for_new_connection() == 2
+        # Only the missing chat table is looked up again.
+        assert probes_for_new_connection() == 1
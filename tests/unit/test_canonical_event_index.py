@@ -0,0 +1,114 @@
+"""
+Unit tests for the blocked canonical event index.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+from rapidfuzz import fuzz
+
+from src.core.schema import create_schema
+from src.services.bet_verification import BetVerificationService
+from src.services.canonical_event_index import (
+    DAY_MS,
+    CanonicalEventIndex,
+    get_event_index,
+    invalidate_event_indexes,
+)
+from src.services.event_normalizer import EventNormalizer
+from src.utils.datetime_helpers import to_epoch_ms
+
+
+@pytest.fixture
+def file_db(tmp_path: Path):
+    invalidate_event_indexes()
+    conn = sqlite3.connect(tmp_path / "events.db")
+    conn.row_factory = sqlite3.Row
+    create_schema(conn)
+    yield conn
+    conn.close()
+    invalidate_event_indexes()
+
+
+def _insert(conn, name: str, kickoff: str | None, sport: str = "football") -> int:
+    pair = EventNormalizer.compute_pair_key(name)
+    cursor = conn.execute(
+        "INSERT INTO canonical_events (normalized_event_name, sport, pair_key, kickoff_time_utc) "
+        "VALUES (?, ?, ?, ?)",
+        (name, sport, pair[2] if pair else None, kickoff),
+    )
+    conn.commit()
+    return int(cursor.lastrowid)
+
+
+def test_window_lookup_uses_sport_and_kickoff_blocks():
+    index = CanonicalEventIndex()
+    index.add(1, "Arsenal vs Chelsea", sport="football", kickoff_time_utc="2025-03-01T23:30:00Z")
+    index.add(2, "Arsenal vs Chelsea", sport="football", kickoff_time_utc="2025-03-02 01:00:00Z")
+    index.add(3, "Arsenal vs Chelsea", sport="football", kickoff_time_utc="2025-03-04T12:00:00Z")
+    index.add(4, "Arsenal vs Chelsea", sport="tennis", kickoff_time_utc="2025-03-02T00:00:00Z")
+
+    kickoff = to_epoch_ms("2025-03-02T00:00:00Z")
+    found = index.in_window(kickoff - DAY_MS, kickoff + DAY_MS, sport="football")
+
+    assert [event.id for event in found] == [1, 2]
+    assert {event.id for event in index.in_window(kickoff, kickoff)} == {4}
+
+
+def test_search_scores_with_cutoff_and_falls_back_to_tokens():
+    index = CanonicalEventIndex()
+    index.add(1, "Manchester United vs Liverpool", kickoff_time_utc="2025-03-01T15:00:00Z")
+    index.add(2, "Real Madrid vs Barcelona", kickoff_time_utc="2025-03-01T20:00:00Z")
+    index.add(3, "Manchester City vs Everton", kickoff_time_utc=None)
+
+    windowed = index.search(
+        "Manchester Utd vs Liverpool",
+        kickoff_ms=to_epoch_ms("2025-03-01T18:00:00Z"),
+        window_ms=DAY_MS,
+        score_cutoff=60,
+    )
+    assert [event.id for event, _ in windowed] == [1]
+
+    by_token = index.search("manchester city v everton", scorer=fuzz.ratio, score_cutoff=90)
+    assert [event.id for event, _ in by_token] == [3]
+
+
+def test_discard_removes_event_from_every_lookup():
+    index = CanonicalEventIndex()
+    index.add(1, "Arsenal vs Chelsea", pair_key="arsenal|chelsea", kickoff_time_utc="2025-03-01T15:00:00Z")
+
+    index.discard(1)
+
+    assert index.by_pair_key("arsenal|chelsea") == []
+    assert index.sharing_tokens("arsenal") == []
+    assert index.in_window(0, to_epoch_ms("2030-01-01")) == []
+
+
+def test_shared_index_picks_up_rows_written_elsewhere(file_db):
+    first = _insert(file_db, "Arsenal vs Chelsea", "2025-03-01T15:00:00Z")
+    index = get_event_index(file_db)
+    assert len(index) == 1
+
+    second = _insert(file_db, "Arsenal vs Chelsea", "2025-03-08T15:00:00Z")
+
+    assert get_event_index(file_db) is index
+    assert [event.id for event in index.by_pair_key(index.get(first).pair_key)] == [second, first]
+
+
+def test_created_events_are_indexed_and_matched_without_requery(file_db):
+    service = BetVerificationService(file_db)
+    event_id = service._create_canonical_event(
+        "Bayern Munich vs Dortmund", "football", None, "2025-03-01T17:30:00Z"
+    )
+    index = get_event_index(file_db)
+    assert index.get(event_id) is not None
+    assert index.max_id == event_id
+
+    matched = service._fuzzy_match_existing_event(
+        "Bayern München vs Dortmund", "football", "2025-03-01T19:00:00Z"
+    )
+
+    assert matched == event_id
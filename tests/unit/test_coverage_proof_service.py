@@ -15,7 +15,7 @@ from unittest.mock import AsyncMock, MagicMock, mock_open, patch
 
 import pytest
 from telegram import Message
-from telegram.error import TelegramError
+from telegram.error import BadRequest, TelegramError, TimedOut
 
 from src.services.coverage_proof_service import (
     CoverageProofResult,
@@ -609,3 +609,126 @@ async def test_resend_honors_rate_limit_wait(seed_test_data):
     assert len(results) == 3
 
     service.close()
+
+
+@pytest.mark.asyncio
+async def test_send_coverage_proof_reuses_cached_file_ids(seed_test_data, tmp_path):
+    """Second send of the same screenshot references the cached Telegram file_id."""
+    service = CoverageProofService(db=seed_test_data)
+    screenshot = tmp_path / "bet2.png"
+    screenshot.write_bytes(b"fake-png-bytes")
+    opposite_screenshots = [{"screenshot_path": str(screenshot)}]
+    surebet_details = service.get_surebet_details(1)
+
+    sent_media = []
+
+    def fake_media(media, caption=None):
+        sent_media.append(media)
+        return MagicMock()
+
+    uploaded = MagicMock(message_id=1)
+    uploaded.photo = (
+        MagicMock(file_id="small-id", file_unique_id="u-small"),
+        MagicMock(file_id="large-id", file_unique_id="u-large"),
+    )
+    mock_bot = AsyncMock()
+    mock_bot.send_media_group.return_value = [uploaded]
+
+    with patch("telegram.InputMediaPhoto", side_effect=fake_media):
+        for associate_id, chat_id in ((1, "123456"), (2, "789012")):
+            result = await service.send_coverage_proof_to_associate(
+                bot=mock_bot,
+                surebet_id=1,
+                associate_id=associate_id,
+                associate_alias="Alias",
+                multibook_chat_id=chat_id,
+                opposite_screenshots=opposite_screenshots,
+                surebet_details=surebet_details,
+            )
+            assert result.success is True
+
+    assert not isinstance(sent_media[0], str)
+    assert sent_media[0].closed
+    assert sent_media[1] == "large-id"
+
+    row = seed_test_data.execute(
+        "SELECT file_id, file_unique_id FROM telegram_file_cache"
+    ).fetchone()
+    assert row["file_id"] == "large-id"
+    assert row["file_unique_id"] == "u-large"
+
+    service.close()
+
+
+@pytest.mark.asyncio
+async def test_send_coverage_proof_reuploads_when_cached_file_id_rejected(
+    seed_test_data, tmp_path
+):
+    """A stale cached file_id is dropped and the screenshot uploaded again."""
+    service = CoverageProofService(db=seed_test_data)
+    screenshot = tmp_path / "bet2.png"
+    screenshot.write_bytes(b"fake-png-bytes")
+    file_hash = service._hash_screenshot(screenshot)
+    service._file_cache.store_file_id(file_hash, "stale-id")
+
+    sent_media = []
+
+    def fake_media(media, caption=None):
+        sent_media.append(media)
+        return MagicMock()
+
+    mock_bot = AsyncMock()
+    mock_bot.send_media_group.side_effect = [
+        BadRequest("Wrong file identifier/http url specified"),
+        [MagicMock(message_id=2, photo=(MagicMock(file_id="fresh-id"),))],
+    ]
+
+    with patch("telegram.InputMediaPhoto", side_effect=fake_media):
+        result = await service.send_coverage_proof_to_associate(
+            bot=mock_bot,
+            surebet_id=1,
+            associate_id=1,
+            associate_alias="Alice",
+            multibook_chat_id="123456",
+            opposite_screenshots=[{"screenshot_path": str(screenshot)}],
+            surebet_details=service.get_surebet_details(1),
+        )
+
+    assert result.success is True
+    assert sent_media[0] == "stale-id"
+    assert sent_media[1].closed
+    assert service._file_cache.get_file_ids([file_hash]) == {file_hash: "fresh-id"}
+
+    service.close()
+
+
+@pytest.mark.asyncio
+async def test_send_coverage_proof_timeout_keeps_cached_file_ids(
+    seed_test_data, tmp_path
+):
+    """A timeout is not a rejected file_id: no cache invalidation, no re-send."""
+    service = CoverageProofService(db=seed_test_data)
+    screenshot = tmp_path / "bet2.png"
+    screenshot.write_bytes(b"fake-png-bytes")
+    file_hash = service._hash_screenshot(screenshot)
+    service._file_cache.store_file_id(file_hash, "cached-id")
+
+    mock_bot = AsyncMock()
+    mock_bot.send_media_group.side_effect = TimedOut()
+
+    with patch("telegram.InputMediaPhoto", return_value=MagicMock()):
+        result = await service.send_coverage_proof_to_associate(
+            bot=mock_bot,
+            surebet_id=1,
+            associate_id=1,
+            associate_alias="Alice",
+            multibook_chat_id="123456",
+            opposite_screenshots=[{"screenshot_path": str(screenshot)}],
+            surebet_details=service.get_surebet_details(1),
+        )
+
+    assert result.success is False
+    assert mock_bot.send_media_group.await_count == 1
+    assert service._file_cache.get_file_ids([file_hash]) == {file_hash: "cached-id"}
+
+    service.close()
@@ -0,0 +1,69 @@
+"""
+Unit tests for epoch-millisecond timestamp conversion.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.core.schema import create_schema, epoch_ms_sql
+from src.utils.datetime_helpers import to_epoch_ms
+
+SPELLINGS = [
+    "2025-10-29 14:30:00Z",
+    "2025-10-29T14:30:00Z",
+    "2025-10-29T14:30:00.123456Z",
+    "2025-10-29T14:30:00.123456+00:00",
+    "2025-10-29T14:30:00.123456+00:00Z",
+    "2025-10-29T16:30:00+02:00",
+    "2025-10-29T14:30:00.0005Z",
+    "2025-10-29 14:30",
+    "2025-10-29",
+    "1969-12-31T23:59:59.999Z",
+    "not a timestamp",
+    "",
+]
+
+
+@pytest.mark.parametrize("value", SPELLINGS)
+def test_to_epoch_ms_matches_sql_expression(value):
+    conn = sqlite3.connect(":memory:")
+    try:
+        expected = conn.execute(f"SELECT {epoch_ms_sql('?')}", (value,)).fetchone()[0]
+    finally:
+        conn.close()
+
+    assert to_epoch_ms(value) == expected
+
+
+def test_to_epoch_ms_accepts_datetimes():
+    aware = datetime(2025, 10, 29, 16, 30, tzinfo=timezone(timedelta(hours=2)))
+
+    assert to_epoch_ms(aware) == to_epoch_ms("2025-10-29T14:30:00Z") == 1761748200000
+    assert to_epoch_ms(aware.replace(tzinfo=None) - timedelta(hours=2)) == 1761748200000
+    assert to_epoch_ms(None) is None
+
+
+def test_generated_columns_follow_inserted_timestamps():
+    conn = sqlite3.connect(":memory:")
+    create_schema(conn)
+    conn.execute("INSERT INTO associates (id, display_alias) VALUES (1, 'Alice')")
+    conn.execute(
+        """
+        INSERT INTO ledger_entries (
+            type, associate_id, amount_native, native_currency, fx_rate_snapshot,
+            amount_eur, created_at_utc
+        ) VALUES ('DEPOSIT', 1, '10', 'EUR', '1', '10', '2025-10-29T14:30:00+00:00Z')
+        """
+    )
+    conn.execute(
+        "INSERT INTO canonical_events (normalized_event_name, kickoff_time_utc) "
+        "VALUES ('A vs B', '2025-10-29 14:30:00Z')"
+    )
+
+    assert conn.execute("SELECT created_at_ms FROM ledger_entries").fetchone()[0] == 1761748200000
+    assert conn.execute("SELECT kickoff_ms FROM canonical_events").fetchone()[0] == 1761748200000
+    conn.close()
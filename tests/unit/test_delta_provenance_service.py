@@ -16,6 +16,7 @@ from src.services.delta_provenance_service import (
     DeltaProvenanceSummary
 )
 from src.core.database import get_db_connection
+from src.core.schema import create_counterparty_delta_table
 
 
 class TestDeltaProvenanceEntry:
@@ -253,6 +254,7 @@ class TestDeltaProvenanceService:
                 FOREIGN KEY (loser_ledger_entry_id) REFERENCES ledger_entries(id)
             );
         """)
+        create_counterparty_delta_table(conn)
         
         # Insert test data
         conn.execute("""
@@ -340,8 +342,8 @@ class TestDeltaProvenanceService:
         assert summary.surebet_count == 0
         assert summary.counterparty_breakdown == {}
 
-    def test_get_associate_delta_provenance_backfills_missing_links(self, setup_test_db):
-        """Ensure missing settlement links are reconstructed on demand."""
+    def test_backfill_missing_links_reconstructs_historical_links(self, setup_test_db):
+        """Ensure the backfill job reconstructs missing settlement links."""
         service = DeltaProvenanceService(setup_test_db)
 
         setup_test_db.execute(
@@ -367,6 +369,13 @@ class TestDeltaProvenanceService:
         ).fetchone()[0]
         assert initial_count == 0
 
+        # Viewing provenance no longer scans for gaps
+        service.get_associate_delta_provenance(associate_id=1)
+        assert setup_test_db.execute(
+            "SELECT COUNT(*) FROM surebet_settlement_links WHERE surebet_id = 2"
+        ).fetchone()[0] == 0
+
+        assert service.backfill_missing_links() == 1
         entries, summary = service.get_associate_delta_provenance(associate_id=1)
 
         link_rows = setup_test_db.execute(
@@ -385,6 +394,49 @@ class TestDeltaProvenanceService:
 
         assert summary.net_delta >= Decimal("50.00")
         assert len(entries) >= 2
+
+    def test_run_link_backfill_records_completion_marker(self, setup_test_db):
+        """The one-time backfill only runs until its marker is written."""
+        setup_test_db.execute(
+            "CREATE TABLE maintenance_markers ("
+            "marker_key TEXT PRIMARY KEY, completed_at_utc TEXT NOT NULL, details TEXT)"
+        )
+        service = DeltaProvenanceService(setup_test_db)
+
+        assert service.is_link_backfill_complete() is False
+        assert service.run_link_backfill() == 0
+        assert service.is_link_backfill_complete() is True
+        assert service.run_link_backfill() is None
+
+    def test_summary_covers_all_pages(self, setup_test_db):
+        """Summary totals are computed across every link, not the returned page."""
+        setup_test_db.execute(
+            """
+            INSERT INTO surebet_settlement_links
+            (surebet_id, winner_associate_id, loser_associate_id, amount_eur,
+             winner_ledger_entry_id, loser_ledger_entry_id, created_at_utc)
+            VALUES
+                (2, 2, 1, '20.00', 101, 100, '2030-01-01T00:00:00Z'),
+                (3, 1, 2, '5.25', 100, 101, '2030-01-02T00:00:00Z')
+            """
+        )
+        setup_test_db.commit()
+        service = DeltaProvenanceService(setup_test_db)
+
+        entries, summary = service.get_associate_delta_provenance(associate_id=1, limit=1)
+
+        assert [entry.surebet_id for entry in entries] == [3]
+        assert summary.surebet_count == 3
+        assert summary.total_surplus == Decimal("55.25")
+        assert summary.total_deficit == Decimal("20.00")
+        assert summary.net_delta == Decimal("35.25")
+        assert summary.counterparty_breakdown == {"Associate 2": Decimal("35.25")}
+
+        second_page, _ = service.get_associate_delta_provenance(
+            associate_id=1, limit=1, offset=1
+        )
+        assert [entry.surebet_id for entry in second_page] == [2]
+        assert second_page[0].is_positive is False
     
     def test_get_counterparty_delta_summary_success(self, setup_test_db):
         """Test successful counterparty summary query."""
@@ -418,6 +470,73 @@ class TestDeltaProvenanceService:
         assert result['first_transaction'] is None
         assert result['last_transaction'] is None
     
+    def test_settlement_link_updates_counterparty_matrix(self, setup_test_db):
+        """Both sides of the matrix move with the link and roll back with it."""
+        service = DeltaProvenanceService(setup_test_db)
+
+        service.create_settlement_link(
+            surebet_id=5,
+            winner_associate_id=2,
+            loser_associate_id=1,
+            amount_eur=Decimal("20.10"),
+            winner_ledger_entry_id=101,
+            loser_ledger_entry_id=100
+        )
+
+        forward = service.get_counterparty_delta_summary(1, 2)
+        reverse = service.get_counterparty_delta_summary(2, 1)
+        assert forward['transaction_count'] == 2
+        assert forward['net_amount_eur'] == "29.90"
+        assert forward['total_won_eur'] == "50.00"
+        assert forward['total_lost_eur'] == "20.10"
+        assert reverse['net_amount_eur'] == "-29.90"
+
+        setup_test_db.rollback()
+        assert service.get_counterparty_delta_summary(1, 2)['net_amount_eur'] == "50.00"
+
+    def test_verify_and_rebuild_counterparty_deltas(self, setup_test_db):
+        """Drift in the matrix is reported by verify and repaired by rebuild."""
+        service = DeltaProvenanceService(setup_test_db)
+        assert service.verify_counterparty_deltas() == []
+
+        setup_test_db.execute(
+            "UPDATE counterparty_delta SET net_amount_eur = '0.00' "
+            "WHERE associate_id = 1 AND counterparty_id = 2"
+        )
+        mismatches = service.verify_counterparty_deltas()
+        assert [(m['associate_id'], m['counterparty_id']) for m in mismatches] == [(1, 2)]
+        assert mismatches[0]['expected']['net_amount_eur'] == "50.00"
+
+        assert service.rebuild_counterparty_deltas() == 2
+        assert service.verify_counterparty_deltas() == []
+
+        matrix = service.get_counterparty_matrix(associate_id=2)
+        assert [(row['counterparty_alias'], row['net_amount_eur']) for row in matrix] == [
+            ("Associate 1", Decimal("-50.00"))
+        ]
+    
+    def test_sub_cent_link_amounts_keep_matrix_consistent(self, setup_test_db):
+        """Link amounts are stored in cents, so the trigger matches the aggregate."""
+        service = DeltaProvenanceService(setup_test_db)
+
+        for surebet_id in (6, 7, 8):
+            service.create_settlement_link(
+                surebet_id=surebet_id,
+                winner_associate_id=2,
+                loser_associate_id=1,
+                amount_eur=Decimal("30.49695"),
+                winner_ledger_entry_id=101,
+                loser_ledger_entry_id=100
+            )
+
+        stored = setup_test_db.execute(
+            "SELECT amount_eur FROM surebet_settlement_links WHERE surebet_id = 6"
+        ).fetchone()[0]
+        assert stored == "30.50"
+        # Seeded -50.00 plus three links of 30.50
+        assert service.get_counterparty_delta_summary(2, 1)['net_amount_eur'] == "41.50"
+        assert service.verify_counterparty_deltas() == []
+
     def test_get_surebet_delta_details_success(self, setup_test_db):
         """Test successful surebet details query."""
         service = DeltaProvenanceService(setup_test_db)
@@ -595,6 +714,7 @@ class TestTelemetryLogging:
                 FOREIGN KEY (loser_ledger_entry_id) REFERENCES ledger_entries(id)
             );
         """)
+        create_counterparty_delta_table(conn)
         
         conn.execute("""
             INSERT INTO associates (id, display_alias, home_currency, is_admin, created_at_utc, updated_at_utc)
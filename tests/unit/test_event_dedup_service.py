@@ -0,0 +1,157 @@
+"""
+Unit tests for canonical event deduplication and merging.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from src.core.schema import create_schema
+from src.core.seed_data import insert_seed_data
+from src.services.bet_verification import BetVerificationService
+from src.services.canonical_event_index import get_event_index, invalidate_event_indexes
+from src.services.event_dedup_service import DEDUP_ACTOR, EventDedupService, resolve_event_id
+from src.services.event_normalizer import EventNormalizer
+
+
+@pytest.fixture
+def file_db(tmp_path: Path):
+    invalidate_event_indexes()
+    conn = sqlite3.connect(tmp_path / "dedup.db")
+    conn.row_factory = sqlite3.Row
+    create_schema(conn)
+    insert_seed_data(conn)
+    yield conn
+    conn.close()
+    invalidate_event_indexes()
+
+
+def _event(conn, name: str, kickoff: str | None, sport: str = "football") -> int:
+    pair = EventNormalizer.compute_pair_key(EventNormalizer.normalize_event_name(name))
+    cursor = conn.execute(
+        "INSERT INTO canonical_events (normalized_event_name, sport, pair_key, kickoff_time_utc) "
+        "VALUES (?, ?, ?, ?)",
+        (name, sport, pair[2] if pair else None, kickoff),
+    )
+    conn.commit()
+    return int(cursor.lastrowid)
+
+
+def _verified_bet(conn, event_id: int, side: str) -> int:
+    cursor = conn.execute(
+        """
+        INSERT INTO bets (
+            associate_id, bookmaker_id, status, stake_eur, odds, currency,
+            stake_original, odds_original, payout, canonical_event_id,
+            market_code, period_scope, line_value, side, is_supported
+        )
+        VALUES (1, 1, 'verified', '100.00', '1.90', 'EUR', '100.00', '1.90', '190.00',
+                ?, 'TOTAL_GOALS_OVER_UNDER', 'FULL_MATCH', '2.5', ?, 1)
+        """,
+        (event_id, side),
+    )
+    conn.commit()
+    return int(cursor.lastrowid)
+
+
+def test_clusters_require_same_sport_window_and_fixture(file_db):
+    survivor = _event(file_db, "Manchester United vs Liverpool", "2025-03-01T15:00:00Z")
+    by_name = _event(file_db, "Manchester Utd vs Liverpool", "2025-03-01T16:00:00Z")
+    by_pair = _event(file_db, "Liverpool vs Manchester United", "2025-03-01T14:00:00Z")
+    _event(file_db, "Manchester United vs Liverpool", "2025-03-09T15:00:00Z")
+    _event(file_db, "Manchester United vs Liverpool", "2025-03-01T15:00:00Z", sport="esports")
+    _event(file_db, "Manchester United vs Liverpool Women", "2025-03-01T15:00:00Z")
+    relaxed = _event(file_db, "Arsenal vs Chelsea", None)
+    relaxed_dup = _event(file_db, "Arsenal - Chelsea", None)
+
+    clusters = EventDedupService(file_db, workers=1).find_clusters()
+
+    assert [(c.survivor_id, c.merged_ids) for c in clusters] == [
+        (survivor, sorted([by_name, by_pair])),
+        (relaxed, [relaxed_dup]),
+    ]
+
+
+def test_merge_repoints_rows_records_aliases_and_rematches(file_db):
+    survivor = _event(file_db, "Bayern München vs Dortmund", "2025-03-01T17:30:00Z")
+    duplicate = _event(file_db, "Bayern Munchen vs Dortmund", "2025-03-01T18:30:00Z")
+    index = get_event_index(file_db)
+    over = _verified_bet(file_db, survivor, "OVER")
+    under = _verified_bet(file_db, duplicate, "UNDER")
+    surebet = file_db.execute(
+        "INSERT INTO surebets (canonical_event_id, market_code, status) VALUES (?, 'BTTS', 'open')",
+        (duplicate,),
+    ).lastrowid
+    file_db.commit()
+
+    result = EventDedupService(file_db, workers=1).dedupe()
+
+    assert result.merged_event_count == 1
+    assert (result.repointed_bets, result.repointed_surebets) == (1, 1)
+    assert file_db.execute("SELECT COUNT(*) FROM canonical_events WHERE id = ?", (duplicate,)).fetchone()[0] == 0
+    assert file_db.execute(
+        "SELECT canonical_event_id FROM surebets WHERE id = ?", (surebet,)
+    ).fetchone()[0] == survivor
+    assert resolve_event_id(file_db, duplicate) == survivor
+    assert index.get(duplicate) is None
+    audit = file_db.execute(
+        "SELECT bet_id, diff_after FROM verification_audit WHERE actor = ?", (DEDUP_ACTOR,)
+    ).fetchall()
+    assert [tuple(row) for row in audit] == [(under, f"canonical_event_id={survivor}")]
+
+    statuses = file_db.execute(
+        "SELECT status FROM bets WHERE id IN (?, ?)", (over, under)
+    ).fetchall()
+    assert [row[0] for row in statuses] == ["matched", "matched"]
+    assert set(result.matched_surebet_ids) == {over, under}
+    assert len(set(result.matched_surebet_ids.values())) == 1
+
+
+def test_stale_event_ids_resolve_to_survivor(file_db, tmp_path):
+    survivor = _event(file_db, "Inter vs AC Milan", "2025-03-02T19:45:00Z")
+    first = _event(file_db, "Inter vs AC Milan", "2025-03-02T20:45:00Z")
+    # A process that indexed the duplicate before the merge drops it on refresh.
+    other_process = sqlite3.connect(tmp_path / "dedup.db")
+    assert get_event_index(other_process).get(first) is not None
+
+    EventDedupService(file_db, workers=1).dedupe(trigger_matching=False)
+    later = _event(file_db, "Inter - AC Milan", "2025-03-02T19:45:00Z")
+    EventDedupService(file_db, workers=1).dedupe(trigger_matching=False)
+
+    assert get_event_index(other_process).get(first) is None
+    other_process.close()
+    assert resolve_event_id(file_db, first) == survivor
+    assert resolve_event_id(file_db, later) == survivor
+
+    bet_id = file_db.execute(
+        "INSERT INTO bets (associate_id, bookmaker_id, status, odds) VALUES (1, 1, 'verified', '2.0')"
+    ).lastrowid
+    file_db.commit()
+    BetVerificationService(file_db).update_verified_bet(bet_id, {"canonical_event_id": first})
+    assert file_db.execute(
+        "SELECT canonical_event_id FROM bets WHERE id = ?", (bet_id,)
+    ).fetchone()[0] == survivor
+
+
+def test_dry_run_leaves_events_untouched(file_db):
+    _event(file_db, "Arsenal vs Chelsea", "2025-03-01T15:00:00Z")
+    _event(file_db, "Arsenal vs Chelsea", "2025-03-01T15:00:00Z")
+
+    result = EventDedupService(file_db, workers=1).dedupe(dry_run=True)
+
+    assert result.merged_event_count == 1
+    assert file_db.execute("SELECT COUNT(*) FROM canonical_events").fetchone()[0] == 2
+
+
+def test_merge_leaves_the_callers_row_factory_alone(file_db):
+    survivor = _event(file_db, "Arsenal vs Chelsea", "2025-03-01T15:00:00Z")
+    duplicate = _event(file_db, "Arsenal - Chelsea", "2025-03-01T15:30:00Z")
+    file_db.row_factory = None
+
+    result = EventDedupService(file_db, workers=1).dedupe(trigger_matching=False)
+
+    assert file_db.row_factory is None
+    assert [(c.survivor_id, c.merged_ids) for c in result.clusters] == [(survivor, [duplicate])]
@@ -0,0 +1,134 @@
+"""
+Unit tests for the bulk canonical event re-link service.
+"""
+
+from __future__ import annotations
+
+import csv
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from src.core.schema import create_schema
+from src.services.canonical_event_index import invalidate_event_indexes
+from src.services.event_normalizer import EventNormalizer
+from src.services.event_relink_service import RELINK_ACTOR, EventRelinkService
+from src.services.surebet_matcher import SurebetMatcher
+
+
+@pytest.fixture
+def file_db(tmp_path: Path):
+    invalidate_event_indexes()
+    conn = sqlite3.connect(tmp_path / "relink.db")
+    conn.row_factory = sqlite3.Row
+    create_schema(conn)
+    conn.execute("INSERT INTO associates (id, display_alias) VALUES (1, 'Alice')")
+    conn.execute("INSERT INTO bookmakers (id, associate_id, bookmaker_name) VALUES (1, 1, 'Book')")
+    conn.commit()
+    yield conn
+    conn.close()
+    invalidate_event_indexes()
+
+
+def _event(conn, name: str, kickoff: str) -> int:
+    pair = EventNormalizer.compute_pair_key(name)
+    cursor = conn.execute(
+        "INSERT INTO canonical_events (normalized_event_name, sport, pair_key, kickoff_time_utc) "
+        "VALUES (?, 'football', ?, ?)",
+        (name, pair[2] if pair else None, kickoff),
+    )
+    conn.commit()
+    return int(cursor.lastrowid)
+
+
+def _bet(conn, selection_text: str, kickoff: str | None, status: str = "incoming") -> int:
+    cursor = conn.execute(
+        "INSERT INTO bets (associate_id, bookmaker_id, status, odds, selection_text, kickoff_time_utc) "
+        "VALUES (1, 1, ?, '2.0', ?, ?)",
+        (status, selection_text, kickoff),
+    )
+    conn.commit()
+    return int(cursor.lastrowid)
+
+
+def _linked_event(conn, bet_id: int):
+    return conn.execute("SELECT canonical_event_id FROM bets WHERE id = ?", (bet_id,)).fetchone()[0]
+
+
+def test_relink_links_confident_matches_and_reports_the_rest(file_db, tmp_path):
+    arsenal = _event(file_db, "Arsenal vs Chelsea", "2025-03-01T15:00:00Z")
+    bayern = _event(file_db, "Bayern München vs Dortmund", "2025-03-01T17:30:00Z")
+    madrid = _event(file_db, "Real Madrid vs Barcelona", "2025-03-02T20:00:00Z")
+    _event(file_db, "Arsenal vs Chelsea", "2025-03-08T15:00:00Z")
+
+    by_pair = _bet(file_db, "Arsenal - Chelsea", "2025-03-01T16:00:00Z")
+    by_name = _bet(file_db, "Bayern Munchen vs Dortmund", "2025-03-01T18:00:00Z")
+    for_review = _bet(file_db, "Real Madrid v Barca", "2025-03-02T19:00:00Z")
+    too_far = _bet(file_db, "Real Madrid vs Barcelona", "2025-03-05T20:00:00Z")
+
+    service = EventRelinkService(file_db, workers=1, report_dir=str(tmp_path / "reports"))
+    result = service.relink(trigger_matching=False)
+
+    assert result.scanned == 4
+    assert {c.bet.bet_id: c.event.id for c in result.linked} == {by_pair: arsenal, by_name: bayern}
+    assert _linked_event(file_db, by_pair) == arsenal
+    assert _linked_event(file_db, by_name) == bayern
+    assert _linked_event(file_db, for_review) is None
+    assert _linked_event(file_db, too_far) is None
+
+    audit = file_db.execute(
+        "SELECT bet_id FROM verification_audit WHERE actor = ? ORDER BY bet_id", (RELINK_ACTOR,)
+    ).fetchall()
+    assert [row[0] for row in audit] == [by_pair, by_name]
+
+    with open(result.report_path, newline="", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    assert [(int(r["bet_id"]), int(r["event_id"])) for r in rows] == [(for_review, madrid)]
+
+
+def test_ambiguous_pair_keys_and_dry_runs_do_not_link(file_db, tmp_path):
+    _event(file_db, "Arsenal vs Chelsea", "2025-03-01T15:00:00Z")
+    _event(file_db, "Arsenal vs Chelsea", "2025-03-01T20:00:00Z")
+    _event(file_db, "Bayern München vs Dortmund", "2025-03-01T17:30:00Z")
+    ambiguous = _bet(file_db, "Arsenal vs Chelsea", "2025-03-01T18:00:00Z")
+    confident = _bet(file_db, "Bayern Munchen vs Dortmund", "2025-03-01T18:00:00Z")
+
+    service = EventRelinkService(file_db, workers=1, report_dir=str(tmp_path))
+    result = service.relink(dry_run=True)
+
+    assert [c.bet.bet_id for c in result.linked] == [confident]
+    assert [c.bet.bet_id for c in result.review] == [ambiguous]
+    assert _linked_event(file_db, confident) is None
+    with open(result.report_path, newline="", encoding="utf-8") as handle:
+        assert {int(r["bet_id"]) for r in csv.DictReader(handle)} == {ambiguous, confident}
+
+
+def test_relink_leaves_the_callers_row_factory_alone(file_db, tmp_path):
+    arsenal = _event(file_db, "Arsenal vs Chelsea", "2025-03-01T15:00:00Z")
+    bet_id = _bet(file_db, "Arsenal - Chelsea", "2025-03-01T16:00:00Z")
+    file_db.row_factory = None
+
+    result = EventRelinkService(file_db, workers=1, report_dir=str(tmp_path)).relink(
+        trigger_matching=False
+    )
+
+    assert file_db.row_factory is None
+    assert {c.bet.bet_id: c.event.id for c in result.linked} == {bet_id: arsenal}
+
+
+def test_newly_linked_verified_bets_are_sent_to_the_matcher(file_db, tmp_path, monkeypatch):
+    event_id = _event(file_db, "Arsenal vs Chelsea", "2025-03-01T15:00:00Z")
+    verified = _bet(file_db, "Arsenal vs Chelsea", None, status="verified")
+    incoming = _bet(file_db, "Arsenal vs Chelsea", "2025-03-01T15:00:00Z")
+    attempted = []
+    monkeypatch.setattr(
+        SurebetMatcher, "attempt_match", lambda self, bet_id: attempted.append(bet_id) or 7
+    )
+
+    result = EventRelinkService(file_db, workers=1, report_dir=str(tmp_path)).relink()
+
+    assert _linked_event(file_db, verified) == event_id
+    assert _linked_event(file_db, incoming) == event_id
+    assert attempted == [verified]
+    assert result.matched_surebet_ids == {verified: 7}
@@ -0,0 +1,168 @@
+"""Tests for the open-exposure tracker and associate limit enforcement."""
+
+import sqlite3
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import pytest
+
+from src.core.schema import create_schema
+from src.services.bet_verification import BetVerificationService
+from src.services.exposure_service import (
+    BOOKMAKER_LIMIT,
+    SUREBET_LIMIT,
+    ExposureLimitError,
+    ExposureService,
+)
+from src.services.fx_manager import store_fx_rate
+
+
+@pytest.fixture
+def test_db():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    create_schema(conn)
+    conn.execute(
+        """
+        INSERT INTO associates (id, display_alias, max_bookmaker_exposure_eur, max_surebet_stake_eur)
+        VALUES (1, 'Alice', '250.00', NULL), (2, 'Bob', NULL, '120.00')
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO bookmakers (id, associate_id, bookmaker_name)
+        VALUES (1, 1, 'Bet365'), (2, 2, 'Pinnacle'), (3, 1, 'Unibet')
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO canonical_events (id, normalized_event_name, sport, league)
+        VALUES (1, 'Team A vs Team B', 'Soccer', 'Premier League')
+        """
+    )
+    today = datetime.now(UTC).isoformat().replace("+00:00", "Z")
+    store_fx_rate("GBP", Decimal("1.20"), today, "test", conn)
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def _add_bet(conn, associate_id, bookmaker_id, stake, currency="EUR", status="incoming", side="OVER"):
+    bet_id = conn.execute(
+        """
+        INSERT INTO bets (
+            associate_id, bookmaker_id, canonical_event_id, status, stake_eur,
+            stake_original, odds, odds_original, currency, payout, market_code,
+            period_scope, line_value, side, is_supported
+        )
+        VALUES (?, ?, 1, ?, '0.00', ?, '2.10', '2.10', ?, '0', 'TOTALS',
+                'FULL_TIME', '2.5', ?, 1)
+        """,
+        (associate_id, bookmaker_id, status, stake, currency, side),
+    ).lastrowid
+    conn.commit()
+    return bet_id
+
+
+def _exposure(conn, associate_id, bookmaker_id):
+    row = conn.execute(
+        "SELECT open_stake_cents, open_bet_count FROM open_exposure WHERE associate_id = ? AND bookmaker_id = ?",
+        (associate_id, bookmaker_id),
+    ).fetchone()
+    return tuple(row) if row else None
+
+
+def test_tracker_follows_verify_match_and_settle(test_db):
+    service = BetVerificationService(test_db)
+    first = _add_bet(test_db, 1, 1, "100.00", currency="GBP")
+    second = _add_bet(test_db, 2, 2, "80.00", side="UNDER")
+
+    service.approve_bet(first)
+    assert _exposure(test_db, 1, 1) == (12000, 1)
+
+    service.approve_bet(second)
+    surebet_id = test_db.execute("SELECT surebet_id FROM surebet_bets WHERE bet_id = ?", (first,)).fetchone()[0]
+    exposure = ExposureService(test_db)
+    assert exposure.get_surebet_exposure(surebet_id, 1) == Decimal("120.00")
+    assert exposure.get_surebet_exposure(surebet_id, 2) == Decimal("80.00")
+
+    service.update_verified_bet(first, {"stake_original": "50.00"})
+    assert exposure.get_open_exposure(1, 1) == Decimal("60.00")
+    assert exposure.get_surebet_exposure(surebet_id, 1) == Decimal("60.00")
+
+    test_db.execute("UPDATE bets SET status = 'settled' WHERE id IN (?, ?)", (first, second))
+    test_db.commit()
+    assert _exposure(test_db, 1, 1) is None
+    assert test_db.execute("SELECT COUNT(*) FROM surebet_open_exposure").fetchone()[0] == 0
+    assert exposure.verify() == []
+
+
+def test_approve_bet_enforces_bookmaker_and_surebet_limits(test_db):
+    service = BetVerificationService(test_db)
+    service.approve_bet(_add_bet(test_db, 1, 1, "200.00"))
+
+    over = _add_bet(test_db, 1, 1, "60.00")
+    with pytest.raises(ExposureLimitError) as excinfo:
+        service.approve_bet(over)
+    assert [breach.limit_name for breach in excinfo.value.breaches] == [BOOKMAKER_LIMIT]
+    assert excinfo.value.breaches[0].projected_eur == Decimal("260.00")
+    assert test_db.execute("SELECT status FROM bets WHERE id = ?", (over,)).fetchone()[0] == "incoming"
+
+    # Lowering the stake during review brings it under the limit; other bookmakers are separate.
+    service.approve_bet(over, {"stake_original": "50.00"})
+    service.approve_bet(_add_bet(test_db, 1, 3, "240.00"))
+    assert _exposure(test_db, 1, 1) == (25000, 2)
+
+    with pytest.raises(ExposureLimitError) as excinfo:
+        service.approve_bet(_add_bet(test_db, 2, 2, "150.00", side="UNDER"))
+    assert [breach.limit_name for breach in excinfo.value.breaches] == [SUREBET_LIMIT]
+
+
+def test_rebuild_and_verify_detect_drift(test_db):
+    verified = _add_bet(test_db, 1, 1, "40.00", status="verified")
+    _add_bet(test_db, 1, 1, "10.00", status="rejected")
+    service = ExposureService(test_db)
+
+    assert service.rebuild() == 1
+    assert service.verify() == []
+
+    test_db.execute("UPDATE open_exposure SET open_stake_cents = 1 WHERE associate_id = 1")
+    test_db.execute("UPDATE bets SET stake_original = '45.00' WHERE id = ?", (verified,))
+    drift = {(item.scope, item.key) for item in service.verify()}
+    assert drift == {("bet", (verified,)), ("bookmaker", (1, 1))}
+
+    service.rebuild()
+    assert service.verify() == []
+    (row,) = service.dashboard_feed()
+    assert (row.associate_alias, row.bookmaker_name) == ("Alice", "Bet365")
+    assert row.open_stake_eur == Decimal("45.00")
+    assert row.utilization == Decimal("0.1800")
+
+
+def test_first_limit_check_builds_without_ending_callers_transaction(test_db):
+    _add_bet(test_db, 1, 1, "40.00", status="verified")
+    pending = _add_bet(test_db, 1, 1, "30.00")
+    test_db.execute("UPDATE bets SET stake_original = '35.00' WHERE id = ?", (pending,))
+    assert test_db.in_transaction
+
+    bet = {"id": pending, "associate_id": 1, "bookmaker_id": 1, "stake_original": "300.00"}
+    assert ExposureService(test_db).check_bet(bet)
+    assert test_db.in_transaction
+    assert _exposure(test_db, 1, 1) == (4000, 1)
+
+    # Rolling back the caller's work discards the build with it.
+    test_db.rollback()
+    assert test_db.execute("SELECT stake_original FROM bets WHERE id = ?", (pending,)).fetchone()[0] == "30.00"
+    assert _exposure(test_db, 1, 1) is None
+
+
+def test_service_leaves_callers_row_factory_alone(test_db):
+    _add_bet(test_db, 1, 1, "40.00", status="verified")
+    test_db.row_factory = None
+
+    service = ExposureService(test_db)
+    assert service.check_bet({"id": 99, "associate_id": 1, "bookmaker_id": 1, "stake_original": "300.00"})
+    assert [row.open_stake_eur for row in service.dashboard_feed()] == [Decimal("40.00")]
+    assert service.verify() == []
+    assert test_db.row_factory is None
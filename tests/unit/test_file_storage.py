@@ -97,6 +97,23 @@ class TestSaveScreenshot:
         assert test_dir.exists()
         assert test_dir.is_dir()
 
+    def test_save_screenshot_never_overwrites(self, tmp_path, monkeypatch):
+        """Screenshots saved within the same millisecond get distinct files."""
+        test_dir = tmp_path / "screenshots"
+        monkeypatch.setattr("src.utils.file_storage.SCREENSHOT_DIR", test_dir)
+        monkeypatch.setattr(
+            "src.utils.file_storage.generate_screenshot_filename",
+            lambda *args, **kwargs: "20251030_143045_123_manual_upload_admin_bet365.png",
+        )
+
+        first, _ = save_screenshot(b"first", "Admin", "Bet365")
+        second, rel_path = save_screenshot(b"second", "Admin", "Bet365")
+
+        assert first != second
+        assert rel_path.endswith("_1.png")
+        assert Path(first).read_bytes() == b"first"
+        assert Path(second).read_bytes() == b"second"
+
 
 class TestGetScreenshotPath:
     """Tests for screenshot path retrieval."""
@@ -306,13 +306,16 @@ class TestFundingTransactionService:
             }
         ]
         
-        mock_db.execute.return_value.fetchall.return_value = mock_rows
+        mock_db.execute.side_effect = [
+            Mock(fetchone=lambda: None),  # No ledger archive manifest
+            Mock(fetchall=lambda: mock_rows),
+        ]
         
         # Call method
         result = service.get_transaction_history()
         
         # Verify query
-        mock_db.execute.assert_called_once()
+        assert mock_db.execute.call_count == 2
         
         # Verify result
         assert len(result) == 1
@@ -333,7 +336,10 @@ class TestFundingTransactionService:
     
     def test_get_transaction_history_with_filters(self, service, mock_db):
         """Test retrieving transaction history with filters."""
-        mock_db.execute.return_value.fetchall.return_value = []
+        mock_db.execute.side_effect = [
+            Mock(fetchone=lambda: None),  # No ledger archive manifest
+            Mock(fetchall=lambda: []),
+        ]
         
         # Call with filters
         service.get_transaction_history(
@@ -343,22 +349,23 @@ class TestFundingTransactionService:
         )
         
         # Verify query parameters
-        mock_db.execute.assert_called_once()
+        assert mock_db.execute.call_count == 2
         call_args = mock_db.execute.call_args
         
         query = call_args[0][0]
         params = call_args[0][1]
         
         assert "WHERE le.type IN" in query
-        assert "AND le.created_at_utc >= ?" in query
+        assert "AND le.created_at_ms >= ?" in query
         assert "AND le.associate_id = ?" in query
         assert "AND le.bookmaker_id = ?" in query
-        assert "ORDER BY le.created_at_utc DESC" in query
+        assert "ORDER BY le.created_at_ms DESC" in query
     
     def test_get_associate_balance_summary(self, service, mock_db):
         """Test retrieving associate balance summary."""
         # Mock database responses
         mock_db.execute.side_effect = [
+            Mock(fetchone=lambda: None),  # No ledger archive manifest
             Mock(fetchone=lambda: {'net_deposits_eur': '1000.00'}),  # Net deposits
             Mock(fetchone=lambda: {'current_holding_eur': '950.00'})   # Current holdings
         ]
@@ -367,7 +374,7 @@ class TestFundingTransactionService:
         result = service.get_associate_balance_summary(1)
         
         # Verify queries were called
-        assert mock_db.execute.call_count == 2
+        assert mock_db.execute.call_count == 3
         
         # Verify result
         assert result['net_deposits_eur'] == Decimal('1000.00')
@@ -0,0 +1,62 @@
+"""Tests for the fixture-driven FX backfill job."""
+
+import json
+import sqlite3
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from src.core.schema import create_fx_rates_daily_table
+from src.integrations.fx_fixture_provider import FXFixtureProvider
+from src.jobs.backfill_fx_rates import backfill_fx_rates
+from src.services.fx_manager import get_fx_rate_as_of
+
+
+@pytest.fixture
+def conn():
+    connection = sqlite3.connect(":memory:")
+    connection.row_factory = sqlite3.Row
+    create_fx_rates_daily_table(connection)
+    yield connection
+    connection.close()
+
+
+def test_backfill_writes_fixture_days_and_skips_gaps(conn, tmp_path):
+    fixture = tmp_path / "rates.json"
+    fixture.write_text(
+        json.dumps(
+            {
+                "2025-01-03": {"GBP": "1.19", "usd": "0.96"},
+                "2025-01-06": {"GBP": "1.20", "USD": "0.97"},
+            }
+        )
+    )
+
+    result = backfill_fx_rates(FXFixtureProvider(fixture), date(2025, 1, 3), date(2025, 1, 6), conn=conn)
+
+    assert result.days_written == 2
+    assert result.rates_written == 4
+    assert result.missing_dates == ["2025-01-04", "2025-01-05"]
+    # The weekend resolves to Friday's rate.
+    assert get_fx_rate_as_of("GBP", date(2025, 1, 5), conn=conn) == Decimal("1.19")
+    assert get_fx_rate_as_of("USD", date(2025, 1, 6), conn=conn) == Decimal("0.97")
+
+
+def test_fixture_provider_reads_csv(tmp_path):
+    fixture = tmp_path / "rates.csv"
+    fixture.write_text("date,currency_code,rate_to_eur\n2025-01-03,GBP,1.19\n2025-01-03,USD,0.96\n")
+
+    provider = FXFixtureProvider(fixture)
+
+    assert provider.dates() == ["2025-01-03"]
+    assert provider.rates_for(date(2025, 1, 3)) == {"GBP": Decimal("1.19"), "USD": Decimal("0.96")}
+    assert provider.rates_for(date(2025, 1, 4)) is None
+
+
+def test_backfill_rejects_reversed_range(conn, tmp_path):
+    fixture = tmp_path / "rates.json"
+    fixture.write_text("{}")
+
+    with pytest.raises(ValueError):
+        backfill_fx_rates(FXFixtureProvider(fixture), date(2025, 1, 6), date(2025, 1, 3), conn=conn)
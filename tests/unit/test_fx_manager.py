@@ -21,9 +21,12 @@ from src.services.fx_manager import (
     convert_to_eur,
     format_timestamp_utc,
     store_fx_rate,
+    store_fx_rates_bulk,
+    get_fx_rate_as_of,
     get_latest_fx_rate,
     parse_utc_iso,
 )
+from src.services.fx_rate_history import FXRateHistory
 
 
 class TestFXManager(unittest.TestCase):
@@ -271,6 +274,61 @@ class TestFXManager(unittest.TestCase):
             # Restore original function
             src.services.fx_manager.get_db_connection = original_get_db
 
+    def test_store_fx_rates_bulk_writes_one_transaction(self):
+        """Test that a full rate set is upserted with a single commit."""
+        commits = []
+        conn = self.conn
+
+        class CountingConnection:
+            def __getattr__(self, name):
+                return getattr(conn, name)
+
+            def commit(self):
+                commits.append(1)
+                conn.commit()
+
+        count = store_fx_rates_bulk(
+            {"AUD": Decimal("0.65"), "cad": Decimal("0.66"), "USD": Decimal("0.92")},
+            fetched_at_utc="2025-10-29T13:00:00Z",
+            source="test",
+            conn=CountingConnection(),
+        )
+
+        self.assertEqual(count, 3)
+        self.assertEqual(len(commits), 1)
+        rows = self.conn.execute(
+            """
+            SELECT currency_code, rate_to_eur FROM fx_rates_daily
+            WHERE date = '2025-10-29' ORDER BY currency_code
+        """
+        ).fetchall()
+        self.assertEqual(
+            [(row["currency_code"], row["rate_to_eur"]) for row in rows],
+            [("AUD", "0.65"), ("CAD", "0.66"), ("GBP", "1.15"), ("USD", "0.92")],
+        )
+
+    def test_get_fx_rate_as_of_uses_nearest_prior_date(self):
+        """Test as-of lookups never fall forward to a later rate."""
+        self.assertEqual(get_fx_rate_as_of("AUD", date(2025, 10, 28), conn=self.conn), Decimal("0.61"))
+        self.assertEqual(get_fx_rate_as_of("AUD", date(2025, 11, 5), conn=self.conn), Decimal("0.60"))
+        self.assertEqual(get_fx_rate_as_of("EUR", date(2000, 1, 1)), Decimal("1.0"))
+        with self.assertRaises(ValueError):
+            get_fx_rate_as_of("AUD", date(2025, 10, 27), conn=self.conn)
+
+    def test_fx_rate_history_refresh_and_replace(self):
+        """Test the history loads new rows incrementally and replaces same-day rates."""
+        history = FXRateHistory()
+        self.assertGreater(history.refresh(self.conn), 0)
+        self.assertEqual(history.refresh(self.conn), 0)
+
+        store_fx_rate("AUD", Decimal("0.62"), "2025-10-28T18:00:00Z", conn=self.conn)
+        self.assertEqual(history.refresh(self.conn), 1)
+        self.assertEqual(history.rate_as_of("aud", "2025-10-28"), (Decimal("0.62"), "2025-10-28"))
+
+        history.add("AUD", date(2025, 10, 1), Decimal("0.70"))
+        self.assertEqual(history.rate_as_of("AUD", "2025-10-15"), (Decimal("0.70"), "2025-10-01"))
+        self.assertEqual(history.latest("AUD"), (Decimal("0.60"), "2025-10-29"))
+
     def test_get_latest_fx_rate_existing_currency(self):
         """Test getting latest FX rate for existing currency."""
         # Mock the database connection to use our test database
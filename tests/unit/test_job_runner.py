@@ -0,0 +1,132 @@
+"""Tests for the single-instance job runner and nightly pipeline DAG."""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from src.core.schema import create_schema
+from src.jobs.run_nightly import build_nightly_pipeline
+from src.jobs.runner import (
+    FAILED,
+    SKIPPED,
+    SUCCEEDED,
+    JobLockedError,
+    JobRunner,
+    JobSpec,
+    acquire_lock,
+    job_lock,
+)
+
+
+@pytest.fixture
+def connect(tmp_path):
+    db_path = tmp_path / "jobs.db"
+    conn = sqlite3.connect(db_path)
+    create_schema(conn)
+    conn.close()
+
+    def _connect():
+        return sqlite3.connect(db_path, check_same_thread=False)
+
+    return _connect
+
+
+def _runs(connect):
+    conn = connect()
+    try:
+        return conn.execute(
+            "SELECT job_name, status, attempt, row_count, error_message FROM job_runs ORDER BY id"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def test_run_job_retries_with_backoff_and_records_attempts(connect):
+    sleeps = []
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise RuntimeError(f"boom {len(calls)}")
+        return 42
+
+    runner = JobRunner(connection_factory=connect, sleep=sleeps.append)
+    result = runner.run_job(JobSpec("flaky", flaky, retries=2, backoff_seconds=1.5))
+
+    assert (result.status, result.attempts, result.row_count) == (SUCCEEDED, 3, 42)
+    assert sleeps == [1.5, 3.0]
+    assert _runs(connect) == [
+        ("flaky", FAILED, 1, None, "boom 1"),
+        ("flaky", FAILED, 2, None, "boom 2"),
+        ("flaky", SUCCEEDED, 3, 42, None),
+    ]
+    assert runner.recent_runs("flaky", limit=1)[0]["duration_ms"] is not None
+
+
+def test_locked_job_is_skipped_until_lock_expires(connect):
+    conn = connect()
+    assert acquire_lock(conn, "export", "other-host:1:abc", ttl_seconds=60)
+    calls = []
+    runner = JobRunner(connection_factory=connect)
+
+    result = runner.run_job(JobSpec("export", lambda: calls.append(1)))
+    assert result.status == SKIPPED and "other-host:1:abc" in result.error
+    assert calls == []
+    with pytest.raises(JobLockedError):
+        with job_lock("export", connection_factory=connect):
+            pass
+
+    conn.execute("UPDATE job_locks SET expires_at_epoch = ?", (time.time() - 1,))
+    conn.commit()
+    assert runner.run_job(JobSpec("export", lambda: calls.append(1))).ok
+    assert calls == [1]
+    assert conn.execute("SELECT COUNT(*) FROM job_locks").fetchone()[0] == 0
+    conn.close()
+
+
+def test_pipeline_runs_independent_jobs_concurrently_and_skips_dependents(connect):
+    both_running = threading.Barrier(2, timeout=5)
+
+    def fail():
+        both_running.wait()
+        raise RuntimeError("provider down")
+
+    def export():
+        both_running.wait()
+        return 7
+
+    specs = [
+        JobSpec("fx", fail),
+        JobSpec("risk", lambda: 1, depends_on=("fx",)),
+        JobSpec("export", export),
+        JobSpec("statements", lambda: 3, depends_on=("risk", "export")),
+    ]
+    results = JobRunner(connection_factory=connect, max_workers=2).run_pipeline("nightly", specs)
+
+    assert list(results) == ["fx", "risk", "export", "statements"]
+    assert {name: result.status for name, result in results.items()} == {
+        "fx": FAILED,
+        "risk": SKIPPED,
+        "export": SUCCEEDED,
+        "statements": SKIPPED,
+    }
+    assert results["risk"].error == "dependency fx failed"
+    assert results["export"].row_count == 7
+
+
+def test_pipeline_rejects_cycles_and_nightly_skip_drops_dependencies(connect):
+    runner = JobRunner(connection_factory=connect)
+    with pytest.raises(ValueError, match="cycle"):
+        runner.run_pipeline(
+            "bad",
+            [JobSpec("a", lambda: 0, depends_on=("b",)), JobSpec("b", lambda: 0, depends_on=("a",))],
+        )
+
+    specs = {spec.name: spec for spec in build_nightly_pipeline(skip=["fx_refresh"])}
+    assert set(specs) == {"risk_recompute", "ledger_export", "daily_statements"}
+    assert all(spec.depends_on == () for spec in specs.values())
+    with pytest.raises(ValueError):
+        build_nightly_pipeline(skip=["nope"])
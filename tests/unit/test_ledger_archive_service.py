@@ -0,0 +1,335 @@
+"""
+Unit tests for cold-row archiving into per-year archive databases.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from src.core.database import RowWithGet
+from src.core.schema import create_schema
+from src.repositories.associate_hub_repository import AssociateHubRepository
+from src.services.bookmaker_balance_service import BookmakerBalanceService
+from src.services.ledger_archive_service import LedgerArchiveService, attach_archives
+from src.services.ledger_export_service import LedgerExportService
+from src.services.period_close_service import PeriodCloseService
+from src.services.reconciliation_service import ReconciliationService
+from src.services.stake_ledger_service import StakeLedgerService
+from src.services.statement_service import StatementService
+
+PERIOD_END = "2024-12-31T23:59:59Z"
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _add_entry(conn, entry_type: str, amount: str, created_at: str, **extra) -> int:
+    cursor = conn.execute(
+        """
+        INSERT INTO ledger_entries (
+            type, associate_id, bookmaker_id, amount_native, native_currency,
+            fx_rate_snapshot, amount_eur, settlement_state, principal_returned_eur,
+            per_surebet_share_eur, created_at_utc, created_by
+        ) VALUES (?, 1, 1, ?, 'EUR', '1.0', ?, ?, ?, ?, ?, 'test')
+        """,
+        (
+            entry_type,
+            amount,
+            amount,
+            "WON" if entry_type == "BET_RESULT" else None,
+            extra.get("principal"),
+            extra.get("share"),
+            created_at,
+        ),
+    )
+    conn.commit()
+    return cursor.lastrowid
+
+
+@pytest.fixture
+def db_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "surebet.db"
+    conn = _connect(path)
+    create_schema(conn)
+    conn.execute(
+        "INSERT INTO associates (id, display_alias, home_currency) VALUES (1, 'Alice', 'EUR')"
+    )
+    conn.execute(
+        "INSERT INTO bookmakers (id, associate_id, bookmaker_name) VALUES (1, 1, 'Bookie')"
+    )
+    conn.execute(
+        """
+        INSERT INTO bets (id, associate_id, bookmaker_id, status, odds, created_at_utc)
+        VALUES (1, 1, 1, 'rejected', '2.00', '2024-11-02 09:00:00Z'),
+               (2, 1, 1, 'verified', '1.90', '2024-11-03 09:00:00Z')
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO verification_audit (bet_id, actor, action, created_at_utc)
+        VALUES (1, 'test', 'REJECTED', '2024-11-02 10:00:00Z')
+        """
+    )
+    conn.commit()
+    _add_entry(conn, "DEPOSIT", "1000.00", "2023-12-01T10:00:00Z")
+    _add_entry(conn, "BET_RESULT", "150.00", "2024-06-10T10:00:00Z", principal="100.00", share="50.00")
+    _add_entry(conn, "WITHDRAWAL", "-200.00", "2024-11-05T10:00:00Z")
+    _add_entry(conn, "BET_RESULT", "80.00", "2025-01-20T10:00:00Z", principal="60.00", share="20.00")
+    conn.close()
+
+    monkeypatch.setattr(
+        "src.services.statement_service.get_db_connection", lambda: _connect(path)
+    )
+    return path
+
+
+def _close_period(db_path: Path) -> None:
+    service = PeriodCloseService(_connect(db_path))
+    try:
+        service.close_period(PERIOD_END)
+    finally:
+        service.db.close()
+
+
+def _statement(cutoff: str) -> tuple:
+    calc = StatementService().generate_statement(1, cutoff)
+    return (
+        calc.net_deposits_eur,
+        calc.should_hold_eur,
+        calc.current_holding_eur,
+        calc.fair_share_eur,
+        [(row.bookmaker_name, row.balance_eur) for row in calc.bookmakers],
+    )
+
+
+def test_archive_moves_covered_rows_and_keeps_statements_exact(db_path, tmp_path):
+    _close_period(db_path)
+    cutoffs = ["2024-01-31T23:59:59Z", "2024-11-30T23:59:59Z", PERIOD_END, "2025-02-28T23:59:59Z"]
+    before = [_statement(cutoff) for cutoff in cutoffs]
+
+    service = LedgerArchiveService(_connect(db_path))
+    try:
+        result = service.archive_period(PERIOD_END)
+        assert service.verify_archives() == []
+    finally:
+        service.db.close()
+
+    assert result.moved["ledger_entries"] == 3
+    assert result.moved["bets"] == 1
+    assert result.moved["verification_audit"] == 1
+    assert sorted(Path(path).name for path in result.archive_paths) == [
+        "archive_2023.db",
+        "archive_2024.db",
+    ]
+
+    conn = _connect(db_path)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM ledger_entries").fetchone()[0] == 1
+        assert [row[0] for row in conn.execute("SELECT id FROM bets")] == [2]
+        with pytest.raises(sqlite3.IntegrityError):
+            conn.execute("DELETE FROM ledger_entries")
+    finally:
+        conn.close()
+
+    assert [_statement(cutoff) for cutoff in cutoffs] == before
+
+
+def test_archive_keeps_rows_still_referenced_from_hot_tables(db_path):
+    conn = _connect(db_path)
+    conn.execute(
+        "INSERT INTO notification_audit (draft_id, ledger_id, status) VALUES ('d1', 2, 'sent')"
+    )
+    conn.commit()
+    conn.close()
+    _close_period(db_path)
+
+    service = LedgerArchiveService(_connect(db_path))
+    try:
+        result = service.archive_period(PERIOD_END, tables=["ledger_entries"])
+        hot_ids = [row[0] for row in service.db.execute("SELECT id FROM ledger_entries ORDER BY id")]
+    finally:
+        service.db.close()
+
+    assert result.moved == {"ledger_entries": 2}
+    assert hot_ids == [2, 4]
+
+
+def test_archive_keeps_stake_rows_of_open_bets_hot(db_path):
+    conn = _connect(db_path)
+    conn.execute(
+        """
+        INSERT INTO ledger_entries (
+            type, associate_id, bookmaker_id, amount_native, native_currency,
+            fx_rate_snapshot, amount_eur, bet_id, created_at_utc, created_by
+        ) VALUES ('BET_STAKE', 1, 1, '-40.00', 'EUR', '1.0', '-40.00', 2,
+                  '2024-11-03T09:30:00Z', 'test')
+        """
+    )
+    conn.commit()
+    conn.close()
+    _close_period(db_path)
+
+    service = LedgerArchiveService(_connect(db_path))
+    try:
+        result = service.archive_period(PERIOD_END, tables=["ledger_entries"])
+        totals = StakeLedgerService(service.db)._load_current_totals(2)
+    finally:
+        service.db.close()
+
+    # Bet 2 is still verified, so its stake row stays next to the bet.
+    assert result.moved == {"ledger_entries": 3}
+    assert totals == {"EUR": Decimal("-40.00")}
+
+
+def test_archive_requires_a_closed_period(db_path):
+    service = LedgerArchiveService(_connect(db_path))
+    try:
+        with pytest.raises(ValueError, match="has not been closed"):
+            service.archive_period(PERIOD_END)
+    finally:
+        service.db.close()
+
+
+def test_ledger_export_reads_archived_rows(db_path, tmp_path):
+    _close_period(db_path)
+    service = LedgerArchiveService(_connect(db_path))
+    try:
+        service.archive_period(PERIOD_END)
+    finally:
+        service.db.close()
+
+    conn = _connect(db_path)
+    try:
+        cursor = LedgerExportService(export_dir=str(tmp_path / "exports"))._execute_ledger_query(conn)
+        assert [row["entry_id"] for row in cursor.fetchall()] == [1, 2, 3, 4]
+    finally:
+        conn.close()
+
+
+def test_attach_archives_refuses_missing_archive(db_path):
+    _close_period(db_path)
+    service = LedgerArchiveService(_connect(db_path))
+    try:
+        result = service.archive_period(PERIOD_END, tables=["ledger_entries"])
+    finally:
+        service.db.close()
+    Path(result.archive_paths[0]).unlink()
+
+    conn = _connect(db_path)
+    try:
+        with pytest.raises(FileNotFoundError):
+            attach_archives(conn)
+    finally:
+        conn.close()
+
+
+def _running_balances(db_path: Path) -> tuple:
+    conn = _connect(db_path)
+    conn.row_factory = RowWithGet
+    try:
+        reconciliation = [
+            (row.associate_id, row.net_deposits_eur, row.should_hold_eur, row.current_holding_eur)
+            for row in ReconciliationService(conn).get_associate_balances()
+        ]
+        hub = AssociateHubRepository(conn)
+        metrics = [
+            (row.associate_id, row.net_deposits_eur, row.should_hold_eur, row.current_holding_eur)
+            for row in hub.list_associates_with_metrics()
+        ]
+        bookmakers = [
+            (row.bookmaker_id, row.modeled_balance_eur, row.delta_eur)
+            for row in hub.list_bookmakers_for_associate(1)
+        ]
+        modeled = [
+            (row.bookmaker_id, row.modeled_balance_eur)
+            for row in BookmakerBalanceService(conn).get_bookmaker_balances()
+        ]
+        return reconciliation, metrics, bookmakers, modeled
+    finally:
+        conn.close()
+
+
+def test_running_balances_survive_archiving(db_path):
+    _close_period(db_path)
+    before = _running_balances(db_path)
+
+    service = LedgerArchiveService(_connect(db_path))
+    try:
+        service.archive_period(PERIOD_END)
+    finally:
+        service.db.close()
+
+    assert _running_balances(db_path) == before
+    assert before[0][0][1:] == (Decimal("800.00"), Decimal("870.00"), Decimal("1030.00"))
+
+
+def _roi(db_path: Path) -> tuple:
+    service = StatementService()
+    conn = _connect(db_path)
+    try:
+        rows = service._fetch_roi_rows(conn, 1, "2025-02-28T23:59:59Z")
+    finally:
+        conn.close()
+    return rows, service._calculate_multibook_delta(1, "2025-02-28T23:59:59Z")
+
+
+def test_statement_roi_survives_archiving_a_settled_surebet(db_path):
+    conn = _connect(db_path)
+    conn.execute("INSERT INTO associates (id, display_alias) VALUES (2, 'Bob')")
+    conn.execute("INSERT INTO bookmakers (id, associate_id, bookmaker_name) VALUES (2, 2, 'Other')")
+    conn.execute("INSERT INTO canonical_events (id, normalized_event_name) VALUES (1, 'A vs B')")
+    conn.execute(
+        """
+        INSERT INTO surebets (id, canonical_event_id, market_code, status, settled_at_utc)
+        VALUES (1, 1, 'TOTAL_GOALS_OVER_UNDER', 'settled', '2024-06-10T12:00:00Z')
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO bets (id, associate_id, bookmaker_id, status, odds, created_at_utc)
+        VALUES (3, 1, 1, 'settled', '2.00', '2024-06-09 09:00:00Z'),
+               (4, 2, 2, 'settled', '2.00', '2024-06-09 09:00:00Z')
+        """
+    )
+    conn.execute(
+        "INSERT INTO surebet_bets (surebet_id, bet_id, side) VALUES (1, 3, 'A'), (1, 4, 'B')"
+    )
+    conn.executemany(
+        """
+        INSERT INTO ledger_entries (
+            type, associate_id, bookmaker_id, amount_native, native_currency,
+            fx_rate_snapshot, amount_eur, settlement_state, surebet_id, bet_id,
+            created_at_utc, created_by
+        ) VALUES (?, ?, ?, ?, 'EUR', '1.0', ?, ?, ?, ?, ?, 'test')
+        """,
+        [
+            ("BET_STAKE", 1, 1, "-100.00", "-100.00", None, None, 3, "2024-06-09T09:00:00Z"),
+            ("BET_STAKE", 2, 2, "-100.00", "-100.00", None, None, 4, "2024-06-09T09:00:00Z"),
+            ("BET_RESULT", 1, 1, "200.00", "200.00", "WON", 1, 3, "2024-06-10T12:00:00Z"),
+            ("BET_RESULT", 2, 2, "0.00", "0.00", "LOST", 1, 4, "2024-06-10T12:00:00Z"),
+        ],
+    )
+    conn.commit()
+    conn.close()
+    _close_period(db_path)
+    before = _roi(db_path)
+
+    service = LedgerArchiveService(_connect(db_path))
+    try:
+        service.archive_period(PERIOD_END, tables=["ledger_entries"])
+        hot_types = {row[0] for row in service.db.execute("SELECT type FROM ledger_entries")}
+    finally:
+        service.db.close()
+
+    assert "BET_STAKE" not in hot_types
+    assert [row["surebet_id"] for row in before[0]] == [1]
+    assert before[0][0]["associate_stake"] == Decimal("100")
+    assert before[1] == Decimal("100")
+    assert _roi(db_path) == before
@@ -0,0 +1,114 @@
+"""
+Unit tests for incremental (watermark) ledger exports.
+"""
+
+import csv
+import gzip
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from src.core.schema import create_schema
+from src.services.ledger_delta_export_service import LedgerDeltaExportService
+
+
+@pytest.fixture
+def conn():
+    db = sqlite3.connect(":memory:")
+    db.row_factory = sqlite3.Row
+    create_schema(db)
+    db.execute(
+        "INSERT INTO associates (id, display_alias, home_currency) "
+        "VALUES (1, 'Alice', 'EUR'), (2, 'Bob', 'EUR')"
+    )
+    db.commit()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def service(conn, tmp_path):
+    return LedgerDeltaExportService(export_dir=str(tmp_path), db=conn)
+
+
+def _add_entries(conn, count, associate_id=1):
+    conn.executemany(
+        """
+        INSERT INTO ledger_entries (
+            type, associate_id, amount_native, native_currency,
+            fx_rate_snapshot, amount_eur, created_by, note
+        ) VALUES ('DEPOSIT', ?, '10.00', 'EUR', '1.0', '10.00', 'test', ?)
+        """,
+        [(associate_id, f"entry {idx}") for idx in range(count)],
+    )
+    conn.commit()
+
+
+def _read_rows(path):
+    with gzip.open(path, "rt", encoding="utf-8", newline="") as handle:
+        return list(csv.DictReader(handle))
+
+
+def test_export_delta_writes_only_new_rows(service, conn):
+    _add_entries(conn, 3)
+    first = service.export_delta(compact_every=None)
+
+    assert first.row_count == 3
+    assert (first.after_entry_id, first.through_entry_id) == (0, 3)
+
+    _add_entries(conn, 2)
+    second = service.export_delta(compact_every=None)
+
+    assert second.row_count == 2
+    assert second.after_entry_id == 3
+    assert [row["entry_id"] for row in _read_rows(second.file_path)] == ["4", "5"]
+    assert service.get_watermark()["last_entry_id"] == 5
+
+
+def test_export_delta_is_noop_without_new_rows(service, conn):
+    _add_entries(conn, 1)
+    service.export_delta(compact_every=None)
+
+    result = service.export_delta(compact_every=None)
+
+    assert result.file_path is None
+    assert result.row_count == 0
+
+
+def test_watermarks_are_tracked_per_scope(service, conn):
+    _add_entries(conn, 2, associate_id=1)
+    _add_entries(conn, 1, associate_id=2)
+
+    service.export_delta(compact_every=None)
+    scoped = service.export_delta(associate_id=2, compact_every=None)
+
+    assert scoped.row_count == 1
+    assert service.get_watermark()["last_entry_id"] == 3
+    assert service.get_watermark(associate_id=2)["last_entry_id"] == 3
+    assert service.get_watermark(associate_id=1)["last_entry_id"] == 0
+
+
+def test_compaction_merges_deltas_into_snapshot(service, conn):
+    for batch in (2, 1, 3):
+        _add_entries(conn, batch)
+        result = service.export_delta(compact_every=3)
+
+    snapshot = Path(result.snapshot_path)
+    assert snapshot.exists()
+    assert len(_read_rows(snapshot)) == 6
+    assert list(snapshot.parent.glob("delta_*.csv.gz")) == []
+
+    _add_entries(conn, 1)
+    service.export_delta(compact_every=None)
+    new_snapshot = service.compact()
+
+    assert [row["entry_id"] for row in _read_rows(new_snapshot)][-1] == "7"
+    assert len(_read_rows(new_snapshot)) == 7
+    assert not snapshot.exists()
+    assert service.get_watermark()["compacted_through_entry_id"] == 7
+
+
+def test_export_delta_rejects_unknown_associate(service):
+    with pytest.raises(ValueError, match="Associate 99 not found"):
+        service.export_delta(associate_id=99)
@@ -5,6 +5,7 @@ Tests core export functionality including Excel generation, validation,
 and file handling with various data scenarios.
 """
 
+import csv
 import tempfile
 from datetime import datetime
 from decimal import Decimal
@@ -147,7 +148,7 @@ class TestLedgerExportService:
         mock_get_conn.return_value = mock_conn
         
         # Mock cursor.execute to return test data
-        mock_cursor.fetchall.return_value = mock_db_data
+        mock_cursor.fetchmany.side_effect = [mock_db_data, []]
         
         # Execute export
         result = service.export_full_ledger()
@@ -187,7 +188,7 @@ class TestLedgerExportService:
         # Mock cursor to return data but validation will fail
         mock_cursor = MagicMock()
         mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.fetchall.return_value = [{"entry_id": 1}]
+        mock_cursor.fetchmany.side_effect = [[{"entry_id": 1}], []]
         
         # Mock file operations to cause validation failure
         with patch.object(service, '_validate_export') as mock_validate:
@@ -350,7 +351,7 @@ class TestLedgerExportService:
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
         mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.fetchall.return_value = mock_db_data
+        mock_cursor.fetchmany.side_effect = [mock_db_data, []]
         mock_get_conn.return_value = mock_conn
         
         result = service.export_full_ledger()
@@ -402,7 +403,7 @@ class TestLedgerExportService:
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
         mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.fetchall.return_value = mock_db_data
+        mock_cursor.fetchmany.side_effect = [mock_db_data, []]
         mock_get_conn.return_value = mock_conn
 
         result = service.export_full_ledger()
@@ -432,7 +433,7 @@ class TestLedgerExportService:
         """Test exporting ledger for a specific associate."""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_cursor.fetchall.return_value = mock_db_data
+        mock_cursor.fetchmany.side_effect = [mock_db_data, []]
         mock_conn.cursor.return_value = mock_cursor
 
         alias_cursor = MagicMock()
@@ -473,10 +474,42 @@ class TestLedgerExportService:
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
         mock_conn.cursor.return_value = mock_cursor
-        mock_cursor.fetchall.return_value = mock_db_data
+        mock_cursor.fetchmany.side_effect = [mock_db_data, []]
         mock_get_conn.return_value = mock_conn
         
         result = service.export_full_ledger()
         
         expected_filename = "all_MULTI_01-01-2025_ledger.xlsx"
         assert Path(result.file_path).name == expected_filename
+
+
+@patch('src.services.ledger_export_service.get_db_connection')
+def test_export_full_ledger_csv_gz_fast_path(mock_get_conn, tmp_path):
+    """CSV.gz exports stream every chunk and pass validation."""
+    import gzip
+
+    mock_conn = MagicMock()
+    mock_cursor = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+    mock_cursor.fetchmany.side_effect = [
+        [{"entry_id": 1, "entry_type": "DEPOSIT", "amount_eur": "10.00"}],
+        [{"entry_id": 2, "entry_type": "WITHDRAWAL", "amount_eur": "-5.00"}],
+        [],
+    ]
+    mock_get_conn.return_value = mock_conn
+
+    service = LedgerExportService(export_dir=str(tmp_path))
+    result = service.export_full_ledger(export_format="csv.gz")
+
+    assert result.file_path.endswith("_ledger.csv.gz")
+    assert result.row_count == 2
+    with gzip.open(result.file_path, "rt", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    assert [row["entry_type"] for row in rows] == ["DEPOSIT", "WITHDRAWAL"]
+    assert service.get_export_history()[0]["row_count"] == 2
+
+
+def test_export_full_ledger_rejects_unknown_format(tmp_path):
+    service = LedgerExportService(export_dir=str(tmp_path))
+    with pytest.raises(ValueError, match="Unsupported export format"):
+        service.export_full_ledger(export_format="parquet")
@@ -0,0 +1,114 @@
+"""
+Unit tests for batch manual uploads with pooled OCR extraction.
+"""
+
+from __future__ import annotations
+
+import io
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from src.core.schema import create_schema
+from src.ui.components import manual_upload
+
+PNG = b"\x89PNG\r\n\x1a\n"
+
+
+class _Upload(io.BytesIO):
+    def __init__(self, name: str, payload: bytes) -> None:
+        super().__init__(payload)
+        self.name = name
+
+
+@pytest.fixture
+def db(tmp_path: Path):
+    conn = sqlite3.connect(tmp_path / "surebet.db")
+    conn.row_factory = sqlite3.Row
+    create_schema(conn)
+    # Added by scripts/migrate_add_screenshot_sha256.py on deployed databases
+    conn.execute("ALTER TABLE bets ADD COLUMN screenshot_sha256 TEXT")
+    conn.execute("INSERT INTO associates (id, display_alias, home_currency) VALUES (1, 'Alice', 'GBP')")
+    conn.execute("INSERT INTO bookmakers (id, associate_id, bookmaker_name) VALUES (1, 1, 'Bet365')")
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def streamed(monkeypatch, tmp_path):
+    chunks: list[str] = []
+
+    def fake_stream(source, header=None, **kwargs):
+        chunks.extend(source())
+        return chunks
+
+    def fake_steps(title, steps, **kwargs):
+        for label, callback in steps:
+            callback()
+            yield label
+
+    monkeypatch.setattr(manual_upload, "stream_with_fallback", fake_stream)
+    monkeypatch.setattr(manual_upload, "status_with_steps", fake_steps)
+    monkeypatch.setattr("src.utils.file_storage.SCREENSHOT_DIR", tmp_path / "screenshots")
+    return chunks
+
+
+def test_batch_creates_bets_in_one_pass_and_streams_each_result(db, streamed, monkeypatch):
+    dispatched = []
+
+    def fake_extractions(bet_ids, **kwargs):
+        dispatched.append(list(bet_ids))
+        for bet_id in reversed(bet_ids):
+            yield bet_id, bet_id != bet_ids[0], None
+
+    monkeypatch.setattr(
+        manual_upload.BetIngestionService, "process_bet_extractions", staticmethod(fake_extractions)
+    )
+    uploads = [_Upload(f"shot_{index}.png", PNG + bytes([index])) for index in range(3)]
+    uploads.append(_Upload("again.png", PNG + bytes([0])))
+
+    handled = manual_upload._process_manual_upload_batch(
+        uploads, 1, "Alice", 1, "Bet365", "From WhatsApp", db
+    )
+
+    rows = db.execute(
+        "SELECT id, status, currency, screenshot_path FROM bets ORDER BY id"
+    ).fetchall()
+    assert handled == 4
+    assert len(rows) == 3
+    assert {row["currency"] for row in rows} == {"GBP"}
+    assert len({row["screenshot_path"] for row in rows}) == 3
+    assert dispatched == [[row["id"] for row in rows]]
+    assert db.execute("SELECT COUNT(*) FROM verification_audit").fetchone()[0] == 3
+    assert [chunk.split("]")[0] for chunk in streamed[1:]] == [
+        ":material/verified: [1/3",
+        ":material/verified: [2/3",
+        ":material/error: [3/3",
+    ]
+
+
+def test_batch_rolls_back_when_an_insert_fails(db, streamed, monkeypatch, tmp_path):
+    real_insert = manual_upload._insert_manual_bet
+    calls = []
+
+    def failing_insert(conn, **kwargs):
+        calls.append(kwargs)
+        if len(calls) == 2:
+            raise sqlite3.OperationalError("database is locked")
+        return real_insert(conn, **kwargs)
+
+    monkeypatch.setattr(manual_upload, "_insert_manual_bet", failing_insert)
+    monkeypatch.setattr(
+        manual_upload.BetIngestionService,
+        "process_bet_extractions",
+        staticmethod(lambda bet_ids, **kwargs: pytest.fail("OCR must not run")),
+    )
+    uploads = [_Upload(f"shot_{index}.png", PNG + bytes([index])) for index in range(2)]
+
+    handled = manual_upload._process_manual_upload_batch(uploads, 1, "Alice", 1, "Bet365", "", db)
+
+    assert handled == 0
+    assert db.execute("SELECT COUNT(*) FROM bets").fetchone()[0] == 0
+    assert list((tmp_path / "screenshots").glob("*.png")) == []
@@ -46,3 +46,18 @@ def test_record_timing_triggers_alert_on_threshold(dummy_st: DummyStreamlit):
     assert alerts
     assert alerts[-1]["label"] == "hot_path"
     performance.clear_performance_alerts()
+
+
+def test_record_timing_forwards_to_persistent_telemetry(
+    dummy_st: DummyStreamlit, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    forwarded = []
+    monkeypatch.setattr(
+        performance.telemetry,
+        "record_timing",
+        lambda label, duration, source: forwarded.append((label, duration, source)),
+    )
+
+    performance.record_timing("reconciliation_cards", 0.3)
+
+    assert forwarded == [("reconciliation_cards", 0.3, "ui")]
@@ -0,0 +1,191 @@
+"""
+Unit tests for period-close checkpoints and checkpoint-based statements.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from src.core.schema import create_schema
+from src.services.period_close_service import PeriodCloseService
+from src.services.statement_service import StatementService
+
+SEPTEMBER_END = "2025-09-30T23:59:59Z"
+OCTOBER_END = "2025-10-31T23:59:59Z"
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _add_entry(
+    conn: sqlite3.Connection,
+    entry_type: str,
+    amount: str,
+    created_at: str,
+    *,
+    principal: str | None = None,
+    share: str | None = None,
+) -> None:
+    conn.execute(
+        """
+        INSERT INTO ledger_entries (
+            type, associate_id, bookmaker_id, amount_native, native_currency,
+            fx_rate_snapshot, amount_eur, settlement_state, principal_returned_eur,
+            per_surebet_share_eur, created_at_utc, created_by
+        ) VALUES (?, 1, 1, ?, 'EUR', '1.0', ?, ?, ?, ?, ?, 'test')
+        """,
+        (
+            entry_type,
+            amount,
+            amount,
+            "WON" if entry_type == "BET_RESULT" else None,
+            principal,
+            share,
+            created_at,
+        ),
+    )
+    conn.commit()
+
+
+@pytest.fixture
+def db_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "period_close.db"
+    conn = _connect(path)
+    create_schema(conn)
+    conn.execute(
+        "INSERT INTO associates (id, display_alias, home_currency) VALUES (1, 'Alice', 'EUR')"
+    )
+    conn.execute(
+        "INSERT INTO bookmakers (id, associate_id, bookmaker_name) VALUES (1, 1, 'Bookie')"
+    )
+    conn.commit()
+    _add_entry(conn, "DEPOSIT", "1000.00", "2025-09-01T10:00:00Z")
+    _add_entry(conn, "BET_RESULT", "150.00", "2025-09-10T10:00:00Z", principal="100.00", share="50.00")
+    _add_entry(conn, "WITHDRAWAL", "-200.00", "2025-10-05T10:00:00Z")
+    _add_entry(conn, "BET_RESULT", "80.00", "2025-10-20T10:00:00Z", principal="60.00", share="20.00")
+    conn.close()
+
+    monkeypatch.setattr(
+        "src.services.statement_service.get_db_connection", lambda: _connect(path)
+    )
+    return path
+
+
+@pytest.fixture
+def service(db_path: Path):
+    close_service = PeriodCloseService(_connect(db_path))
+    yield close_service
+    close_service.db.close()
+
+
+def _metrics(calc) -> tuple:
+    return (
+        calc.net_deposits_eur,
+        calc.total_deposits_eur,
+        calc.total_withdrawals_eur,
+        calc.should_hold_eur,
+        calc.current_holding_eur,
+        calc.fair_share_eur,
+        [(row.bookmaker_id, row.balance_eur, row.withdrawals_eur) for row in calc.bookmakers],
+    )
+
+
+def test_statement_from_checkpoint_matches_full_history(service, db_path):
+    result = service.close_period(SEPTEMBER_END)
+
+    assert result.associate_count == 1
+    assert result.bookmaker_row_count == 1
+    checkpoint = service.repository.get_checkpoint(1, SEPTEMBER_END)
+    assert checkpoint.holdings_eur == Decimal("1150.00")
+    assert checkpoint.should_hold_eur == Decimal("150.00")
+
+    incremental = StatementService().generate_statement(1, OCTOBER_END)
+    full = StatementService(use_checkpoints=False).generate_statement(1, OCTOBER_END)
+
+    assert _metrics(incremental) == _metrics(full)
+    assert incremental.current_holding_eur == Decimal("1030.00")
+
+
+def test_statement_starts_from_stored_checkpoint(service):
+    service.close_period(SEPTEMBER_END)
+    service.db.execute(
+        "UPDATE period_closing_balances SET holdings_eur = '0.00' WHERE bookmaker_id IS NULL"
+    )
+    service.db.commit()
+
+    calc = StatementService().generate_statement(1, OCTOBER_END)
+
+    # Only October's rows (-200 + 80) are added to the tampered checkpoint.
+    assert calc.current_holding_eur == Decimal("-120.00")
+    assert [(m["field"], m["expected"]) for m in service.verify_checkpoints()] == [
+        ("holdings_eur", "1150.00")
+    ]
+
+
+def test_backdated_entry_after_close_is_still_counted(service, db_path):
+    service.close_period(SEPTEMBER_END)
+    conn = _connect(db_path)
+    _add_entry(conn, "DEPOSIT", "25.00", "2025-09-15T10:00:00Z")
+    conn.close()
+
+    september = StatementService().generate_statement(1, SEPTEMBER_END)
+    full = StatementService(use_checkpoints=False).generate_statement(1, SEPTEMBER_END)
+
+    assert september.total_deposits_eur == full.total_deposits_eur == Decimal("1025.00")
+    assert service.verify_checkpoints() == []
+
+
+def test_closing_later_period_builds_on_previous_checkpoint(service):
+    service.close_period(SEPTEMBER_END)
+    service.close_period(OCTOBER_END)
+    service.close_period(OCTOBER_END)  # re-closing replaces the checkpoint
+
+    october = service.repository.get_checkpoint(1, OCTOBER_END)
+    assert october.net_deposits_eur == Decimal("800.00")
+    assert october.signed_withdrawals_eur == Decimal("-200.00")
+    assert october.bookmakers[1].withdrawals_eur == Decimal("200.00")
+    assert len(service.repository.list_checkpoints()) == 2
+    assert service.verify_checkpoints() == []
+
+
+def test_close_period_rejects_future_period_end(service):
+    with pytest.raises(ValueError, match="future"):
+        service.close_period("2999-12-31T23:59:59Z")
+
+
+def test_close_period_normalizes_period_end_spelling(service):
+    result = service.close_period("2025-09-30 23:59:59Z")
+    service.close_period("2025-10-31T23:59:59+00:00")
+
+    assert result.period_end_utc == SEPTEMBER_END
+    assert [c.period_end_utc for c in service.repository.list_checkpoints()] == [
+        SEPTEMBER_END,
+        OCTOBER_END,
+    ]
+    # A space-separated cutoff must still pick the October checkpoint, not September
+    nearest = service.repository.get_nearest_checkpoint(1, "2025-10-31 23:59:59Z")
+    assert nearest.period_end_utc == OCTOBER_END
+
+
+def test_nearest_checkpoint_compares_epoch_ms(service):
+    service.close_period(SEPTEMBER_END)
+    service.close_period(OCTOBER_END)
+    # A checkpoint written before spellings were normalized still sorts by time
+    service.db.execute(
+        "UPDATE period_closing_balances SET period_end_utc = '2025-10-31 23:59:59Z' "
+        "WHERE period_end_utc = ?",
+        (OCTOBER_END,),
+    )
+    service.db.commit()
+
+    nearest = service.repository.get_nearest_checkpoint(1, "2025-10-31T23:59:59.500Z")
+    assert nearest.period_end_utc == "2025-10-31 23:59:59Z"
+    earlier = service.repository.get_nearest_checkpoint(1, "2025-10-31T23:59:58Z")
+    assert earlier.period_end_utc == SEPTEMBER_END
@@ -811,8 +811,12 @@ def test_execute_settlement_persists_share_and_identifiers(
     assert len(insert_params) == 2
     first_entry, second_entry = insert_params
 
-    assert first_entry[9] == "12.34"
+    # Rows come from build_settlement_ledger_row: native amount and currency,
+    # the preview's per-surebet share for staked seats only
+    assert first_entry[3] == "200.00"
+    assert first_entry[4] == "EUR"
+    assert first_entry[9] == "6.17"
     assert second_entry[9] == "0.00"
     assert first_entry[10] == 77
     assert first_entry[11] == 501
-    assert first_entry[13] == "batch-xyz"
+    assert first_entry[12] == "batch-xyz"
@@ -0,0 +1,67 @@
+"""
+Unit tests for SQL statement tracing.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+
+import pytest
+
+from src.core import sql_tracing
+from src.core.sql_tracing import SqlTraceRegistry, TracingConnection, normalize_sql
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    registry = SqlTraceRegistry(slow_threshold_ms=1_000_000, slow_log_path=str(tmp_path / "slow.log"))
+    monkeypatch.setattr(sql_tracing, "_REGISTRY", registry)
+    return registry
+
+
+@pytest.fixture
+def conn(registry):
+    connection = sqlite3.connect(":memory:", factory=TracingConnection)
+    connection.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    connection.executemany("INSERT INTO items (name) VALUES (?)", [(f"n{i}",) for i in range(5)])
+    yield connection
+    connection.close()
+
+
+def test_normalize_sql_collapses_literals_and_whitespace():
+    assert normalize_sql("SELECT *\n  FROM t WHERE a = 'x''y' AND b = 42 AND c IN (?, ?, ?)") == (
+        "SELECT * FROM t WHERE a = ? AND b = ? AND c IN (?...)"
+    )
+
+
+def test_statements_are_aggregated_with_rows_and_caller(registry, conn):
+    for limit in (1, 2, 3):
+        conn.execute(f"SELECT id FROM items WHERE id <= {limit}").fetchall()
+    rows = [row for row in conn.execute("SELECT name FROM items")]
+
+    stats = {item.sql: item for item in registry.top_statements(limit=10)}
+    ranged = stats["SELECT id FROM items WHERE id <= ?"]
+    assert ranged.calls == 3
+    assert ranged.avg_rows == 2.0
+    assert ranged.p50_ms <= ranged.p95_ms <= ranged.max_ms
+    assert ranged.top_caller == "unknown"  # called from tests, not src.*
+    assert stats["SELECT name FROM items"].avg_rows == len(rows) == 5
+    assert stats["INSERT INTO items (name) VALUES (?)"].avg_rows == 5
+
+
+def test_slow_statements_are_logged(registry, conn):
+    registry.slow_threshold_ms = 0.0
+    conn.execute("SELECT COUNT(*) FROM items").fetchone()
+
+    slow = registry.slow_queries()
+    assert slow and slow[-1]["sql"] == "SELECT COUNT(*) FROM items"
+    logged = [json.loads(line) for line in registry.slow_log_path.read_text().splitlines()]
+    assert logged[-1]["sql"] == "SELECT COUNT(*) FROM items"
+
+
+def test_connection_factory_follows_toggle(monkeypatch):
+    monkeypatch.setattr(sql_tracing, "_ENABLED", False)
+    assert sql_tracing.connection_factory() is sqlite3.Connection
+    sql_tracing.set_tracing_enabled(True)
+    assert sql_tracing.connection_factory() is TracingConnection
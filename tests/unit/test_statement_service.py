@@ -13,6 +13,7 @@ from unittest.mock import MagicMock
 from openpyxl import load_workbook
 import pytest
 
+from src.core.schema import create_epoch_ms_columns
 from src.services.statement_service import (
     InternalSection,
     PartnerFacingSection,
@@ -197,6 +198,7 @@ def test_calculate_profit_before_payout_handles_signed_shares():
         )
         """
     )
+    create_epoch_ms_columns(conn)
     rows = [
         (1, "BET_RESULT", "10.00", "2025-10-01T10:00:00Z"),
         (1, "BET_RESULT", "-4.50", "2025-10-05T10:00:00Z"),
@@ -219,6 +221,39 @@ def test_calculate_profit_before_payout_handles_signed_shares():
     conn.close()
 
 
+def test_cutoff_compares_instants_across_timestamp_spellings():
+    service = StatementService(use_checkpoints=False)
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute(
+        """
+        CREATE TABLE ledger_entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            associate_id INTEGER,
+            amount_eur TEXT,
+            created_at_utc TEXT
+        )
+        """
+    )
+    create_epoch_ms_columns(conn)
+    conn.executemany(
+        "INSERT INTO ledger_entries (associate_id, amount_eur, created_at_utc) VALUES (1, ?, ?)",
+        [
+            ("1.00", "2025-10-31 12:00:00Z"),  # exactly the cutoff
+            ("2.00", "2025-10-31T11:59:59.999+00:00Z"),
+            ("40.00", "2025-10-31 13:00:00Z"),  # sorts before "...T12" as text
+            ("80.00", "2025-10-31T12:00:00.001Z"),  # sorts before "...Z" as text
+        ],
+    )
+
+    result = service._calculate_current_holding(
+        conn, associate_id=1, cutoff_date="2025-10-31T12:00:00Z"
+    )
+
+    assert result == Decimal("3.00")
+    conn.close()
+
+
 def test_calculate_funding_totals_preserves_signed_withdrawals():
     service = StatementService()
     conn = sqlite3.connect(":memory:")
@@ -235,6 +270,7 @@ def test_calculate_funding_totals_preserves_signed_withdrawals():
         )
         """
     )
+    create_epoch_ms_columns(conn)
     conn.executemany(
         """
         INSERT INTO ledger_entries (associate_id, type, amount_eur, created_at_utc)
@@ -0,0 +1,156 @@
+"""Tests for the batch surebet risk recompute service."""
+
+import sqlite3
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import pytest
+
+from src.core.schema import create_schema
+from src.services.fx_manager import store_fx_rate
+from src.services.surebet_calculator import SurebetRiskCalculator
+from src.services.surebet_risk_recompute_service import SurebetRiskRecomputeService
+
+
+@pytest.fixture
+def test_db():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    create_schema(conn)
+    conn.execute("INSERT INTO associates (id, display_alias) VALUES (1, 'Alice'), (2, 'Bob')")
+    conn.execute(
+        """
+        INSERT INTO bookmakers (id, associate_id, bookmaker_name)
+        VALUES (1, 1, 'Bet365'), (2, 2, 'Pinnacle')
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO canonical_events (id, normalized_event_name, sport, league)
+        VALUES (1, 'Team A vs Team B', 'Soccer', 'Premier League')
+        """
+    )
+    yield conn
+    conn.close()
+
+
+def _store_rate(conn, currency, rate):
+    today = datetime.now(UTC).isoformat().replace("+00:00", "Z")
+    store_fx_rate(currency, Decimal(rate), today, "test", conn)
+
+
+def _add_surebet(conn, surebet_id, legs, status="open"):
+    """legs: (side, currency, stake, payout) tuples."""
+    conn.execute(
+        """
+        INSERT INTO surebets (id, canonical_event_id, market_code, period_scope, line_value, status)
+        VALUES (?, 1, 'TOTALS', 'FULL_TIME', '2.5', ?)
+        """,
+        (surebet_id, status),
+    )
+    for side, currency, stake, payout in legs:
+        bet_id = conn.execute(
+            """
+            INSERT INTO bets (
+                associate_id, bookmaker_id, canonical_event_id, status, stake_eur,
+                stake_original, odds, odds_original, currency, payout, market_code,
+                period_scope, line_value, side, is_supported
+            )
+            VALUES (?, ?, 1, 'matched', ?, ?, '2.10', '2.10', ?, ?, 'TOTALS',
+                    'FULL_TIME', '2.5', ?, 1)
+            """,
+            (
+                1 if side == "A" else 2,
+                1 if side == "A" else 2,
+                stake,
+                stake,
+                currency,
+                payout,
+                "OVER" if side == "A" else "UNDER",
+            ),
+        ).lastrowid
+        conn.execute(
+            "INSERT INTO surebet_bets (surebet_id, bet_id, side) VALUES (?, ?, ?)",
+            (surebet_id, bet_id, side),
+        )
+    conn.commit()
+
+
+def _store_single_risk(conn, surebet_id):
+    """Persist risk the way the matcher does after a match."""
+    risk = SurebetRiskCalculator(conn).calculate_surebet_risk(surebet_id)
+    conn.execute(
+        """
+        UPDATE surebets
+        SET worst_case_profit_eur = ?, total_staked_eur = ?, roi = ?, risk_classification = ?
+        WHERE id = ?
+        """,
+        (
+            str(risk["worst_case_profit_eur"]),
+            str(risk["total_staked_eur"]),
+            str(risk["roi"]),
+            risk["risk_classification"],
+            surebet_id,
+        ),
+    )
+    conn.commit()
+
+
+def test_recompute_matches_calculator_and_skips_unchanged_rows(test_db):
+    _store_rate(test_db, "AUD", "0.60")
+    _store_rate(test_db, "GBP", "1.15")
+    _add_surebet(test_db, 1, [("A", "AUD", "100.00", "210.00"), ("B", "GBP", "100.00", "210.00")])
+    _add_surebet(test_db, 2, [("A", "EUR", "100.00", "210.00"), ("B", "EUR", "100.00", "210.00")])
+    _store_single_risk(test_db, 1)
+    _store_single_risk(test_db, 2)
+
+    result = SurebetRiskRecomputeService(test_db).recompute()
+
+    assert result.scanned == 2
+    assert result.updated == []
+
+
+def test_recompute_after_rate_change_updates_affected_currency_only(test_db):
+    _store_rate(test_db, "GBP", "1.15")
+    _add_surebet(test_db, 1, [("A", "EUR", "100.00", "205.00"), ("B", "GBP", "87.00", "182.70")])
+    _add_surebet(test_db, 2, [("A", "EUR", "100.00", "150.00"), ("B", "EUR", "100.00", "150.00")])
+    _add_surebet(test_db, 3, [("A", "GBP", "10.00", "30.00"), ("B", "EUR", "10.00", "30.00")], status="settled")
+    service = SurebetRiskRecomputeService(test_db)
+    assert {risk.surebet_id for risk in service.recompute().updated} == {1, 2}
+    before = service.snapshot_rates()
+    stale = dict(test_db.execute("SELECT id, updated_at_utc FROM surebets").fetchall())
+
+    _store_rate(test_db, "GBP", "0.90")
+    result = service.recompute_changed_rates(before)
+
+    assert result.currencies == ["GBP"]
+    assert [risk.surebet_id for risk in result.updated] == [1]
+    assert [risk.surebet_id for risk in result.classification_changes] == [1]
+    row = test_db.execute("SELECT * FROM surebets WHERE id = 1").fetchone()
+    expected = SurebetRiskCalculator(test_db).calculate_surebet_risk(1)
+    assert row["total_staked_eur"] == str(expected["total_staked_eur"]) == "178.30"
+    assert row["worst_case_profit_eur"] == str(expected["worst_case_profit_eur"])
+    assert row["risk_classification"] == expected["risk_classification"] == "Unsafe"
+    untouched = dict(test_db.execute("SELECT id, updated_at_utc FROM surebets WHERE id != 1").fetchall())
+    assert untouched == {2: stale[2], 3: stale[3]}
+
+
+def test_recompute_skips_surebets_without_fx_rate(test_db):
+    _add_surebet(test_db, 1, [("A", "USD", "100.00", "210.00"), ("B", "EUR", "100.00", "210.00")])
+
+    result = SurebetRiskRecomputeService(test_db).recompute(["usd"])
+
+    assert result.currencies == ["USD"]
+    assert result.updated == []
+    assert result.skipped == {1: "no FX rate for USD"}
+
+
+def test_recompute_leaves_the_callers_row_factory_alone(test_db):
+    _add_surebet(test_db, 1, [("A", "EUR", "100.00", "210.00"), ("B", "EUR", "100.00", "210.00")])
+    test_db.row_factory = None
+
+    result = SurebetRiskRecomputeService(test_db).recompute()
+
+    assert test_db.row_factory is None
+    assert [risk.surebet_id for risk in result.updated] == [1]
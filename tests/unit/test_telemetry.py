@@ -0,0 +1,82 @@
+"""
+Unit tests for the persistent timing telemetry store.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from src.core import telemetry
+from src.core.telemetry import TelemetryStore, TimingSample
+
+
+def _ts(day: str, hour: int = 12) -> float:
+    return datetime.fromisoformat(f"{day}T{hour:02d}:00:00").replace(tzinfo=timezone.utc).timestamp()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TelemetryStore(str(tmp_path / "telemetry.db"), max_samples=50, release="1.0.0")
+    yield store
+    store.close()
+
+
+def test_rollups_report_percentiles_per_label_and_day(store):
+    samples = [TimingSample("incoming_queue", "ui", float(ms), _ts("2025-11-01")) for ms in range(1, 101)]
+    samples.append(TimingSample("incoming_queue", "ui", 5.0, _ts("2025-11-02")))
+    store.write(samples)
+
+    rollups = store.get_rollups(label="incoming_queue")
+
+    assert [(item.day, item.count) for item in rollups] == [("2025-11-02", 1), ("2025-11-01", 100)]
+    first_day = rollups[1]
+    assert first_day.max_ms == 100.0
+    assert first_day.mean_ms == pytest.approx(50.5)
+    # Log buckets are 10% wide, so percentiles are accurate to that resolution.
+    assert first_day.p50_ms == pytest.approx(50, rel=0.1)
+    assert first_day.p95_ms == pytest.approx(95, rel=0.1)
+    assert first_day.p99_ms == pytest.approx(99, rel=0.1)
+
+
+def test_ring_buffer_prunes_samples_but_keeps_rollups(store):
+    store.write([TimingSample("job.export", "job", 10.0, _ts("2025-11-01")) for _ in range(80)])
+
+    assert store.sample_count() == 50
+    assert store.get_rollups()[0].count == 80
+
+
+def test_rollups_merge_days_to_compare_releases(tmp_path):
+    path = str(tmp_path / "telemetry.db")
+    old = TelemetryStore(path, release="1.0.0")
+    new = TelemetryStore(path, release="1.1.0")
+    try:
+        old.write([TimingSample("statements", "ui", 100.0, _ts(day)) for day in ("2025-11-01", "2025-11-02")])
+        new.write([TimingSample("statements", "ui", 40.0, _ts("2025-11-03"))])
+
+        merged = {item.release: item for item in new.get_rollups(label="statements", by_day=False)}
+    finally:
+        old.close()
+        new.close()
+
+    assert merged["1.0.0"].count == 2 and merged["1.0.0"].day == "all"
+    assert merged["1.1.0"].p95_ms < merged["1.0.0"].p95_ms
+
+
+def test_recorded_timings_are_buffered_until_flush(store, monkeypatch):
+    monkeypatch.setattr(telemetry, "_store", store)
+    monkeypatch.setattr(telemetry, "_enabled", True)
+    monkeypatch.setattr(telemetry, "FLUSH_INTERVAL_SECONDS", 3600)
+
+    @telemetry.timed("job.nightly")
+    def run_job():
+        return "done"
+
+    assert run_job() == "done"
+    telemetry.record_timing("surebets_overview", 0.2, source="ui")
+    assert store.get_rollups() == []
+
+    telemetry.flush()
+    labels = {(item.label, item.source) for item in store.get_rollups()}
+    assert labels == {("job.nightly", "job"), ("surebets_overview", "ui")}